@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Parallel parse/validate/dedup for large URI dumps
+The GitHub background cache (runtime/HUNTER_github_configs_cache.txt) only
+ever grows. This command loads such a file once into a shared-memory
+buffer and hands worker processes byte ranges of it (line-aligned shards),
+so no URI strings are pickled. Each worker trims, dedups, parses and keeps
+configs that pass ParsedConfig::isValid (uri_parser.parse_many), then
+writes its sorted unique survivors back into its own shard of the buffer.
+The parent k-way merges the shards into one sorted, deduplicated file,
+the same result filterValidGithubConfigs' std::set produces.
+
+Run with --bench to measure scaling from 1 to N worker processes.
+"""
+
+import argparse
+import heapq
+import os
+import sys
+import time
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+from uri_parser import parse_many
+
+SHARDS_PER_WORKER = 4
+MIN_SHARD_BYTES = 256 * 1024
+
+_shared = None
+
+
+def _init_worker(name):
+    # Pool workers share the parent's resource tracker, so attaching only
+    # re-adds a name the parent already tracks and unlinks on exit
+    global _shared
+    _shared = SharedMemory(name=name)
+
+
+def validate_lines(raw):
+    """Sorted unique valid URIs (bytes) of a newline-separated block, plus
+    ``(lines, invalid, duplicates)`` counts
+    """
+    lines = raw.decode("utf-8", "surrogateescape").split("\n")
+    unique = set()
+    total = 0
+    for line in lines:
+        uri = line.strip(" \t\r\n")
+        if uri:
+            total += 1
+            unique.add(uri)
+    valid = sorted(cfg.uri.encode("utf-8", "surrogateescape") for cfg in parse_many(unique))
+    return valid, (total, len(unique) - len(valid), total - len(unique))
+
+
+def _validate_shard(task):
+    """Worker: validate ``buf[start:end]`` and compact the result in place"""
+    start, end = task
+    buf = _shared.buf
+    valid, counts = validate_lines(bytes(buf[start:end]))
+    out = b"\n".join(valid) + b"\n" if valid else b""
+    # Valid lines are trimmed input lines, so they fit in the shard; only the
+    # last shard may need one byte more for a newline the file lacked
+    buf[start:start + len(out)] = out
+    return start, len(out), counts
+
+
+def shard_bounds(path, shards):
+    """Line-aligned ``(start, end)`` byte ranges covering ``path``"""
+    size = os.path.getsize(path)
+    bounds = [0]
+    with open(path, "rb") as f:
+        for i in range(1, shards):
+            target = size * i // shards
+            if target <= bounds[-1]:
+                continue
+            f.seek(target)
+            f.readline()
+            if f.tell() < size and f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def batch_validate(path, output, workers=None):
+    """Validate ``path`` with ``workers`` processes; returns a stats dict"""
+    global _shared
+    workers = max(1, workers or os.cpu_count() or 1)
+    size = os.path.getsize(path)
+    shards = max(1, min(workers * SHARDS_PER_WORKER, size // MIN_SHARD_BYTES or 1))
+    tasks = shard_bounds(path, shards)
+    shm = SharedMemory(create=True, size=size + 1)
+    stats = {"lines": 0, "invalid": 0, "duplicates": 0, "valid": 0, "workers": workers,
+             "shards": len(tasks)}
+    try:
+        with open(path, "rb") as f:
+            f.readinto(shm.buf[:size])
+
+        if workers == 1:
+            _shared = shm
+            results = [_validate_shard(task) for task in tasks]
+        else:
+            with get_context().Pool(workers, initializer=_init_worker,
+                                    initargs=(shm.name,)) as pool:
+                results = pool.map(_validate_shard, tasks, chunksize=1)
+
+        runs = []
+        for start, length, (lines, invalid, duplicates) in results:
+            stats["lines"] += lines
+            stats["invalid"] += invalid
+            stats["duplicates"] += duplicates
+            if length:
+                runs.append(bytes(shm.buf[start:start + length - 1]).split(b"\n"))
+
+        tmp = output + ".tmp"
+        with open(tmp, "wb") as out:
+            previous = None
+            for uri in heapq.merge(*runs):
+                if uri != previous:
+                    out.write(uri + b"\n")
+                    stats["valid"] += 1
+                    previous = uri
+                else:
+                    stats["duplicates"] += 1
+        os.replace(tmp, output)
+    finally:
+        _shared = None
+        shm.close()
+        shm.unlink()
+    return stats
+
+
+def make_synthetic_dump(path, count, seed=11):
+    """URI file with re-announced lines, blank lines and invalid entries"""
+    import random
+
+    from uri_parser import make_synthetic_uris
+
+    rng = random.Random(seed)
+    uris = make_synthetic_uris(count // 2, seed=seed)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            r = rng.random()
+            if r < 0.03:
+                f.write("\n")
+            elif r < 0.08:
+                f.write(f"vless://broken-{i}@:0\n")
+            else:
+                f.write(f"  {rng.choice(uris)}\n" if r < 0.1 else f"{rng.choice(uris)}\n")
+
+
+def run_benchmark(count=1000000, max_workers=None):
+    import tempfile
+
+    max_workers = max_workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "dump.txt")
+        make_synthetic_dump(source, count)
+        print(f"[BENCH] {count:,} lines, {os.path.getsize(source) / 1e6:.1f} MB, "
+              f"{os.cpu_count()} CPUs")
+
+        start = time.perf_counter()
+        with open(source, "rb") as f:
+            baseline, _ = validate_lines(f.read())
+        single = time.perf_counter() - start
+        print(f"   in-process, one thread: {single:.2f} s, {len(baseline):,} valid")
+
+        counts = sorted({min(2 ** i, max_workers) for i in range(max_workers.bit_length() + 1)})
+        base = None
+        for workers in counts:
+            output = os.path.join(tmp, f"valid-{workers}.txt")
+            start = time.perf_counter()
+            stats = batch_validate(source, output, workers)
+            elapsed = time.perf_counter() - start
+            base = base or elapsed
+            with open(output, "rb") as f:
+                assert f.read().split(b"\n")[:-1] == baseline
+            print(f"   {workers:3d} workers: {elapsed:6.2f} s, speedup {base / elapsed:5.2f}x, "
+                  f"efficiency {base / elapsed / workers:5.1%} ({stats['shards']} shards)")
+        if max_workers == 1:
+            print("   (single CPU: no scaling to measure here)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel parse/validate/dedup of a URI dump")
+    parser.add_argument("input", nargs="?", help="URI file, e.g. runtime/HUNTER_github_configs_cache.txt")
+    parser.add_argument("-o", "--output", help="sorted valid URIs (default: <input>.valid.txt)")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: CPUs)")
+    parser.add_argument("--bench", nargs="?", type=int, const=1000000, metavar="LINES",
+                        help="measure scaling on a synthetic dump")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmark(args.bench, args.workers)
+        return 0
+    if not args.input:
+        parser.print_usage()
+        return 2
+
+    output = args.output or args.input + ".valid.txt"
+    start = time.perf_counter()
+    stats = batch_validate(args.input, output, args.workers)
+    elapsed = time.perf_counter() - start
+    print(f"[BATCH] {stats['lines']:,} lines -> {stats['valid']:,} valid unique "
+          f"({stats['invalid']:,} invalid, {stats['duplicates']:,} duplicates) "
+          f"in {elapsed:.2f} s with {stats['workers']} workers")
+    print(f"[SAVE] {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
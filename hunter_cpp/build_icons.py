@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Icon asset pipeline for the Win32 resources (src/win32/resource.rc)
+Every icon is declared once in ICONS (name, color, glyph, sizes). Each one
+is rendered natively at every size it ships (supersampled coverage with
+numpy, no Pillow needed and no resizing of a 256 px master), then packed
+into a multi-resolution .ico: BMP entries below 256 px, PNG for 256 px,
+as Windows expects.
+
+Builds are incremental: the inputs of an icon (its declaration, the
+source of its glyph and of the renderer) are hashed and recorded with a
+hash of the written file in src/win32/icons/.icon_cache.json. An icon
+whose inputs and output are unchanged is skipped; the stale ones are
+rendered in a process pool. The cache is local build state and is not
+versioned; a fresh checkout rebuilds the (identical) icons once.
+
+Replaces create_icons.py, create_icons_fixed.py, create_basic_icons.py,
+create_reliable_icons.py and create_windows_icons.py.
+
+Run with --force to rebuild everything, NAMES to rebuild some, or --bench
+to time cold, parallel and incremental builds in a scratch directory.
+"""
+
+import argparse
+import functools
+import hashlib
+import inspect
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_OUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "win32", "icons")
+CACHE_FILE = ".icon_cache.json"
+APP_SIZES = (16, 24, 32, 48, 64, 128, 256)
+SMALL_SIZES = (16, 24, 32, 48)
+DISK_RADIUS = 0.75            # margin of size/8 on each side
+
+
+class IconSpec:
+    """One .ico file: RGB disk color, glyph name and the sizes it contains"""
+
+    __slots__ = ("name", "color", "glyph", "sizes")
+
+    def __init__(self, name, color, glyph, sizes=SMALL_SIZES):
+        self.name = name
+        self.color = tuple(color)
+        self.glyph = glyph
+        self.sizes = tuple(sorted(set(sizes)))
+
+    def __repr__(self):
+        return f"IconSpec({self.name!r}, {self.color}, {self.glyph!r}, {self.sizes})"
+
+
+BLUE = (34, 120, 242)
+LIGHT_BLUE = (59, 130, 246)
+GREEN = (34, 197, 94)
+GRAY = (107, 114, 128)
+YELLOW = (234, 179, 8)
+RED = (239, 68, 68)
+PURPLE = (168, 85, 247)
+
+ICONS = (
+    IconSpec("app", BLUE, "hunter", APP_SIZES),
+    IconSpec("app_small", BLUE, "hunter", (16, 24, 32)),
+    IconSpec("app_large", BLUE, "hunter", (32, 48, 64)),
+    IconSpec("online", GREEN, "check"),
+    IconSpec("offline", GRAY, "cross"),
+    IconSpec("working", YELLOW, "spinner"),
+    IconSpec("error", RED, "exclamation"),
+    IconSpec("config", LIGHT_BLUE, "gear"),
+    IconSpec("download", GREEN, "arrow_down"),
+    IconSpec("settings", PURPLE, "menu"),
+    IconSpec("logs", GRAY, "document"),
+    IconSpec("censorship", YELLOW, "shield"),
+    IconSpec("sources", BLUE, "globe"),
+    IconSpec("about", LIGHT_BLUE, "info"),
+)
+
+
+# ─── Shape primitives (x, y in [-1, 1], y pointing down) ───
+
+def disk(x, y, cx, cy, r):
+    return (x - cx) ** 2 + (y - cy) ** 2 <= r * r
+
+
+def ring(x, y, cx, cy, outer, inner):
+    d2 = (x - cx) ** 2 + (y - cy) ** 2
+    return (d2 <= outer * outer) & (d2 >= inner * inner)
+
+
+def box(x, y, x0, y0, x1, y1):
+    return (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+
+
+def stroke(x, y, x0, y0, x1, y1, width):
+    """Capsule of ``width`` around the segment (x0, y0)-(x1, y1)"""
+    dx, dy = x1 - x0, y1 - y0
+    t = np.clip(((x - x0) * dx + (y - y0) * dy) / (dx * dx + dy * dy), 0.0, 1.0)
+    return (x - x0 - t * dx) ** 2 + (y - y0 - t * dy) ** 2 <= (width / 2) ** 2
+
+
+def triangle(x, y, a, b, c):
+    def side(p, q):
+        return (q[0] - p[0]) * (y - p[1]) - (q[1] - p[1]) * (x - p[0])
+    s1, s2, s3 = side(a, b), side(b, c), side(c, a)
+    return ((s1 >= 0) & (s2 >= 0) & (s3 >= 0)) | ((s1 <= 0) & (s2 <= 0) & (s3 <= 0))
+
+
+# ─── Glyphs ───
+
+def glyph_hunter(x, y):
+    return (box(x, y, -0.36, -0.42, -0.2, 0.42) | box(x, y, 0.2, -0.42, 0.36, 0.42)
+            | box(x, y, -0.36, -0.07, 0.36, 0.07))
+
+
+def glyph_check(x, y):
+    return stroke(x, y, -0.36, 0.02, -0.1, 0.28, 0.16) | stroke(x, y, -0.1, 0.28, 0.38, -0.24, 0.16)
+
+
+def glyph_cross(x, y):
+    return stroke(x, y, -0.3, -0.3, 0.3, 0.3, 0.16) | stroke(x, y, -0.3, 0.3, 0.3, -0.3, 0.16)
+
+
+def glyph_spinner(x, y):
+    angle = np.arctan2(y, x)
+    return ring(x, y, 0, 0, 0.4, 0.24) & ~((angle > -np.pi / 2) & (angle < -np.pi / 6))
+
+
+def glyph_exclamation(x, y):
+    return stroke(x, y, 0, -0.4, 0, 0.1, 0.16) | disk(x, y, 0, 0.32, 0.1)
+
+
+def glyph_gear(x, y):
+    r = np.sqrt(x * x + y * y)
+    teeth = (r <= 0.45) & (np.cos(8 * np.arctan2(y, x)) > 0.25)
+    return ((r <= 0.34) | teeth) & (r >= 0.14)
+
+
+def glyph_arrow_down(x, y):
+    return (stroke(x, y, 0, -0.42, 0, 0.05, 0.16)
+            | triangle(x, y, (-0.32, -0.02), (0.32, -0.02), (0, 0.36))
+            | box(x, y, -0.34, 0.4, 0.34, 0.48))
+
+
+def glyph_menu(x, y):
+    return (stroke(x, y, -0.34, -0.26, 0.34, -0.26, 0.14) | stroke(x, y, -0.34, 0, 0.34, 0, 0.14)
+            | stroke(x, y, -0.34, 0.26, 0.34, 0.26, 0.14))
+
+
+def glyph_document(x, y):
+    corner = triangle(x, y, (0.12, -0.43), (0.31, -0.43), (0.31, -0.24))
+    page = box(x, y, -0.3, -0.42, 0.3, 0.42) & ~corner
+    lines = (stroke(x, y, -0.18, -0.16, 0.18, -0.16, 0.08)
+             | stroke(x, y, -0.18, 0.02, 0.18, 0.02, 0.08)
+             | stroke(x, y, -0.18, 0.2, 0.1, 0.2, 0.08))
+    return page & ~lines
+
+
+def glyph_shield(x, y):
+    top = box(x, y, -0.34, -0.42, 0.34, 0.0)
+    bottom = (x / 0.34) ** 2 + (y / 0.46) ** 2 <= 1.0
+    return top | (bottom & (y >= 0))
+
+
+def glyph_globe(x, y):
+    meridian = (np.abs((x / 0.18) ** 2 + (y / 0.42) ** 2 - 1.0) <= 0.35) & (np.abs(y) <= 0.42)
+    return (ring(x, y, 0, 0, 0.44, 0.34) | meridian | box(x, y, -0.42, -0.04, 0.42, 0.04))
+
+
+def glyph_info(x, y):
+    return disk(x, y, 0, -0.3, 0.1) | stroke(x, y, 0, -0.06, 0, 0.38, 0.16)
+
+
+GLYPHS = {name[len("glyph_"):]: fn for name, fn in list(globals().items())
+          if name.startswith("glyph_")}
+
+
+# ─── Rendering and encoding ───
+
+def render(spec, size):
+    """RGBA uint8 array of ``spec`` at ``size`` px (supersampled coverage)"""
+    ss = min(8, max(4, 64 // size))
+    n = size * ss
+    coords = (np.arange(n, dtype=np.float32) + 0.5) / n * 2.0 - 1.0
+    x, y = np.meshgrid(coords, coords)
+    background = disk(x, y, 0, 0, DISK_RADIUS)
+    glyph = GLYPHS[spec.glyph](x, y) & background
+    alpha = background.astype(np.float32)
+    rgb = np.empty((n, n, 3), np.float32)
+    rgb[:] = spec.color
+    rgb[glyph] = 255.0
+    premultiplied = np.concatenate([rgb * alpha[..., None], alpha[..., None]], axis=2)
+    pooled = premultiplied.reshape(size, ss, size, ss, 4).mean(axis=(1, 3))
+    a = pooled[..., 3:]
+    color = np.where(a > 0, pooled[..., :3] / np.maximum(a, 1e-6), 0.0)
+    out = np.concatenate([color, a * 255.0], axis=2)
+    return np.clip(np.rint(out), 0, 255).astype(np.uint8)
+
+
+def _png(rgba):
+    height, width = rgba.shape[:2]
+    raw = np.concatenate([np.zeros((height, 1), np.uint8), rgba.reshape(height, -1)], axis=1)
+
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), 9)) + chunk(b"IEND", b""))
+
+
+def _bmp(rgba):
+    """32-bit DIB as stored in .ico: bottom-up BGRA, then the 1-bit AND mask"""
+    height, width = rgba.shape[:2]
+    bgra = rgba[::-1][..., [2, 1, 0, 3]]
+    transparent = rgba[::-1][..., 3] == 0
+    mask = np.packbits(transparent, axis=1)
+    pad = (-mask.shape[1]) % 4
+    mask = np.pad(mask, ((0, 0), (0, pad)))
+    header = struct.pack("<IiiHHIIiiII", 40, width, height * 2, 1, 32, 0,
+                         bgra.nbytes + mask.nbytes, 0, 0, 0, 0)
+    return header + bgra.tobytes() + mask.tobytes()
+
+
+def encode_ico(images):
+    """Pack ``{size: rgba}`` into .ico bytes (PNG for 256 px, BMP below)"""
+    entries = [(size, _png(img) if size >= 256 else _bmp(img))
+               for size, img in sorted(images.items())]
+    offset = 6 + 16 * len(entries)
+    header = struct.pack("<HHH", 0, 1, len(entries))
+    directory = b""
+    for size, data in entries:
+        dim = 0 if size >= 256 else size
+        directory += struct.pack("<BBBBHHII", dim, dim, 0, 0, 1, 32, len(data), offset)
+        offset += len(data)
+    return header + directory + b"".join(data for _, data in entries)
+
+
+def build_icon(spec):
+    """Render and encode one icon; runs in the pool workers"""
+    return spec.name, encode_ico({size: render(spec, size) for size in spec.sizes})
+
+
+# ─── Incremental build ───
+
+_RENDERER = (disk, ring, box, stroke, triangle, render, _png, _bmp, encode_ico, build_icon)
+
+
+@functools.lru_cache(maxsize=None)
+def _source_hash(glyph):
+    h = hashlib.sha256(f"{DISK_RADIUS}".encode())
+    for fn in _RENDERER + (GLYPHS[glyph],):
+        # Line endings normalised so a CRLF checkout hashes the same
+        h.update("\n".join(inspect.getsource(fn).splitlines()).encode())
+    return h.hexdigest()
+
+
+def input_hash(spec):
+    """Hash of everything that determines the icon's bytes"""
+    return hashlib.sha256((repr(spec) + _source_hash(spec.glyph)).encode()).hexdigest()
+
+
+def _file_hash(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def load_cache(out_dir):
+    try:
+        with open(os.path.join(out_dir, CACHE_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def stale_icons(specs, out_dir, cache=None):
+    """Specs whose inputs changed or whose .ico is missing or was edited"""
+    cache = load_cache(out_dir) if cache is None else cache
+    stale = []
+    for spec in specs:
+        entry = cache.get(spec.name, {})
+        path = os.path.join(out_dir, spec.name + ".ico")
+        if entry.get("input") != input_hash(spec) or entry.get("output") != _file_hash(path):
+            stale.append(spec)
+    return stale
+
+
+def build(specs=ICONS, out_dir=DEFAULT_OUT_DIR, force=False, jobs=None, verbose=True):
+    """Bring ``out_dir`` up to date; returns the names that were rebuilt"""
+    os.makedirs(out_dir, exist_ok=True)
+    cache = load_cache(out_dir)
+    todo = list(specs) if force else stale_icons(specs, out_dir, cache)
+    if not todo:
+        return []
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            built = list(pool.map(build_icon, todo))
+    else:
+        built = [build_icon(spec) for spec in todo]
+    by_name = {spec.name: spec for spec in todo}
+    for name, data in built:
+        path = os.path.join(out_dir, name + ".ico")
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+        cache[name] = {"input": input_hash(by_name[name]),
+                       "output": hashlib.sha256(data).hexdigest()}
+        if verbose:
+            print(f"  - {name}.ico ({', '.join(map(str, by_name[name].sizes))} px, "
+                  f"{len(data):,} bytes)")
+    with open(os.path.join(out_dir, CACHE_FILE + ".tmp"), "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+        f.write("\n")
+    os.replace(os.path.join(out_dir, CACHE_FILE + ".tmp"), os.path.join(out_dir, CACHE_FILE))
+    return [name for name, _ in built]
+
+
+def run_benchmark(jobs=None):
+    import tempfile
+
+    jobs = jobs or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        runs = [("cold, serial", dict(force=True, jobs=1)),
+                (f"cold, {jobs} processes", dict(force=True, jobs=jobs)),
+                ("incremental, nothing changed", dict()),
+                ("incremental, one icon edited", dict())]
+        print(f"[BENCH] {len(ICONS)} icons, {sum(len(s.sizes) for s in ICONS)} images")
+        for label, kwargs in runs:
+            specs = ICONS
+            if label.endswith("edited"):
+                specs = tuple(IconSpec(s.name, (200, 60, 60), s.glyph, s.sizes)
+                              if s.name == "about" else s for s in ICONS)
+            start = time.perf_counter()
+            rebuilt = build(specs, tmp, verbose=False, **kwargs)
+            elapsed = time.perf_counter() - start
+            print(f"   {label:30s}: {len(rebuilt):2d} rebuilt in {elapsed * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Win32 .ico assets")
+    parser.add_argument("names", nargs="*", help="icons to build (default: all declared)")
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="output directory")
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--bench", action="store_true")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmark(args.jobs)
+        return 0
+
+    specs = ICONS
+    if args.names:
+        unknown = set(args.names) - {s.name for s in ICONS}
+        if unknown:
+            print(f"[ERROR] unknown icons: {', '.join(sorted(unknown))}")
+            return 1
+        specs = tuple(s for s in ICONS if s.name in args.names)
+    start = time.perf_counter()
+    rebuilt = build(specs, args.out, force=args.force, jobs=args.jobs)
+    print(f"[ICONS] {len(rebuilt)}/{len(specs)} rebuilt, {len(specs) - len(rebuilt)} up to date "
+          f"in {args.out} ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
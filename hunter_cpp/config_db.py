@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+Offline reader for ConfigDatabase snapshots
+ConfigDatabase::saveToDisk writes runtime/HUNTER_config_db.tsv: a
+#HUNTER_CONFIG_DB_V2 header followed by one tab-separated
+ConfigHealthRecord per line. This module mirrors the record model and the
+hashUri/endpointKeyForUri keying, and SnapshotReader memory-maps a
+snapshot and builds a byte-offset index keyed by uri_hash so single
+records, last_tested ranges and getTagStats-style aggregations can be
+served without materializing every record. JSON-lines exports with the
+same field names are read as well.
+
+Run with --bench to measure index and scan throughput in records/sec.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+
+import numpy as np
+
+from uri_parser import parse
+
+SNAPSHOT_HEADER_V2 = b"#HUNTER_CONFIG_DB_V2"
+SNAPSHOT_HEADER_V1 = b"#HUNTER_CONFIG_DB_V1"
+
+# Column order written by ConfigDatabase::saveToDisk (V1 lacks telegram_only)
+SNAPSHOT_FIELDS_V2 = ("uri", "tag", "engine_used", "first_seen", "last_tested",
+                      "last_alive_time", "alive", "telegram_only", "latency_ms",
+                      "consecutive_fails", "total_tests", "total_passes")
+SNAPSHOT_FIELDS_V1 = tuple(f for f in SNAPSHOT_FIELDS_V2 if f != "telegram_only")
+
+INDEX_SUFFIX = ".idx.npz"
+INDEX_VERSION = 2
+EXTRA_PREFIX = "x_"            # derived per-row columns stored alongside the index
+INDEX_COLUMNS = ("offsets", "hashes", "last_tested", "tag_codes",
+                 "alive", "latency_ms", "total_tests")
+
+
+class ConfigHealthRecord:
+    """Health record for one config, field-for-field with hunter::ConfigHealthRecord"""
+
+    __slots__ = ("uri", "uri_hash", "tag", "engine_used", "first_seen",
+                 "priority_boost_until", "last_tested", "last_alive_time", "alive",
+                 "telegram_only", "latency_ms", "consecutive_fails", "total_tests",
+                 "total_passes", "needs_retest")
+
+    def __init__(self, uri="", uri_hash="", tag=""):
+        self.uri = uri
+        self.uri_hash = uri_hash
+        self.tag = tag
+        self.engine_used = ""
+        self.first_seen = 0.0
+        self.priority_boost_until = 0.0
+        self.last_tested = 0.0
+        self.last_alive_time = 0.0
+        self.alive = False
+        self.telegram_only = False
+        self.latency_ms = 0.0
+        self.consecutive_fails = 0
+        self.total_tests = 0
+        self.total_passes = 0
+        self.needs_retest = True
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        state = "alive" if self.alive else "dead"
+        return f"ConfigHealthRecord({self.uri_hash} {self.tag or '-'} {state} {self.latency_ms:.0f}ms)"
+
+
+# ─── Keying (continuous_validator.cpp) ───
+
+_HEX = frozenset("0123456789abcdefABCDEF")
+
+
+def looks_like_literal_ip(address):
+    if not address:
+        return False
+    if ":" in address:
+        return all(c in _HEX or c in ":.[]" for c in address)
+    has_dot = False
+    for c in address:
+        if c == ".":
+            has_dot = True
+        elif not ("0" <= c <= "9"):
+            return False
+    return has_dot
+
+
+def _ascii_lower(text):
+    # std::tolower in the C locale only folds ASCII letters
+    return text.encode("utf-8", "surrogateescape").lower().decode("utf-8", "surrogateescape")
+
+
+def endpoint_key_for_uri(uri):
+    """endpointKeyForUri: literal-IP address when parseable, else the lowercased URI"""
+    parsed = parse(uri)
+    if parsed is not None and parsed.is_valid():
+        address = _ascii_lower(parsed.address.strip(" \t\r\n"))
+        if looks_like_literal_ip(address):
+            return address
+    return _ascii_lower(uri.strip(" \t\r\n"))
+
+
+def endpoint_digest(uri):
+    """Full 20-byte SHA-1 of the endpoint key; hashUri is its first 8 bytes in hex"""
+    return hashlib.sha1(endpoint_key_for_uri(uri).encode("utf-8", "surrogateescape")).digest()
+
+
+def hash_uri(uri):
+    """ConfigDatabase::hashUri: first 16 hex chars of SHA-1(endpoint key)"""
+    return endpoint_digest(uri)[:8].hex()
+
+
+def hash_to_int(uri_hash):
+    """The 16-hex-char hash as an unsigned 64-bit integer (same sort order)"""
+    return int(uri_hash, 16)
+
+
+# ─── Record parsing (ConfigDatabase::loadFromDisk) ───
+
+_STOI_RE = re.compile(rb"\s*([+-]?[0-9]+)")
+_F32 = struct.Struct("<f")
+
+
+def _stoi(raw):
+    """std::stoi on a bytes field: leading integer prefix, ValueError if none"""
+    try:
+        return int(raw)
+    except ValueError:
+        m = _STOI_RE.match(raw)
+        if not m:
+            raise
+        return int(m.group(1))
+
+
+def to_float32(value):
+    """Round a double to the nearest float (ConfigHealthRecord::latency_ms)"""
+    return _F32.unpack(_F32.pack(value))[0]
+
+
+def parse_snapshot_line(line, fields=SNAPSHOT_FIELDS_V2, uri_hash=None):
+    """Parse one TSV snapshot line into a ConfigHealthRecord, or None if malformed"""
+    parts = line.rstrip(b"\r\n").split(b"\t")
+    if len(parts) < len(fields):
+        return None
+    uri = parts[0].decode("utf-8", "surrogateescape")
+    if not uri or "://" not in uri:
+        return None
+    rec = ConfigHealthRecord(uri, uri_hash or hash_uri(uri))
+    shift = 1 if len(fields) == len(SNAPSHOT_FIELDS_V2) else 0
+    try:
+        rec.tag = parts[1].decode("utf-8", "surrogateescape")
+        rec.engine_used = parts[2].decode("utf-8", "surrogateescape")
+        rec.first_seen = float(parts[3])
+        rec.last_tested = float(parts[4])
+        rec.last_alive_time = float(parts[5])
+        rec.alive = _stoi(parts[6]) != 0
+        if shift:
+            rec.telegram_only = _stoi(parts[7]) != 0
+        rec.latency_ms = to_float32(float(parts[7 + shift]))
+        rec.consecutive_fails = _stoi(parts[8 + shift])
+        rec.total_tests = _stoi(parts[9 + shift])
+        rec.total_passes = _stoi(parts[10 + shift])
+    except (ValueError, OverflowError):
+        return None
+    rec.needs_retest = True
+    return rec
+
+
+def parse_json_line(line, uri_hash=None):
+    """Parse one JSON-lines export record into a ConfigHealthRecord"""
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None
+    uri = data.get("uri", "")
+    if not uri or "://" not in uri:
+        return None
+    rec = ConfigHealthRecord(uri, uri_hash or data.get("uri_hash") or hash_uri(uri))
+    for name in ConfigHealthRecord.__slots__:
+        if name in ("uri", "uri_hash") or name not in data:
+            continue
+        setattr(rec, name, type(getattr(rec, name))(data[name]))
+    return rec
+
+
+def record_to_snapshot_line(rec):
+    """Serialize a record the way ConfigDatabase::saveToDisk does"""
+    return (f"{rec.uri}\t{rec.tag}\t{rec.engine_used}\t{rec.first_seen:.6f}\t"
+            f"{rec.last_tested:.6f}\t{rec.last_alive_time:.6f}\t{1 if rec.alive else 0}\t"
+            f"{1 if rec.telegram_only else 0}\t{rec.latency_ms:.6f}\t{rec.consecutive_fails}\t"
+            f"{rec.total_tests}\t{rec.total_passes}\n")
+
+
+def write_snapshot(path, records, header_extra="", with_index=False):
+    """Write records in saveToDisk order (sorted by uri_hash) with the V2 header
+
+    The file is written next to ``path`` and renamed into place. Extra
+    ``key=value`` header tokens ride on the header line, which loadFromDisk
+    only checks for the version marker. With ``with_index`` the
+    SnapshotReader index is written from the in-memory records so the next
+    reader skips the hashing pass.
+    """
+    ordered = sorted((r for r in records if r.uri), key=lambda r: r.uri_hash)
+    header = SNAPSHOT_HEADER_V2 + (b" " + header_extra.encode() if header_extra else b"") + b"\n"
+    offsets = []
+    pos = len(header)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for rec in ordered:
+            line = record_to_snapshot_line(rec).encode("utf-8", "surrogateescape")
+            offsets.append(pos)
+            pos += len(line)
+            f.write(line)
+    os.replace(tmp, path)
+    if with_index:
+        tag_index = {}
+        _write_index(path, {
+            "offsets": np.array(offsets, dtype=np.int64),
+            "hashes": np.array([hash_to_int(r.uri_hash) for r in ordered], dtype=np.uint64),
+            "last_tested": np.array([r.last_tested for r in ordered], dtype=np.float64),
+            "tag_codes": np.array([tag_index.setdefault(r.tag, len(tag_index)) for r in ordered],
+                                  dtype=np.uint32),
+            "alive": np.array([r.alive for r in ordered], dtype=bool),
+            "latency_ms": np.array([r.latency_ms for r in ordered], dtype=np.float32),
+            "total_tests": np.array([r.total_tests for r in ordered], dtype=np.int64),
+        }, list(tag_index))
+    return len(ordered)
+
+
+def _index_stamp(path):
+    st = os.stat(path)
+    return np.array([INDEX_VERSION, st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+
+def _write_index(path, columns, tags):
+    try:
+        with open(path + INDEX_SUFFIX, "wb") as f:
+            np.savez(f, stamp=_index_stamp(path), tags=np.array(tags if tags else [""], dtype=str),
+                     **columns)
+    except OSError:
+        pass
+
+
+# ─── Memory-mapped snapshot reader ───
+
+class TagStats:
+    """ConfigDatabase::TagStats"""
+
+    __slots__ = ("tag", "total", "alive", "avg_latency_ms", "untested", "needs_retest")
+
+    def __init__(self, tag=""):
+        self.tag = tag
+        self.total = 0
+        self.alive = 0
+        self.avg_latency_ms = 0.0
+        self.untested = 0
+        self.needs_retest = 0
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"TagStats({self.tag}: total={self.total} alive={self.alive} "
+                f"avg={self.avg_latency_ms:.1f}ms untested={self.untested})")
+
+
+class SnapshotReader:
+    """Random access and aggregations over one snapshot file via mmap
+
+    The index holds, per record in file order: byte offset, uri_hash (as
+    uint64), last_tested, tag code, alive flag, latency_ms and total_tests.
+    It is built in one pass over the mapped bytes and cached next to the
+    snapshot as ``<snapshot>.idx.npz`` until the snapshot changes. Like
+    loadFromDisk, the first record wins when two lines share a uri_hash.
+    Callers may keep derived columns in the same file (``store_extra``);
+    they come back in ``extra`` while the index is valid.
+    """
+
+    def __init__(self, path, use_cache=True):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.format, self.fields, self._data_start = self._detect_format()
+        self.index_build_seconds = 0.0
+        self.extra = {}
+        if not (use_cache and self._load_index()):
+            self._build_index()
+            if use_cache:
+                self._save_index()
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    # ─── Index ───
+
+    def _detect_format(self):
+        first_end = self._mm.find(b"\n")
+        first = self._mm[:first_end if first_end != -1 else len(self._mm)]
+        start = first_end + 1 if first_end != -1 else len(self._mm)
+        self.header = {}
+        if first[:1] == b"#":
+            self.header = dict(token.decode("utf-8", "replace").split("=", 1)
+                               for token in first.split()[1:] if b"=" in token)
+        if SNAPSHOT_HEADER_V2 in first:
+            return "tsv-v2", SNAPSHOT_FIELDS_V2, start
+        if SNAPSHOT_HEADER_V1 in first:
+            return "tsv-v1", SNAPSHOT_FIELDS_V1, start
+        if first.lstrip()[:1] == b"{":
+            return "jsonl", None, 0
+        raise ValueError(f"{self.path}: not a ConfigDatabase snapshot")
+
+    def _index_path(self):
+        return self.path + INDEX_SUFFIX
+
+    def _load_index(self):
+        try:
+            with np.load(self._index_path(), allow_pickle=False) as data:
+                if not np.array_equal(data["stamp"], _index_stamp(self.path)):
+                    return False
+                for name in INDEX_COLUMNS:
+                    setattr(self, name, data[name])
+                self.tags = [str(t) for t in data["tags"]]
+                self.extra = {name[len(EXTRA_PREFIX):]: data[name] for name in data.files
+                              if name.startswith(EXTRA_PREFIX)}
+        except (OSError, KeyError, ValueError):
+            return False
+        self._finish_index()
+        return True
+
+    def _save_index(self):
+        columns = {name: getattr(self, name) for name in INDEX_COLUMNS}
+        columns.update({EXTRA_PREFIX + name: values for name, values in self.extra.items()})
+        _write_index(self.path, columns, self.tags)
+
+    def store_extra(self, columns):
+        """Keep derived arrays (one value per index row, or lookup tables)
+        in the cached index; they are dropped when the snapshot changes"""
+        self.extra.update(columns)
+        self._save_index()
+
+    def _build_index(self):
+        start = time.perf_counter()
+        mm = self._mm
+        end = len(mm)
+        pos = self._data_start
+        offsets, hashes, last_tested, tag_codes = [], [], [], []
+        alive, latency, total_tests = [], [], []
+        tag_index = {}
+        seen = set()
+        jsonl = self.format == "jsonl"
+        col = {name: i for i, name in enumerate(self.fields or ())}
+        # Fields only validated here, so a row is kept exactly when
+        # parse_snapshot_line (and loadFromDisk) would keep it
+        float_checks = [col[f] for f in ("first_seen", "last_alive_time") if f in col]
+        int_checks = [col[f] for f in ("telegram_only", "consecutive_fails", "total_passes")
+                      if f in col]
+
+        while pos < end:
+            nl = mm.find(b"\n", pos)
+            if nl == -1:
+                nl = end
+            line = mm[pos:nl]
+            line_start = pos
+            pos = nl + 1
+            if not line.strip() or line[:1] == b"#":
+                continue
+            if jsonl:
+                rec = parse_json_line(line)
+                if rec is None:
+                    continue
+                uri_hash, tag = rec.uri_hash, rec.tag
+                values = (rec.last_tested, rec.alive, rec.latency_ms, rec.total_tests)
+            else:
+                parts = line.rstrip(b"\r").split(b"\t")
+                if len(parts) < len(self.fields) or b"://" not in parts[0]:
+                    continue
+                try:
+                    values = (float(parts[col["last_tested"]]),
+                              _stoi(parts[col["alive"]]) != 0,
+                              to_float32(float(parts[col["latency_ms"]])),
+                              _stoi(parts[col["total_tests"]]))
+                    for i in float_checks:
+                        float(parts[i])
+                    for i in int_checks:
+                        _stoi(parts[i])
+                except (ValueError, OverflowError):
+                    continue
+                uri_hash = hash_uri(parts[0].decode("utf-8", "surrogateescape"))
+                tag = parts[col["tag"]].decode("utf-8", "surrogateescape")
+            if uri_hash in seen:
+                continue
+            seen.add(uri_hash)
+            offsets.append(line_start)
+            hashes.append(hash_to_int(uri_hash))
+            last_tested.append(values[0])
+            alive.append(values[1])
+            latency.append(values[2])
+            total_tests.append(values[3])
+            tag_codes.append(tag_index.setdefault(tag, len(tag_index)))
+
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.hashes = np.array(hashes, dtype=np.uint64)
+        self.last_tested = np.array(last_tested, dtype=np.float64)
+        self.tag_codes = np.array(tag_codes, dtype=np.uint32)
+        self.alive = np.array(alive, dtype=bool)
+        self.latency_ms = np.array(latency, dtype=np.float32)
+        self.total_tests = np.array(total_tests, dtype=np.int64)
+        self.tags = list(tag_index)
+        self._finish_index()
+        self.index_build_seconds = time.perf_counter() - start
+
+    def _finish_index(self):
+        self._hash_order = np.argsort(self.hashes, kind="stable")
+        self._sorted_hashes = self.hashes[self._hash_order]
+        self._time_order = np.argsort(self.last_tested, kind="stable")
+        self._sorted_times = self.last_tested[self._time_order]
+        self._tag_lookup = {tag: code for code, tag in enumerate(self.tags)}
+
+    # ─── Record access ───
+
+    def _line_at(self, offset):
+        nl = self._mm.find(b"\n", offset)
+        return self._mm[offset:nl if nl != -1 else len(self._mm)]
+
+    def record_at(self, row):
+        """Materialize the record at index row ``row``"""
+        line = self._line_at(int(self.offsets[row]))
+        uri_hash = f"{int(self.hashes[row]):016x}"
+        if self.format == "jsonl":
+            return parse_json_line(line, uri_hash)
+        return parse_snapshot_line(line, self.fields, uri_hash)
+
+    def get(self, uri_hash):
+        """Record for a 16-hex-char uri_hash, or None"""
+        try:
+            key = np.uint64(hash_to_int(uri_hash))
+        except ValueError:
+            return None
+        pos = np.searchsorted(self._sorted_hashes, key)
+        if pos >= len(self._sorted_hashes) or self._sorted_hashes[pos] != key:
+            return None
+        return self.record_at(self._hash_order[pos])
+
+    def get_uri(self, uri):
+        """Record for a config URI (looked up by its hashUri key)"""
+        return self.get(hash_uri(uri))
+
+    def rows_tested_between(self, start=None, end=None):
+        """Index rows with start <= last_tested < end, oldest first"""
+        lo = 0 if start is None else np.searchsorted(self._sorted_times, start, side="left")
+        hi = len(self._sorted_times) if end is None else np.searchsorted(self._sorted_times, end, side="left")
+        return self._time_order[lo:hi]
+
+    def scan_tested_between(self, start=None, end=None):
+        """Yield records with start <= last_tested < end, oldest first"""
+        for row in self.rows_tested_between(start, end):
+            yield self.record_at(row)
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self.record_at(row)
+
+    # ─── Aggregations ───
+
+    def tag_stats(self, tag):
+        """getTagStats(tag) computed from the index columns
+
+        needs_retest equals total because loadFromDisk flags every loaded
+        record for retest.
+        """
+        stats = TagStats(tag)
+        code = self._tag_lookup.get(tag)
+        if not tag or code is None:
+            return stats
+        in_tag = self.tag_codes == code
+        live = in_tag & self.alive & (self.latency_ms > 0)
+        stats.total = int(in_tag.sum())
+        stats.alive = int(live.sum())
+        stats.untested = int((in_tag & (self.total_tests == 0)).sum())
+        stats.needs_retest = stats.total
+        if stats.alive:
+            # Sequential float32 accumulation in uri_hash order, as std::accumulate over db_
+            order = self._hash_order[live[self._hash_order]]
+            total = np.cumsum(self.latency_ms[order], dtype=np.float32)[-1]
+            stats.avg_latency_ms = float(np.float32(total) / np.float32(stats.alive))
+        return stats
+
+    def all_tag_stats(self):
+        return {tag: self.tag_stats(tag) for tag in self.tags if tag}
+
+
+def make_synthetic_snapshot(path, count=200000, seed=3, now=None):
+    """Write a V2 snapshot with ``count`` synthetic records (distinct uri_hash)
+
+    The vmess and ss URIs share a small pool of literal IPs, which hashUri
+    keys on, so twice as many URIs are drawn and the first ``count``
+    distinct keys kept.
+    """
+    import random
+
+    from uri_parser import make_synthetic_uris
+
+    rng = random.Random(seed)
+    now = now or time.time()
+    tags = ["scrape", "github_bg", "harvest", "download", "manual"]
+    engines = ["xray", "sing-box", "mihomo", ""]
+    records = {}
+    for i, uri in enumerate(make_synthetic_uris(2 * count + 2000, seed=seed)):
+        if len(records) == count:
+            break
+        rec = ConfigHealthRecord(f"{uri}&n={i}" if "?" in uri else f"{uri}#n{i}")
+        rec.uri_hash = hash_uri(rec.uri)
+        if rec.uri_hash in records:
+            continue
+        rec.tag = rng.choice(tags)
+        rec.engine_used = rng.choice(engines)
+        rec.first_seen = now - rng.uniform(0, 86400 * 3)
+        rec.total_tests = rng.choice([0, 0, 1, 2, 3, 5, 8, 13])
+        if rec.total_tests:
+            rec.last_tested = now - rng.uniform(0, 86400)
+            rec.alive = rng.random() < 0.2
+            rec.total_passes = rng.randint(0, rec.total_tests)
+            rec.consecutive_fails = 0 if rec.alive else rng.randint(1, 12)
+            if rec.alive:
+                rec.latency_ms = float(np.float32(rng.uniform(80, 3000)))
+                rec.last_alive_time = rec.last_tested
+        records[rec.uri_hash] = rec
+    write_snapshot(path, records.values())
+    return list(records.values())
+
+
+def run_benchmark(count=200000):
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "HUNTER_config_db.tsv")
+        count = len(make_synthetic_snapshot(path, count))
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"[BENCH] snapshot with {count:,} records ({size_mb:.1f} MB)")
+
+        start = time.perf_counter()
+        with SnapshotReader(path) as reader:
+            build = time.perf_counter() - start
+        print(f"   index build (cold)  : {build:6.2f} s  {count / build:12,.0f} records/s")
+
+        start = time.perf_counter()
+        with SnapshotReader(path) as reader:
+            warm = time.perf_counter() - start
+            print(f"   index load (cached) : {warm:6.3f} s  {count / warm:12,.0f} records/s")
+
+            probes = [f"{int(h):016x}" for h in reader.hashes[::max(1, count // 10000)]]
+            start = time.perf_counter()
+            found = sum(1 for h in probes if reader.get(h) is not None)
+            lookup = time.perf_counter() - start
+            print(f"   random lookups      : {found:,} in {lookup * 1000:.0f} ms "
+                  f"({len(probes) / lookup:,.0f} lookups/s)")
+
+            cutoff = time.time() - 3600
+            start = time.perf_counter()
+            scanned = sum(1 for _ in reader.scan_tested_between(cutoff))
+            scan = time.perf_counter() - start
+            print(f"   range scan (1h)     : {scanned:,} records in {scan * 1000:.0f} ms "
+                  f"({scanned / max(scan, 1e-9):,.0f} records/s)")
+
+            start = time.perf_counter()
+            stats = reader.all_tag_stats()
+            agg = time.perf_counter() - start
+            print(f"   tag stats           : {len(stats)} tags in {agg * 1000:.1f} ms "
+                  f"({count / agg:,.0f} records/s)")
+
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            f.readline()
+            full = [parse_snapshot_line(line, uri_hash="0" * 16) for line in f]
+        parse_all = time.perf_counter() - start
+        print(f"   full parse baseline : {parse_all:6.2f} s  {len(full) / parse_all:12,.0f} records/s")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        run_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 200000)
+    elif len(sys.argv) > 1:
+        with SnapshotReader(sys.argv[1]) as reader:
+            print(f"[SNAPSHOT] {sys.argv[1]}: {len(reader):,} records ({reader.format})")
+            for tag, stats in sorted(reader.all_tag_stats().items()):
+                print(f"   {stats!r}")
+            for uri_hash in sys.argv[2:]:
+                print(f"   {uri_hash}: {reader.get(uri_hash)!r}")
+    else:
+        print("Usage: config_db.py --bench [COUNT] | config_db.py <snapshot> [uri_hash ...]")
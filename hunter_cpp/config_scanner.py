@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Single-pass config payload scanner
+Replaces the lowercase-and-rescan checks in the sweep scripts with compiled
+byte regexes: one pass over the lines yields the proxy-line count and the
+per-scheme counts, and the remaining markers are found with literal or
+prefix-anchored searches that stop at the first hit. Works directly on response bytes.
+
+Run with --bench to compare against the legacy is_valid_config_content.
+"""
+
+import json
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+
+# Patterns reported in the found-pattern set, in the legacy order
+SCHEME_PATTERNS = ['vmess://', 'vless://', 'trojan://', 'hysteria://', 'ss://']
+TEXT_PATTERNS = ['shadowsocks',
+                 '"protocol":', '"server":', '"port":', '"settings":',
+                 '"host":', '"path":', '"tls":', '"network":']
+# Base64 markers are case-sensitive: '{"' encodes to 'eyJ', '{\n' to 'ewo'
+BASE64_PATTERNS = ['eyJ', 'ewo', 'In0', 'CiAg']
+CONFIG_PATTERNS = SCHEME_PATTERNS + TEXT_PATTERNS + BASE64_PATTERNS
+
+# Schemes that count as importable proxy configs (constants::supportedSchemes)
+PROXY_SCHEMES = frozenset(['vmess', 'vless', 'trojan', 'ss', 'ssr',
+                           'hysteria', 'hysteria2', 'hy2', 'tuic'])
+
+# One match per line: the first "<scheme>://" and the rest of that line. Matches
+# may only start where a run of scheme characters starts; otherwise a long
+# base64 blob is rescanned from every offset (quadratic in its length)
+_SCHEME_LINE_RE = re.compile(
+    rb'(?<![A-Za-z0-9+.\-])[0-9+.\-]*(([A-Za-z][A-Za-z0-9+.\-]*)://[^\n]*)')
+# JSON keys share a literal '"' prefix, so the regex engine can skip ahead
+_JSON_KEY_RE = re.compile(
+    rb'"(?i:(protocol|server|port|settings|host|path|tls|network))":')
+# Case-insensitive literal scans are ~4x slower than memmem; these casings
+# cover what subscription payloads actually contain
+_SHADOWSOCKS_SPELLINGS = (b'shadowsocks', b'Shadowsocks', b'ShadowSocks', b'SHADOWSOCKS')
+_MIN_CONTENT_RE = re.compile(rb'(?:\s*\S){10}')
+
+ScanResult = namedtuple('ScanResult', [
+    'size',            # payload size in bytes
+    'found_patterns',  # CONFIG_PATTERNS present, legacy order
+    'proxy_lines',     # lines containing a "<scheme>://" URI
+    'scheme_counts',   # Counter of lowercase scheme -> lines
+    'config_count',    # proxy_lines restricted to PROXY_SCHEMES
+])
+
+
+def _as_bytes(content):
+    if isinstance(content, str):
+        return content.encode('utf-8', 'surrogatepass')
+    return bytes(content) if isinstance(content, (bytearray, memoryview)) else content
+
+
+def _text_tokens(data, found):
+    """Add the JSON/text markers in ``data`` to ``found``, stopping once all are seen"""
+    wanted = len(TEXT_PATTERNS) - 1
+    json_seen = sum(1 for p in TEXT_PATTERNS[1:] if p in found)
+    if json_seen < wanted:
+        for m in _JSON_KEY_RE.finditer(data):
+            key = f'"{m.group(1).lower().decode()}":'
+            if key not in found:
+                found.add(key)
+                json_seen += 1
+                if json_seen == wanted:
+                    break
+    if 'shadowsocks' not in found:
+        if any(data.find(spelling) != -1 for spelling in _SHADOWSOCKS_SPELLINGS):
+            found.add('shadowsocks')
+
+
+def _scan_region(data, scheme_counts, found):
+    """Accumulate scheme counts and found markers for one block of whole lines"""
+    schemes = Counter(m[1] for m in _SCHEME_LINE_RE.findall(data))
+    for scheme, count in schemes.items():
+        scheme_counts[scheme.decode('ascii').lower()] += count
+    _text_tokens(data, found)
+    for pattern in BASE64_PATTERNS:
+        if pattern not in found and data.find(pattern.encode()) != -1:
+            found.add(pattern)
+
+
+def _make_result(size, scheme_counts, found):
+    # Substring semantics of the legacy check: "vmess://" also contains "ss://"
+    for scheme in scheme_counts:
+        tail = scheme + '://'
+        for pattern in SCHEME_PATTERNS:
+            if tail.endswith(pattern):
+                found.add(pattern)
+
+    proxy_lines = sum(scheme_counts.values())
+    config_count = sum(n for s, n in scheme_counts.items() if s in PROXY_SCHEMES)
+    ordered = [p for p in CONFIG_PATTERNS if p in found]
+    return ScanResult(size, ordered, proxy_lines, scheme_counts, config_count)
+
+
+def scan_config_content(content):
+    """Scan a payload once and return a ScanResult"""
+    data = _as_bytes(content)
+    scheme_counts = Counter()
+    found = set()
+    _scan_region(data, scheme_counts, found)
+    return _make_result(len(data), scheme_counts, found)
+
+
+def first_config_lines(content, limit=3):
+    """Return up to ``limit`` proxy lines without scanning the whole payload"""
+    lines = []
+    for m in _SCHEME_LINE_RE.finditer(_as_bytes(content)):
+        if m.group(2).decode('ascii').lower() in PROXY_SCHEMES:
+            lines.append(m.group(1).strip().decode('utf-8', 'replace'))
+            if len(lines) >= limit:
+                break
+    return lines
+
+
+def iter_proxy_uris(content):
+    """Yield every proxy URI (PROXY_SCHEMES only) in a payload, one per line"""
+    for m in _SCHEME_LINE_RE.finditer(_as_bytes(content)):
+        if m.group(2).decode('ascii').lower() in PROXY_SCHEMES:
+            yield m.group(1).strip().decode('utf-8', 'surrogateescape')
+
+
+def _looks_like_json_object(data):
+    head = data[:256].lstrip()
+    if not head:
+        head = data.lstrip()
+    tail = data[-256:].rstrip()
+    if not tail:
+        tail = data.rstrip()
+    return head[:1] == b'{' and tail[-1:] == b'}'
+
+
+def content_verdict(scan, json_payload=None):
+    """Turn a ScanResult into the ``(is_valid, message)`` pair
+
+    ``json_payload`` is the full body when it looks like a single JSON
+    object; it is parsed to reject truncated or broken templates.
+    """
+    found_patterns = scan.found_patterns
+    if not found_patterns:
+        return False, "No config patterns found"
+
+    # Additional validation for JSON configs
+    if json_payload is not None:
+        try:
+            json.loads(json_payload)
+            return True, f"Valid JSON with patterns: {', '.join(found_patterns[:3])}"
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return False, "Invalid JSON format"
+
+    if scan.proxy_lines >= 1:
+        return True, f"Valid proxy list with {scan.proxy_lines} configs"
+
+    return True, f"Valid content with patterns: {', '.join(found_patterns[:3])}"
+
+
+def is_valid_config_content(content, scan=None):
+    """Check if downloaded content contains valid configuration data
+
+    Replaces the sweep scripts' check; accepts str or bytes and returns
+    ``(is_valid, message)`` in the same wording. One verdict differs on
+    purpose: the base64 markers are matched case-sensitively, so 'eyJ',
+    'In0' and 'CiAg' (which the lowercased legacy check never matched) now
+    count, and 'ewo' no longer matches an upper-case 'EWO'.
+    """
+    data = _as_bytes(content)
+    if not data or not _MIN_CONTENT_RE.match(data):
+        return False, "Content too short or empty"
+
+    if scan is None:
+        scan = scan_config_content(data)
+    return content_verdict(scan, data if _looks_like_json_object(data) else None)
+
+
+class StreamingConfigCounter:
+    """Incremental scan_config_content for chunked downloads
+
+    Feed response chunks as they arrive; only the unfinished last line is
+    carried between chunks, so memory stays at about one chunk no matter how
+    large the subscription file is. ``feed`` returns True once
+    ``max_configs`` config lines have been counted so the caller can stop
+    reading early. ``uri_sink`` (e.g. ``EndpointIndex.add``) is called with
+    every proxy URI as its line completes.
+    """
+
+    MAX_LINE = 1024 * 1024
+    MAX_JSON_BODY = 4 * 1024 * 1024
+    _WHITESPACE = b' \t\r\n\x0b\x0c'
+
+    def __init__(self, max_configs=None, sample_limit=3, uri_sink=None):
+        self.max_configs = max_configs
+        self.sample_limit = sample_limit
+        self.uri_sink = uri_sink
+        self.size = 0
+        self.samples = []
+        self.truncated = False
+        self.peak_buffer = 0
+        self._scheme_counts = Counter()
+        self._found = set()
+        self._config_count = 0
+        self._tail = b''
+        self._skip_line = False
+        self._nonspace = 0
+        self._json_body = None
+        self._last_byte = b''
+
+    def feed(self, chunk):
+        if self.truncated or not chunk:
+            return self.truncated
+        self.size += len(chunk)
+        if self._nonspace < 10:
+            if self._nonspace == 0:
+                lead = chunk.lstrip(self._WHITESPACE)[:1]
+                if lead:
+                    self._json_body = bytearray() if lead == b'{' else None
+            self._nonspace += len(chunk.translate(None, self._WHITESPACE))
+        if self._json_body is not None:
+            if len(self._json_body) + len(chunk) <= self.MAX_JSON_BODY:
+                self._json_body += chunk
+            else:
+                self._json_body = None
+        stripped = chunk.rstrip(self._WHITESPACE)
+        if stripped:
+            self._last_byte = stripped[-1:]
+
+        buffer = self._tail + chunk
+        self.peak_buffer = max(self.peak_buffer, len(buffer) + len(self._json_body or b''))
+        cut = buffer.rfind(b'\n')
+        if cut == -1:
+            self._tail = buffer
+            if len(buffer) > self.MAX_LINE:
+                # Not a proxy line; keep looking for markers but stop buffering
+                _text_tokens(buffer, self._found)
+                self._tail = b''
+                self._skip_line = True
+            return False
+
+        block, self._tail = buffer[:cut + 1], buffer[cut + 1:]
+        if self._skip_line:
+            first = block.find(b'\n')
+            _text_tokens(block[:first], self._found)
+            block = block[first + 1:]
+            self._skip_line = False
+        self._consume(block)
+        return self.truncated
+
+    def skip(self, chunk):
+        """Account for a chunk decoded elsewhere: size only, no line scan"""
+        self.size += len(chunk)
+        self.peak_buffer = max(self.peak_buffer, len(chunk))
+
+    def close(self):
+        """Flush the final unterminated line and return the ScanResult"""
+        if self._tail and not self.truncated and not self._skip_line:
+            self._consume(self._tail)
+        self._tail = b''
+        return self.result()
+
+    def _consume(self, block):
+        before = self._config_count
+        _scan_region(block, self._scheme_counts, self._found)
+        self._config_count = sum(n for s, n in self._scheme_counts.items() if s in PROXY_SCHEMES)
+        if self.uri_sink is not None and self._config_count > before:
+            for uri in iter_proxy_uris(block):
+                self.uri_sink(uri)
+        if len(self.samples) < self.sample_limit and self._config_count > before:
+            self.samples.extend(first_config_lines(block, self.sample_limit - len(self.samples)))
+        if self.max_configs and self._config_count >= self.max_configs:
+            self.truncated = True
+
+    def result(self):
+        return _make_result(self.size, Counter(self._scheme_counts), set(self._found))
+
+    def verdict(self):
+        """``(is_valid, message)`` for everything fed so far"""
+        if self._nonspace < 10:
+            return False, "Content too short or empty"
+        json_payload = None
+        if self._json_body is not None and self._last_byte == b'}' and not self.truncated:
+            json_payload = bytes(self._json_body)
+        return content_verdict(self.result(), json_payload)
+
+
+def legacy_is_valid_config_content(content):
+    """The original per-pattern/per-line check, kept as the benchmark baseline"""
+    if not content or len(content.strip()) < 10:
+        return False, "Content too short or empty"
+
+    content_lower = content.lower()
+    found_patterns = []
+    for pattern in CONFIG_PATTERNS:
+        if pattern in content_lower:
+            found_patterns.append(pattern)
+
+    if not found_patterns:
+        return False, "No config patterns found"
+
+    if content.strip().startswith('{') and content.strip().endswith('}'):
+        try:
+            json.loads(content)
+            return True, f"Valid JSON with patterns: {', '.join(found_patterns[:3])}"
+        except json.JSONDecodeError:
+            return False, "Invalid JSON format"
+
+    lines = [line.strip() for line in content.split('\n') if line.strip()]
+    proxy_lines = [line for line in lines if any(pattern in line.lower() for pattern in ['://', 'ss://', 'vmess://'])]
+
+    if len(proxy_lines) >= 1:
+        return True, f"Valid proxy list with {len(proxy_lines)} configs"
+
+    return True, f"Valid content with patterns: {', '.join(found_patterns[:3])}"
+
+
+def make_synthetic_payload(target_mb, seed=1):
+    """Build a mixed vless/vmess/ss/trojan subscription list of ~target_mb MB"""
+    import base64
+    import random
+
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    i = 0
+    while size < target_mb * 1024 * 1024:
+        r = rng.random()
+        if r < 0.4:
+            line = (f"vless://{i:08x}-1a2b-3c4d-5e6f-{i:012x}@node{i}.example.com:443"
+                    f"?security=reality&type=grpc&sni=www.speedtest.net&pbk=K{i}#Remark%20{i}")
+        elif r < 0.7:
+            body = json.dumps({"v": "2", "ps": f"node {i}", "add": f"10.0.{i % 250}.{i % 200}",
+                               "port": "443", "id": f"{i:08x}-0000-0000-0000-000000000000",
+                               "net": "ws", "tls": "tls"})
+            line = "vmess://" + base64.b64encode(body.encode()).decode()
+        elif r < 0.9:
+            line = f"ss://YWVzLTI1Ni1nY206cGFzc3dvcmQ=@172.16.{i % 250}.{i % 200}:8388#ss-{i}"
+        else:
+            line = f"trojan://secret{i}@t{i}.example.org:443?security=tls&sni=t{i}.example.org#t{i}"
+        lines.append(line)
+        size += len(line) + 1
+        i += 1
+    return "\n".join(lines)
+
+
+def run_benchmark(sizes_mb=(4, 16, 32), repeat=3):
+    """Compare the legacy check with the compiled scanner on synthetic payloads"""
+    print("[BENCH] is_valid_config_content: legacy vs single-pass scanner")
+    print("=" * 70)
+    for mb in sizes_mb:
+        text = make_synthetic_payload(mb)
+        raw = text.encode()
+
+        def best_of(fn, arg):
+            best = None
+            out = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                out = fn(arg)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best, out
+
+        legacy_t, legacy_out = best_of(legacy_is_valid_config_content, text)
+        str_t, str_out = best_of(is_valid_config_content, text)
+        bytes_t, bytes_out = best_of(is_valid_config_content, raw)
+        same = legacy_out == str_out == bytes_out
+        size_mb = len(raw) / (1024 * 1024)
+
+        print(f"\n[SIZE] {size_mb:.1f} MB, {text.count(chr(10)) + 1:,} lines")
+        print(f"   legacy (str)   : {legacy_t * 1000:8.1f} ms  {size_mb / legacy_t:7.1f} MB/s")
+        print(f"   scanner (str)  : {str_t * 1000:8.1f} ms  {size_mb / str_t:7.1f} MB/s")
+        print(f"   scanner (bytes): {bytes_t * 1000:8.1f} ms  {size_mb / bytes_t:7.1f} MB/s")
+        print(f"   speedup        : {legacy_t / bytes_t:.1f}x  results match: {same}")
+        if not same:
+            print(f"   [DIFF] legacy={legacy_out} scanner={bytes_out}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        sizes = tuple(int(x) for x in sys.argv[2:]) or (4, 16, 32)
+        run_benchmark(sizes)
+    elif len(sys.argv) > 1:
+        with open(sys.argv[1], 'rb') as f:
+            payload = f.read()
+        result = scan_config_content(payload)
+        print(f"[SCAN] {sys.argv[1]}: {result.size:,} bytes")
+        print(f"   Patterns: {', '.join(result.found_patterns) or '-'}")
+        print(f"   Proxy lines: {result.proxy_lines}  Configs: {result.config_count}")
+        for scheme, count in result.scheme_counts.most_common():
+            print(f"   {scheme:12s} {count}")
+        print(f"   Verdict: {is_valid_config_content(payload, scan=result)}")
+    else:
+        print("Usage: config_scanner.py --bench [MB ...] | config_scanner.py <payload file>")
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Columnar in-memory table for parsed configs
+Holds 150K+ ParsedConfig rows as NumPy columns instead of Python objects:
+low-cardinality fields (protocol, network, security, ...) are interned to
+uint16 codes, ports are uint16, hosts/SNIs/paths are interned to
+uint32 ids, and URIs live in one contiguous byte blob (joined lazily
+after appends). Rarely used fields (uuid, ps, public_key, short_id, extra)
+are materialized lazily by re-parsing the row's URI. ConfigTable.load
+reads a ConfigDatabase snapshot (saveToDisk TSV or JSON lines) through
+config_db.SnapshotReader.
+
+Run with --bench to compare memory against a list of ParsedConfig objects.
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from config_db import SnapshotReader
+from uri_parser import FIELDS, ParsedConfig, parse, parse_many
+
+# Fields stored as interned uint16 codes (few distinct values)
+CATEGORY_FIELDS = ("protocol", "network", "security", "fingerprint",
+                   "encryption", "flow", "type")
+# Fields stored as interned uint32 ids (many values, heavy repetition)
+INTERNED_FIELDS = ("address", "sni", "host", "path")
+# Fields rebuilt from the URI on demand
+LAZY_FIELDS = tuple(f for f in FIELDS
+                    if f not in CATEGORY_FIELDS + INTERNED_FIELDS + ("uri", "port"))
+
+
+class Vocab:
+    """Bidirectional string <-> code mapping for one column"""
+
+    __slots__ = ("values", "index")
+
+    def __init__(self, values=()):
+        self.values = []
+        self.index = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.index[value] = code
+            self.values.append(value)
+        return code
+
+    def truncate(self, size):
+        """Forget every value coded after the first ``size``"""
+        for value in self.values[size:]:
+            del self.index[value]
+        del self.values[size:]
+
+    def lookup(self, value):
+        """Code for an existing value, or -1 when it never occurs"""
+        return self.index.get(value, -1)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class ConfigTable:
+    """Column store for ParsedConfig rows with vectorized filtering"""
+
+    def __init__(self):
+        self.vocabs = {name: Vocab() for name in CATEGORY_FIELDS + INTERNED_FIELDS}
+        self.columns = {name: np.zeros(0, dtype=np.uint16) for name in CATEGORY_FIELDS}
+        self.columns.update({name: np.zeros(0, dtype=np.uint32) for name in INTERNED_FIELDS})
+        self.columns["port"] = np.zeros(0, dtype=np.uint16)
+        self._uri_parts = []
+        self._uri_offsets = np.zeros(1, dtype=np.int64)
+        self._lazy = {}
+
+    # ─── Construction ───
+
+    @classmethod
+    def from_configs(cls, configs):
+        table = cls()
+        table.extend(configs)
+        return table
+
+    @classmethod
+    def from_uris(cls, uris):
+        """Parse URIs with uri_parser.parse_many and load the valid ones"""
+        return cls.from_configs(parse_many(uris))
+
+    @classmethod
+    def load(cls, path, use_cache=True):
+        """Load the URIs of a saveToDisk snapshot (V1/V2 TSV) or JSON-lines export
+
+        Rows come from the SnapshotReader index, so a uri_hash repeated in
+        the file is loaded once, as loadFromDisk does.
+        """
+        with SnapshotReader(path, use_cache=use_cache) as reader:
+            if reader.format == "jsonl":
+                return cls.from_uris([rec.uri for rec in reader])
+            with open(path, "rb") as f:
+                data = f.read()
+        uris = []
+        for offset in reader.offsets.tolist():
+            end = data.find(b"\t", offset)
+            uris.append(data[offset:end].decode("utf-8", "surrogateescape"))
+        return cls.from_uris(uris)
+
+    def extend(self, configs):
+        cat_codes = {name: [] for name in CATEGORY_FIELDS + INTERNED_FIELDS}
+        coders = {name: self.vocabs[name].code for name in cat_codes}
+        sizes = {name: len(self.vocabs[name]) for name in cat_codes}
+        ports = []
+        uris = []
+        for cfg in configs:
+            for name, out in cat_codes.items():
+                out.append(coders[name](getattr(cfg, name)))
+            ports.append(cfg.port)
+            uris.append(cfg.uri.encode("utf-8", "surrogateescape"))
+
+        full = [name for name in CATEGORY_FIELDS if len(self.vocabs[name]) > 65536]
+        if full:
+            # Nothing was appended yet: drop the new values so vocabs match the columns
+            for name, size in sizes.items():
+                self.vocabs[name].truncate(size)
+            raise ValueError(f"column {full[0]} has more than 65536 distinct values")
+        if not uris:
+            return
+        for name in CATEGORY_FIELDS:
+            new = np.fromiter(cat_codes[name], dtype=np.uint16, count=len(uris))
+            self.columns[name] = np.concatenate([self.columns[name], new])
+        for name in INTERNED_FIELDS:
+            new = np.fromiter(cat_codes[name], dtype=np.uint32, count=len(uris))
+            self.columns[name] = np.concatenate([self.columns[name], new])
+        self.columns["port"] = np.concatenate(
+            [self.columns["port"], np.fromiter(ports, dtype=np.uint16, count=len(uris))])
+
+        lengths = np.fromiter(map(len, uris), dtype=np.int64, count=len(uris))
+        offsets = self._uri_offsets[-1] + np.cumsum(lengths)
+        self._uri_offsets = np.concatenate([self._uri_offsets, offsets])
+        self._uri_parts.append(b"".join(uris))
+        self._lazy.clear()
+
+    # ─── Access ───
+
+    def __len__(self):
+        return len(self._uri_offsets) - 1
+
+    @property
+    def port(self):
+        return self.columns["port"]
+
+    @property
+    def _uri_blob(self):
+        # Appends only queue parts; join them on first read
+        if len(self._uri_parts) > 1:
+            self._uri_parts = [b"".join(self._uri_parts)]
+        return self._uri_parts[0] if self._uri_parts else b""
+
+    def uri(self, i):
+        start, end = self._uri_offsets[i], self._uri_offsets[i + 1]
+        return self._uri_blob[start:end].decode("utf-8", "surrogateescape")
+
+    def value(self, name, i):
+        """One field of one row; lazy fields re-parse the URI"""
+        if name == "uri":
+            return self.uri(i)
+        if name == "port":
+            return int(self.port[i])
+        if name in self.vocabs:
+            return self.vocabs[name].values[self.columns[name][i]]
+        return getattr(self.row(i), name)
+
+    def row(self, i):
+        """Materialize row ``i`` as a full ParsedConfig"""
+        return parse(self.uri(i)) or ParsedConfig(self.uri(i))
+
+    def __getitem__(self, i):
+        return self.row(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def lazy_column(self, name):
+        """Materialize a lazy field for every row (cached until the next extend)"""
+        if name not in LAZY_FIELDS:
+            raise KeyError(f"{name} is not a lazy column")
+        if name not in self._lazy:
+            self._lazy[name] = [getattr(self.row(i), name) for i in range(len(self))]
+        return self._lazy[name]
+
+    def strings(self, name):
+        """Decode an interned column back to a list of strings"""
+        values = self.vocabs[name].values
+        return [values[c] for c in self.columns[name]]
+
+    # ─── Filtering ───
+
+    def mask(self, **conditions):
+        """Boolean mask of rows matching every condition
+
+        Each keyword is a stored column name; the value is a single value or
+        a list/tuple/set of accepted values, e.g.
+        ``table.mask(security="reality", network="grpc", port=443)``.
+        """
+        result = np.ones(len(self), dtype=bool)
+        for name, wanted in conditions.items():
+            many = isinstance(wanted, (list, tuple, set, frozenset))
+            values = list(wanted) if many else [wanted]
+            column = self.columns.get(name)
+            if column is None:
+                raise KeyError(f"{name} is not a filterable column")
+            if name != "port":
+                values = [self.vocabs[name].lookup(v) for v in values]
+                values = [v for v in values if v >= 0]
+            if not values:
+                result[:] = False
+            elif len(values) == 1:
+                result &= column == values[0]
+            else:
+                result &= np.isin(column, values)
+        return result
+
+    def where(self, mask=None, **conditions):
+        """Row indices matching ``mask`` and/or keyword conditions"""
+        if mask is None:
+            mask = self.mask(**conditions)
+        elif conditions:
+            mask = mask & self.mask(**conditions)
+        return np.flatnonzero(mask)
+
+    def select(self, mask):
+        """New table holding only the selected rows (vocabs are shared)"""
+        idx = np.flatnonzero(mask) if mask.dtype == bool else np.asarray(mask)
+        sub = ConfigTable()
+        sub.vocabs = self.vocabs
+        sub.columns = {name: col[idx] for name, col in self.columns.items()}
+        starts = self._uri_offsets[idx]
+        ends = self._uri_offsets[idx + 1]
+        blob = self._uri_blob
+        sub._uri_parts = [b"".join(blob[s:e] for s, e in zip(starts.tolist(), ends.tolist()))]
+        sub._uri_offsets = np.concatenate([[0], np.cumsum(ends - starts)]).astype(np.int64)
+        return sub
+
+    def counts(self, name, mask=None):
+        """Value -> row count for a stored column, optionally within a mask"""
+        column = self.columns[name] if mask is None else self.columns[name][mask]
+        if name == "port":
+            values, counts = np.unique(column, return_counts=True)
+            return dict(zip(values.tolist(), counts.tolist()))
+        counts = np.bincount(column, minlength=len(self.vocabs[name]))
+        vocab = self.vocabs[name].values
+        return {vocab[code]: int(n) for code, n in enumerate(counts) if n}
+
+    def nbytes(self):
+        """Approximate memory held by columns, URI blob and vocabularies"""
+        total = sum(col.nbytes for col in self.columns.values())
+        total += sum(map(len, self._uri_parts)) + self._uri_offsets.nbytes
+        for vocab in self.vocabs.values():
+            total += sum(sys.getsizeof(v) for v in vocab.values)
+        return total
+
+
+def run_benchmark(count=150000):
+    import tracemalloc
+    from uri_parser import make_synthetic_uris
+
+    uris = make_synthetic_uris(count)
+
+    tracemalloc.start()
+    configs = parse_many(uris)
+    objects_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    table = ConfigTable.from_configs(configs)
+    build = time.perf_counter() - start
+    del configs
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    hits = table.where(security="reality", network="grpc", port=443)
+    query = time.perf_counter() - start
+
+    print(f"[BENCH] ConfigTable with {len(table):,} rows")
+    print(f"   ParsedConfig objects : {objects_bytes / 1e6:8.1f} MB")
+    print(f"   ConfigTable          : {table_bytes / 1e6:8.1f} MB (build {build * 1000:.0f} ms)")
+    print(f"   reality+grpc+443     : {len(hits):,} rows in {query * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        run_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 150000)
+    elif len(sys.argv) > 1:
+        source = sys.argv[1]
+        try:
+            table = ConfigTable.load(source)
+        except ValueError:
+            # Not a snapshot: a plain URI list
+            with open(source, encoding="utf-8", errors="surrogateescape") as f:
+                table = ConfigTable.from_uris(f.read().splitlines())
+        print(f"[TABLE] {len(table):,} configs, ~{table.nbytes() / 1e6:.1f} MB")
+        for name in ("protocol", "network", "security"):
+            print(f"   {name}: {table.counts(name)}")
+        print(f"   reality+grpc+443: {len(table.where(security='reality', network='grpc', port=443))}")
+    else:
+        print("Usage: config_table.py --bench [COUNT] | config_table.py <snapshot, .jsonl export or uri list>")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Endpoint-level dedup index for harvested URIs
+Keys every URI the way ConfigDatabase::hashUri does (SHA-1 of
+endpointKeyForUri, see config_db.py), so the Python tooling counts the
+same records the C++ database would keep. Inserts are streaming
+insert-or-skip: an exact set of 64-bit hashes by default, or a fixed-size
+Bloom filter when memory matters more than the rare false "duplicate".
+
+Run with --bench to measure lines/minute for both backends, or pass
+payload files to report unique endpoints per file and across all of them.
+"""
+
+import math
+import sys
+import time
+from collections import namedtuple
+
+from config_db import endpoint_digest
+from payload_decoder import decode_uris
+
+DEFAULT_ERROR_RATE = 0.001
+
+SourceDedup = namedtuple("SourceDedup", [
+    "source",   # source name or URL
+    "uris",     # proxy URIs in the payload
+    "unique",   # distinct endpoints within the payload
+    "new",      # endpoints not seen in any earlier source
+])
+
+
+class BloomFilter:
+    """Bit-array Bloom filter fed with SHA-1 digests
+
+    Bit positions come from double hashing two 64-bit words of the digest,
+    so no extra hashing is done per insert.
+    """
+
+    def __init__(self, capacity, error_rate=DEFAULT_ERROR_RATE):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(64, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, digest):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add_digest(self, digest):
+        """Set the digest's bits; True if at least one was unset (new item)"""
+        bits = self._bits
+        new = False
+        for pos in self._positions(digest):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        return new
+
+    def contains_digest(self, digest):
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+    @property
+    def nbytes(self):
+        return len(self._bits)
+
+
+class EndpointIndex:
+    """Streaming insert-or-skip set of ConfigDatabase endpoint hashes
+
+    ``bloom_capacity`` switches to a Bloom filter sized for that many
+    endpoints at ``error_rate``; otherwise hashes are kept exactly.
+    """
+
+    def __init__(self, bloom_capacity=None, error_rate=DEFAULT_ERROR_RATE):
+        self.bloom = BloomFilter(bloom_capacity, error_rate) if bloom_capacity else None
+        self._hashes = set() if self.bloom is None else None
+        self.seen = 0
+        self.unique = 0
+
+    def add(self, uri):
+        """Insert ``uri``; True if its endpoint was not in the index yet"""
+        return self.add_digest(endpoint_digest(uri))
+
+    def add_digest(self, digest):
+        """Insert a precomputed endpoint_digest"""
+        self.seen += 1
+        if self.bloom is not None:
+            new = self.bloom.add_digest(digest)
+        else:
+            key = int.from_bytes(digest[:8], "big")
+            new = key not in self._hashes
+            if new:
+                self._hashes.add(key)
+        if new:
+            self.unique += 1
+        return new
+
+    def add_many(self, uris):
+        """Yield the URIs whose endpoint is new, skipping the rest"""
+        add = self.add
+        for uri in uris:
+            if uri and add(uri):
+                yield uri
+
+    def __contains__(self, uri):
+        digest = endpoint_digest(uri)
+        if self.bloom is not None:
+            return self.bloom.contains_digest(digest)
+        return int.from_bytes(digest[:8], "big") in self._hashes
+
+    def __len__(self):
+        return self.unique
+
+    @property
+    def duplicates(self):
+        return self.seen - self.unique
+
+    def nbytes(self):
+        if self.bloom is not None:
+            return self.bloom.nbytes
+        return sys.getsizeof(self._hashes) + 32 * len(self._hashes)
+
+
+def unique_endpoint_count(content):
+    """Distinct ConfigDatabase endpoints among the proxy configs of a payload"""
+    index = EndpointIndex()
+    for uri in decode_uris(content):
+        index.add(uri)
+    return len(index)
+
+
+def dedup_sources(payloads, index=None):
+    """Per-source URI, unique-endpoint and new-endpoint counts
+
+    ``payloads`` yields ``(source, content)`` pairs in sweep order; ``index``
+    carries endpoints seen across sources (a fresh exact index by default).
+    """
+    index = index if index is not None else EndpointIndex()
+    results = []
+    for source, content in payloads:
+        local = set()
+        uris = new = 0
+        for uri in decode_uris(content):
+            digest = endpoint_digest(uri)
+            uris += 1
+            local.add(digest[:8])
+            if index.add_digest(digest):
+                new += 1
+        results.append(SourceDedup(source, uris, len(local), new))
+    return results
+
+
+def make_synthetic_harvest(count, duplicate_share=0.6, seed=13):
+    """URI lines where ``duplicate_share`` re-announce an earlier endpoint
+
+    Duplicates reuse an earlier URI with a different remark; for literal-IP
+    endpoints they also change the port, which hashUri ignores.
+    """
+    import random
+
+    from uri_parser import make_synthetic_uris
+
+    rng = random.Random(seed)
+    base = make_synthetic_uris(int(count * (1 - duplicate_share)) + 1, seed=seed)
+    lines = []
+    for i in range(count):
+        if lines and rng.random() < duplicate_share:
+            uri = rng.choice(base[:max(1, len(lines) // 2)])
+            if uri.startswith(("ss://", "trojan://")) and "@172." in uri:
+                uri = uri.replace(":8388#", f":{8000 + i % 1000}#")
+            lines.append(uri.split("#")[0] + f"#dup{i}" if not uri.startswith("vmess://") else uri)
+        else:
+            lines.append(base[min(i, len(base) - 1)])
+    return lines
+
+
+def run_benchmark(count=1000000):
+    lines = make_synthetic_harvest(count)
+    print(f"[BENCH] {count:,} harvested lines")
+    for label, kwargs in (("exact set", {}), ("bloom 0.1%", {"bloom_capacity": count})):
+        index = EndpointIndex(**kwargs)
+        start = time.perf_counter()
+        kept = sum(1 for _ in index.add_many(lines))
+        elapsed = time.perf_counter() - start
+        print(f"   {label:11s}: {kept:,} unique endpoints, {index.duplicates:,} skipped, "
+              f"{count / elapsed * 60 / 1e6:.1f}M lines/min, {index.nbytes() / 1e6:.1f} MB index")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        run_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 1000000)
+    elif len(sys.argv) > 1:
+        def payloads():
+            for path in sys.argv[1:]:
+                with open(path, "rb") as f:
+                    yield path, f.read()
+
+        index = EndpointIndex()
+        print(f"{'URIs':>9} {'unique':>9} {'new':>9}  source")
+        for row in dedup_sources(payloads(), index):
+            print(f"{row.uris:9,} {row.unique:9,} {row.new:9,}  {row.source}")
+        print(f"[DEDUP] {index.seen:,} URIs -> {len(index):,} unique endpoints")
+    else:
+        print("Usage: endpoint_index.py --bench [LINES] | endpoint_index.py <payload> ...")
@@ -0,0 +1,668 @@
+#!/usr/bin/env python3
+"""
+Recorder for the orchestrator's monitor channel
+Subscribes to the monitor websocket (status snapshots, logs batches and
+any other broadcast event) and stores every event, as received, in a
+chunked, compressed, time-indexed recording so history older than the
+LogRingBuffer survives. A replay tool streams a recording back out at 1x
+or accelerated speed, to stdout or to monitor clients over the bridge
+protocol (via mock_orchestrator).
+
+Recording layout (*.hrec):
+    magic    b"HMREC1\\n"
+    chunks   <b"CHNK"><u8 codec><u32 count><f64 t_first><f64 t_last>
+             <u32 raw_len><u32 comp_len><u32 crc32(body)><u16 ntypes>
+             ntypes x (<u8 n><type[n]><u32 count>)  then the body
+    index    <b"INDX"><u32 len><u32 crc32><json chunk table>
+    trailer  <u64 index_offset><b"HMRECEND">
+A chunk body decompresses to records <f64 t><u8 type_no><u32 n><event json[n]>,
+type_no indexing the chunk's type table. Codecs are zstd (when the
+zstandard module is installed) or zlib. A recording without an index
+(recorder killed) is scanned chunk by chunk instead, and a torn last chunk
+is truncated away when the file is reopened for appending.
+
+Events are buffered per chunk on the event loop and compressed/written
+by a background thread; a chunk is sealed at ``chunk_events`` events,
+``chunk_bytes`` raw bytes or ``flush_interval`` seconds, whichever comes
+first, so a crash loses at most one interval.
+
+Run ``record OUT``, ``replay IN``, ``info IN`` or ``--bench``.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import os
+import queue
+import random
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import Counter, namedtuple
+
+from realtime_client import (DEFAULT_HOST, DEFAULT_MONITOR_PORT, MonitorClient, RealtimeError,
+                             decode_event)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+REC_MAGIC = b"HMREC1\n"
+CHUNK_MAGIC = b"CHNK"
+INDEX_MAGIC = b"INDX"
+TRAILER_MAGIC = b"HMRECEND"
+
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {CODEC_ZLIB: "zlib", CODEC_ZSTD: "zstd"}
+
+DEFAULT_CHUNK_EVENTS = 4096
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_WRITE_QUEUE = 64
+
+_CHUNK = struct.Struct("<4sBIddIIIH")
+_TYPE_COUNT = struct.Struct("<I")
+_RECORD = struct.Struct("<dBI")
+_INDEX = struct.Struct("<4sII")
+_TRAILER = struct.Struct("<Q8s")
+
+RecordedEvent = namedtuple("RecordedEvent", ["t", "type", "raw"])
+ChunkInfo = namedtuple("ChunkInfo", ["offset", "codec", "count", "t_first", "t_last",
+                                     "raw_len", "comp_len", "types"])
+
+
+def default_codec():
+    return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def _compress(codec, data):
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return zlib.compress(data, 6)
+
+
+def _decompress(codec, data, raw_len):
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("recording uses zstd; install the zstandard module to read it")
+        return zstandard.ZstdDecompressor().decompress(data, max_output_size=raw_len)
+    return zlib.decompress(data)
+
+
+def event_type(raw):
+    """``type`` of a monitor event without a full parse for makeEvent output"""
+    if raw.startswith('{"type":"'):
+        end = raw.find('"', 9)
+        if end > 9:
+            return raw[9:end]
+    event = decode_event(raw)
+    return event.type if event is not None else ""
+
+
+# ─── Writing ───
+
+class _Chunk:
+    """Records of one chunk as they accumulate on the event loop"""
+
+    __slots__ = ("buf", "count", "t_first", "t_last", "types", "type_no", "opened")
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.count = 0
+        self.t_first = 0.0
+        self.t_last = 0.0
+        self.types = Counter()
+        self.type_no = {}
+        self.opened = time.monotonic()
+
+    def add(self, t, type, data):
+        no = self.type_no.get(type)
+        if no is None:
+            if len(self.type_no) >= 254:
+                # The u8 type table is full; further types share the "" slot
+                type, no = "", self.type_no.setdefault("", len(self.type_no))
+            else:
+                no = self.type_no[type] = len(self.type_no)
+        if not self.count:
+            self.t_first = t
+        self.t_last = max(self.t_last, t)
+        self.count += 1
+        self.types[type] += 1
+        self.buf += _RECORD.pack(t, no, len(data))
+        self.buf += data
+
+
+def _encode_chunk(chunk, codec):
+    """``(header, body, type names)`` of a sealed chunk"""
+    body = _compress(codec, bytes(chunk.buf))
+    names = sorted(chunk.type_no, key=chunk.type_no.get)
+    parts = [_CHUNK.pack(CHUNK_MAGIC, codec, chunk.count, chunk.t_first, chunk.t_last,
+                         len(chunk.buf), len(body), zlib.crc32(body), len(names))]
+    for name in names:
+        encoded = name.encode("utf-8")[:255]
+        parts.append(bytes([len(encoded)]) + encoded + _TYPE_COUNT.pack(chunk.types[name]))
+    return b"".join(parts), body, names
+
+
+def _read_chunk_header(f, offset):
+    """ChunkInfo and type names at ``offset``, or None if torn/absent"""
+    f.seek(offset)
+    head = f.read(_CHUNK.size)
+    if len(head) < _CHUNK.size:
+        return None
+    magic, codec, count, t_first, t_last, raw_len, comp_len, crc, ntypes = _CHUNK.unpack(head)
+    if magic != CHUNK_MAGIC or codec not in CODEC_NAMES:
+        return None
+    names, types = [], {}
+    for _ in range(ntypes):
+        n = f.read(1)
+        if not n:
+            return None
+        name = f.read(n[0]).decode("utf-8", "replace")
+        raw = f.read(_TYPE_COUNT.size)
+        if len(raw) < _TYPE_COUNT.size:
+            return None
+        names.append(name)
+        types[name] = _TYPE_COUNT.unpack(raw)[0]
+    body_offset = f.tell()
+    body = f.read(comp_len)
+    if len(body) < comp_len or zlib.crc32(body) != crc:
+        return None
+    info = ChunkInfo(offset, codec, count, t_first, t_last, raw_len, comp_len, types)
+    return info, names, body_offset
+
+
+def _scan_chunks(f, start=len(REC_MAGIC)):
+    """Chunk table by walking the file; also returns where valid data ends"""
+    chunks, offset = [], start
+    while True:
+        found = _read_chunk_header(f, offset)
+        if found is None:
+            return chunks, offset
+        info, names, body_offset = found
+        chunks.append((info, names, body_offset))
+        offset = body_offset + info.comp_len
+
+
+def _load_index(f, size):
+    """Chunk table from the footer, or None if the recording has none"""
+    if size < len(REC_MAGIC) + _TRAILER.size:
+        return None
+    f.seek(size - _TRAILER.size)
+    index_offset, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+    if magic != TRAILER_MAGIC or index_offset >= size:
+        return None
+    f.seek(index_offset)
+    magic, length, crc = _INDEX.unpack(f.read(_INDEX.size))
+    data = f.read(length)
+    if magic != INDEX_MAGIC or zlib.crc32(data) != crc:
+        return None
+    table = json.loads(data)
+    chunks = [(ChunkInfo(c["offset"], c["codec"], c["count"], c["t_first"], c["t_last"],
+                         c["raw_len"], c["comp_len"], c["types"]), c["names"], c["body_offset"])
+              for c in table["chunks"]]
+    return chunks, index_offset
+
+
+class EventRecorder:
+    """Appends events to a recording; ``append`` is cheap and never blocks
+    unless ``write_queue`` sealed chunks are already waiting on the disk
+    """
+
+    def __init__(self, path, codec=None, chunk_events=DEFAULT_CHUNK_EVENTS,
+                 chunk_bytes=DEFAULT_CHUNK_BYTES, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 write_queue=DEFAULT_WRITE_QUEUE):
+        self.path = path
+        self.codec = codec or default_codec()
+        self.chunk_events = max(1, chunk_events)
+        self.chunk_bytes = max(1, chunk_bytes)
+        self.flush_interval = flush_interval
+        self.stats = {"events": 0, "raw_bytes": 0, "stored_bytes": 0, "chunks": 0, "stalls": 0}
+        self._chunks = []
+        self._open(path)
+        self._chunk = _Chunk()
+        self._queue = queue.Queue(maxsize=max(1, write_queue))
+        self._error = None
+        self._thread = threading.Thread(target=self._writer, name="event-recorder", daemon=True)
+        self._thread.start()
+
+    def _open(self, path):
+        exists = os.path.exists(path) and os.path.getsize(path) >= len(REC_MAGIC)
+        self._file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self._file.write(REC_MAGIC)
+            self._end = len(REC_MAGIC)
+            return
+        self._file.seek(0)
+        if self._file.read(len(REC_MAGIC)) != REC_MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not an event recording")
+        size = os.path.getsize(path)
+        indexed = _load_index(self._file, size)
+        if indexed is not None:
+            self._chunks, self._end = indexed
+        else:
+            self._chunks, self._end = _scan_chunks(self._file)
+        # Drop the old index (rewritten on close) or a torn last chunk
+        self._file.truncate(self._end)
+
+    def append(self, t, type, raw):
+        """Record one event; ``raw`` is the event text as received"""
+        data = raw.encode("utf-8") if isinstance(raw, str) else raw
+        chunk = self._chunk
+        chunk.add(t, type, data)
+        self.stats["events"] += 1
+        self.stats["raw_bytes"] += len(data)
+        if chunk.count >= self.chunk_events or len(chunk.buf) >= self.chunk_bytes:
+            self.seal()
+
+    def seal(self):
+        """Hand the open chunk to the writer thread"""
+        chunk = self._chunk
+        if not chunk.count:
+            chunk.opened = time.monotonic()
+            return
+        self._chunk = _Chunk()
+        if self._error is not None:
+            raise self._error
+        if self._queue.full():
+            self.stats["stalls"] += 1
+        self._queue.put(chunk)
+
+    def maybe_seal(self):
+        """Seal the open chunk if it is older than ``flush_interval``"""
+        if self._chunk.count and time.monotonic() - self._chunk.opened >= self.flush_interval:
+            self.seal()
+
+    def _writer(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            try:
+                header, body, names = _encode_chunk(chunk, self.codec)
+                offset = self._end
+                self._file.seek(offset)
+                self._file.write(header + body)
+                self._file.flush()
+                self._end = offset + len(header) + len(body)
+                info = ChunkInfo(offset, self.codec, chunk.count, chunk.t_first, chunk.t_last,
+                                 len(chunk.buf), len(body), dict(chunk.types))
+                self._chunks.append((info, names, offset + len(header)))
+                self.stats["chunks"] += 1
+                self.stats["stored_bytes"] += len(header) + len(body)
+            except Exception as e:
+                self._error = e
+
+    def close(self):
+        """Flush everything and write the index footer"""
+        if self._file is None:
+            return
+        self.seal()
+        self._queue.put(None)
+        self._thread.join()
+        table = {"version": 1, "chunks": [
+            dict(info._asdict(), names=names, body_offset=body_offset)
+            for info, names, body_offset in self._chunks]}
+        data = json.dumps(table, separators=(",", ":")).encode("utf-8")
+        self._file.seek(self._end)
+        self._file.write(_INDEX.pack(INDEX_MAGIC, len(data), zlib.crc32(data)) + data)
+        self._file.write(_TRAILER.pack(self._end, TRAILER_MAGIC))
+        self._file.truncate()
+        self._file.close()
+        self._file = None
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ─── Reading ───
+
+class Recording:
+    """Random access to a recording by time range and event type"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        if self._file.read(len(REC_MAGIC)) != REC_MAGIC:
+            self._file.close()
+            raise ValueError(f"{path} is not an event recording")
+        indexed = _load_index(self._file, os.path.getsize(path))
+        self.indexed = indexed is not None
+        self._chunks = indexed[0] if indexed else _scan_chunks(self._file)[0]
+        # Running max of t_last, so bisection stays valid if the clock stepped back
+        self._running_max = []
+        high = float("-inf")
+        for info, _, _ in self._chunks:
+            high = max(high, info.t_last)
+            self._running_max.append(high)
+
+    @property
+    def chunks(self):
+        return [info for info, _, _ in self._chunks]
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def time_range(self):
+        if not self._chunks:
+            return 0.0, 0.0
+        return (min(info.t_first for info, _, _ in self._chunks),
+                max(info.t_last for info, _, _ in self._chunks))
+
+    def counts(self):
+        total = Counter()
+        for info, _, _ in self._chunks:
+            total.update(info.types)
+        return total
+
+    def _chunk_events(self, info, names, body_offset):
+        self._file.seek(body_offset)
+        body = _decompress(info.codec, self._file.read(info.comp_len), info.raw_len)
+        view = memoryview(body)
+        pos, end = 0, len(body)
+        while pos < end:
+            t, no, n = _RECORD.unpack_from(body, pos)
+            pos += _RECORD.size
+            yield t, names[no] if no < len(names) else "", view[pos:pos + n]
+            pos += n
+
+    def events(self, start=None, end=None, types=None):
+        """RecordedEvent for every event with ``start <= t < end`` of ``types``
+
+        Chunks ending before ``start`` are skipped by bisection on the
+        index, and chunks holding none of ``types`` are never decompressed.
+        """
+        wanted = set(types) if types else None
+        first = 0 if start is None else bisect.bisect_left(self._running_max, start)
+        for info, names, body_offset in self._chunks[first:]:
+            # No early exit on ``end``: a clock step can make later chunks overlap
+            if end is not None and info.t_first >= end:
+                continue
+            if start is not None and info.t_last < start:
+                continue
+            if wanted is not None and not wanted.intersection(info.types):
+                continue
+            for t, type, data in self._chunk_events(info, names, body_offset):
+                if start is not None and t < start:
+                    continue
+                if end is not None and t >= end:
+                    continue
+                if wanted is not None and type not in wanted:
+                    continue
+                yield RecordedEvent(t, type, bytes(data).decode("utf-8", "replace"))
+
+    def seek(self, t, types=None):
+        """First event at or after ``t`` (of ``types``), or None"""
+        return next(self.events(start=t, types=types), None)
+
+
+# ─── Recording from the monitor channel ───
+
+class RecordingMonitor(MonitorClient):
+    """MonitorClient that writes raw events to an EventRecorder instead of
+    decoding and queueing them
+    """
+
+    def __init__(self, recorder, host=DEFAULT_HOST, port=DEFAULT_MONITOR_PORT, types=None,
+                 **kwargs):
+        super().__init__(host, port, types=types, **kwargs)
+        self.recorder = recorder
+
+    async def _on_message(self, text):
+        type = event_type(text)
+        self.stats["events"] += 1
+        if self.types is not None and type not in self.types:
+            return
+        self.recorder.append(time.time(), type, text)
+
+
+async def record(path, host=DEFAULT_HOST, port=DEFAULT_MONITOR_PORT, types=None,
+                 duration=None, report_every=10.0, **recorder_kwargs):
+    """Record the monitor channel at ``host:port`` into ``path``
+
+    Runs until ``duration`` seconds pass or the task is cancelled; the
+    recording is finalized either way. Returns the recorder stats.
+    """
+    recorder = EventRecorder(path, **recorder_kwargs)
+    monitor = RecordingMonitor(recorder, host, port, types=types)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        await monitor.start()
+        next_report = started + report_every
+        while duration is None or loop.time() - started < duration:
+            await asyncio.sleep(min(recorder.flush_interval, 0.25))
+            recorder.maybe_seal()
+            if report_every and loop.time() >= next_report:
+                next_report += report_every
+                s = recorder.stats
+                print(f"[REC] {s['events']:,} events, {s['raw_bytes'] / 1e6:.1f} MB raw -> "
+                      f"{s['stored_bytes'] / 1e6:.1f} MB, {monitor.stats['connects']} connects")
+    finally:
+        await monitor.close()
+        await loop.run_in_executor(None, recorder.close)
+    return dict(recorder.stats, elapsed_s=loop.time() - started)
+
+
+# ─── Replay ───
+
+async def replay(recording, speed=1.0, start=None, end=None, types=None):
+    """Yield RecordedEvents paced as recorded, ``speed`` times faster
+    (``speed=0`` replays as fast as possible)
+    """
+    loop = asyncio.get_running_loop()
+    t0 = wall0 = None
+    for event in recording.events(start, end, types):
+        if speed > 0:
+            if t0 is None:
+                t0, wall0 = event.t, loop.time()
+            delay = wall0 + (event.t - t0) / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield event
+
+
+async def replay_to_monitor(path, port=DEFAULT_MONITOR_PORT, speed=1.0, start=None, end=None,
+                            types=None, control_port=0, wait_clients=0):
+    """Serve a recording on a monitor port (bridge protocol) at ``speed``"""
+    from mock_orchestrator import MockOrchestrator
+
+    async with MockOrchestrator(control_port, port, status_hz=0, logs_hz=0,
+                                latency_scale=0, greet=False) as mock:
+        print(f"[REPLAY] monitor ws://127.0.0.1:{mock.monitor_port}")
+        while mock.stats["monitor_clients"] < wait_clients:
+            await asyncio.sleep(0.05)
+        sent = 0
+        with Recording(path) as recording:
+            async for event in replay(recording, speed, start, end, types):
+                await mock.broadcast(event.raw)
+                sent += 1
+        return sent
+
+
+# ─── Benchmark ───
+
+def _synthetic_events(count, seed=4):
+    from mock_orchestrator import MockOrchestrator
+
+    mock = MockOrchestrator(alive_configs=20, seed=seed)
+    rng = random.Random(seed)
+    templates = []
+    for i in range(64):
+        mock.log(f"[Validator] batch {i} tested")
+        templates.append(("status", mock.status_event()))
+        templates.append(("logs", mock.logs_event()))
+        templates.append(("discovery_log", json.dumps(
+            {"type": "discovery_log", "payload": {"source": f"src{i}", "found": i}})))
+    t = time.time()
+    for _ in range(count):
+        t += rng.expovariate(2000.0)
+        type, raw = templates[rng.randrange(len(templates))]
+        yield t, type, raw
+
+
+def run_benchmark(count=200000):
+    import tempfile
+
+    events = list(_synthetic_events(count))
+    raw_mb = sum(len(raw) for _, _, raw in events) / 1e6
+    print(f"[BENCH] {count:,} events, {raw_mb:.1f} MB raw, codec "
+          f"{CODEC_NAMES[default_codec()]}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.hrec")
+        start = time.perf_counter()
+        with EventRecorder(path) as recorder:
+            for t, type, raw in events:
+                recorder.append(t, type, raw)
+        elapsed = time.perf_counter() - start
+        stored = os.path.getsize(path)
+        print(f"   write: {count / elapsed:10,.0f} events/s ({raw_mb / elapsed:.0f} MB/s raw), "
+              f"{stored / 1e6:.1f} MB on disk ({raw_mb * 1e6 / stored:.1f}x), "
+              f"{recorder.stats['chunks']} chunks, {recorder.stats['stalls']} stalls")
+
+        with Recording(path) as recording:
+            t_first, t_last = recording.time_range()
+            rng = random.Random(1)
+            start = time.perf_counter()
+            for _ in range(200):
+                at = rng.uniform(t_first, t_last)
+                found = recording.seek(at, types=("discovery_log",))
+                assert found is None or (found.t >= at and found.type == "discovery_log")
+            seek_ms = (time.perf_counter() - start) / 200 * 1000
+            start = time.perf_counter()
+            total = sum(1 for _ in recording.events())
+            scan = time.perf_counter() - start
+            assert total == count
+        print(f"   seek by time+type: {seek_ms:.2f} ms; full scan {count / scan:,.0f} events/s")
+
+        async def live(rate=2000, seconds=3.0):
+            from mock_orchestrator import MockOrchestrator
+
+            path_live = os.path.join(tmp, "live.hrec")
+            async with MockOrchestrator(status_hz=rate / 2, logs_hz=rate / 2, alive_configs=20,
+                                        latency_scale=0) as mock:
+                stats = await record(path_live, port=mock.monitor_port, duration=seconds,
+                                     report_every=0)
+                broadcast = mock.stats["events"]
+            with Recording(path_live) as recording:
+                recorded = sum(recording.counts().values())
+            print(f"   live from mock at {rate:,} events/s target: {broadcast:,} broadcast, "
+                  f"{recorded:,} recorded in {stats['elapsed_s']:.1f} s "
+                  f"({recorded / stats['elapsed_s']:,.0f} events/s)")
+
+        asyncio.run(live())
+
+
+def _parse_time(value, recording):
+    """Epoch seconds, or ``+N`` seconds from the start of the recording"""
+    if value is None:
+        return None
+    if value.startswith("+"):
+        return recording.time_range()[0] + float(value[1:])
+    return float(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay monitor channel events")
+    parser.add_argument("--bench", nargs="?", type=int, const=200000, metavar="EVENTS",
+                        help="write/seek/live throughput on synthetic events")
+    sub = parser.add_subparsers(dest="action")
+
+    rec = sub.add_parser("record", help="record the monitor channel")
+    rec.add_argument("output")
+    rec.add_argument("--host", default=DEFAULT_HOST)
+    rec.add_argument("--port", type=int, default=DEFAULT_MONITOR_PORT)
+    rec.add_argument("--types", help="comma-separated event types to keep")
+    rec.add_argument("--duration", type=float, help="seconds to record (default: until Ctrl+C)")
+    rec.add_argument("--codec", choices=("zstd", "zlib"),
+                     help="default: zstd when the zstandard module is installed")
+
+    rep = sub.add_parser("replay", help="replay a recording")
+    rep.add_argument("input")
+    rep.add_argument("--speed", type=float, default=1.0, help="1 = real time, 0 = no pacing")
+    rep.add_argument("--from", dest="start", help="epoch seconds or +N from the start")
+    rep.add_argument("--to", dest="end", help="epoch seconds or +N from the start")
+    rep.add_argument("--types", help="comma-separated event types")
+    rep.add_argument("--serve", type=int, metavar="PORT",
+                     help="broadcast on a monitor websocket port instead of printing")
+    rep.add_argument("--wait-clients", type=int, default=1,
+                     help="with --serve, monitor clients to wait for before starting")
+
+    info = sub.add_parser("info", help="summarize a recording")
+    info.add_argument("input")
+    args = parser.parse_args()
+
+    if args.bench:
+        run_benchmark(args.bench)
+        return 0
+    if args.action is None:
+        parser.print_usage()
+        return 2
+
+    types = args.types.split(",") if getattr(args, "types", None) else None
+    try:
+        if args.action == "record":
+            codec = {"zstd": CODEC_ZSTD, "zlib": CODEC_ZLIB}.get(args.codec)
+            if codec == CODEC_ZSTD and zstandard is None:
+                print("[ERROR] zstd needs the zstandard module")
+                return 1
+            stats = asyncio.run(record(args.output, args.host, args.port, types=types,
+                                       duration=args.duration, codec=codec))
+            print(f"[SAVE] {args.output}: {stats['events']:,} events, "
+                  f"{stats['stored_bytes'] / 1e6:.1f} MB")
+            return 0
+
+        with Recording(args.input) as recording:
+            if args.action == "info":
+                t_first, t_last = recording.time_range()
+                chunks = recording.chunks
+                print(f"[INFO] {args.input}: {len(chunks)} chunks, "
+                      f"{'indexed' if recording.indexed else 'no index (scanned)'}")
+                print(f"   {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t_first))} .. "
+                      f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t_last))} "
+                      f"({t_last - t_first:.1f} s)")
+                for type, count in recording.counts().most_common():
+                    print(f"   {type or '(unknown)':20s} {count:,}")
+                return 0
+            start = _parse_time(args.start, recording)
+            end = _parse_time(args.end, recording)
+
+        if args.serve is not None:
+            sent = asyncio.run(replay_to_monitor(args.input, args.serve, args.speed, start, end,
+                                                 types, wait_clients=args.wait_clients))
+            print(f"[REPLAY] {sent:,} events sent")
+            return 0
+
+        async def to_stdout():
+            with Recording(args.input) as recording:
+                async for event in replay(recording, args.speed, start, end, types):
+                    sys.stdout.write(event.raw + "\n")
+
+        asyncio.run(to_stdout())
+        return 0
+    except (OSError, RealtimeError) as e:
+        print(f"[ERROR] {e}")
+        return 1
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
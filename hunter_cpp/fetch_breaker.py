@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Circuit breaker and retry budget for the Python source downloads
+The Python counterpart of ConfigFetcher::isCircuitOpen / recordFailure /
+recordSuccess and FlexibleFetcher's CircuitState: after three failed
+downloads in a row a source's circuit opens and the next sweeps skip it
+in microseconds instead of waiting out the 30 s timeout again. When the
+cooldown (120 s like the C++ side, doubling with every re-trip, jittered)
+has passed the circuit goes half-open and lets exactly one probe through,
+with a short timeout; success closes it, failure opens it again.
+
+Transient failures (timeouts, resets, 429, 5xx) are retried with jittered
+exponential backoff, but only while a shared retry budget allows it, so
+a bad network day cannot multiply the sweep's traffic. Circuit state is
+kept in runtime/fetch_breaker.tsv across runs.
+
+Both wrap the ``fetch_one(url, timeout=...)`` downloaders the sweep
+scripts hand to source_fetcher:
+
+    fetch_one = breaker.guard(with_retries(fetch_one, RetryBudget()))
+
+Run with --bench to sweep the local source farm with dead sources a few
+times with and without the breaker.
+"""
+
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+from source_fetcher import failed_result
+
+DEFAULT_STATE_FILE = os.path.join("runtime", "fetch_breaker.tsv")
+FAILURE_THRESHOLD = 3         # failures in a row before the circuit opens
+BASE_COOLDOWN = 120.0         # seconds; ConfigFetcher's Iran-tuned cooldown
+MAX_COOLDOWN = 6 * 3600.0
+COOLDOWN_JITTER = 0.2
+PROBE_TIMEOUT = 10            # seconds allowed for a half-open probe
+RETRY_RATIO = 0.2             # retries allowed per first attempt
+MIN_RETRIES = 3               # retries always allowed per budget window
+RETRY_WINDOW = 60.0
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.5
+MAX_RETRY_BACKOFF = 8.0
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+STATE_HEADER = "# key\tstate\tfailures\ttrips\topen_until\tlast_failure\tlast_error\n"
+
+TRANSIENT_MESSAGE = re.compile(
+    r"timeout|timed out|connection|reset|refused|temporar|remote end closed|"
+    r"incomplete|chunked|\b(429|5\d\d)\b", re.IGNORECASE)
+
+
+def is_transient(message):
+    """Whether a failure message is worth retrying (not a 404 or bad content)"""
+    return bool(TRANSIENT_MESSAGE.search(message or ""))
+
+
+class Circuit:
+    """Breaker state of one source"""
+
+    __slots__ = ("key", "state", "failures", "trips", "open_until", "last_failure", "last_error")
+
+    def __init__(self, key):
+        self.key = key
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.open_until = 0.0
+        self.last_failure = 0.0
+        self.last_error = ""
+
+    @classmethod
+    def from_columns(cls, cols):
+        if len(cols) < 6 or not cols[0]:
+            return None
+        circuit = cls(cols[0])
+        # A probe in flight when the state was saved never reported back
+        circuit.state = OPEN if cols[1] == HALF_OPEN else cols[1]
+        try:
+            circuit.failures, circuit.trips = int(cols[2]), int(cols[3])
+            circuit.open_until, circuit.last_failure = float(cols[4]), float(cols[5])
+        except ValueError:
+            return None
+        circuit.last_error = cols[6] if len(cols) > 6 else ""
+        return circuit
+
+    def to_line(self):
+        error = self.last_error.replace("\t", " ").replace("\n", " ").replace("\r", " ")
+        return (f"{self.key}\t{self.state}\t{self.failures}\t{self.trips}\t"
+                f"{self.open_until:.1f}\t{self.last_failure:.1f}\t{error[:200]}\n")
+
+
+class CircuitBreaker:
+    """Per-source circuit breakers with half-open probing
+
+    ``key`` maps a URL to the circuit it belongs to (the URL itself by
+    default, as in ConfigFetcher; ``source_fetcher.host_of`` to trip a
+    whole dead host at once). With ``path`` the state is loaded on
+    creation and written by ``save()``.
+    """
+
+    def __init__(self, path=None, threshold=FAILURE_THRESHOLD, base_cooldown=BASE_COOLDOWN,
+                 max_cooldown=MAX_COOLDOWN, jitter=COOLDOWN_JITTER, probe_timeout=PROBE_TIMEOUT,
+                 key=None, clock=time.time, seed=None):
+        self.path = path
+        self.threshold = max(1, threshold)
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.jitter = jitter
+        self.probe_timeout = probe_timeout
+        self.key = key or (lambda url: url)
+        self.clock = clock
+        self.stats = {"allowed": 0, "rejected": 0, "probes": 0, "trips": 0, "closed": 0}
+        self._circuits = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        if path:
+            self.load(path)
+
+    # ─── State machine ───
+
+    def _circuit(self, url):
+        key = self.key(url)
+        circuit = self._circuits.get(key)
+        if circuit is None:
+            circuit = self._circuits[key] = Circuit(key)
+        return circuit
+
+    def state(self, url):
+        with self._lock:
+            circuit = self._circuits.get(self.key(url))
+            return circuit.state if circuit else CLOSED
+
+    def retry_in(self, url):
+        """Seconds until an open circuit lets a probe through (0 if not open)"""
+        with self._lock:
+            circuit = self._circuits.get(self.key(url))
+            if circuit is None or circuit.state != OPEN:
+                return 0.0
+            return max(0.0, circuit.open_until - self.clock())
+
+    def allow(self, url):
+        """Decide whether to download ``url`` now
+
+        Returns CLOSED (go ahead), HALF_OPEN (go ahead as the one probe) or
+        None (skip it).
+        """
+        with self._lock:
+            circuit = self._circuit(url)
+            if circuit.state == CLOSED:
+                self.stats["allowed"] += 1
+                return CLOSED
+            if circuit.state == OPEN and self.clock() >= circuit.open_until:
+                circuit.state = HALF_OPEN
+                self.stats["probes"] += 1
+                return HALF_OPEN
+            self.stats["rejected"] += 1
+            return None
+
+    def record_success(self, url):
+        with self._lock:
+            circuit = self._circuits.pop(self.key(url), None)
+            if circuit is not None and circuit.state != CLOSED:
+                self.stats["closed"] += 1
+
+    def record_failure(self, url, error=""):
+        with self._lock:
+            circuit = self._circuit(url)
+            now = self.clock()
+            circuit.failures += 1
+            circuit.last_failure = now
+            circuit.last_error = error
+            if circuit.state == HALF_OPEN or circuit.failures >= self.threshold:
+                cooldown = min(self.max_cooldown, self.base_cooldown * 2 ** circuit.trips)
+                cooldown *= 1.0 + self._rng.uniform(-self.jitter, self.jitter)
+                circuit.state = OPEN
+                circuit.trips += 1
+                circuit.open_until = now + cooldown
+                self.stats["trips"] += 1
+
+    def open_circuits(self):
+        with self._lock:
+            return [c.key for c in self._circuits.values() if c.state != CLOSED]
+
+    # ─── Wrapping a downloader ───
+
+    def guard(self, fetch_one):
+        """Wrap ``fetch_one(url, timeout=...)`` with the breaker
+
+        Skipped sources come back as failed results immediately; a
+        half-open probe runs with at most ``probe_timeout``. Any failed
+        result or exception counts as a failure, as in ConfigFetcher.
+        """
+
+        def guarded(url, timeout=30):
+            verdict = self.allow(url)
+            if verdict is None:
+                return failed_result(f"Circuit open (retry in {self.retry_in(url):.0f}s)")
+            if verdict == HALF_OPEN:
+                timeout = min(timeout, self.probe_timeout)
+            try:
+                result = fetch_one(url, timeout=timeout)
+            except Exception as e:
+                self.record_failure(url, str(e))
+                raise
+            if result[0]:
+                self.record_success(url)
+            else:
+                self.record_failure(url, result[2])
+            return result
+
+        return guarded
+
+    # ─── Persistence ───
+
+    def load(self, path=None):
+        path = path or self.path
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                lines = [line.rstrip("\n").split("\t") for line in f if not line.startswith("#")]
+        except FileNotFoundError:
+            return 0
+        with self._lock:
+            for cols in lines:
+                circuit = Circuit.from_columns(cols)
+                if circuit is not None:
+                    self._circuits[circuit.key] = circuit
+            return len(self._circuits)
+
+    def save(self, path=None):
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            lines = [c.to_line() for c in self._circuits.values()]
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+            f.write(STATE_HEADER)
+            f.writelines(lines)
+        os.replace(tmp, path)
+
+
+class RetryBudget:
+    """Caps retries at a share of first attempts over a sliding window
+
+    Every first attempt deposits ``ratio`` of a retry; a retry spends a
+    whole one. ``min_retries`` are always available per window so a small
+    sweep can still retry a blip.
+    """
+
+    def __init__(self, ratio=RETRY_RATIO, min_retries=MIN_RETRIES, window=RETRY_WINDOW,
+                 clock=time.monotonic):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self.clock = clock
+        self.stats = {"attempts": 0, "retries": 0, "denied": 0}
+        self._attempts = []
+        self._retries = []
+        self._lock = threading.Lock()
+
+    def _trim(self, now):
+        cutoff = now - self.window
+        for events in (self._attempts, self._retries):
+            while events and events[0] < cutoff:
+                events.pop(0)
+
+    def deposit(self):
+        with self._lock:
+            now = self.clock()
+            self._trim(now)
+            self._attempts.append(now)
+            self.stats["attempts"] += 1
+
+    def withdraw(self):
+        """Take one retry if the budget has it"""
+        with self._lock:
+            now = self.clock()
+            self._trim(now)
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._attempts):
+                self.stats["denied"] += 1
+                return False
+            self._retries.append(now)
+            self.stats["retries"] += 1
+            return True
+
+
+def with_retries(fetch_one, budget, attempts=RETRY_ATTEMPTS, backoff=RETRY_BACKOFF,
+                 max_backoff=MAX_RETRY_BACKOFF, sleep=time.sleep, seed=None):
+    """Retry transient failures of ``fetch_one`` while ``budget`` allows
+
+    Waits a full-jitter exponential backoff (``backoff * 2**n``, capped at
+    ``max_backoff``) between attempts. A failure that took half the
+    timeout or more is not retried; those are for the breaker to cut off.
+    Returns the last result; the last exception is re-raised if every
+    attempt raised.
+    """
+    rng = random.Random(seed)
+
+    def retrying(url, timeout=30):
+        budget.deposit()
+        for attempt in range(max(1, attempts)):
+            started = time.monotonic()
+            try:
+                result = fetch_one(url, timeout=timeout)
+                error = None if result[0] else result[2]
+            except Exception as e:
+                result, error = e, str(e)
+            slow = time.monotonic() - started >= timeout / 2
+            if error is None or slow or not is_transient(error) or attempt + 1 >= attempts \
+                    or not budget.withdraw():
+                break
+            sleep(rng.uniform(0, min(max_backoff, backoff * 2 ** attempt)))
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return retrying
+
+
+def run_benchmark(sources=24, sweeps=4, timeout=3):
+    import tempfile
+
+    from fetch_session import fetch
+    from source_farm import SourceFarm
+    from source_fetcher import fetch_sources
+
+    def download(url, timeout=30):
+        response = fetch(url, timeout=timeout)
+        response.raise_for_status()
+        return True, len(response.content), "ok", 0
+
+    with tempfile.TemporaryDirectory() as tmp, SourceFarm(sources, 16) as farm:
+        urls = farm.urls()
+        # Every fourth source hangs (dead host), one flaps with 503s
+        for i in range(0, len(urls), 4):
+            urls[i] += "?hang=60"
+        urls[1] += "?status=503"
+        dead = sum("hang" in u for u in urls)
+        print(f"[BENCH] {len(urls)} farm sources ({dead} dead, 1 returning 503), "
+              f"timeout {timeout}s, {sweeps} sweeps")
+        state = os.path.join(tmp, "fetch_breaker.tsv")
+        for label in ("plain", "breaker"):
+            print(f"   {label}:")
+            for sweep_no in range(1, sweeps + 1):
+                fetch_one = download
+                if label == "breaker":
+                    # A fresh process every sweep: only the state file carries over
+                    breaker = CircuitBreaker(state, threshold=2, seed=sweep_no)
+                    fetch_one = breaker.guard(with_retries(download, RetryBudget(), backoff=0.05))
+                start = time.perf_counter()
+                results = fetch_sources(urls, fetch_one, timeout=timeout, host_interval=0,
+                                        concurrency=8, per_host=8)
+                elapsed = time.perf_counter() - start
+                ok = sum(r[0] for r in results)
+                note = ""
+                if label == "breaker":
+                    breaker.save()
+                    note = (f", {breaker.stats['rejected']} skipped by open circuits, "
+                            f"{len(breaker.open_circuits())} open")
+                print(f"      sweep {sweep_no}: {ok}/{len(urls)} ok in {elapsed:5.2f}s{note}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        run_benchmark(*(int(x) for x in sys.argv[2:5]))
+    elif len(sys.argv) > 1 and sys.argv[1] == "--reset":
+        path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_STATE_FILE
+        if os.path.exists(path):
+            os.remove(path)
+    else:
+        breaker = CircuitBreaker(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATE_FILE)
+        for key in breaker.open_circuits():
+            print(f"[OPEN] retry in {breaker.retry_in(key):6.0f}s  {key}")
+        print("Usage: fetch_breaker.py [STATE_FILE] | --bench [SOURCES] [SWEEPS] [TIMEOUT] "
+              "| --reset [STATE_FILE]")
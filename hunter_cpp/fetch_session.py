@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP session for every source download in the Python tooling
+One keep-alive connection pool per host (capped at ``per_host``
+connections) is reused across all sources of a sweep, so the second and
+later files on raw.githubusercontent.com skip the TCP+TLS handshake.
+Responses are negotiated with gzip (and brotli when the ``brotli`` module
+is installed). HTTP/2 multiplexing is used when ``http2=True`` and httpx
+with h2 support is available; otherwise the session stays on requests.
+
+Counters for handshakes (new connections), requests and bytes on the wire
+(compressed body bytes) are kept per session. Errors are raised as
+requests exceptions on both transports. A session can route everything
+through one proxy (``proxy="http://127.0.0.1:10809"``; socks5h:// needs
+PySocks), which is how proxy_pool gives each local port its own pool.
+"""
+
+import threading
+from contextlib import contextmanager
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import brotli  # noqa: F401  (enables urllib3's br decoder)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+try:
+    import httpx
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
+
+DEFAULT_PER_HOST = 4
+DEFAULT_MAX_HOSTS = 64
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'text/plain,application/json,*/*',
+    'Accept-Encoding': ACCEPT_ENCODING,
+}
+
+
+class FetchResponse:
+    """Status, headers and decoded body of a completed download"""
+
+    __slots__ = ("url", "status_code", "headers", "content", "wire_bytes", "from_cache")
+
+    def __init__(self, url, status_code, headers, content, wire_bytes=0, from_cache=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.wire_bytes = wire_bytes
+        self.from_cache = from_cache
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+def _header_bytes(status_code, headers):
+    return len(f"HTTP/1.1 {status_code} \r\n\r\n") + sum(
+        len(k) + len(v) + 4 for k, v in headers.items())
+
+
+class FetchSession:
+    """Pooled session shared by the sweep scripts and the source fetcher"""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST, http2=False, headers=None,
+                 max_hosts=DEFAULT_MAX_HOSTS, proxy=None):
+        self.per_host = max(1, per_host)
+        self.proxy = proxy
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.http2 = bool(http2 and httpx is not None)
+        self.stats = {"requests": 0, "bytes_on_wire": 0, "bytes_decoded": 0}
+        self._lock = threading.Lock()
+        if self.http2:
+            self._client = httpx.Client(
+                http2=True, headers=self.headers, follow_redirects=True, proxy=proxy,
+                limits=httpx.Limits(max_connections=self.per_host * max_hosts,
+                                    max_keepalive_connections=self.per_host * max_hosts))
+            self._h2_connections = set()
+        else:
+            self._session = requests.Session()
+            self._session.headers.update(self.headers)
+            if proxy:
+                self._session.proxies = {"http": proxy, "https": proxy}
+                self._session.trust_env = False
+            self._adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=self.per_host,
+                                        pool_block=True)
+            self._session.mount("http://", self._adapter)
+            self._session.mount("https://", self._adapter)
+
+    @property
+    def handshakes(self):
+        """New connections opened so far (one TCP+TLS handshake each)"""
+        if self.http2:
+            return len(self._h2_connections)
+        # With a proxy, requests opens connections through proxy_manager[proxy]
+        managers = [self._adapter.poolmanager] + list(self._adapter.proxy_manager.values())
+        return sum(manager.pools[key].num_connections
+                   for manager in managers for key in list(manager.pools.keys()))
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+        stats["handshakes"] = self.handshakes
+        return stats
+
+    def _account(self, wire, decoded):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_on_wire"] += wire
+            self.stats["bytes_decoded"] += decoded
+
+    def fetch(self, url, timeout=30, headers=None):
+        """Download ``url`` completely and return a FetchResponse
+
+        The status is not checked; call ``raise_for_status`` (304 and other
+        non-error codes are returned as-is for conditional requests).
+        """
+        if self.http2:
+            with self._translate_errors():
+                response = self._client.get(url, headers=headers, timeout=timeout)
+                self._note_h2(response)
+                content = response.content
+                wire = response.num_bytes_downloaded
+                result = FetchResponse(url, response.status_code, response.headers, content)
+        else:
+            response = self._session.get(url, headers=headers, timeout=timeout)
+            content = response.content
+            wire = response.raw.tell() if response.raw is not None else len(content)
+            result = FetchResponse(url, response.status_code, response.headers, content)
+        result.wire_bytes = wire + _header_bytes(result.status_code, result.headers)
+        self._account(result.wire_bytes, len(content))
+        return result
+
+    def iter_chunks(self, url, timeout=30, chunk_size=DEFAULT_CHUNK_SIZE, headers=None,
+                    meta=None):
+        """Yield decoded body chunks of ``url``; raises on HTTP errors
+
+        Closing the generator early (e.g. ``break``) releases the connection
+        back to the pool. If ``meta`` is a dict it receives ``status_code``
+        and ``headers`` before the first chunk.
+        """
+        wire = decoded = 0
+        if self.http2:
+            with self._translate_errors(), self._client.stream(
+                    "GET", url, headers=headers, timeout=timeout) as response:
+                self._note_h2(response)
+                if meta is not None:
+                    meta.update(status_code=response.status_code, headers=response.headers)
+                if response.status_code >= 400:
+                    raise requests.exceptions.HTTPError(
+                        f"{response.status_code} Error for url: {url}")
+                try:
+                    for chunk in response.iter_bytes(chunk_size):
+                        decoded += len(chunk)
+                        yield chunk
+                finally:
+                    wire = response.num_bytes_downloaded + _header_bytes(
+                        response.status_code, response.headers)
+                    self._account(wire, decoded)
+            return
+
+        with self._session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            if meta is not None:
+                meta.update(status_code=response.status_code, headers=response.headers)
+            try:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    decoded += len(chunk)
+                    yield chunk
+            finally:
+                wire = response.raw.tell() + _header_bytes(response.status_code, response.headers)
+                self._account(wire, decoded)
+
+    def _note_h2(self, response):
+        stream = response.extensions.get("network_stream")
+        if stream is not None:
+            with self._lock:
+                self._h2_connections.add(id(stream))
+
+    @contextmanager
+    def _translate_errors(self):
+        try:
+            yield
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(str(e)) from e
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(str(e)) from e
+
+    def close(self):
+        if self.http2:
+            self._client.close()
+        else:
+            self._session.close()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_session():
+    """The process-wide FetchSession, created on first use"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = FetchSession()
+        return _shared
+
+
+def configure_session(**kwargs):
+    """Replace the process-wide session (e.g. ``configure_session(http2=True)``)"""
+    global _shared
+    with _shared_lock:
+        if _shared is not None:
+            _shared.close()
+        _shared = FetchSession(**kwargs)
+        return _shared
+
+
+def fetch(url, timeout=30, headers=None):
+    """Download ``url`` with the shared session and raise on HTTP errors"""
+    response = get_session().fetch(url, timeout=timeout, headers=headers)
+    response.raise_for_status()
+    return response
+
+
+def run_benchmark(sources=48, payload_kb=256):
+    """Handshakes and bytes on the wire: bare requests.get vs the shared session"""
+    import time
+
+    from source_fetcher import fetch_sources
+    from source_farm import SourceFarm
+
+    legacy_headers = {k: v for k, v in DEFAULT_HEADERS.items() if k != 'Accept-Encoding'}
+
+    def bare(url, timeout=30):
+        response = requests.get(url, headers=legacy_headers, timeout=timeout)
+        response.raise_for_status()
+        return True, len(response.content), "ok", 0
+
+    def pooled(session):
+        def fetch_one(url, timeout=30):
+            response = session.fetch(url, timeout=timeout)
+            response.raise_for_status()
+            return True, len(response.content), "ok", 0
+        return fetch_one
+
+    gzip_only = FetchSession(headers={'Accept-Encoding': 'gzip, deflate'})
+    shared = FetchSession()
+    runs = [("bare requests.get", bare), ("shared, gzip", pooled(gzip_only))]
+    if 'br' in ACCEPT_ENCODING:
+        runs.append(("shared, brotli", pooled(shared)))
+
+    with SourceFarm(sources, payload_kb) as farm:
+        urls = farm.urls()
+        print(f"[BENCH] {len(urls)} farm sources x {payload_kb} KB, 2 sweeps each")
+        for label, fetch_one in runs:
+            farm.reset_stats()
+            start = time.perf_counter()
+            decoded = 0
+            for _ in range(2):
+                decoded += sum(r[1] for r in fetch_sources(urls, fetch_one, host_interval=0))
+            elapsed = time.perf_counter() - start
+            stats = farm.stats
+            print(f"   {label:18s}: {stats['connections']:4d} handshakes for "
+                  f"{stats['requests']} requests, {stats['bytes_sent'] / 1e6:7.2f} MB on wire "
+                  f"for {decoded / 1e6:7.2f} MB of payload, {elapsed:.2f} s")
+    for session in (gzip_only, shared):
+        session.close()
+    print(f"   HTTP/2: {'available' if httpx is not None else 'unavailable (pip install httpx[http2])'}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        run_benchmark(*(int(x) for x in sys.argv[2:4]))
+    else:
+        print("Usage: fetch_session.py --bench [SOURCES] [PAYLOAD_KB]")
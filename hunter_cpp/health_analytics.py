@@ -0,0 +1,575 @@
+#!/usr/bin/env python3
+"""
+Vectorized analytics over ConfigDatabase health snapshots
+Loads a saveToDisk snapshot (TSV) or JSON-lines export into NumPy columns,
+one per ConfigHealthRecord field, and answers the usual questions without
+per-record Python loops:
+
+  pass_rates(by)            tests/passes/alive per group (tag, engine, ...)
+  latency_percentiles(by)   percentiles of alive latency per group, e.g.
+                            by=("protocol", "network", "security")
+  survival(by)              Kaplan-Meier curve of how long configs stay
+                            alive after they are first seen
+
+stats() and tag_stats() reproduce ConfigDatabase::getStats and
+getTagStats bit for bit (float32 latency sums accumulated in uri_hash
+order, like std::accumulate over the std::map). scalar_stats() is a
+record-by-record port of getStats used to check them.
+
+Rows are deduplicated by uri_hash with the first record winning, via the
+SnapshotReader index (cached as <snapshot>.idx.npz). protocol, network and
+security come from parsing the URIs once with uri_parser.parse_many; the
+codes are stored in the same index file, so reloading an unchanged
+snapshot skips the parse.
+
+Run with a snapshot path for a report, or --bench for timings at 200K.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from config_db import (SnapshotReader, TagStats, hash_to_int, hash_uri,
+                       make_synthetic_snapshot, parse_snapshot_line, write_snapshot)
+from config_table import Vocab
+from uri_parser import parse_many
+
+STALE_THRESHOLD = 300.0  # getStats: tested more than 5 min ago
+GROUP_FIELDS = ("tag", "engine_used", "protocol", "network", "security")
+DEFAULT_PERCENTILES = (50, 90, 99)
+DEFAULT_HORIZONS_H = (1, 3, 6, 12, 24, 48)
+CLASS_FIELDS = ("protocol", "network", "security")
+CLASS_CACHE_VERSION = 1          # bump when uri_parser changes what these fields hold
+
+_FLOAT_FIELDS = ("first_seen", "last_tested", "last_alive_time")
+_INT_FIELDS = ("consecutive_fails", "total_tests", "total_passes")
+_BOOL_FIELDS = ("alive", "telegram_only", "needs_retest")
+
+
+class HealthFrame:
+    """Column arrays for a set of ConfigHealthRecords, in file order
+
+    ``hashes`` holds uri_hash as uint64; ``tag`` and ``engine_used`` are
+    uint32 codes into ``vocabs``. protocol/network/security are filled in
+    on first use by classify(), or from the snapshot's index when load()
+    finds them cached there.
+    """
+
+    def __init__(self, uris, hashes, columns, vocabs):
+        self.uris = uris
+        self.hashes = hashes
+        self.columns = columns
+        self.vocabs = vocabs
+        self.snapshot = None          # snapshot whose index caches the classification
+        self._hash_order = None
+        self._group_cache = {}
+
+    def __len__(self):
+        return len(self.uris)
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    # ─── Construction ───
+
+    @classmethod
+    def from_records(cls, records):
+        """Build from ConfigHealthRecords (first record per uri_hash wins)"""
+        vocabs = {"tag": Vocab(), "engine_used": Vocab()}
+        values = {name: [] for name in _FLOAT_FIELDS + _INT_FIELDS + _BOOL_FIELDS}
+        values.update(latency_ms=[], tag=[], engine_used=[])
+        uris, hashes, seen = [], [], set()
+        for rec in records:
+            uri_hash = rec.uri_hash or hash_uri(rec.uri)
+            if uri_hash in seen:
+                continue
+            seen.add(uri_hash)
+            uris.append(rec.uri)
+            hashes.append(hash_to_int(uri_hash))
+            for name in _FLOAT_FIELDS + _INT_FIELDS + _BOOL_FIELDS + ("latency_ms",):
+                values[name].append(getattr(rec, name))
+            values["tag"].append(vocabs["tag"].code(rec.tag))
+            values["engine_used"].append(vocabs["engine_used"].code(rec.engine_used))
+        return cls(uris, np.array(hashes, dtype=np.uint64), _typed_columns(values), vocabs)
+
+    @classmethod
+    def load(cls, path, use_cache=True):
+        """Load a saveToDisk snapshot (V1/V2 TSV) or a JSON-lines export
+
+        With ``use_cache`` the protocol/network/security codes cached in the
+        snapshot's index are reused, and classify() stores them there.
+        """
+        with SnapshotReader(path, use_cache=use_cache) as reader:
+            if reader.format == "jsonl":
+                frame = cls.from_records(reader)
+            else:
+                with open(path, "rb") as f:
+                    data = f.read()
+                frame = cls._from_tsv(data, reader)
+            if use_cache:
+                frame.snapshot = path
+                frame._restore_classes(reader.extra)
+        return frame
+
+    @classmethod
+    def _from_tsv(cls, data, reader):
+        fields = reader.fields
+        lines = data.split(b"\n")
+        starts = np.zeros(len(lines), dtype=np.int64)
+        np.cumsum(np.fromiter((len(l) + 1 for l in lines[:-1]), dtype=np.int64,
+                              count=len(lines) - 1), out=starts[1:])
+        # The index lists the rows loadFromDisk keeps (first per uri_hash)
+        rows = np.searchsorted(starts, reader.offsets)
+        if len(rows) and (rows.max() >= len(lines) or not np.array_equal(starts[rows], reader.offsets)):
+            raise ValueError(f"{reader.path}: index does not match the snapshot lines")
+        parts = [lines[i].rstrip(b"\r").split(b"\t") for i in rows.tolist()]
+        col = {name: i for i, name in enumerate(fields)}
+        try:
+            columns = _vectorized_columns(parts, col)
+        except ValueError:
+            # Odd numeric text (std::stoi prefixes etc.): fall back to the exact parser
+            records = [parse_snapshot_line(lines[i], fields, f"{int(h):016x}")
+                       for i, h in zip(rows.tolist(), reader.hashes.tolist())]
+            return cls.from_records(records)
+
+        # The index already codes tags in first-seen order, as Vocab does
+        vocabs = {"tag": Vocab(reader.tags if len(parts) else ())}
+        columns["tag"] = reader.tag_codes.astype(np.uint32)
+        vocab = vocabs["engine_used"] = Vocab()
+        code = vocab.code
+        i = col["engine_used"]
+        columns["engine_used"] = np.fromiter(
+            (code(p[i].decode("utf-8", "surrogateescape")) for p in parts),
+            dtype=np.uint32, count=len(parts))
+        uris = [p[0].decode("utf-8", "surrogateescape") for p in parts]
+        return cls(uris, reader.hashes.copy(), columns, vocabs)
+
+    # ─── Grouping ───
+
+    @property
+    def hash_order(self):
+        """Row order of the C++ std::map (ascending uri_hash)"""
+        if self._hash_order is None:
+            self._hash_order = np.argsort(self.hashes, kind="stable")
+        return self._hash_order
+
+    def classify(self):
+        """Parse every URI once and add protocol/network/security code columns"""
+        if "protocol" in self.columns:
+            return
+        parsed = {cfg.uri: cfg for cfg in parse_many(self.uris)}
+        for name in CLASS_FIELDS:
+            vocab = self.vocabs[name] = Vocab([""])
+            code = vocab.code
+            self.columns[name] = np.fromiter(
+                (code(getattr(parsed[u], name)) if u in parsed else 0
+                 for u in (uri.strip(" \t\r\n") for uri in self.uris)),
+                dtype=np.uint32, count=len(self))
+        if self.snapshot is not None:
+            self._store_classes()
+
+    @staticmethod
+    def _class_key(name):
+        return f"class{CLASS_CACHE_VERSION}_{name}"
+
+    def _restore_classes(self, extra):
+        keys = [self._class_key(name) for name in CLASS_FIELDS]
+        if not all(key in extra and key + "_values" in extra for key in keys):
+            return
+        if any(len(extra[key]) != len(self) for key in keys):
+            return
+        for name, key in zip(CLASS_FIELDS, keys):
+            self.vocabs[name] = Vocab(str(v) for v in extra[key + "_values"])
+            self.columns[name] = extra[key].astype(np.uint32)
+
+    def _store_classes(self):
+        with SnapshotReader(self.snapshot) as reader:
+            if not np.array_equal(reader.hashes, self.hashes):
+                return          # the snapshot changed since load()
+            extra = {}
+            for name in CLASS_FIELDS:
+                key = self._class_key(name)
+                extra[key] = self.columns[name]
+                extra[key + "_values"] = np.array(self.vocabs[name].values, dtype=str)
+            reader.store_extra(extra)
+
+    def group(self, by):
+        """``(codes, labels)``: a group code per row and the label per code
+
+        ``by`` is one field of GROUP_FIELDS or a tuple of them; labels are
+        strings or tuples of strings. Only combinations that occur get a
+        code.
+        """
+        key = (by,) if isinstance(by, str) else tuple(by)
+        if key in self._group_cache:
+            return self._group_cache[key]
+        for name in key:
+            if name not in GROUP_FIELDS:
+                raise KeyError(f"cannot group by {name}; choose from {GROUP_FIELDS}")
+            if name in CLASS_FIELDS:
+                self.classify()
+        combined = np.zeros(len(self), dtype=np.int64)
+        for name in key:
+            combined = combined * len(self.vocabs[name]) + self.columns[name]
+        present, codes = np.unique(combined, return_inverse=True)
+        labels = []
+        for value in present.tolist():
+            parts = []
+            for name in reversed(key):
+                size = len(self.vocabs[name])
+                parts.append(self.vocabs[name].values[value % size])
+                value //= size
+            parts.reverse()
+            labels.append(parts[0] if len(key) == 1 else tuple(parts))
+        result = (codes.astype(np.int64).reshape(-1), labels)
+        self._group_cache[key] = result
+        return result
+
+    # ─── ConfigDatabase::getStats / getTagStats ───
+
+    def _float32_mean(self, mask):
+        """std::accumulate(float) over masked latencies in uri_hash order, / count"""
+        order = self.hash_order[mask[self.hash_order]]
+        if not len(order):
+            return 0.0
+        total = np.cumsum(self.latency_ms[order], dtype=np.float32)[-1]
+        return float(np.float32(total) / np.float32(len(order)))
+
+    def stats(self, now=None):
+        """ConfigDatabase::Stats as a dict, evaluated at ``now``"""
+        now = time.time() if now is None else now
+        tested = self.total_tests > 0
+        return {
+            "total": len(self),
+            "alive": int(self.alive.sum()),
+            "avg_latency_ms": self._float32_mean(self.alive & (self.latency_ms > 0)),
+            "tested_unique": int(tested.sum()),
+            "untested_unique": int((~tested).sum()),
+            "stale_unique": int((tested & ((now - self.last_tested) > STALE_THRESHOLD)).sum()),
+            "total_tested": int(self.total_tests.sum()),
+            "total_passed": int(self.total_passes.sum()),
+        }
+
+    def tag_stats(self, tag):
+        """ConfigDatabase::getTagStats(tag)"""
+        stats = TagStats(tag)
+        code = self.vocabs["tag"].lookup(tag)
+        if not tag or code < 0:
+            return stats
+        in_tag = self.columns["tag"] == code
+        live = in_tag & self.alive & (self.latency_ms > 0)
+        stats.total = int(in_tag.sum())
+        stats.alive = int(live.sum())
+        stats.untested = int((in_tag & (self.total_tests == 0)).sum())
+        stats.needs_retest = int((in_tag & self.needs_retest).sum())
+        stats.avg_latency_ms = self._float32_mean(live)
+        return stats
+
+    def all_tag_stats(self):
+        return {tag: self.tag_stats(tag) for tag in self.vocabs["tag"].values if tag}
+
+    # ─── Group-bys ───
+
+    def pass_rates(self, by="tag"):
+        """Per group: records, tested, alive, tests, passes, pass and alive rates"""
+        codes, labels = self.group(by)
+        n = len(labels)
+        records = np.bincount(codes, minlength=n)
+        tested = np.bincount(codes, weights=self.total_tests > 0, minlength=n)
+        alive = np.bincount(codes, weights=self.alive, minlength=n)
+        tests = np.bincount(codes, weights=self.total_tests, minlength=n)
+        passes = np.bincount(codes, weights=self.total_passes, minlength=n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pass_rate = np.where(tests > 0, passes / tests, 0.0)
+            alive_rate = np.where(tested > 0, alive / tested, 0.0)
+        return [{"group": labels[i], "records": int(records[i]), "tested": int(tested[i]),
+                 "alive": int(alive[i]), "tests": int(tests[i]), "passes": int(passes[i]),
+                 "pass_rate": float(pass_rate[i]), "alive_rate": float(alive_rate[i])}
+                for i in np.argsort(-records, kind="stable").tolist()]
+
+    def latency_percentiles(self, by=("protocol", "network", "security"),
+                            percentiles=DEFAULT_PERCENTILES, min_count=1):
+        """Percentiles of latency_ms over alive records per group
+
+        Uses the same linear interpolation as np.percentile, computed for
+        all groups at once from one lexsort.
+        """
+        codes, labels = self.group(by)
+        live = self.alive & (self.latency_ms > 0)
+        group_codes = codes[live]
+        latency = self.latency_ms[live].astype(np.float64)
+        order = np.lexsort((latency, group_codes))
+        values = latency[order]
+        counts = np.bincount(group_codes, minlength=len(labels))
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        present = np.flatnonzero(counts >= max(1, min_count))
+        n = counts[present]
+        result = {"group": [labels[i] for i in present.tolist()], "count": n.tolist()}
+        for q in percentiles:
+            pos = (n - 1) * (q / 100.0)
+            lo = np.floor(pos).astype(np.int64)
+            hi = np.minimum(lo + 1, n - 1)
+            frac = pos - lo
+            base = starts[present]
+            result[f"p{q:g}"] = (values[base + lo] + (values[base + hi] - values[base + lo]) * frac).tolist()
+        rows = [dict(zip(result, row)) for row in zip(*result.values())]
+        rows.sort(key=lambda r: -r["count"])
+        return rows
+
+    # ─── Survival ───
+
+    def lifetimes(self, now=None):
+        """``(durations_s, died)`` for configs that were ever alive
+
+        A config's lifetime runs from first_seen to its last_alive_time; it
+        is an observed death if the config is no longer alive, otherwise
+        censored at ``now`` (still alive).
+        """
+        now = time.time() if now is None else now
+        ever = self.last_alive_time > 0
+        died = ever & ~self.alive
+        end = np.where(self.alive, np.maximum(now, self.last_alive_time), self.last_alive_time)
+        durations = np.maximum(0.0, end - self.first_seen)
+        return durations, died, ever
+
+    def survival(self, by=None, now=None):
+        """Kaplan-Meier survival of alive configs, overall or per group
+
+        Returns ``{label: (times_s, survival)}`` with the step function
+        evaluated at each distinct death time.
+        """
+        durations, died, ever = self.lifetimes(now)
+        if by is None:
+            codes, labels = np.zeros(len(self), dtype=np.int64), ["all"]
+        else:
+            codes, labels = self.group(by)
+        curves = {}
+        codes, durations, died = codes[ever], durations[ever], died[ever]
+        # Sort by group, then time; deaths before censorings at equal times
+        order = np.lexsort((~died, durations, codes))
+        codes, durations, died = codes[order], durations[order], died[order]
+        bounds = np.flatnonzero(np.diff(codes)) + 1
+        for segment in np.split(np.arange(len(codes)), bounds):
+            if not len(segment):
+                continue
+            t, d = durations[segment], died[segment]
+            times, first = np.unique(t, return_index=True)
+            deaths = np.add.reduceat(d.astype(np.int64), first)
+            at_risk = len(t) - first
+            keep = deaths > 0
+            surv = np.cumprod(1.0 - deaths / at_risk)[keep]
+            curves[labels[int(codes[segment[0]])]] = (times[keep], surv)
+        return curves
+
+    @staticmethod
+    def survival_at(curve, horizons_s):
+        """Survival probability of a curve at each horizon (seconds)"""
+        times, surv = curve
+        idx = np.searchsorted(times, np.asarray(horizons_s, dtype=np.float64), side="right") - 1
+        return np.where(idx >= 0, surv[np.maximum(idx, 0)], 1.0)
+
+    @staticmethod
+    def median_lifetime(curve):
+        """First time the curve drops to 0.5 or below, or None"""
+        times, surv = curve
+        below = np.flatnonzero(surv <= 0.5)
+        return float(times[below[0]]) if len(below) else None
+
+
+def _typed_columns(values):
+    columns = {name: np.array(values[name], dtype=np.float64) for name in _FLOAT_FIELDS}
+    columns.update({name: np.array(values[name], dtype=np.int64) for name in _INT_FIELDS})
+    columns.update({name: np.array(values[name], dtype=bool) for name in _BOOL_FIELDS})
+    columns["latency_ms"] = np.array(values["latency_ms"], dtype=np.float32)
+    for name in ("tag", "engine_used"):
+        if name in values:
+            columns[name] = np.array(values[name], dtype=np.uint32)
+    return columns
+
+
+def _vectorized_columns(parts, col):
+    """Numeric columns from split TSV rows; ValueError if any field is irregular"""
+    def raw(name):
+        return np.array([p[col[name]] for p in parts], dtype=bytes)
+
+    def as_int(name):
+        return raw(name).astype(np.int64)
+
+    columns = {name: raw(name).astype(np.float64) for name in _FLOAT_FIELDS}
+    columns.update({name: as_int(name) for name in _INT_FIELDS})
+    columns["alive"] = as_int("alive") != 0
+    columns["telegram_only"] = (as_int("telegram_only") != 0 if "telegram_only" in col
+                                else np.zeros(len(parts), dtype=bool))
+    # loadFromDisk flags every loaded record for retest
+    columns["needs_retest"] = np.ones(len(parts), dtype=bool)
+    # stof then float storage: round the double to float32
+    columns["latency_ms"] = raw("latency_ms").astype(np.float64).astype(np.float32)
+    return columns
+
+
+def scalar_stats(records, now):
+    """ConfigDatabase::getStats, record by record in uri_hash order"""
+    s = {"total": 0, "alive": 0, "avg_latency_ms": 0.0, "tested_unique": 0,
+         "untested_unique": 0, "stale_unique": 0, "total_tested": 0, "total_passed": 0}
+    by_hash = {}
+    for rec in records:
+        by_hash.setdefault(rec.uri_hash or hash_uri(rec.uri), rec)
+    total = np.float32(0.0)
+    count = 0
+    for _, rec in sorted(by_hash.items()):
+        s["total"] += 1
+        if rec.alive:
+            s["alive"] += 1
+            if rec.latency_ms > 0:
+                total = np.float32(total + np.float32(rec.latency_ms))
+                count += 1
+        if rec.total_tests > 0:
+            s["tested_unique"] += 1
+            if (now - rec.last_tested) > STALE_THRESHOLD:
+                s["stale_unique"] += 1
+        else:
+            s["untested_unique"] += 1
+        s["total_tested"] += rec.total_tests
+        s["total_passed"] += rec.total_passes
+    if count:
+        s["avg_latency_ms"] = float(total / np.float32(count))
+    return s
+
+
+# ─── Report / benchmark ───
+
+def _label(group):
+    return "/".join(g or "-" for g in group) if isinstance(group, tuple) else (group or "-")
+
+
+def print_report(frame, now=None, by="tag"):
+    now = time.time() if now is None else now
+    s = frame.stats(now)
+    print(f"[STATS] {s['total']:,} configs, {s['alive']:,} alive, avg {s['avg_latency_ms']:.1f} ms, "
+          f"{s['tested_unique']:,} tested ({s['stale_unique']:,} stale), "
+          f"{s['untested_unique']:,} untested, {s['total_passed']:,}/{s['total_tested']:,} passes")
+
+    print(f"\n[PASS RATE] by {by}")
+    for row in frame.pass_rates(by):
+        print(f"   {_label(row['group']):28s} {row['records']:8,} records  "
+              f"pass {row['pass_rate']:6.1%}  alive {row['alive_rate']:6.1%}")
+
+    print("\n[LATENCY] alive configs by protocol/network/security")
+    for row in frame.latency_percentiles(min_count=5)[:15]:
+        pcts = "  ".join(f"p{q:g} {row[f'p{q:g}']:7.0f}" for q in DEFAULT_PERCENTILES)
+        print(f"   {_label(row['group']):28s} {row['count']:7,}  {pcts} ms")
+
+    print("\n[SURVIVAL] share of configs still alive N hours after first seen")
+    horizons = np.array(DEFAULT_HORIZONS_H, dtype=np.float64) * 3600
+    print("   " + " " * 28 + "".join(f"{h:>7g}h" for h in DEFAULT_HORIZONS_H) + "   median")
+    for label, curve in frame.survival(by, now).items():
+        at = frame.survival_at(curve, horizons)
+        median = frame.median_lifetime(curve)
+        print(f"   {_label(label):28s}" + "".join(f"{v:8.1%}" for v in at)
+              + (f"  {median / 3600:6.1f}h" if median is not None else "       -"))
+
+
+def decaying_records(count, seed=3, now=None):
+    """Synthetic snapshot records with a spread of alive lifetimes (bench and tests)"""
+    import random
+
+    import tempfile
+
+    rng = random.Random(seed)
+    now = now or time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        records = make_synthetic_snapshot(os.path.join(tmp, "seed.tsv"), count, seed, now)
+    mean_life = {"scrape": 4 * 3600, "github_bg": 10 * 3600, "harvest": 2 * 3600,
+                 "download": 6 * 3600, "manual": 20 * 3600}
+    for rec in records:
+        if rec.total_tests and not rec.alive and rng.random() < 0.5:
+            life = rng.expovariate(1.0 / mean_life[rec.tag])
+            rec.last_alive_time = min(rec.last_tested, rec.first_seen + life)
+    return records
+
+
+def run_benchmark(count=200000):
+    import tempfile
+
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "HUNTER_config_db.tsv")
+        records = decaying_records(count, now=now)
+        write_snapshot(path, records)
+        count = len(records)
+        print(f"[BENCH] {count:,} records ({os.path.getsize(path) / 1e6:.1f} MB snapshot)")
+
+        with SnapshotReader(path):
+            pass  # build the cached index once, as a long-lived install would have it
+        start = time.perf_counter()
+        frame = HealthFrame.load(path)
+        loaded = time.perf_counter()
+        frame.classify()
+        done = time.perf_counter()
+        print(f"   first load            : {(loaded - start) * 1000:7.0f} ms "
+              f"+ classify {(done - loaded) * 1000:.0f} ms (parses every URI, then cached)")
+        start = time.perf_counter()
+        frame = HealthFrame.load(path)
+        frame.classify()
+        print(f"   reload + classify     : {(time.perf_counter() - start) * 1000:7.0f} ms "
+              f"(classification from the index)")
+
+        timings = {}
+        start = time.perf_counter()
+        stats = frame.stats(now)
+        timings["getStats"] = time.perf_counter() - start
+        start = time.perf_counter()
+        tag_stats = frame.all_tag_stats()
+        timings["getTagStats (all)"] = time.perf_counter() - start
+        start = time.perf_counter()
+        frame.pass_rates("tag")
+        frame.pass_rates(("protocol", "security"))
+        timings["pass rates x2"] = time.perf_counter() - start
+        start = time.perf_counter()
+        frame.latency_percentiles()
+        timings["latency percentiles"] = time.perf_counter() - start
+        start = time.perf_counter()
+        frame.survival("tag", now)
+        timings["survival by tag"] = time.perf_counter() - start
+        for name, seconds in timings.items():
+            print(f"   {name:22s}: {seconds * 1000:7.1f} ms")
+        print(f"   all queries           : {sum(timings.values()) * 1000:7.1f} ms")
+
+        start = time.perf_counter()
+        reference = scalar_stats(records, now)
+        scalar = time.perf_counter() - start
+        assert stats == reference, (stats, reference)
+        with SnapshotReader(path) as reader:
+            for tag, ts in tag_stats.items():
+                assert ts.to_dict() == reader.tag_stats(tag).to_dict(), tag
+        print(f"   getStats matches the scalar port exactly (scalar: {scalar * 1000:.0f} ms); "
+              f"getTagStats matches SnapshotReader for {len(tag_stats)} tags")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Health analytics over ConfigDatabase snapshots")
+    parser.add_argument("snapshot", nargs="?", help="HUNTER_config_db.tsv or a JSONL export")
+    parser.add_argument("--by", default="tag",
+                        help=f"group for pass rates and survival, comma-separated from {GROUP_FIELDS}")
+    parser.add_argument("--now", type=float, help="evaluate stale/survival at this epoch time")
+    parser.add_argument("--bench", nargs="?", type=int, const=200000, metavar="RECORDS")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmark(args.bench)
+        return 0
+    if not args.snapshot:
+        parser.print_usage()
+        return 2
+    by = tuple(args.by.split(",")) if "," in args.by else args.by
+    print_report(HealthFrame.load(args.snapshot), args.now, by)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Append-only health log for ConfigDatabase
+Instead of rewriting runtime/HUNTER_config_db.tsv every ~60s, each
+updateHealth call (and each addConfigs insert) is appended as a small
+checksummed frame to the current log segment. A compactor periodically
+folds sealed segments into a new snapshot, whose header records the last
+folded segment, and a loader rebuilds the database from snapshot plus
+log tail.
+
+Segment file layout (health-<seq>.log):
+    magic   b"HHLOG1\\n"
+    frames  <u32 length><u32 crc32(payload)><payload>
+Payloads start with a kind byte:
+    UPDATE  <u64 uri_hash><f64 timestamp><f32 latency_ms><u8 flags><u8 n><engine_used[n]>
+    ADD     <f64 timestamp><u8 n><tag[n]><uri ...>
+A torn frame at the end of a segment (crash mid-write) ends replay of that
+segment and is truncated away when the segment is reopened.
+
+Run with --bench to compare write amplification and cold-load time with
+full snapshot rewrites.
+"""
+
+import argparse
+import os
+import re
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+from config_db import (ConfigHealthRecord, SnapshotReader, hash_to_int, hash_uri,
+                       parse_snapshot_line, write_snapshot)
+
+LOG_MAGIC = b"HHLOG1\n"
+SEGMENT_PATTERN = re.compile(r"health-(\d{8})\.log$")
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+DEFAULT_COMPACT_BYTES = 32 * 1024 * 1024
+DEFAULT_COMPACT_INTERVAL = 60.0
+DEFAULT_MAX_SIZE = 200000
+
+KIND_UPDATE = 1
+KIND_ADD = 2
+
+FLAG_ALIVE = 1
+FLAG_FORCE_DEAD = 2
+FLAG_TELEGRAM_ONLY = 4
+
+# ConfigDatabase::addConfigsWithPriority
+HIGH_PRIORITY_TAGS = ("manual", "import", "user_import")
+PRIORITY_BOOST_SECONDS = 1800.0
+
+_FRAME = struct.Struct("<II")
+_UPDATE = struct.Struct("<BQdfBB")
+_ADD = struct.Struct("<BdB")
+
+HealthUpdate = namedtuple("HealthUpdate", [
+    "uri_hash", "timestamp", "alive", "latency_ms", "engine_used",
+    "force_dead", "telegram_only"])
+ConfigAdd = namedtuple("ConfigAdd", ["uri", "tag", "timestamp"])
+LoadStats = namedtuple("LoadStats", [
+    "snapshot_records", "log_seq", "segments", "replayed", "skipped", "seconds"])
+
+
+def segment_name(seq):
+    return f"health-{seq:08d}.log"
+
+
+def list_segments(directory):
+    """(seq, path) for every log segment in ``directory``, oldest first"""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    found = []
+    for name in names:
+        m = SEGMENT_PATTERN.match(name)
+        if m:
+            found.append((int(m.group(1)), os.path.join(directory, name)))
+    return sorted(found)
+
+
+# ─── Encoding ───
+
+def encode_update(uri_hash, alive, latency_ms, engine_used="", timestamp=None,
+                  force_dead=False, telegram_only=False):
+    flags = ((FLAG_ALIVE if alive else 0) | (FLAG_FORCE_DEAD if force_dead else 0)
+             | (FLAG_TELEGRAM_ONLY if telegram_only else 0))
+    engine = engine_used.encode("utf-8")[:255]
+    payload = _UPDATE.pack(KIND_UPDATE, hash_to_int(uri_hash),
+                           time.time() if timestamp is None else timestamp,
+                           latency_ms, flags, len(engine)) + engine
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def encode_add(uri, tag, timestamp=None):
+    tag_bytes = tag.encode("utf-8")[:255]
+    payload = (_ADD.pack(KIND_ADD, time.time() if timestamp is None else timestamp,
+                         len(tag_bytes))
+               + tag_bytes + uri.encode("utf-8", "surrogateescape"))
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def decode_payload(payload):
+    kind = payload[0]
+    if kind == KIND_UPDATE:
+        _, value, ts, latency, flags, n = _UPDATE.unpack_from(payload)
+        engine = payload[_UPDATE.size:_UPDATE.size + n].decode("utf-8", "replace")
+        return HealthUpdate(f"{value:016x}", ts, bool(flags & FLAG_ALIVE), latency, engine,
+                            bool(flags & FLAG_FORCE_DEAD), bool(flags & FLAG_TELEGRAM_ONLY))
+    if kind == KIND_ADD:
+        _, ts, n = _ADD.unpack_from(payload)
+        tag = payload[_ADD.size:_ADD.size + n].decode("utf-8", "replace")
+        uri = payload[_ADD.size + n:].decode("utf-8", "surrogateescape")
+        return ConfigAdd(uri, tag, ts)
+    raise ValueError(f"unknown log entry kind {kind}")
+
+
+def _valid_frames(data):
+    """Yield (end_offset, payload) for each intact frame after the magic"""
+    pos = len(LOG_MAGIC)
+    end = len(data)
+    while pos + _FRAME.size <= end:
+        length, crc = _FRAME.unpack_from(data, pos)
+        start = pos + _FRAME.size
+        if length == 0 or start + length > end:
+            return
+        payload = data[start:start + length]
+        if zlib.crc32(payload) != crc:
+            return
+        pos = start + length
+        yield pos, payload
+
+
+def read_segment(path):
+    """Decode every intact entry of one segment, in append order"""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(LOG_MAGIC):
+        return []
+    entries = []
+    for _, payload in _valid_frames(data):
+        try:
+            entries.append(decode_payload(payload))
+        except (ValueError, struct.error):
+            break
+    return entries
+
+
+def _intact_length(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(LOG_MAGIC):
+        return 0
+    end = len(LOG_MAGIC)
+    for end, _ in _valid_frames(data):
+        pass
+    return end
+
+
+# ─── Replay (ConfigDatabase semantics) ───
+
+def apply_update(rec, update):
+    """ConfigDatabase::updateHealth applied to one record"""
+    rec.last_tested = update.timestamp
+    rec.total_tests += 1
+    rec.needs_retest = False
+    rec.priority_boost_until = 0.0
+    if update.engine_used:
+        rec.engine_used = update.engine_used
+    if update.alive:
+        rec.alive = True
+        rec.telegram_only = update.telegram_only
+        rec.latency_ms = update.latency_ms
+        rec.consecutive_fails = 0
+        rec.total_passes += 1
+        rec.last_alive_time = rec.last_tested
+    else:
+        if update.force_dead:
+            rec.consecutive_fails = 3
+        else:
+            rec.consecutive_fails += 1
+        if rec.consecutive_fails >= 3:
+            rec.alive = False
+            rec.telegram_only = False
+            rec.latency_ms = 0.0
+
+
+def apply_add(db, add, max_size=DEFAULT_MAX_SIZE):
+    """ConfigDatabase::addConfigsWithPriority for one URI; returns True if inserted
+
+    Stale-record eviction is not replayed: once ``max_size`` is reached new
+    URIs are dropped, as they are when evictStale frees nothing.
+    """
+    if not add.uri:
+        return False
+    uri_hash = hash_uri(add.uri)
+    high_priority = add.tag in HIGH_PRIORITY_TAGS
+    boost_until = add.timestamp + PRIORITY_BOOST_SECONDS if high_priority else 0.0
+    rec = db.get(uri_hash)
+    if rec is not None:
+        if high_priority:
+            rec.needs_retest = True
+            rec.priority_boost_until = max(rec.priority_boost_until, boost_until)
+            rec.tag = add.tag
+        return False
+    if len(db) >= max_size:
+        return False
+    rec = ConfigHealthRecord(add.uri, uri_hash, add.tag)
+    rec.first_seen = add.timestamp
+    rec.priority_boost_until = boost_until
+    db[uri_hash] = rec
+    return True
+
+
+def load_snapshot(snapshot_path):
+    """Records of a snapshot keyed by uri_hash, plus the log_seq it folds in"""
+    if not os.path.exists(snapshot_path):
+        return {}, 0
+    with SnapshotReader(snapshot_path) as reader:
+        db = {rec.uri_hash: rec for rec in reader if rec is not None}
+        log_seq = int(reader.header.get("log_seq", 0))
+    return db, log_seq
+
+
+def load_database(snapshot_path, log_dir, upto_seq=None, max_size=DEFAULT_MAX_SIZE):
+    """Rebuild the database from a snapshot and the log segments after it
+
+    Returns ``(db, LoadStats)``; ``db`` maps uri_hash to ConfigHealthRecord.
+    Updates for hashes not in the database are skipped, as updateHealth
+    ignores unknown URIs.
+    """
+    start = time.perf_counter()
+    db, log_seq = load_snapshot(snapshot_path)
+    snapshot_records = len(db)
+    replayed = skipped = segments = 0
+    for seq, path in list_segments(log_dir):
+        if seq <= log_seq or (upto_seq is not None and seq > upto_seq):
+            continue
+        segments += 1
+        for entry in read_segment(path):
+            if isinstance(entry, HealthUpdate):
+                rec = db.get(entry.uri_hash)
+                if rec is None:
+                    skipped += 1
+                    continue
+                apply_update(rec, entry)
+            else:
+                apply_add(db, entry, max_size)
+            replayed += 1
+    stats = LoadStats(snapshot_records, log_seq, segments, replayed, skipped,
+                      time.perf_counter() - start)
+    return db, stats
+
+
+# ─── Writer ───
+
+class HealthLog:
+    """Appends health deltas to the newest segment in ``directory``
+
+    Thread-safe. Frames are buffered by the file object; call ``flush``
+    (or construct with ``fsync=True`` for per-flush durability) at the
+    cadence the caller can afford to lose on a crash.
+    """
+
+    def __init__(self, directory, segment_bytes=DEFAULT_SEGMENT_BYTES, fsync=False):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.bytes_written = 0
+        self.entries_written = 0
+        self._lock = threading.Lock()
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+        segments = list_segments(directory)
+        if segments:
+            self.seq, path = segments[-1]
+            intact = _intact_length(path)
+            if intact == 0:
+                with open(path, "wb") as f:
+                    f.write(LOG_MAGIC)
+            elif intact != os.path.getsize(path):
+                with open(path, "r+b") as f:
+                    f.truncate(intact)
+            self._open(path)
+        else:
+            self.seq = 1
+            self._open(os.path.join(directory, segment_name(self.seq)))
+
+    def _open(self, path):
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(LOG_MAGIC)
+            self.bytes_written += len(LOG_MAGIC)
+        self._size = self._file.tell()
+
+    def _append(self, frame):
+        with self._lock:
+            if self._size + len(frame) > self.segment_bytes and self._size > len(LOG_MAGIC):
+                self._roll_locked()
+            self._file.write(frame)
+            self._size += len(frame)
+            self.bytes_written += len(frame)
+            self.entries_written += 1
+
+    def append_update(self, uri_hash, alive, latency_ms, engine_used="", timestamp=None,
+                      force_dead=False, telegram_only=False):
+        """Log one updateHealth call"""
+        self._append(encode_update(uri_hash, alive, latency_ms, engine_used, timestamp,
+                                   force_dead, telegram_only))
+
+    def append_add(self, uri, tag, timestamp=None):
+        """Log one URI passed to addConfigs"""
+        self._append(encode_add(uri, tag, timestamp))
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _roll_locked(self):
+        self._flush_locked()
+        self._file.close()
+        self.seq += 1
+        self._open(os.path.join(self.directory, segment_name(self.seq)))
+
+    def roll(self):
+        """Seal the current segment and start a new one; returns the sealed seq"""
+        with self._lock:
+            sealed = self.seq
+            self._roll_locked()
+            return sealed
+
+    def pending_bytes(self):
+        """Bytes in segments on disk that a compaction would fold"""
+        return sum(os.path.getsize(path) for _, path in list_segments(self.directory))
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._flush_locked()
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ─── Compaction ───
+
+def compact(snapshot_path, log, max_size=DEFAULT_MAX_SIZE):
+    """Fold every sealed segment into a new snapshot and delete the segments
+
+    Returns ``(records_written, bytes_written)``. The new snapshot is
+    renamed into place before any segment is removed, and its header names
+    the last folded segment, so a crash at any point replays each delta
+    exactly once.
+    """
+    sealed = log.roll()
+    db, _ = load_database(snapshot_path, log.directory, upto_seq=sealed, max_size=max_size)
+    written = write_snapshot(snapshot_path, db.values(), header_extra=f"log_seq={sealed}",
+                             with_index=True)
+    for seq, path in list_segments(log.directory):
+        if seq <= sealed:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return written, os.path.getsize(snapshot_path)
+
+
+class Compactor(threading.Thread):
+    """Background thread that compacts once the log outgrows ``threshold_bytes``"""
+
+    def __init__(self, snapshot_path, log, threshold_bytes=DEFAULT_COMPACT_BYTES,
+                 interval=DEFAULT_COMPACT_INTERVAL, max_size=DEFAULT_MAX_SIZE):
+        super().__init__(name="health-log-compactor", daemon=True)
+        self.snapshot_path = snapshot_path
+        self.log = log
+        self.threshold_bytes = threshold_bytes
+        self.interval = interval
+        self.max_size = max_size
+        self.compactions = 0
+        self.bytes_written = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.maybe_compact()
+
+    def maybe_compact(self):
+        self.log.flush()
+        if self.log.pending_bytes() < self.threshold_bytes:
+            return False
+        try:
+            _, size = compact(self.snapshot_path, self.log, self.max_size)
+        except OSError as e:
+            print(f"[COMPACT] failed: {e}")
+            return False
+        self.compactions += 1
+        self.bytes_written += size
+        return True
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# ─── Benchmark ───
+
+def load_full_snapshot(snapshot_path):
+    """The loadFromDisk baseline: parse and hash every line of a snapshot"""
+    db = {}
+    with open(snapshot_path, "rb") as f:
+        f.readline()
+        for line in f:
+            rec = parse_snapshot_line(line)
+            if rec is not None and rec.uri_hash not in db:
+                db[rec.uri_hash] = rec
+    return db
+
+
+def run_benchmark(count=200000, minutes=60, updates_per_minute=2000):
+    import random
+    import tempfile
+
+    from config_db import make_synthetic_snapshot
+
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as tmp:
+        full_path = os.path.join(tmp, "full", "HUNTER_config_db.tsv")
+        log_path = os.path.join(tmp, "log", "HUNTER_config_db.tsv")
+        log_dir = os.path.join(tmp, "log", "health")
+        os.makedirs(os.path.dirname(full_path))
+        os.makedirs(log_dir)
+        records = make_synthetic_snapshot(full_path, count)
+        db = {rec.uri_hash: rec for rec in records}
+        write_snapshot(log_path, records, header_extra="log_seq=0", with_index=True)
+        hashes = list(db)
+        snapshot_mb = os.path.getsize(full_path) / 1e6
+        print(f"[BENCH] {len(db):,} records ({snapshot_mb:.1f} MB snapshot), "
+              f"{minutes} min x {updates_per_minute:,} updates/min")
+
+        log = HealthLog(log_dir)
+        compactor = Compactor(log_path, log, threshold_bytes=int(snapshot_mb * 1e6 * 0.05))
+        full_bytes = 0
+        delta_bytes = 0
+        now = time.time()
+        start = time.perf_counter()
+        for minute in range(minutes):
+            for _ in range(updates_per_minute):
+                uri_hash = rng.choice(hashes)
+                alive = rng.random() < 0.2
+                update = HealthUpdate(uri_hash, now + minute * 60, alive,
+                                      rng.uniform(80, 3000) if alive else 0.0,
+                                      "xray", False, False)
+                apply_update(db[uri_hash], update)
+                log.append_update(uri_hash, update.alive, update.latency_ms,
+                                  update.engine_used, update.timestamp)
+                # Logical payload: hash, alive, latency, engine, timestamp
+                delta_bytes += 8 + 1 + 4 + len(update.engine_used) + 8
+            log.flush()
+            compactor.maybe_compact()
+            # The orchestrator rewrites the whole TSV every ~60s
+            write_snapshot(full_path, db.values())
+            full_bytes += os.path.getsize(full_path)
+        log_total = log.bytes_written + compactor.bytes_written
+        elapsed = time.perf_counter() - start
+        log.close()
+
+        print(f"   logical delta bytes  : {delta_bytes / 1e6:9.2f} MB")
+        print(f"   full rewrite / 60s   : {full_bytes / 1e6:9.2f} MB written  "
+              f"(write amplification {full_bytes / delta_bytes:8.1f}x)")
+        print(f"   log + compaction     : {log_total / 1e6:9.2f} MB written  "
+              f"(write amplification {log_total / delta_bytes:8.1f}x, "
+              f"{compactor.compactions} compactions)")
+        print(f"   simulated run        : {elapsed:.1f} s")
+
+        start = time.perf_counter()
+        full_db = load_full_snapshot(full_path)
+        full_load = time.perf_counter() - start
+        replayed_db, stats = load_database(log_path, log_dir)
+        same = (len(full_db) == len(replayed_db)
+                and all(full_db[h].total_tests == replayed_db[h].total_tests
+                        and full_db[h].alive == replayed_db[h].alive for h in full_db))
+        print(f"   cold load (full TSV) : {full_load:6.2f} s")
+        print(f"   cold load (snap+log) : {stats.seconds:6.2f} s  "
+              f"({stats.segments} segments, {stats.replayed:,} entries replayed)  match: {same}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load or compact a snapshot plus health log")
+    parser.add_argument("snapshot", nargs="?", help="saveToDisk snapshot (HUNTER_config_db.tsv)")
+    parser.add_argument("log_dir", nargs="?", default="runtime/health",
+                        help="log segment directory (default: runtime/health)")
+    parser.add_argument("--compact", action="store_true",
+                        help="fold sealed segments into the snapshot")
+    parser.add_argument("--bench", nargs="?", type=int, const=200000, metavar="COUNT")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmark(args.bench)
+        return 0
+    if args.snapshot is None:
+        parser.error("a snapshot path is required")
+
+    if args.compact:
+        # A first compaction may create the snapshot, but needs a log to fold
+        if not os.path.isdir(args.log_dir):
+            print(f"[ERROR] no log directory at {args.log_dir}")
+            return 1
+        with HealthLog(args.log_dir) as health_log:
+            written, size = compact(args.snapshot, health_log)
+        print(f"[COMPACT] {written:,} records -> {args.snapshot} ({size / 1e6:.1f} MB)")
+        return 0
+
+    if not os.path.isfile(args.snapshot):
+        print(f"[ERROR] no snapshot at {args.snapshot}")
+        return 1
+    if not os.path.isdir(args.log_dir):
+        print(f"[WARN] no log directory at {args.log_dir}; loading the snapshot alone")
+    db, stats = load_database(args.snapshot, args.log_dir)
+    print(f"[LOAD] {len(db):,} records in {stats.seconds:.2f} s "
+          f"(snapshot {stats.snapshot_records:,}, log_seq {stats.log_seq}, "
+          f"{stats.segments} segments, {stats.replayed:,} replayed, {stats.skipped:,} skipped)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the orchestrator's websocket bridge, for load tests
+Speaks the same protocol as realtime::WebSocketBridge on two loopback
+ports, with no xray, network or Windows needed:
+
+  control  performServerHandshake, then readTextFrame per command
+           (unfragmented text only; anything else closes the connection),
+           command_ack when a request_id is present, then a
+           processRealtimeCommand-shaped command_result after a latency
+           drawn per command; non-quiet commands broadcast a status event
+  monitor  a status and logs snapshot on connect, then synthetic status
+           and logs events at ``status_hz`` / ``logs_hz``, written to the
+           clients one after another like broadcastMonitorJson
+
+Status documents follow buildStatusJson (db, validator, speed, workers,
+alive_configs, ...) and carry ``ts_ms`` so clients can measure delivery
+latency. pause/resume, set_speed/set_threads/set_timeout, add_configs,
+clear_old and friends change the synthetic state.
+
+Run with --serve to keep a mock up for realtime_client.py, or --bench to
+fan events out to hundreds of MonitorClients and report throughput and
+latency percentiles.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque
+
+from realtime_client import (DEFAULT_CONTROL_PORT, DEFAULT_MONITOR_PORT, OP_TEXT,
+                             ControlClient, MonitorClient, RealtimeError, StatusEvent,
+                             accept_value, encode_frame, read_frame)
+from uri_parser import make_synthetic_uris
+
+MAX_FRAME_BYTES = 8 * 1024 * 1024
+MAX_CLIENT_BUFFER = 4 * 1024 * 1024
+LOG_RING_LINES = 200
+
+# Median response time in ms per command; jitter is lognormal around it
+COMMAND_LATENCY_MS = {
+    "ping": 0.2,
+    "get_status": 4.0,
+    "pause": 1.0,
+    "resume": 1.0,
+    "speed_profile": 2.0,
+    "set_speed": 1.0,
+    "set_threads": 1.0,
+    "set_timeout": 1.0,
+    "clear_old": 40.0,
+    "clear_alive": 20.0,
+    "remove_configs": 15.0,
+    "add_configs": 25.0,
+    "import_config_file": 400.0,
+    "export_config_db": 250.0,
+    "run_cycle": 3.0,
+    "refresh_ports": 5.0,
+    "download_configs": 5.0,
+}
+DEFAULT_LATENCY_MS = 2.0
+
+# Same fallback order as processRealtimeCommand when "command" is missing
+LEGACY_COMMANDS = ("pause", "resume", "speed_profile", "set_speed", "set_threads", "set_timeout",
+                   "clear_old", "clear_alive", "remove_configs", "add_configs",
+                   "import_config_file", "export_config_db", "run_cycle", "refresh_ports",
+                   "recheck_live_ports", "reprovision_ports", "load_raw_files",
+                   "load_bundle_files", "detect_censorship", "update_runtime_settings",
+                   "edge_router_bypass", "download_configs", "stop", "get_status", "ping")
+
+WORKER_NAMES = ("config_scanner", "github_downloader", "telegram_scraper", "health_monitor",
+                "balancer", "harvester")
+
+
+async def serve_handshake(reader, writer):
+    """Server side of the upgrade; False (connection unusable) on a bad request"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        return False
+    key = ""
+    for line in head.decode("latin-1").split("\r\n")[1:]:
+        name, sep, value = line.partition(":")
+        if sep and name.strip().lower() == "sec-websocket-key":
+            key = value.strip()
+    if not key:
+        return False
+    writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                  "Upgrade: websocket\r\n"
+                  "Connection: Upgrade\r\n"
+                  f"Sec-WebSocket-Accept: {accept_value(key)}\r\n\r\n").encode("ascii"))
+    return True
+
+
+async def read_text_frame(reader):
+    """Client text frame the way readTextFrame accepts it, else None"""
+    try:
+        fin, opcode, payload = await read_frame(reader, MAX_FRAME_BYTES)
+    except (asyncio.IncompleteReadError, RealtimeError, ConnectionError):
+        return None
+    # Unlike readTextFrame, unmasked client frames are tolerated
+    if not fin or opcode != OP_TEXT:
+        return None
+    return payload.decode("utf-8", "replace")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class _MonitorConn:
+    __slots__ = ("writer", "alive")
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.alive = True
+
+
+class MockOrchestrator:
+    """Bridge-compatible control and monitor servers over synthetic state
+
+    Ports default to 0 (ephemeral); read ``control_port`` / ``monitor_port``
+    after start(). ``latency_scale`` multiplies every command latency
+    (0 answers immediately). ``greet=False`` skips the status/logs snapshot
+    new monitor clients get (for replaying recorded events).
+    """
+
+    def __init__(self, control_port=0, monitor_port=0, host="127.0.0.1", status_hz=2.0,
+                 logs_hz=2.0, alive_configs=50, latency_scale=1.0, seed=1, greet=True):
+        self.host = host
+        self.greet = greet
+        self.control_port = control_port
+        self.monitor_port = monitor_port
+        self.status_hz = status_hz
+        self.logs_hz = logs_hz
+        self.latency_scale = latency_scale
+        self.rng = random.Random(seed)
+        self.stats = {"commands": 0, "control_clients": 0, "monitor_clients": 0,
+                      "events": 0, "frames_sent": 0, "bytes_sent": 0, "slow_clients": 0}
+        self._servers = []
+        self._tasks = []
+        self._monitors = []
+        self._seq = 0
+        self._started = time.time()
+        self._logs = deque(maxlen=LOG_RING_LINES)
+        self._uris = make_synthetic_uris(max(1, alive_configs), seed=seed)[:alive_configs]
+        self.paused = False
+        self.db = {"total": 12000, "alive": len(self._uris), "tested_unique": 4000,
+                   "untested_unique": 8000, "stale_unique": 300, "avg_latency_ms": 850.0,
+                   "total_tests": 25000, "total_passes": 1800}
+        self.speed = {"profile": "medium", "max_threads": 10, "test_timeout_s": 5, "chunk_size": 10}
+
+    # ─── Synthetic state ───
+
+    def log(self, line):
+        self._logs.append(f"[{time.strftime('%H:%M:%S')}] {line}")
+
+    def _tick(self):
+        if self.paused:
+            return
+        tested = self.rng.randint(5, 40)
+        passed = self.rng.randint(0, tested // 4)
+        db = self.db
+        db["total_tests"] += tested
+        db["total_passes"] += passed
+        db["tested_unique"] = min(db["total"], db["tested_unique"] + tested)
+        db["untested_unique"] = max(0, db["total"] - db["tested_unique"])
+        db["avg_latency_ms"] = round(0.9 * db["avg_latency_ms"] + 0.1 * self.rng.uniform(200, 2500), 1)
+        return tested, passed
+
+    def status_json(self, phase=None):
+        now = time.time()
+        self._seq += 1
+        tested, passed = self._tick() or (0, 0)
+        db = self.db
+        alive = [{"uri": uri, "latency_ms": round(self.rng.uniform(80, 1500), 1),
+                  "engine_used": "xray", "first_seen": self._started, "last_alive": now,
+                  "last_tested": now, "total_tests": 10, "total_passes": 7,
+                  "consecutive_fails": 0, "alive": True, "tag": "github"}
+                 for uri in self._uris]
+        workers = [{"name": name, "state": "sleeping" if self.paused else "running",
+                    "last_run": now, "last_error": "", "runs": self._seq}
+                   for name in WORKER_NAMES]
+        return {
+            "ts": now, "ts_ms": now * 1000.0, "seq": self._seq,
+            "phase": phase or ("paused" if self.paused else "running"),
+            "paused": self.paused, "uptime_s": now - self._started,
+            "balancer_backends": min(10, len(self._uris)),
+            "pending_unique": db["untested_unique"] + db["stale_unique"],
+            "eta_seconds": db["untested_unique"] / 20.0,
+            "db": dict(db),
+            "validator": {"last_tested": tested, "last_passed": passed, "interval_s": 30,
+                          "active_test_processes": 0 if self.paused else self.speed["max_threads"],
+                          "max_test_processes": self.speed["max_threads"], "rate_per_s": tested / 2.0},
+            "speed": dict(self.speed),
+            "workers": workers,
+            "alive_configs": alive,
+            "telegram_only_configs": [],
+            "history": [],
+            "provisioned_ports": [],
+            "balancers": [{"port": 10808, "type": "main", "running": True,
+                           "backends": min(10, len(self._uris)), "healthy": min(8, len(self._uris))}],
+        }
+
+    def make_event(self, type, payload):
+        return json.dumps({"type": type, "payload": payload}, separators=(",", ":"))
+
+    def status_event(self):
+        return self.make_event("status", self.status_json())
+
+    def logs_event(self):
+        return self.make_event("logs", {"lines": list(self._logs)})
+
+    # ─── Control channel ───
+
+    def command_latency(self, command):
+        median = COMMAND_LATENCY_MS.get(command, DEFAULT_LATENCY_MS) * self.latency_scale
+        if median <= 0:
+            return 0.0
+        return median * self.rng.lognormvariate(0.0, 0.35) / 1000.0
+
+    def parse_command(self, message):
+        """``(body, command)`` of a control message, with the legacy fallback"""
+        try:
+            body = json.loads(message)
+        except ValueError:
+            body = None
+        if not isinstance(body, dict):
+            body = {}
+        command = body.get("command") or ""
+        if not command:
+            command = next((name for name in LEGACY_COMMANDS if f'"{name}"' in message), "")
+        return body, command
+
+    def process_command(self, message, received=None):
+        """command_result JSON for one control message (processRealtimeCommand)"""
+        received = time.time() if received is None else received
+        body, command = self.parse_command(message)
+        ok, text, data = self.apply_command(command, body)
+        self.stats["commands"] += 1
+        response = {"type": "command_result", "ok": ok, "request_id": body.get("request_id", ""),
+                    "command": command, "quiet": bool(body.get("quiet", False)), "message": text,
+                    "received_ts": received, "received_ts_ms": received * 1000.0}
+        now = time.time()
+        response.update(response_ts=now, response_ts_ms=now * 1000.0, status=self.status_json())
+        if data is not None:
+            response["data"] = data
+        return json.dumps(response, separators=(",", ":"))
+
+    def apply_command(self, command, body):
+        """``(ok, message, data)`` for ``command``, updating the synthetic state"""
+        speed = self.speed
+        if command == "pause":
+            self.paused = True
+            return True, "paused", None
+        if command == "resume":
+            self.paused = False
+            return True, "resumed", None
+        if command == "speed_profile":
+            speed["profile"] = body.get("value") or "medium"
+            return True, "speed_profile_applied", None
+        if command == "set_speed":
+            threads = int(body.get("threads", speed["max_threads"]))
+            timeout = int(body.get("timeout", speed["test_timeout_s"]))
+            if not 1 <= threads <= 50:
+                return False, "invalid_threads", None
+            if not 1 <= timeout <= 10:
+                return False, "invalid_timeout", None
+            speed.update(max_threads=threads, test_timeout_s=timeout, profile="custom",
+                         chunk_size=max(1, min(50, int(body.get("chunk_size", threads)))))
+            return True, "speed_updated", None
+        if command == "set_threads":
+            value = int(body.get("value", speed["max_threads"]))
+            if not 1 <= value <= 50:
+                return False, "invalid_threads", None
+            speed.update(max_threads=value, chunk_size=value, profile="custom")
+            return True, "threads_updated", None
+        if command == "set_timeout":
+            value = int(body.get("value", speed["test_timeout_s"]))
+            if not 1 <= value <= 10:
+                return False, "invalid_timeout", None
+            speed.update(test_timeout_s=value, profile="custom")
+            return True, "timeout_updated", None
+        if command == "clear_old":
+            removed = min(self.db["stale_unique"], self.rng.randint(0, 200))
+            self.db["stale_unique"] -= removed
+            self.db["total"] -= removed
+            return True, f"cleared_{removed}", None
+        if command == "clear_alive":
+            removed, self.db["alive"] = self.db["alive"], 0
+            return True, f"alive_cleared_{removed}", None
+        if command == "remove_configs":
+            lines = [l for l in str(body.get("uris_text", "")).splitlines() if l.strip()]
+            self.db["total"] = max(0, self.db["total"] - len(lines))
+            return True, f"removed_{len(lines)}", None
+        if command == "add_configs":
+            configs = [l for l in str(body.get("configs", "")).splitlines() if "://" in l]
+            if not configs:
+                return False, "invalid_configs_payload", None
+            self.db["total"] += len(configs)
+            self.db["untested_unique"] += len(configs)
+            self.log(f"[Cmd] Added {len(configs)} manual configs")
+            return True, "configs_added", None
+        if command == "download_configs":
+            sources = body.get("sources") or []
+            self.log(f"[Orchestrator] Processing download_configs command ({len(sources)} sources)")
+            return True, "download_started", None
+        if command in ("get_status", "ping", "run_cycle", "refresh_ports", "recheck_live_ports",
+                       "reprovision_ports", "detect_censorship", "update_runtime_settings",
+                       "edge_router_bypass", "load_raw_files", "load_bundle_files",
+                       "import_config_file", "export_config_db", "stop"):
+            return True, "ok" if command != "ping" else "pong", None
+        return False, "unknown_command", None
+
+    async def _handle_control(self, reader, writer):
+        self.stats["control_clients"] += 1
+        try:
+            if not await serve_handshake(reader, writer):
+                return
+            while True:
+                message = await read_text_frame(reader)
+                if message is None:
+                    break
+                received = time.time()
+                body, command = self.parse_command(message)
+                if body.get("request_id"):
+                    writer.write(encode_frame(json.dumps(
+                        {"type": "command_ack", "request_id": body["request_id"]}), mask=False))
+                delay = self.command_latency(command)
+                if delay:
+                    await asyncio.sleep(delay)
+                response = self.process_command(message, received)
+                writer.write(encode_frame(response, mask=False))
+                await writer.drain()
+                if '"quiet":true' not in response:
+                    await self.broadcast(self.status_event())
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.stats["control_clients"] -= 1
+            writer.close()
+
+    # ─── Monitor channel ───
+
+    async def _handle_monitor(self, reader, writer):
+        if not await serve_handshake(reader, writer):
+            writer.close()
+            return
+        conn = _MonitorConn(writer)
+        self._monitors.append(conn)
+        self.stats["monitor_clients"] += 1
+        if self.greet:
+            self._send(conn, encode_frame(self.status_event(), mask=False))
+            if self._logs:
+                self._send(conn, encode_frame(self.logs_event(), mask=False))
+        try:
+            # The bridge never reads monitor sockets; this only notices EOF
+            while await reader.read(4096):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            conn.alive = False
+
+    def _send(self, conn, frame):
+        if not conn.alive:
+            return False
+        transport = conn.writer.transport
+        if transport.is_closing() or transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            # sendTextFrame would block here; treat as a failed send
+            conn.alive = False
+            self.stats["slow_clients"] += 1
+            conn.writer.close()
+            return False
+        conn.writer.write(frame)
+        self.stats["frames_sent"] += 1
+        self.stats["bytes_sent"] += len(frame)
+        return True
+
+    async def broadcast(self, event_json):
+        """broadcastMonitorJson: one frame, written to each client in turn"""
+        frame = encode_frame(event_json, mask=False)
+        self.stats["events"] += 1
+        for conn in list(self._monitors):
+            self._send(conn, frame)
+        self._monitors = [conn for conn in self._monitors if conn.alive]
+        self.stats["monitor_clients"] = len(self._monitors)
+
+    async def _emit(self, hz, make_event):
+        interval = 1.0 / hz
+        loop = asyncio.get_running_loop()
+        next_at = loop.time()
+        while True:
+            next_at += interval
+            await self.broadcast(make_event())
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
+
+    def _logs_event_with_line(self):
+        self.log(self.rng.choice((
+            "[Validator] batch tested", "[GitHub] cache refreshed", "[Balancer] backend rotated",
+            "[Harvester] source downloaded", "[DB] snapshot saved")))
+        return self.logs_event()
+
+    # ─── Lifecycle ───
+
+    async def start(self):
+        control = await asyncio.start_server(self._handle_control, self.host, self.control_port)
+        monitor = await asyncio.start_server(self._handle_monitor, self.host, self.monitor_port)
+        self._servers = [control, monitor]
+        self.control_port = control.sockets[0].getsockname()[1]
+        self.monitor_port = monitor.sockets[0].getsockname()[1]
+        if self.status_hz > 0:
+            self._tasks.append(asyncio.ensure_future(self._emit(self.status_hz, self.status_event)))
+        if self.logs_hz > 0:
+            self._tasks.append(asyncio.ensure_future(self._emit(self.logs_hz, self._logs_event_with_line)))
+        self.log("[Mock] orchestrator started")
+        return self
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for conn in self._monitors:
+            conn.writer.close()
+        self._monitors = []
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+# ─── Load test ───
+
+async def measure_fanout(target, clients=200, duration=5.0, commanders=4):
+    """Attach ``clients`` MonitorClients and ``commanders`` ControlClients to
+    ``target`` (host, control, monitor) for ``duration`` seconds
+
+    Returns a report dict: status delivery latency percentiles (ms),
+    delivered events per second, and command round-trip percentiles.
+    """
+    host, control_port, monitor_port = target
+    monitors = await asyncio.gather(*(
+        MonitorClient(host, monitor_port, reconnect=False, max_queue=1024).start()
+        for _ in range(clients)))
+    controls = [await ControlClient(host, control_port, reconnect=False).start()
+                for _ in range(commanders)]
+    latencies = []
+    round_trips = []
+    delivered = [0]
+    deadline = asyncio.get_running_loop().time() + duration
+
+    async def drain(monitor):
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                event = await monitor.get(timeout=remaining)
+            except (asyncio.TimeoutError, RealtimeError):
+                return
+            delivered[0] += 1
+            if isinstance(event, StatusEvent) and "ts_ms" in event.payload:
+                latencies.append(event.received * 1000.0 - event.payload["ts_ms"])
+
+    async def command_loop(client):
+        loop = asyncio.get_running_loop()
+        commands = ("get_status", "ping", "set_threads", "pause", "resume")
+        i = 0
+        while loop.time() < deadline:
+            command = commands[i % len(commands)]
+            i += 1
+            fields = {"value": 10} if command == "set_threads" else {}
+            try:
+                result = await client.request(command, timeout=max(0.1, deadline - loop.time()),
+                                              **fields)
+            except (asyncio.TimeoutError, RealtimeError):
+                return
+            round_trips.append(result.round_trip_s * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(drain(m) for m in monitors), *(command_loop(c) for c in controls))
+    elapsed = time.perf_counter() - started
+    dropped = sum(m.stats["dropped"] + m.stats["coalesced"] for m in monitors)
+    for client in controls + monitors:
+        await client.close()
+
+    latencies.sort()
+    round_trips.sort()
+    return {
+        "clients": clients,
+        "elapsed_s": elapsed,
+        "events_delivered": delivered[0],
+        "events_per_s": delivered[0] / elapsed if elapsed else 0.0,
+        "dropped": dropped,
+        "latency_ms": {q: percentile(latencies, q) for q in (50, 95, 99)},
+        "commands": len(round_trips),
+        "round_trip_ms": {q: percentile(round_trips, q) for q in (50, 95, 99)},
+    }
+
+
+async def _bench(clients_list, status_hz, logs_hz, duration, alive_configs):
+    for clients in clients_list:
+        async with MockOrchestrator(status_hz=status_hz, logs_hz=logs_hz,
+                                    alive_configs=alive_configs, latency_scale=1.0) as mock:
+            report = await measure_fanout(("127.0.0.1", mock.control_port, mock.monitor_port),
+                                          clients=clients, duration=duration)
+            sent_mb = mock.stats["bytes_sent"] / 1e6
+        lat = report["latency_ms"]
+        rtt = report["round_trip_ms"]
+        print(f"   {clients:4d} clients: {report['events_per_s']:9,.0f} events/s delivered, "
+              f"{sent_mb / report['elapsed_s']:6.1f} MB/s out, "
+              f"latency p50/p95/p99 {lat[50]:6.1f}/{lat[95]:6.1f}/{lat[99]:6.1f} ms, "
+              f"command rtt p50/p99 {rtt[50]:5.1f}/{rtt[99]:5.1f} ms ({report['commands']} cmds)")
+
+
+def run_benchmark(clients_list=(1, 50, 200, 500), status_hz=10.0, logs_hz=5.0, duration=3.0,
+                  alive_configs=50):
+    print(f"[BENCH] status {status_hz:g} Hz + logs {logs_hz:g} Hz, {alive_configs} alive configs "
+          f"per status, {duration:g} s per run (server and clients share one event loop)")
+    asyncio.run(_bench(clients_list, status_hz, logs_hz, duration, alive_configs))
+
+
+async def _serve(args):
+    mock = MockOrchestrator(args.control_port, args.monitor_port, status_hz=args.status_hz,
+                            logs_hz=args.logs_hz, alive_configs=args.alive_configs,
+                            latency_scale=args.latency_scale)
+    async with mock:
+        print(f"[MOCK] control ws://127.0.0.1:{mock.control_port}  "
+              f"monitor ws://127.0.0.1:{mock.monitor_port}")
+        while True:
+            await asyncio.sleep(10)
+            s = mock.stats
+            print(f"[MOCK] {s['monitor_clients']} monitors, {s['commands']} commands, "
+                  f"{s['events']} events, {s['bytes_sent'] / 1e6:.1f} MB sent")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock orchestrator websocket bridge")
+    parser.add_argument("--serve", action="store_true", help="run until interrupted")
+    parser.add_argument("--bench", action="store_true", help="monitor fan-out benchmark")
+    parser.add_argument("--control-port", type=int, default=DEFAULT_CONTROL_PORT)
+    parser.add_argument("--monitor-port", type=int, default=DEFAULT_MONITOR_PORT)
+    parser.add_argument("--status-hz", type=float, default=2.0, help="status events per second")
+    parser.add_argument("--logs-hz", type=float, default=2.0, help="logs events per second")
+    parser.add_argument("--alive-configs", type=int, default=50,
+                        help="alive_configs entries per status (controls event size)")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="multiply per-command response latencies (0 = instant)")
+    parser.add_argument("--clients", default="1,50,200,500",
+                        help="comma-separated monitor client counts for --bench")
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per bench run")
+    args = parser.parse_args()
+
+    try:
+        if args.bench:
+            run_benchmark([int(c) for c in args.clients.split(",")], args.status_hz,
+                          args.logs_hz, args.duration, args.alive_configs)
+            return 0
+        if args.serve:
+            asyncio.run(_serve(args))
+            return 0
+    except KeyboardInterrupt:
+        return 0
+    parser.print_usage()
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
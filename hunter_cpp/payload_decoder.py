@@ -0,0 +1,724 @@
+#!/usr/bin/env python3
+"""
+Format-aware decoder pipeline for subscription payloads
+Sniffs the first few KB of a payload once, picks a decoder and streams the
+rest of the body through it, yielding normalized proxy URIs:
+
+  plain   - one URI per line (the existing scanner regex)
+  base64  - a base64 subscription; the decoded text is sniffed again
+  clash   - Clash / Mihomo YAML; entries under ``proxies:`` are converted
+  json    - v2ray/xray configs (outbounds), sing-box configs, or JSON
+            lists of either; a config with no proxy outbound (e.g. the
+            v2fly template) yields nothing
+
+Decoders are push-style (``feed(chunk)`` / ``close()``) so they slot into
+the chunked download loop. New formats are added with register_decoder.
+Per-format counters record payloads, bytes, URIs and skipped entries.
+
+Run with --bench for MB/s per format on farm fixtures, or pass payload
+files to print their format and config counts.
+"""
+
+import base64
+import binascii
+import json
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from urllib.parse import quote
+
+from config_scanner import PROXY_SCHEMES, _SCHEME_LINE_RE
+
+try:
+    import yaml
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:
+    yaml = None
+
+SNIFF_BYTES = 4096
+MAX_JSON_BYTES = 64 * 1024 * 1024
+CLASH_BATCH = 256
+
+_WHITESPACE = b" \t\r\n\x0b\x0c"
+_B64_CHARS = re.compile(rb"[A-Za-z0-9+/=_\-\s]+")
+_B64_JUNK = bytes(c for c in range(256)
+                  if not (c < 128 and chr(c).isalnum()) and chr(c) not in "+/=-_")
+_URLSAFE = bytes.maketrans(b"-_", b"+/")
+_CLASH_KEY_RE = re.compile(
+    rb"(?m)^(?:proxies|proxy-groups|proxy-providers|port|mixed-port|socks-port|"
+    rb"allow-lan|mode|log-level|external-controller|dns|rules):")
+_CLASH_PROXIES_RE = re.compile(r"proxies:\s*(?:#.*)?$")
+
+Decoder = namedtuple("Decoder", ["name", "sniff", "factory"])
+DECODERS = []
+
+
+def register_decoder(name, sniff, factory, first=False):
+    """Add a format: ``sniff(head) -> bool`` on the stripped first bytes,
+    ``factory(emit, stats)`` returns an object with ``feed``/``close``
+    """
+    decoder = Decoder(name, sniff, factory)
+    if first:
+        DECODERS.insert(0, decoder)
+    else:
+        DECODERS.append(decoder)
+
+
+# ─── URI builders ───
+
+def _host(address):
+    return f"[{address}]" if ":" in address and not address.startswith("[") else address
+
+
+def _query(params):
+    return "&".join(f"{k}={quote(str(v), safe='')}" for k, v in params.items()
+                    if v not in (None, ""))
+
+
+def make_uri(protocol, address, port, secret, name="", **params):
+    """Share link for one proxy; ``secret`` is the uuid or password
+
+    Shadowsocks takes ``method`` and vmess its JSON fields from ``params``.
+    Returns None for protocols without a share-link form.
+    """
+    if not address or not port or secret in (None, ""):
+        return None
+    fragment = f"#{quote(str(name), safe='')}" if name else ""
+    host = f"{_host(address)}:{port}"
+    if protocol == "vmess":
+        body = {"v": "2", "ps": str(name), "add": address, "port": str(port),
+                "id": str(secret), "aid": "0", "scy": params.get("method") or "auto",
+                "net": params.get("type") or "tcp", "type": "none",
+                "host": params.get("host", ""), "path": params.get("path") or
+                params.get("serviceName", ""), "tls": params.get("security", ""),
+                "sni": params.get("sni", ""), "fp": params.get("fp", "")}
+        return "vmess://" + base64.b64encode(
+            json.dumps(body, separators=(",", ":")).encode()).decode()
+    if protocol in ("ss", "shadowsocks"):
+        method = params.get("method")
+        if not method:
+            return None
+        userinfo = base64.urlsafe_b64encode(f"{method}:{secret}".encode()).decode().rstrip("=")
+        return f"ss://{userinfo}@{host}{fragment}"
+    if protocol == "vless":
+        params.setdefault("encryption", "none")
+    elif protocol not in ("trojan", "hysteria2", "tuic"):
+        return None
+    params.pop("method", None)
+    query = _query(params)
+    scheme = "hy2" if protocol == "hysteria2" else protocol
+    return f"{scheme}://{quote(str(secret), safe=':')}@{host}" \
+           f"{'?' + query if query else ''}{fragment}"
+
+
+def _clash_uri(proxy):
+    """Share link for one Clash ``proxies`` entry, or None"""
+    if not isinstance(proxy, dict):
+        return None
+    kind = str(proxy.get("type", "")).lower()
+    ws = proxy.get("ws-opts") or {}
+    grpc = proxy.get("grpc-opts") or {}
+    reality = proxy.get("reality-opts") or {}
+    tls = proxy.get("tls") in (True, "true") or kind in ("trojan", "hysteria2", "tuic")
+    params = {
+        "type": proxy.get("network", "") if proxy.get("network") != "tcp" else "",
+        "security": "reality" if reality else ("tls" if tls else ""),
+        "sni": proxy.get("servername") or proxy.get("sni", ""),
+        "fp": proxy.get("client-fingerprint", ""),
+        "flow": proxy.get("flow", ""),
+        "path": ws.get("path", "") if isinstance(ws, dict) else "",
+        "host": ((ws.get("headers") or {}).get("Host", "") if isinstance(ws, dict) else ""),
+        "serviceName": grpc.get("grpc-service-name", "") if isinstance(grpc, dict) else "",
+        "pbk": reality.get("public-key", "") if isinstance(reality, dict) else "",
+        "sid": reality.get("short-id", "") if isinstance(reality, dict) else "",
+    }
+    secret = proxy.get("uuid") or proxy.get("password")
+    if kind == "ss":
+        params = {"method": proxy.get("cipher", "")}
+    elif kind == "vmess":
+        params["method"] = proxy.get("cipher", "")
+    elif kind == "tuic" and proxy.get("uuid"):
+        secret = f"{proxy['uuid']}:{proxy.get('password', '')}"
+    return make_uri(kind, str(proxy.get("server", "")), proxy.get("port"), secret,
+                    proxy.get("name", ""), **params)
+
+
+def _v2ray_uris(outbound):
+    """Share links for a v2ray/xray outbound (one per server/user)"""
+    protocol = outbound.get("protocol")
+    settings = outbound.get("settings") or {}
+    stream = outbound.get("streamSettings") or {}
+    security = stream.get("security", "")
+    tls = stream.get("tlsSettings") or {}
+    reality = stream.get("realitySettings") or {}
+    ws = stream.get("wsSettings") or {}
+    params = {
+        "type": stream.get("network", "") if stream.get("network") != "tcp" else "",
+        "security": security if security in ("tls", "reality") else "",
+        "sni": tls.get("serverName") or reality.get("serverName", ""),
+        "fp": tls.get("fingerprint") or reality.get("fingerprint", ""),
+        "pbk": reality.get("publicKey", ""),
+        "sid": reality.get("shortId", ""),
+        "path": ws.get("path", ""),
+        "host": (ws.get("headers") or {}).get("Host", ""),
+        "serviceName": (stream.get("grpcSettings") or {}).get("serviceName", ""),
+    }
+    name = outbound.get("tag", "")
+    uris = []
+    if protocol in ("vmess", "vless"):
+        for server in settings.get("vnext") or []:
+            for user in server.get("users") or []:
+                extra = {"flow": user.get("flow", "")}
+                if protocol == "vmess":
+                    extra["method"] = user.get("security", "")
+                uris.append(make_uri(protocol, server.get("address", ""), server.get("port"),
+                                     user.get("id"), name, **params, **extra))
+    elif protocol in ("trojan", "shadowsocks"):
+        for server in settings.get("servers") or []:
+            extra = {"method": server.get("method", "")} if protocol == "shadowsocks" else params
+            uris.append(make_uri(protocol, server.get("address", ""), server.get("port"),
+                                 server.get("password"), name, **extra))
+    else:
+        return None
+    return uris
+
+
+def _singbox_uri(outbound):
+    kind = outbound.get("type")
+    tls = outbound.get("tls") or {}
+    reality = tls.get("reality") or {}
+    transport = outbound.get("transport") or {}
+    params = {
+        "type": transport.get("type", ""),
+        "security": "reality" if reality.get("enabled") else ("tls" if tls.get("enabled") else ""),
+        "sni": tls.get("server_name", ""),
+        "fp": (tls.get("utls") or {}).get("fingerprint", ""),
+        "pbk": reality.get("public_key", ""),
+        "sid": reality.get("short_id", ""),
+        "flow": outbound.get("flow", ""),
+        "path": transport.get("path", ""),
+        "host": (transport.get("headers") or {}).get("Host", ""),
+        "serviceName": transport.get("service_name", ""),
+    }
+    secret = outbound.get("uuid") or outbound.get("password")
+    if kind == "shadowsocks":
+        params = {"method": outbound.get("method", "")}
+    elif kind == "vmess":
+        params["method"] = outbound.get("security", "")
+    elif kind == "tuic" and outbound.get("uuid"):
+        secret = f"{outbound['uuid']}:{outbound.get('password', '')}"
+    elif kind not in ("vless", "trojan", "hysteria2"):
+        return None
+    return make_uri(kind, outbound.get("server", ""), outbound.get("server_port"), secret,
+                    outbound.get("tag", ""), **params)
+
+
+# ─── Decoders ───
+
+class PlainDecoder:
+    """One URI per line; only the unfinished last line is carried over"""
+
+    def __init__(self, emit, stats):
+        self.emit = emit
+        self.stats = stats
+        self._tail = b""
+
+    def _lines(self, block):
+        for m in _SCHEME_LINE_RE.finditer(block):
+            if m.group(2).decode("ascii").lower() in PROXY_SCHEMES:
+                self.emit(m.group(1).strip().decode("utf-8", "surrogateescape"))
+
+    def feed(self, chunk):
+        buffer = self._tail + chunk
+        cut = buffer.rfind(b"\n")
+        if cut == -1:
+            self._tail = buffer
+            return
+        self._tail = buffer[cut + 1:]
+        self._lines(buffer[:cut + 1])
+
+    def close(self):
+        if self._tail:
+            self._lines(self._tail)
+        self._tail = b""
+
+
+class Base64Decoder:
+    """Decodes 4-character groups as they arrive and re-sniffs the text"""
+
+    def __init__(self, emit, stats):
+        self.inner = PayloadDecoder(uri_sink=emit, stats=stats, prefix="base64/")
+        self.stats = stats
+        self._pending = b""
+        self._started = False
+        self._done = False
+        self._failed = False
+
+    def _decode(self, data):
+        try:
+            self.inner.feed(binascii.a2b_base64(data))
+        except binascii.Error:
+            self.stats["errors"] += 1
+            self._done = self._failed = True
+
+    def feed(self, chunk):
+        if self._done:
+            return
+        if not self._started:
+            # The first chunk holds the whole sniffed head, BOM included
+            self._started = True
+            chunk = chunk.lstrip(_WHITESPACE)
+            if chunk.startswith(b"\xef\xbb\xbf"):
+                chunk = chunk[3:]
+        data = self._pending + chunk.translate(None, _B64_JUNK).translate(_URLSAFE)
+        # Like utils::base64Decode, decoding stops at the first '='
+        eq = data.find(b"=")
+        if eq != -1:
+            data = data[:eq]
+            self._done = True
+        usable = len(data) - len(data) % 4
+        self._pending = data[usable:]
+        if usable:
+            self._decode(data[:usable])
+
+    def close(self):
+        rest = self._pending
+        if len(rest) % 4 == 1:
+            rest = rest[:-1]
+        if rest and not self._failed:
+            self._decode(rest + b"=" * (-len(rest) % 4))
+        self._pending = b""
+        self.inner.close()
+
+
+_FLOW_TOKEN_RE = re.compile(
+    r"""\s*(?:"([^"\\]*)"|'([^']*)'|([{}\[\],])|([^,{}\[\]"'\s](?:[^,{}\[\]:]|:(?!\s))*))""")
+_FLOW_KEY_RE = re.compile(r"\s*:\s*")
+_BLOCK_LINE_RE = re.compile(r"( *)([^\s:#'\"][^:#]*?|\"[^\"]*\"|'[^']*'):(?:[ \t]+(.*))?$")
+_BOOLS = {"true": True, "yes": True, "on": True, "false": False, "no": False, "off": False}
+
+
+def _yaml_scalar(raw):
+    """SafeLoader-style resolution of the plain scalars Clash files use"""
+    lower = raw.lower()
+    if lower in _BOOLS:
+        return _BOOLS[lower]
+    if lower in ("", "~", "null"):
+        return None
+    if raw.isdigit() or (raw[:1] in "+-" and raw[1:].isdigit()):
+        return int(raw)
+    return raw
+
+
+def _parse_flow(text, pos=0):
+    """Parse a one-line flow mapping/sequence; ValueError on anything unusual"""
+    def value(pos):
+        m = _FLOW_TOKEN_RE.match(text, pos)
+        if not m:
+            raise ValueError(text)
+        if m.group(3) == "{":
+            result = {}
+            pos = m.end()
+            while True:
+                m = _FLOW_TOKEN_RE.match(text, pos)
+                if m and m.group(3) == "}":
+                    return result, m.end()
+                key, pos = value(pos)
+                colon = _FLOW_KEY_RE.match(text, pos)
+                if not colon or text[pos:colon.end()].strip() != ":":
+                    raise ValueError(text)
+                result[key], pos = value(colon.end())
+                m = _FLOW_TOKEN_RE.match(text, pos)
+                if m and m.group(3) == ",":
+                    pos = m.end()
+                elif not (m and m.group(3) == "}"):
+                    raise ValueError(text)
+        if m.group(3) == "[":
+            result = []
+            pos = m.end()
+            while True:
+                m = _FLOW_TOKEN_RE.match(text, pos)
+                if m and m.group(3) == "]":
+                    return result, m.end()
+                item, pos = value(pos)
+                result.append(item)
+                m = _FLOW_TOKEN_RE.match(text, pos)
+                if m and m.group(3) == ",":
+                    pos = m.end()
+                elif not (m and m.group(3) == "]"):
+                    raise ValueError(text)
+        if m.group(3):
+            raise ValueError(text)
+        if m.group(1) is not None:
+            return m.group(1), m.end()
+        if m.group(2) is not None:
+            return m.group(2), m.end()
+        return _yaml_scalar(m.group(4).strip()), m.end()
+
+    result, pos = value(pos)
+    if text[pos:].strip():
+        raise ValueError(text)
+    return result
+
+
+def _block_value(raw):
+    raw = raw.strip()
+    if raw[:1] in ("{", "["):
+        return _parse_flow(raw)
+    if raw[:1] in ("|", ">", "&", "*", "!"):
+        raise ValueError(raw)
+    if raw[:1] == '"':
+        if raw[-1:] != '"' or "\\" in raw or len(raw) < 2:
+            raise ValueError(raw)
+        return raw[1:-1]
+    if raw[:1] == "'":
+        if raw[-1:] != "'" or len(raw) < 2:
+            raise ValueError(raw)
+        return raw[1:-1].replace("''", "'")
+    hash_mark = raw.find(" #")
+    if hash_mark != -1:
+        raw = raw[:hash_mark].rstrip()
+    return _yaml_scalar(raw)
+
+
+def _parse_clash_item(lines):
+    """Fast path for one ``- ...`` list item (block or flow mapping)
+
+    Covers what subscription files contain: scalars, nested mappings and
+    flow collections. Anything else (block lists, anchors, multi-line
+    strings) raises ValueError and the item goes to the YAML loader.
+    """
+    first = lines[0][1:].lstrip(" ")
+    if first[:1] == "{":
+        if len(lines) > 1:
+            raise ValueError(first)
+        return _parse_flow(first)
+    root = {}
+    stack = [(len(lines[0]) - len(first), root)]
+    lines = [" " * stack[0][0] + first] + lines[1:]
+    pending = None
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        m = _BLOCK_LINE_RE.match(line)
+        if not m:
+            raise ValueError(line)
+        indent, key, raw = len(m.group(1)), m.group(2), m.group(3)
+        if key[:1] in ("'", '"'):
+            key = key[1:-1]
+        if pending is not None:
+            if indent > stack[-1][0]:
+                stack.append((indent, pending[0][pending[1]]))
+            else:
+                pending[0][pending[1]] = None
+            pending = None
+        while stack and indent < stack[-1][0]:
+            stack.pop()
+        if not stack or indent != stack[-1][0]:
+            raise ValueError(line)
+        target = stack[-1][1]
+        if raw is None or not raw.strip() or raw.lstrip().startswith("#"):
+            target[key] = {}
+            pending = (target, key)
+        else:
+            target[key] = _block_value(raw)
+    if pending is not None:
+        pending[0][pending[1]] = None
+    return root
+
+
+class ClashDecoder:
+    """Streams the ``proxies:`` list; entries go through _parse_clash_item,
+    falling back to the YAML loader in batches
+    """
+
+    def __init__(self, emit, stats):
+        self.emit = emit
+        self.stats = stats
+        self._tail = b""
+        self._in_proxies = False
+        self._indent = None
+        self._items = []
+
+    def _entry(self, entry):
+        uri = _clash_uri(entry)
+        if uri:
+            self.emit(uri)
+        else:
+            self.stats["skipped"] += 1
+
+    def _flush(self):
+        entries = []
+        fallback = []
+        for item in self._items:
+            try:
+                entries.append(_parse_clash_item(item))
+            except ValueError:
+                fallback.append(len(entries))
+                entries.append("\n".join(item))
+        self._items = []
+        if fallback and yaml is None:
+            self.stats["skipped"] += len(fallback)
+            entries = [e for i, e in enumerate(entries) if i not in set(fallback)]
+        elif fallback:
+            try:
+                loaded = yaml.load("\n".join(entries[i] for i in fallback), Loader=_YamlLoader)
+            except yaml.YAMLError:
+                loaded = None
+            if not isinstance(loaded, list) or len(loaded) != len(fallback):
+                self.stats["errors"] += 1
+                loaded = [None] * len(fallback)
+            for i, entry in zip(fallback, loaded):
+                entries[i] = entry
+        for entry in entries:
+            self._entry(entry)
+
+    def _line(self, line):
+        stripped = line.lstrip(" ")
+        if not stripped or stripped.startswith("#"):
+            return
+        indent = len(line) - len(stripped)
+        if not self._in_proxies:
+            if indent == 0 and _CLASH_PROXIES_RE.match(stripped):
+                self._in_proxies = True
+            return
+        if self._indent is None:
+            if not stripped.startswith("-"):
+                self._in_proxies = indent > 0
+                return
+            self._indent = indent
+        if indent < self._indent or (indent == self._indent and not stripped.startswith("-")):
+            self._flush()
+            self._in_proxies = False
+            self._indent = None
+            if indent == 0 and _CLASH_PROXIES_RE.match(stripped):
+                self._in_proxies = True
+            return
+        if indent == self._indent:
+            if len(self._items) >= CLASH_BATCH:
+                self._flush()
+            self._items.append([line[indent:]])
+        elif self._items:
+            self._items[-1].append(line[self._indent:])
+
+    def feed(self, chunk):
+        buffer = self._tail + chunk
+        cut = buffer.rfind(b"\n")
+        if cut == -1:
+            self._tail = buffer
+            return
+        self._tail = buffer[cut + 1:]
+        for line in buffer[:cut].decode("utf-8", "replace").split("\n"):
+            self._line(line.rstrip("\r"))
+
+    def close(self):
+        if self._tail:
+            self._line(self._tail.decode("utf-8", "replace").rstrip("\r"))
+        self._tail = b""
+        self._flush()
+
+
+class JsonDecoder:
+    """Whole-document JSON: v2ray/xray and sing-box outbounds, Clash-in-JSON"""
+
+    def __init__(self, emit, stats):
+        self.emit = emit
+        self.stats = stats
+        self._parts = []
+        self._size = 0
+
+    def feed(self, chunk):
+        self._size += len(chunk)
+        if self._size <= MAX_JSON_BYTES:
+            self._parts.append(chunk)
+
+    def close(self):
+        if self._size > MAX_JSON_BYTES:
+            self.stats["errors"] += 1
+            return
+        try:
+            doc = json.loads(b"".join(self._parts))
+        except (ValueError, UnicodeDecodeError):
+            self.stats["errors"] += 1
+            return
+        self._parts = []
+        for config in doc if isinstance(doc, list) else [doc]:
+            if isinstance(config, dict):
+                self._config(config)
+
+    def _config(self, config):
+        for outbound in config.get("outbounds") or []:
+            if not isinstance(outbound, dict):
+                continue
+            if "protocol" in outbound:
+                uris = _v2ray_uris(outbound)
+            else:
+                uri = _singbox_uri(outbound)
+                uris = None if uri is None else [uri]
+            if uris is None:
+                continue    # freedom, blackhole, direct, selector, dns ...
+            for uri in uris:
+                if uri:
+                    self.emit(uri)
+                else:
+                    self.stats["skipped"] += 1
+        for proxy in config.get("proxies") or []:
+            uri = _clash_uri(proxy)
+            if uri:
+                self.emit(uri)
+            else:
+                self.stats["skipped"] += 1
+
+
+def _sniff_json(head):
+    return head[:1] in (b"{", b"[")
+
+
+def _sniff_clash(head):
+    return _CLASH_KEY_RE.search(head) is not None and b"://" not in head[:512]
+
+
+def _sniff_base64(head):
+    sample = head[:1024]
+    return (len(sample.translate(None, _WHITESPACE)) >= 16 and b"://" not in sample
+            and _B64_CHARS.fullmatch(sample) is not None)
+
+
+register_decoder("json", _sniff_json, JsonDecoder)
+register_decoder("clash", _sniff_clash, ClashDecoder)
+register_decoder("base64", _sniff_base64, Base64Decoder)
+register_decoder("plain", lambda head: True, PlainDecoder)
+
+
+class PayloadDecoder:
+    """Sniff once, then stream a payload through the matching decoder
+
+    ``uri_sink`` receives every normalized URI; ``stats`` (a dict of
+    per-format Counters, shared across payloads if passed in) counts
+    ``payloads``, ``bytes``, ``uris``, ``skipped`` and ``errors``.
+    """
+
+    def __init__(self, uri_sink=None, stats=None, prefix=""):
+        self.uri_sink = uri_sink
+        self.stats = stats if stats is not None else {}
+        self.prefix = prefix
+        self.uris = 0
+        self._format = None
+        self._decoder = None
+        self._head = b""
+
+    @property
+    def format(self):
+        """Detected format; nested formats read e.g. ``base64/clash``"""
+        inner = getattr(self._decoder, "inner", None)
+        if inner is not None and inner.format is not None:
+            return inner.format
+        return self._format
+
+    def _emit(self, uri):
+        self.uris += 1
+        self._counters["uris"] += 1
+        if self.uri_sink is not None:
+            self.uri_sink(uri)
+
+    def _start(self, data):
+        head = data.lstrip(_WHITESPACE)
+        if head.startswith(b"\xef\xbb\xbf"):
+            head = head[3:].lstrip(_WHITESPACE)
+        decoder = next(d for d in DECODERS if d.sniff(head[:SNIFF_BYTES]))
+        self._format = self.prefix + decoder.name
+        self._counters = self.stats.setdefault(self._format, Counter())
+        self._counters["payloads"] += 1
+        self._decoder = decoder.factory(self._emit, self._counters)
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        if self._decoder is None:
+            self._head += chunk
+            if len(self._head.lstrip(_WHITESPACE)) < SNIFF_BYTES:
+                return
+            chunk, self._head = self._head, b""
+            self._start(chunk)
+        self._counters["bytes"] += len(chunk)
+        self._decoder.feed(chunk)
+
+    def close(self):
+        if self._decoder is None:
+            if not self._head.strip(_WHITESPACE):
+                self._format = self.prefix + "empty"
+                self.stats.setdefault(self._format, Counter())["payloads"] += 1
+                return self
+            head, self._head = self._head, b""
+            self._start(head)
+            self._counters["bytes"] += len(head)
+            self._decoder.feed(head)
+        self._decoder.close()
+        return self
+
+
+def decode_payload(content, stats=None):
+    """``(format, uris)`` for a complete payload"""
+    uris = []
+    decoder = PayloadDecoder(uri_sink=uris.append, stats=stats)
+    decoder.feed(content if isinstance(content, bytes) else content.encode("utf-8"))
+    decoder.close()
+    return decoder.format, uris
+
+
+def decode_uris(content):
+    """Normalized proxy URIs in any supported payload format"""
+    return decode_payload(content)[1]
+
+
+def decode_verdict(decoder):
+    """``(is_valid, message)`` from what a PayloadDecoder extracted"""
+    if decoder.uris:
+        return True, f"Valid {decoder.format} payload with {decoder.uris} configs"
+    if decoder.format.endswith("empty"):
+        return False, "Content too short or empty"
+    return False, f"No proxy configs in {decoder.format} payload"
+
+
+def print_stats(stats):
+    for name in sorted(stats):
+        c = stats[name]
+        print(f"   {name:14s} {c['payloads']:4d} payloads {c['bytes'] / 1e6:8.2f} MB "
+              f"{c['uris']:9,} URIs {c['skipped']:6,} skipped {c['errors']:3d} errors")
+
+
+def run_benchmark(size_kb=4096):
+    from config_scanner import is_valid_config_content, scan_config_content
+    from source_farm import FIXTURE_KINDS, make_fixture
+
+    print(f"[BENCH] {size_kb} KB fixture per format")
+    for kind in FIXTURE_KINDS:
+        payload = make_fixture(kind, 0, size_kb)
+        start = time.perf_counter()
+        fmt, uris = decode_payload(payload)
+        elapsed = time.perf_counter() - start
+        old_count = scan_config_content(payload).config_count
+        old_valid = is_valid_config_content(payload)[0]
+        print(f"   {kind:7s} -> {fmt:13s} {len(uris):8,} URIs "
+              f"{len(payload) / elapsed / 1e6:6.1f} MB/s  "
+              f"(scanner: {old_count:,} configs, valid={old_valid})")
+
+    template = json.dumps({"log": {}, "inbounds": [{"protocol": "socks", "port": 1080}],
+                           "outbounds": [{"protocol": "freedom"}, {"protocol": "blackhole"}]})
+    print(f"   v2fly template -> {len(decode_uris(template))} URIs "
+          f"(scanner: valid={is_valid_config_content(template)[0]})")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        run_benchmark(*(int(x) for x in sys.argv[2:3]))
+    elif len(sys.argv) > 1:
+        stats = {}
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                fmt, uris = decode_payload(f.read(), stats)
+            print(f"{len(uris):9,} {fmt:14s} {path}")
+        print_stats(stats)
+    else:
+        print("Usage: payload_decoder.py --bench [SIZE_KB] | payload_decoder.py <payload> ...")
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+Proxy-port rotation for source downloads
+The Python side of AggressiveHarvester's proxy handling: where direct
+access to the source hosts is blocked, downloads go through the local
+SOCKS/HTTP inbounds the running engines expose (10808, 10809, ...).
+probe() checks every port concurrently (TCP connect plus a SOCKS5 or
+HTTP CONNECT handshake) like probeAlivePorts; instead of
+nextProxyPort's plain round robin each request then goes to the alive
+port with the best measured throughput per request in flight, so a slow
+or overloaded engine gets less work. Every port keeps its own pooled
+FetchSession.
+
+Only the proxy's own faults count against a port: after a transport
+error the port is re-probed, and if it no longer completes the handshake
+the request is retried on the next best port; after three such failures
+in a row the port is dropped until the next probe. HTTP answers (a 5xx
+from the origin, the proxy's 502 for a dead source) and errors behind a
+proxy that still answers are returned to the caller without failover,
+so dead sources cannot take the ports down. With ``direct=True`` a
+request that no port could serve falls back to a direct download, as
+fetchOneSource does. stats() / print_stats() report requests, success
+rate, bytes and throughput per port.
+
+socks5h:// ports need PySocks (requests' SOCKS support); without it a
+pool with SOCKS ports refuses to start instead of probing them alive and
+failing every download. http:// ports work without it. Run with --bench
+to download the local source farm through stub proxies of different
+speeds.
+"""
+
+import argparse
+import http.client
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+
+try:
+    import socks  # noqa: F401  (enables requests' socks5h:// proxies)
+except ImportError:
+    socks = None
+
+from fetch_session import DEFAULT_CHUNK_SIZE, FetchSession
+
+DEFAULT_PROXY_PORTS = (10808, 10809, 11808, 11809, 9250, 1080, 2080, 7890)
+DEFAULT_HOST = "127.0.0.1"
+PROBE_TIMEOUT = 1.0           # isPortAlive(p, 1000)
+REPROBE_INTERVAL = 60.0
+MAX_PORT_FAILURES = 3
+THROUGHPUT_ALPHA = 0.3
+DIRECT = "direct"
+
+
+def parse_ports(text, scheme="socks5h"):
+    """``"10808,http:10809,7890"`` -> ``[("socks5h", 10808), ("http", 10809), ...]``"""
+    ports = []
+    for item in filter(None, (part.strip() for part in str(text).split(","))):
+        kind, _, port = item.rpartition(":")
+        ports.append((kind or scheme, int(port)))
+    return ports
+
+
+def probe_port(host, port, scheme, timeout=PROBE_TIMEOUT):
+    """Handshake latency in ms, or None if the port is not a working proxy
+
+    SOCKS ports must answer a no-auth SOCKS5 greeting; HTTP ports must
+    answer a request (any status line counts).
+    """
+    started = time.perf_counter()
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.settimeout(timeout)
+            if scheme.startswith("socks"):
+                sock.sendall(b"\x05\x01\x00")
+                if sock.recv(2) != b"\x05\x00":
+                    return None
+            else:
+                sock.sendall(b"OPTIONS * HTTP/1.1\r\nHost: probe\r\nConnection: close\r\n\r\n")
+                if not sock.recv(16).startswith(b"HTTP/"):
+                    return None
+    except OSError:
+        return None
+    return (time.perf_counter() - started) * 1000.0
+
+
+class ProxyPort:
+    """One local proxy inbound and its download statistics"""
+
+    __slots__ = ("scheme", "port", "alive", "latency_ms", "requests", "ok", "failed",
+                 "consecutive_failures", "bytes", "seconds", "throughput", "in_flight",
+                 "session")
+
+    def __init__(self, scheme, port):
+        self.scheme = scheme
+        self.port = port
+        self.alive = False
+        self.latency_ms = None
+        self.requests = 0
+        self.ok = 0
+        self.failed = 0
+        self.consecutive_failures = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.throughput = None        # bytes/s, exponentially weighted
+        self.in_flight = 0
+        self.session = None
+
+    @property
+    def name(self):
+        return DIRECT if self.port is None else f"{self.scheme}:{self.port}"
+
+    def to_dict(self):
+        return {"port": self.name, "alive": self.alive, "latency_ms": self.latency_ms,
+                "requests": self.requests, "ok": self.ok, "failed": self.failed,
+                "bytes": self.bytes, "seconds": round(self.seconds, 3),
+                "throughput": self.bytes / self.seconds if self.seconds else 0.0}
+
+
+class ProxyPool:
+    """Spreads downloads over alive local proxy ports by measured throughput
+
+    ``ports`` is a list of ``(scheme, port)`` or bare ints (``scheme``
+    applies). Has the FetchSession ``fetch`` / ``iter_chunks`` interface,
+    so it can stand in for the shared session.
+    """
+
+    def __init__(self, ports=DEFAULT_PROXY_PORTS, scheme="socks5h", host=DEFAULT_HOST,
+                 direct=False, per_host=4, probe_timeout=PROBE_TIMEOUT,
+                 reprobe_interval=REPROBE_INTERVAL, max_failures=MAX_PORT_FAILURES,
+                 attempts=2):
+        self.host = host
+        self.ports = []
+        for item in ports:
+            kind, port = item if isinstance(item, tuple) else (scheme, item)
+            if all(p.port != port for p in self.ports):
+                self.ports.append(ProxyPort(kind, port))
+        missing = [p.name for p in self.ports if p.scheme.startswith("socks") and socks is None]
+        if missing:
+            raise RuntimeError(f"{', '.join(missing)}: SOCKS proxies need PySocks "
+                               "(pip install pysocks), or list HTTP inbounds as http:PORT")
+        self.direct = ProxyPort("", None)
+        self.direct.alive = bool(direct)
+        self.per_host = per_host
+        self.probe_timeout = probe_timeout
+        self.reprobe_interval = reprobe_interval
+        self.max_failures = max_failures
+        self.attempts = max(1, attempts)
+        self.last_probe = 0.0
+        self._lock = threading.Lock()
+
+    # ─── Health ───
+
+    def probe(self):
+        """Probe every port concurrently; returns the alive ones"""
+        with ThreadPoolExecutor(max_workers=max(1, len(self.ports))) as pool:
+            latencies = list(pool.map(
+                lambda p: probe_port(self.host, p.port, p.scheme, self.probe_timeout), self.ports))
+        with self._lock:
+            for port, latency in zip(self.ports, latencies):
+                port.alive = latency is not None
+                port.latency_ms = latency
+                if port.alive:
+                    port.consecutive_failures = 0
+            self.last_probe = time.monotonic()
+            return [p for p in self.ports if p.alive]
+
+    def alive_ports(self):
+        with self._lock:
+            return [p for p in self.ports if p.alive]
+
+    def _session(self, port):
+        if port.session is None:
+            proxy = None if port.port is None else f"{port.scheme}://{self.host}:{port.port}"
+            port.session = FetchSession(per_host=self.per_host, proxy=proxy)
+        return port.session
+
+    # ─── Selection ───
+
+    def _pick(self, exclude):
+        """Alive port with the best throughput per request in flight
+
+        Ports without a measurement yet come first, so each gets tried.
+        """
+        if self.reprobe_interval and time.monotonic() - self.last_probe > self.reprobe_interval:
+            self.probe()
+        with self._lock:
+            candidates = [p for p in self.ports if p.alive and p not in exclude]
+            if not candidates:
+                return None
+            known = [p.throughput for p in candidates if p.throughput]
+            default = max(known) if known else 1.0
+
+            def score(p):
+                if p.throughput is None and p.requests == 0:
+                    return float("inf") if p.in_flight == 0 else default / (p.in_flight + 1)
+                return (p.throughput or default * 0.1) / (p.in_flight + 1)
+
+            best = max(candidates, key=score)
+            best.in_flight += 1
+            best.requests += 1
+            return best
+
+    def _begin_direct(self):
+        with self._lock:
+            self.direct.in_flight += 1
+            self.direct.requests += 1
+        return self.direct
+
+    def _proxy_at_fault(self, port, error):
+        """Whether a transport error lies with the proxy rather than the origin
+
+        HTTP errors are answers, so never. Otherwise the port is probed
+        again: a proxy that still completes the handshake passed the
+        request on, and the origin is the one that refused or stalled.
+        """
+        if port.port is None or isinstance(error, requests.exceptions.HTTPError):
+            return False
+        return probe_port(self.host, port.port, port.scheme, self.probe_timeout) is None
+
+    def _finish(self, port, ok, size=None, seconds=0.0):
+        """Record one request; ``size=None`` means no body to measure"""
+        with self._lock:
+            port.in_flight -= 1
+            if ok:
+                port.ok += 1
+                port.consecutive_failures = 0
+                if size is None:
+                    return
+                port.bytes += size
+                port.seconds += seconds
+                rate = size / max(seconds, 1e-6)
+                port.throughput = rate if port.throughput is None else (
+                    (1 - THROUGHPUT_ALPHA) * port.throughput + THROUGHPUT_ALPHA * rate)
+            else:
+                port.failed += 1
+                port.consecutive_failures += 1
+                if port.port is not None and port.consecutive_failures >= self.max_failures:
+                    port.alive = False
+
+    def _routes(self):
+        """Ports to try for one request: the best ``attempts``, then direct"""
+        tried = []
+        while len(tried) < self.attempts:
+            port = self._pick(tried)
+            if port is None:
+                break
+            tried.append(port)
+            yield port
+        if self.direct.alive:
+            yield self._begin_direct()
+
+    # ─── FetchSession interface ───
+
+    def fetch(self, url, timeout=30, headers=None):
+        """Download ``url`` through the best port (status not checked)
+
+        HTTP errors are returned as responses. A transport error moves on to
+        the next port only when the proxy itself stopped answering; origin
+        errors are raised at once. Raises the last error when no route worked.
+        """
+        error = None
+        for port in self._routes():
+            started = time.perf_counter()
+            try:
+                response = self._session(port).fetch(url, timeout=timeout, headers=headers)
+            except requests.exceptions.RequestException as e:
+                if not self._proxy_at_fault(port, e):
+                    self._finish(port, True)
+                    raise
+                self._finish(port, False)
+                error = e
+                continue
+            size = len(response.content) if response.status_code < 400 else None
+            self._finish(port, True, size, time.perf_counter() - started)
+            return response
+        raise error or requests.exceptions.ConnectionError("No alive proxy port")
+
+    def iter_chunks(self, url, timeout=30, chunk_size=DEFAULT_CHUNK_SIZE, headers=None,
+                    meta=None):
+        """Stream ``url`` through the best port
+
+        Only a connection the proxy could not serve is failed over; HTTP
+        and origin errors are raised, and once the first chunk has arrived
+        the download stays on its port.
+        """
+        error = None
+        for port in self._routes():
+            started = time.perf_counter()
+            size = 0
+            chunks = self._session(port).iter_chunks(url, timeout=timeout, chunk_size=chunk_size,
+                                                     headers=headers, meta=meta)
+            try:
+                for chunk in chunks:
+                    size += len(chunk)
+                    yield chunk
+            except requests.exceptions.RequestException as e:
+                at_fault = self._proxy_at_fault(port, e)
+                self._finish(port, not at_fault)
+                if size or not at_fault:
+                    raise
+                error = e
+                continue
+            except BaseException:
+                self._finish(port, True, size, time.perf_counter() - started)
+                raise
+            finally:
+                chunks.close()
+            self._finish(port, True, size, time.perf_counter() - started)
+            return
+        raise error or requests.exceptions.ConnectionError("No alive proxy port")
+
+    # ─── Reporting ───
+
+    def stats(self):
+        with self._lock:
+            ports = self.ports + ([self.direct] if self.direct.requests else [])
+            return [p.to_dict() for p in ports]
+
+    def print_stats(self):
+        print(f"[PROXY] {len(self.alive_ports())}/{len(self.ports)} ports alive")
+        for s in self.stats():
+            latency = f"{s['latency_ms']:6.1f}ms" if s["latency_ms"] is not None else "     -  "
+            rate = s["ok"] / s["requests"] * 100 if s["requests"] else 0.0
+            print(f"   {s['port']:>15s} {'UP  ' if s['alive'] else 'DOWN'} {latency} "
+                  f"{s['requests']:5d} req {rate:5.1f}% ok {s['bytes'] / 1e6:8.2f} MB "
+                  f"{s['throughput'] / 1e6:6.2f} MB/s")
+
+    def close(self):
+        for port in self.ports + [self.direct]:
+            if port.session is not None:
+                port.session.close()
+                port.session = None
+
+
+# ─── Stub proxies (tests and benchmark) ───
+
+class StubProxy:
+    """Local HTTP forward proxy with a bandwidth cap, for tests and --bench
+
+    ``rate`` caps the relayed body in bytes/s (None = unlimited);
+    ``fail`` is None, "error" (502 for everything) or "hang" (accepts and
+    never answers).
+    """
+
+    def __init__(self, rate=None, fail=None, chunk_size=16 * 1024):
+        self.rate = rate
+        self.fail = fail
+        self.chunk_size = chunk_size
+        self.requests = 0
+        self._stopping = threading.Event()
+        self._server = None
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_OPTIONS(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                stub.requests += 1
+                if stub.fail == "hang":
+                    stub._stopping.wait(60)
+                    return
+                if stub.fail == "error":
+                    self.send_error(502)
+                    return
+                target = urlsplit(self.path)
+                upstream = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=30)
+                try:
+                    path = target.path + (f"?{target.query}" if target.query else "")
+                    upstream.request("GET", path, headers={"Accept-Encoding": "identity"})
+                    response = upstream.getresponse()
+                    body = response.read()
+                except OSError:
+                    self.send_error(502)
+                    return
+                finally:
+                    upstream.close()
+                self.send_response(response.status)
+                self.send_header("Content-Type", response.getheader("Content-Type", "text/plain"))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for start in range(0, len(body), stub.chunk_size):
+                    chunk = body[start:start + stub.chunk_size]
+                    self.wfile.write(chunk)
+                    if stub.rate:
+                        time.sleep(len(chunk) / stub.rate)
+
+        self._server = ThreadingHTTPServer((DEFAULT_HOST, 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind((DEFAULT_HOST, 0))
+        return sock.getsockname()[1]
+
+
+def run_benchmark(sources=32, payload_kb=256):
+    from source_farm import SourceFarm
+    from source_fetcher import fetch_sources
+
+    rates = [4e6, 2e6, 0.5e6]
+    stubs = [StubProxy(rate).start() for rate in rates]
+    dead = _free_port()
+    try:
+        with SourceFarm(sources, payload_kb) as farm:
+            urls = farm.urls()
+            print(f"[BENCH] {len(urls)} farm sources x {payload_kb} KB through stub proxies "
+                  f"of {', '.join(f'{r / 1e6:g}' for r in rates)} MB/s, one dying after "
+                  f"the probe, one closed port")
+            for label in ("round robin", "throughput"):
+                dying = StubProxy().start()
+                ports = [("http", s.port) for s in stubs] + [("http", dying.port), ("http", dead)]
+                pool = ProxyPool(ports, reprobe_interval=0)
+                alive = pool.probe()
+                dying.stop()
+                if label == "round robin":
+                    counter = iter(range(1 << 30))
+
+                    def fetch_one(url, timeout=30):
+                        # nextProxyPort: alive_ports_[idx++ % size], no failover
+                        port = alive[next(counter) % len(alive)]
+                        response = pool._session(port).fetch(url, timeout=timeout)
+                        response.raise_for_status()
+                        return True, len(response.content), port.name, 0
+                else:
+                    def fetch_one(url, timeout=30):
+                        response = pool.fetch(url, timeout=timeout)
+                        response.raise_for_status()
+                        return True, len(response.content), "ok", 0
+
+                start = time.perf_counter()
+                results = fetch_sources(urls, fetch_one, concurrency=8, per_host=8,
+                                        host_interval=0)
+                elapsed = time.perf_counter() - start
+                ok = sum(r[0] for r in results)
+                print(f"   {label:11s}: {ok}/{len(urls)} ok in {elapsed:5.2f}s "
+                      f"({sum(r[1] for r in results) / elapsed / 1e6:.2f} MB/s)")
+                if label == "throughput":
+                    pool.print_stats()
+                pool.close()
+    finally:
+        for stub in stubs:
+            stub.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Probe local proxy ports and show their stats")
+    parser.add_argument("ports", nargs="?", type=parse_ports,
+                        help="comma-separated ports, e.g. 10808,http:10809 "
+                             "(default: the harvester's port list)")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--bench", action="store_true",
+                        help="download the source farm through stub proxies")
+    parser.add_argument("--sources", type=int, default=32, help="farm sources for --bench")
+    parser.add_argument("--size", type=int, default=256, metavar="KB",
+                        help="payload size for --bench")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmark(args.sources, args.size)
+        return 0
+
+    try:
+        pool = ProxyPool(args.ports or DEFAULT_PROXY_PORTS, host=args.host)
+    except RuntimeError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    pool.probe()
+    pool.print_stats()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
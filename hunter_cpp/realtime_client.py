@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+"""
+Asyncio client for the realtime websocket channels of the orchestrator
+realtime::WebSocketBridge listens on two loopback ports (15491 control,
+15492 monitor by default). The control channel takes one JSON command per
+text frame, answers ``command_ack`` when the command carries a
+``request_id`` and then the ``command_result`` built by
+processRealtimeCommand. The monitor channel only broadcasts events in the
+makeEvent shape ``{"type": ..., "payload": ...}``: ``status`` (the
+buildStatusJson document), ``logs`` (the recent log ring) and extras such
+as ``discovery_log``.
+
+The framing is the small RFC 6455 subset the bridge speaks (unfragmented
+text frames, masked from the client), implemented here on asyncio streams
+so no websocket package is needed.
+
+  ControlClient  - request() correlates results by request_id; commands
+                   are pipelined on one connection (the bridge answers
+                   them in order) and the connection is re-opened with
+                   backoff when it drops
+  MonitorClient  - async iterator of typed events; a bounded buffer keeps
+                   only the newest status/logs snapshot when the consumer
+                   falls behind, or pauses reading (overflow="block")
+  Orchestrator   - both channels of one instance; command_many fans a
+                   command out to many instances at once
+
+Run ``realtime_client.py get_status`` to send a command, or ``--watch`` to
+print monitor events. Repeat ``--target`` to address several instances.
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import os
+import struct
+import sys
+import time
+from collections import deque
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_CONTROL_PORT = 15491
+DEFAULT_MONITOR_PORT = 15492
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_MAX_QUEUE = 256
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+RECONNECT_MIN = 0.2
+RECONNECT_MAX = 10.0
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_CONT, OP_TEXT, OP_BINARY, OP_CLOSE, OP_PING, OP_PONG = 0x0, 0x1, 0x2, 0x8, 0x9, 0xA
+
+# Events that carry a full snapshot, so an older queued one can be dropped
+SNAPSHOT_EVENTS = ("status", "logs")
+
+
+class RealtimeError(ConnectionError):
+    """Connection to a bridge channel failed or was lost"""
+
+
+# ─── Framing ───
+
+def accept_value(key):
+    """Sec-WebSocket-Accept for a Sec-WebSocket-Key (httpWebSocketAcceptValue)"""
+    digest = hashlib.sha1((key + WS_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def encode_frame(payload, opcode=OP_TEXT, mask=True):
+    """One FIN frame; clients must mask, the bridge sends unmasked frames"""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, (0x80 if mask else 0) | length)
+    elif length <= 0xFFFF:
+        header = struct.pack("!BBH", 0x80 | opcode, (0x80 if mask else 0) | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, (0x80 if mask else 0) | 127, length)
+    if not mask:
+        return header + payload
+    key = os.urandom(4)
+    if length:
+        # XOR the whole payload against the repeated key in one int op
+        repeated = (key * (length // 4 + 1))[:length]
+        payload = (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+    return header + key + payload
+
+
+async def read_frame(reader, max_bytes=MAX_FRAME_BYTES):
+    """``(fin, opcode, payload)`` of the next frame, unmasking if needed"""
+    b0, b1 = await reader.readexactly(2)
+    length = b1 & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", await reader.readexactly(8))[0]
+    if length > max_bytes:
+        raise RealtimeError(f"frame of {length} bytes exceeds {max_bytes}")
+    key = await reader.readexactly(4) if b1 & 0x80 else None
+    payload = await reader.readexactly(length)
+    if key and length:
+        repeated = (key * (length // 4 + 1))[:length]
+        payload = (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+    return bool(b0 & 0x80), b0 & 0x0F, payload
+
+
+async def read_message(reader, writer, mask=True):
+    """Text of the next data message, answering pings; None on close"""
+    parts = []
+    while True:
+        fin, opcode, payload = await read_frame(reader)
+        if opcode == OP_PING:
+            writer.write(encode_frame(payload, OP_PONG, mask=mask))
+            continue
+        if opcode == OP_PONG:
+            continue
+        if opcode == OP_CLOSE:
+            return None
+        parts.append(payload)
+        if fin:
+            return b"".join(parts).decode("utf-8", "replace")
+
+
+async def open_websocket(host, port, path="/", timeout=DEFAULT_TIMEOUT):
+    """Connect and perform the client side of performServerHandshake"""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write((f"GET {path} HTTP/1.1\r\n"
+                  f"Host: {host}:{port}\r\n"
+                  "Upgrade: websocket\r\n"
+                  "Connection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\n"
+                  "Sec-WebSocket-Version: 13\r\n\r\n").encode("ascii"))
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError) as e:
+        writer.close()
+        raise RealtimeError(f"handshake with {host}:{port} failed: {e!r}") from e
+    lines = head.decode("latin-1").split("\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    if " 101 " not in lines[0] + " " or headers.get("sec-websocket-accept") != accept_value(key):
+        writer.close()
+        raise RealtimeError(f"handshake with {host}:{port} rejected: {lines[0]}")
+    return reader, writer
+
+
+# ─── Typed events ───
+
+class MonitorEvent:
+    """Monitor event with no dedicated decoder"""
+
+    __slots__ = ("type", "payload", "received")
+
+    def __init__(self, type, payload, received=None):
+        self.type = type
+        self.payload = payload
+        self.received = time.time() if received is None else received
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(type={self.type!r})"
+
+
+class DbStats:
+    """The ``db`` block of a status document (ConfigDatabase::getStats)"""
+
+    __slots__ = ("total", "alive", "tested_unique", "untested_unique", "stale_unique",
+                 "avg_latency_ms", "total_tests", "total_passes")
+
+    def __init__(self, data=None):
+        data = data or {}
+        for name in self.__slots__:
+            setattr(self, name, data.get(name, 0))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class StatusEvent(MonitorEvent):
+    """``status`` event: the buildStatusJson document with typed top-level fields"""
+
+    __slots__ = ("ts", "phase", "paused", "uptime_s", "pending_unique", "eta_seconds",
+                 "balancer_backends", "db", "validator", "speed", "workers")
+
+    def __init__(self, payload, received=None):
+        super().__init__("status", payload, received)
+        self.ts = float(payload.get("ts", 0.0))
+        self.phase = payload.get("phase", "")
+        self.paused = bool(payload.get("paused", False))
+        self.uptime_s = float(payload.get("uptime_s", 0.0))
+        self.pending_unique = int(payload.get("pending_unique", 0))
+        self.eta_seconds = float(payload.get("eta_seconds", 0.0))
+        self.balancer_backends = int(payload.get("balancer_backends", 0))
+        self.db = DbStats(payload.get("db"))
+        self.validator = payload.get("validator") or {}
+        self.speed = payload.get("speed") or {}
+        self.workers = payload.get("workers") or []
+
+    def __repr__(self):
+        return (f"StatusEvent(phase={self.phase!r}, paused={self.paused}, "
+                f"db_total={self.db.total}, db_alive={self.db.alive})")
+
+
+class LogsEvent(MonitorEvent):
+    """``logs`` event: the recent log lines (makeLogEvent)"""
+
+    __slots__ = ("lines",)
+
+    def __init__(self, payload, received=None):
+        super().__init__("logs", payload, received)
+        self.lines = [line for line in payload.get("lines", []) if isinstance(line, str)]
+
+    def __repr__(self):
+        return f"LogsEvent({len(self.lines)} lines)"
+
+
+EVENT_TYPES = {}
+
+
+def register_event(type, factory):
+    """Decode monitor events of ``type`` with ``factory(payload, received)``"""
+    EVENT_TYPES[type] = factory
+
+
+register_event("status", StatusEvent)
+register_event("logs", LogsEvent)
+
+
+def decode_event(text, received=None):
+    """Typed event for one monitor message, or None if it is not an event"""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or "type" not in data:
+        return None
+    payload = data.get("payload")
+    if not isinstance(payload, dict):
+        payload = {} if payload is None else {"value": payload}
+    factory = EVENT_TYPES.get(data["type"])
+    if factory is None:
+        return MonitorEvent(data["type"], payload, received)
+    return factory(payload, received)
+
+
+class CommandResult:
+    """A ``command_result`` from processRealtimeCommand"""
+
+    __slots__ = ("ok", "request_id", "command", "message", "quiet", "received_ts",
+                 "response_ts", "status", "data", "round_trip_s", "raw")
+
+    def __init__(self, raw, round_trip_s=0.0):
+        self.raw = raw
+        self.ok = bool(raw.get("ok", False))
+        self.request_id = raw.get("request_id", "")
+        self.command = raw.get("command", "")
+        self.message = raw.get("message", "")
+        self.quiet = bool(raw.get("quiet", False))
+        self.received_ts = float(raw.get("received_ts", 0.0))
+        self.response_ts = float(raw.get("response_ts", 0.0))
+        status = raw.get("status")
+        self.status = StatusEvent(status) if isinstance(status, dict) else None
+        self.data = raw.get("data")
+        self.round_trip_s = round_trip_s
+
+    def __repr__(self):
+        return (f"CommandResult(command={self.command!r}, ok={self.ok}, "
+                f"message={self.message!r}, round_trip_s={self.round_trip_s:.3f})")
+
+
+# ─── Channels ───
+
+def _backoff(attempt):
+    return min(RECONNECT_MAX, RECONNECT_MIN * (2 ** attempt))
+
+
+class _Channel:
+    """One bridge connection that is re-opened with backoff when it drops"""
+
+    def __init__(self, host, port, reconnect=True, timeout=DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.reconnect = reconnect
+        self.timeout = timeout
+        self.stats = {"connects": 0, "disconnects": 0, "frames_in": 0, "frames_out": 0}
+        self._writer = None
+        self._connected = asyncio.Event()
+        self._closing = False
+        self._task = None
+        self.last_error = None
+
+    @property
+    def connected(self):
+        return self._connected.is_set()
+
+    async def start(self):
+        """Connect once (raising on failure), then keep the connection up"""
+        if self._task is None:
+            reader, writer = await open_websocket(self.host, self.port, timeout=self.timeout)
+            self._task = asyncio.ensure_future(self._run(reader, writer))
+        return self
+
+    async def wait_connected(self, timeout=None):
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+        except asyncio.TimeoutError:
+            raise RealtimeError(f"{self.host}:{self.port} not connected: {self.last_error!r}") from None
+
+    async def _run(self, reader, writer):
+        attempt = 0
+        while True:
+            if reader is None:
+                try:
+                    reader, writer = await open_websocket(self.host, self.port, timeout=self.timeout)
+                except (OSError, RealtimeError, asyncio.TimeoutError) as e:
+                    self.last_error = e
+                    if not self.reconnect or self._closing:
+                        break
+                    await asyncio.sleep(_backoff(attempt))
+                    attempt += 1
+                    continue
+            attempt = 0
+            self._writer = writer
+            self.stats["connects"] += 1
+            self._connected.set()
+            try:
+                await self._on_connect()
+                while True:
+                    text = await read_message(reader, writer)
+                    if text is None:
+                        break
+                    self.stats["frames_in"] += 1
+                    await self._on_message(text)
+            except (OSError, asyncio.IncompleteReadError, RealtimeError) as e:
+                self.last_error = e
+            finally:
+                self._connected.clear()
+                self._writer = None
+                writer.close()
+                self.stats["disconnects"] += 1
+                self._on_disconnect()
+            reader = writer = None
+            if not self.reconnect or self._closing:
+                break
+        self._on_closed()
+
+    async def send(self, text):
+        if self._writer is None:
+            raise RealtimeError(f"{self.host}:{self.port} is not connected")
+        self._writer.write(encode_frame(text))
+        self.stats["frames_out"] += 1
+        await self._writer.drain()
+
+    async def close(self):
+        self._closing = True
+        writer = self._writer
+        if writer is not None:
+            try:
+                writer.write(encode_frame(b"", OP_CLOSE))
+            except Exception:
+                pass
+            writer.close()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+            self._on_closed()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _on_connect(self):
+        pass
+
+    async def _on_message(self, text):
+        pass
+
+    def _on_disconnect(self):
+        pass
+
+    def _on_closed(self):
+        pass
+
+
+class ControlClient(_Channel):
+    """Control channel: ``await client.request("pause")`` -> CommandResult
+
+    Every command gets a unique ``request_id``; the bridge echoes it in
+    ``command_ack`` and processRealtimeCommand in ``command_result``.
+    Commands still waiting when the connection drops fail with
+    RealtimeError and are not re-sent (they may already have run).
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_CONTROL_PORT, reconnect=True,
+                 timeout=DEFAULT_TIMEOUT, client_id=None):
+        super().__init__(host, port, reconnect, timeout)
+        self.client_id = client_id or f"py{os.getpid()}-{next(self._ids)}"
+        self._seq = itertools.count(1)
+        self._pending = {}
+        self._order = deque()
+        self.stats.update({"requests": 0, "acks": 0, "results": 0, "failed": 0})
+
+    async def request(self, command, timeout=None, **fields):
+        """Send ``command`` with extra JSON ``fields`` and await its result"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        await self.wait_connected(timeout)
+        request_id = f"{self.client_id}-{next(self._seq)}"
+        body = dict(fields, command=command, request_id=request_id)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = [future, time.monotonic(), None]
+        self._order.append(request_id)
+        self.stats["requests"] += 1
+        try:
+            await self.send(json.dumps(body))
+            remaining = max(0.0, deadline - time.monotonic())
+            return await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            # A late result for a timed-out request is simply dropped
+            self._pending.pop(request_id, None)
+
+    async def _on_message(self, text):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return
+        if not isinstance(data, dict):
+            return
+        request_id = data.get("request_id", "")
+        if data.get("type") == "command_ack":
+            entry = self._pending.get(request_id)
+            if entry is not None:
+                entry[2] = time.monotonic()
+                self.stats["acks"] += 1
+            return
+        if data.get("type") != "command_result":
+            return
+        entry = self._pending.get(request_id)
+        if entry is None and not request_id:
+            # The bridge answers in order, so an id-less result is the oldest
+            entry = next((self._pending[rid] for rid in self._order
+                          if rid in self._pending and not self._pending[rid][0].done()), None)
+        while self._order and (self._order[0] not in self._pending
+                               or self._pending[self._order[0]][0].done()):
+            self._order.popleft()
+        if entry is None or entry[0].done():
+            return
+        self.stats["results"] += 1
+        entry[0].set_result(CommandResult(data, time.monotonic() - entry[1]))
+
+    def _on_disconnect(self):
+        lost = RealtimeError(f"{self.host}:{self.port} closed with commands in flight")
+        for future, _, _ in self._pending.values():
+            if not future.done():
+                self.stats["failed"] += 1
+                future.set_exception(lost)
+                # Mark retrieved so an abandoned request doesn't log a warning
+                future.exception()
+        self._order.clear()
+
+    def _on_closed(self):
+        self._on_disconnect()
+
+
+class MonitorClient(_Channel):
+    """Monitor channel as an async iterator of typed events
+
+    Events are buffered up to ``max_queue``. When the consumer falls
+    behind, ``overflow="latest"`` drops queued events of the same snapshot
+    type (status/logs carry full state, so only intermediate frames are
+    lost) and otherwise drops the oldest event;
+    ``overflow="block"`` stops reading instead, pushing the backlog into
+    the TCP window. Note the bridge writes to monitor clients one after
+    another, so a blocked client delays everyone else's events too.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_MONITOR_PORT, reconnect=True,
+                 timeout=DEFAULT_TIMEOUT, max_queue=DEFAULT_MAX_QUEUE, overflow="latest",
+                 types=None):
+        if overflow not in ("latest", "block"):
+            raise ValueError(f"unknown overflow policy: {overflow}")
+        super().__init__(host, port, reconnect, timeout)
+        self.max_queue = max(1, max_queue)
+        self.overflow = overflow
+        self.types = set(types) if types else None
+        self.latest = {}
+        self._queue = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._done = False
+        self.stats.update({"events": 0, "coalesced": 0, "dropped": 0, "undecoded": 0})
+
+    async def _on_message(self, text):
+        event = decode_event(text)
+        if event is None:
+            self.stats["undecoded"] += 1
+            return
+        self.stats["events"] += 1
+        self.latest[event.type] = event
+        if self.types is not None and event.type not in self.types:
+            return
+        if len(self._queue) >= self.max_queue:
+            if self.overflow == "block":
+                while len(self._queue) >= self.max_queue:
+                    self._space.clear()
+                    await self._space.wait()
+            elif not self._coalesce(event):
+                self._queue.popleft()
+                self.stats["dropped"] += 1
+        self._queue.append(event)
+        self._ready.set()
+
+    def _coalesce(self, event):
+        """Drop queued snapshots the new event supersedes; True if any were"""
+        if event.type not in SNAPSHOT_EVENTS:
+            return False
+        kept = deque(queued for queued in self._queue if queued.type != event.type)
+        superseded = len(self._queue) - len(kept)
+        self._queue = kept
+        self.stats["coalesced"] += superseded
+        return superseded > 0
+
+    def _on_closed(self):
+        self._done = True
+        self._ready.set()
+
+    async def get(self, timeout=None):
+        """Next event; raises RealtimeError once the channel is closed for good"""
+        while not self._queue:
+            if self._done:
+                raise RealtimeError(f"{self.host}:{self.port} monitor closed: {self.last_error!r}")
+            self._ready.clear()
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        event = self._queue.popleft()
+        self._space.set()
+        return event
+
+    def pending(self):
+        return len(self._queue)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.get()
+        except RealtimeError:
+            raise StopAsyncIteration from None
+
+
+class Orchestrator:
+    """Control and monitor channels of one orchestrator instance"""
+
+    def __init__(self, host=DEFAULT_HOST, control_port=DEFAULT_CONTROL_PORT,
+                 monitor_port=None, monitor=True, **kwargs):
+        monitor_kwargs = {k: kwargs.pop(k) for k in ("max_queue", "overflow", "types") if k in kwargs}
+        self.name = f"{host}:{control_port}"
+        self.control = ControlClient(host, control_port, **kwargs)
+        self.monitor = None
+        if monitor:
+            port = control_port + 1 if monitor_port is None else monitor_port
+            self.monitor = MonitorClient(host, port, **dict(kwargs, **monitor_kwargs))
+
+    async def start(self):
+        await self.control.start()
+        if self.monitor is not None:
+            await self.monitor.start()
+        return self
+
+    async def close(self):
+        await self.control.close()
+        if self.monitor is not None:
+            await self.monitor.close()
+
+    async def request(self, command, **fields):
+        return await self.control.request(command, **fields)
+
+    def status(self):
+        """Newest status event seen on the monitor channel, if any"""
+        return self.monitor.latest.get("status") if self.monitor is not None else None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+def parse_target(spec):
+    """``host:control[:monitor]`` or a bare port -> (host, control, monitor)"""
+    parts = spec.rsplit(":", 2) if spec.count(":") >= 1 else [spec]
+    if len(parts) == 1:
+        host, control, monitor = DEFAULT_HOST, int(parts[0]), None
+    elif len(parts) == 2:
+        host, control, monitor = parts[0], int(parts[1]), None
+    else:
+        host, control, monitor = parts[0], int(parts[1]), int(parts[2])
+    return host or DEFAULT_HOST, control, control + 1 if monitor is None else monitor
+
+
+async def connect_many(targets, **kwargs):
+    """Start an Orchestrator per ``(host, control, monitor)`` target
+
+    Returns ``(clients, errors)``; targets that could not be reached are
+    reported in ``errors`` as ``(target, exception)`` instead of raising.
+    """
+    clients = [Orchestrator(host, control, monitor, **kwargs) for host, control, monitor in targets]
+    results = await asyncio.gather(*(c.start() for c in clients), return_exceptions=True)
+    started, errors = [], []
+    for target, client, result in zip(targets, clients, results):
+        if isinstance(result, BaseException):
+            await client.close()
+            errors.append((target, result))
+        else:
+            started.append(client)
+    return started, errors
+
+
+async def command_many(clients, command, timeout=None, **fields):
+    """Send one command to every client concurrently
+
+    Returns a list in client order of CommandResult or the exception that
+    request raised.
+    """
+    return await asyncio.gather(
+        *(c.request(command, timeout=timeout, **fields) for c in clients),
+        return_exceptions=True)
+
+
+# ─── CLI ───
+
+def _parse_fields(items):
+    fields = {}
+    for item in items or ():
+        key, _, value = item.partition("=")
+        try:
+            fields[key] = json.loads(value)
+        except ValueError:
+            fields[key] = value
+    return fields
+
+
+async def _run_command(targets, command, fields, timeout):
+    clients, errors = await connect_many(targets, monitor=False, reconnect=False, timeout=timeout)
+    for target, error in errors:
+        print(f"[FAIL] {target[0]}:{target[1]} {error}")
+    try:
+        results = await command_many(clients, command, timeout=timeout, **fields)
+        for client, result in zip(clients, results):
+            if isinstance(result, BaseException):
+                print(f"[FAIL] {client.name} {result!r}")
+            else:
+                print(f"[{'OK' if result.ok else 'FAIL'}] {client.name} {result.command}: "
+                      f"{result.message} ({result.round_trip_s * 1000:.1f} ms)")
+                if result.data is not None:
+                    print(json.dumps(result.data, indent=2))
+        return 0 if clients and all(isinstance(r, CommandResult) and r.ok for r in results) else 1
+    finally:
+        for client in clients:
+            await client.close()
+
+
+async def _watch(targets, types, timeout):
+    clients, errors = await connect_many(targets, types=types, timeout=timeout)
+    for target, error in errors:
+        print(f"[FAIL] {target[0]}:{target[2]} {error}")
+    if not clients:
+        return 1
+
+    async def pump(client):
+        async for event in client.monitor:
+            if isinstance(event, LogsEvent):
+                tail = event.lines[-1] if event.lines else ""
+                print(f"[{client.name}] logs {len(event.lines)} lines: {tail}")
+            else:
+                print(f"[{client.name}] {event!r}")
+
+    try:
+        await asyncio.gather(*(pump(c) for c in clients))
+    finally:
+        for client in clients:
+            await client.close()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Talk to orchestrator websocket channels")
+    parser.add_argument("command", nargs="?", help="control command, e.g. get_status, pause")
+    parser.add_argument("-f", "--field", action="append", metavar="KEY=VALUE",
+                        help="extra command field; VALUE is parsed as JSON when possible")
+    parser.add_argument("-t", "--target", action="append", metavar="HOST:CONTROL[:MONITOR]",
+                        help=f"orchestrator to address (default: {DEFAULT_HOST}:"
+                             f"{DEFAULT_CONTROL_PORT}:{DEFAULT_MONITOR_PORT}); repeatable")
+    parser.add_argument("--watch", action="store_true", help="print monitor events")
+    parser.add_argument("--types", help="comma-separated event types to watch")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    args = parser.parse_args()
+
+    specs = args.target or [f"{DEFAULT_HOST}:{DEFAULT_CONTROL_PORT}:{DEFAULT_MONITOR_PORT}"]
+    targets = [parse_target(spec) for spec in specs]
+    try:
+        if args.watch:
+            types = args.types.split(",") if args.types else None
+            return asyncio.run(_watch(targets, types, args.timeout))
+        if not args.command:
+            parser.print_usage()
+            return 2
+        return asyncio.run(_run_command(targets, args.command, _parse_fields(args.field),
+                                        args.timeout))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
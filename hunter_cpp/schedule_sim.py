@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+Discrete-event simulator for the background validation schedule
+Replays a ConfigDatabase snapshot through ConfigDatabase::getUntestedBatch
+and ContinuousValidator::validateBatch as the ValidatorWorker drives them,
+against a synthetic ground truth of which configs are really up and how
+fast they are, so scheduling policies can be compared offline:
+
+  ValidatorWorker      every interval_s after the previous batch finished
+  validateBatch        getUntestedBatch(min(batch_size, 50)), tested in
+                       chunks of max_concurrent; a chunk lasts as long as
+                       its slowest test, results are applied in order
+  getUntestedBatch     boosted first, then priority 0 never tested,
+                       1 needs_retest, 2 alive and stale > 30 s, 3 failed
+                       and past its 60 s / 5 min / 30 min backoff; fewer
+                       total_tests first
+  updateHealth         3 consecutive failures mark a config dead
+
+std::sort leaves ties unordered; the simulator breaks them in uri_hash
+(std::map) order. New configs arrive in bursts like harvest cycles; tags
+in HIGH_PRIORITY_TAGS get the 30 min priority boost of
+addConfigsWithPriority. Arrivals beyond max_size are dropped (evictStale
+is not modelled).
+
+Reported per policy: tests/s, share of tests spent on configs that were
+really down, time from arrival to first test and to first pass (when the
+config can reach the balancer), how often alive configs are rechecked,
+how long a dead config stays marked alive, and how many of the marked
+alive configs are really down.
+
+Run with a snapshot path (or --synthetic N) and --policy all to compare
+the shipped policy with the alternatives in POLICIES.
+"""
+
+import argparse
+import heapq
+import sys
+import time
+
+import numpy as np
+
+from config_db import make_synthetic_snapshot
+from health_analytics import HealthFrame
+
+HIGH_PRIORITY_TAGS = ("manual", "import", "user_import")
+PRIORITY_BOOST_S = 1800.0
+ALIVE_RECHECK_S = 30.0
+MAX_VALIDATE_BATCH = 50
+DEFAULT_ARRIVAL_TAGS = (("scrape", 0.4), ("github_bg", 0.3), ("harvest", 0.2),
+                        ("download", 0.08), ("manual", 0.02))
+NEVER = np.inf
+
+
+def failure_backoff(consecutive_fails):
+    """getUntestedBatch backoff for failed configs (seconds)"""
+    return np.where(consecutive_fails >= 10, 1800.0,
+                    np.where(consecutive_fails >= 5, 300.0, 60.0))
+
+
+class SimDatabase:
+    """ConfigDatabase state as columns, one row per config
+
+    Rows for configs that arrive during the run exist from the start with
+    ``present`` False until their arrival time. ``rank`` is the row's
+    position in uri_hash order.
+    """
+
+    COLUMNS = ("first_seen", "priority_boost_until", "last_tested", "last_alive_time",
+               "alive", "latency_ms", "consecutive_fails", "total_tests", "total_passes",
+               "needs_retest", "present", "arrival")
+
+    def __init__(self, hashes, tags, columns):
+        self.hashes = hashes
+        self.tags = tags
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+        self.rank = np.empty(len(hashes), dtype=np.int64)
+        self.rank[np.argsort(hashes, kind="stable")] = np.arange(len(hashes))
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @classmethod
+    def from_frame(cls, frame, restart=True):
+        """Initial state from a HealthFrame; ``restart`` flags every row for
+        retest like loadFromDisk"""
+        n = len(frame)
+        columns = {
+            "first_seen": frame.first_seen.copy(),
+            "priority_boost_until": np.zeros(n),
+            "last_tested": frame.last_tested.copy(),
+            "last_alive_time": frame.last_alive_time.copy(),
+            "alive": frame.alive.copy(),
+            "latency_ms": frame.latency_ms.astype(np.float64),
+            "consecutive_fails": frame.consecutive_fails.copy(),
+            "total_tests": frame.total_tests.copy(),
+            "total_passes": frame.total_passes.copy(),
+            "needs_retest": np.ones(n, dtype=bool) if restart else frame.needs_retest.copy(),
+            "present": np.ones(n, dtype=bool),
+            "arrival": np.full(n, -NEVER),
+        }
+        tags = np.array(frame.vocabs["tag"].values, dtype=object)[frame.columns["tag"]]
+        return cls(frame.hashes.copy(), tags, columns)
+
+    def with_arrivals(self, arrival_times, tags, rng):
+        """A new database with future rows appended (random uri_hash each)"""
+        n = len(arrival_times)
+        hashes = rng.integers(0, 2 ** 63, size=n, dtype=np.int64).astype(np.uint64) * np.uint64(2)
+        columns = {name: getattr(self, name) for name in self.COLUMNS}
+        extra = {
+            "first_seen": np.zeros(n), "priority_boost_until": np.zeros(n),
+            "last_tested": np.zeros(n), "last_alive_time": np.zeros(n),
+            "alive": np.zeros(n, dtype=bool), "latency_ms": np.zeros(n),
+            "consecutive_fails": np.zeros(n, dtype=np.int64),
+            "total_tests": np.zeros(n, dtype=np.int64),
+            "total_passes": np.zeros(n, dtype=np.int64),
+            "needs_retest": np.zeros(n, dtype=bool), "present": np.zeros(n, dtype=bool),
+            "arrival": np.asarray(arrival_times, dtype=np.float64),
+        }
+        merged = {name: np.concatenate([columns[name], extra[name]]) for name in self.COLUMNS}
+        return SimDatabase(np.concatenate([self.hashes, hashes]),
+                           np.concatenate([self.tags, np.asarray(tags, dtype=object)]), merged)
+
+    def copy(self):
+        return SimDatabase(self.hashes, self.tags,
+                           {name: getattr(self, name).copy() for name in self.COLUMNS})
+
+    def size(self):
+        return int(self.present.sum())
+
+    def add(self, rows, now):
+        """addConfigsWithPriority for rows arriving at ``now``"""
+        self.present[rows] = True
+        self.first_seen[rows] = now
+        self.needs_retest[rows] = True
+        boosted = np.isin(self.tags[rows], HIGH_PRIORITY_TAGS)
+        self.priority_boost_until[rows] = np.where(boosted, now + PRIORITY_BOOST_S, 0.0)
+
+    def update_health(self, i, alive, latency_ms, now):
+        """ConfigDatabase::updateHealth; returns True if the row just turned dead"""
+        self.last_tested[i] = now
+        self.total_tests[i] += 1
+        self.needs_retest[i] = False
+        self.priority_boost_until[i] = 0.0
+        if alive:
+            self.alive[i] = True
+            self.latency_ms[i] = latency_ms
+            self.consecutive_fails[i] = 0
+            self.total_passes[i] += 1
+            self.last_alive_time[i] = now
+            return False
+        self.consecutive_fails[i] += 1
+        if self.consecutive_fails[i] >= 3 and self.alive[i]:
+            self.alive[i] = False
+            self.latency_ms[i] = 0.0
+            return True
+        return False
+
+
+# ─── Policies ───
+
+class HunterPolicy:
+    """ConfigDatabase::getUntestedBatch as shipped"""
+
+    name = "hunter"
+    description = "shipped getUntestedBatch"
+
+    def priorities(self, db, now):
+        """Priority bucket per row, -1 for rows that are not candidates"""
+        since = now - db.last_tested
+        never = db.total_tests == 0
+        retest = ~never & db.needs_retest
+        rest = ~never & ~db.needs_retest
+        stale_alive = rest & db.alive & (since > ALIVE_RECHECK_S)
+        failed = (rest & ~db.alive & (db.consecutive_fails > 0)
+                  & (since > failure_backoff(db.consecutive_fails)))
+        priority = np.select([never, retest, stale_alive, failed], [0, 1, 2, 3], -1)
+        priority[~db.present] = -1
+        return priority
+
+    def tie_break(self, db, rows, now):
+        """Secondary key within a bucket (ascending): fewer total_tests first"""
+        return db.total_tests[rows]
+
+    def select(self, db, now, batch_size):
+        priority = self.priorities(db, now)
+        rows = np.flatnonzero(priority >= 0)
+        if not len(rows):
+            return rows
+        bucket = np.where(db.priority_boost_until[rows] > now, 0, 4) + priority[rows]
+        secondary = np.clip(self.tie_break(db, rows, now), 0, (1 << 20) - 1).astype(np.int64)
+        key = (bucket.astype(np.int64) << 52) | (secondary << 32) | db.rank[rows]
+        if len(rows) > batch_size:
+            top = np.argpartition(key, batch_size - 1)[:batch_size]
+            rows, key = rows[top], key[top]
+        return rows[np.argsort(key, kind="stable")]
+
+
+class NewestFirstPolicy(HunterPolicy):
+    """Same buckets, but newer configs first within a bucket"""
+
+    name = "newest_first"
+    description = "shipped buckets, newest first_seen first among untested/retest"
+
+    def tie_break(self, db, rows, now):
+        # Untested/retest buckets: whole seconds since first seen, so fresh
+        # arrivals jump the backlog; rechecks keep fewer-tests-first
+        fresh = (db.total_tests[rows] == 0) | db.needs_retest[rows]
+        return np.where(fresh, (now - db.first_seen[rows]).astype(np.int64), db.total_tests[rows])
+
+
+class DeadBackoffPolicy(HunterPolicy):
+    """Exponential backoff for failing configs and slower alive rechecks"""
+
+    name = "dead_backoff"
+    description = "60 s * 2^(fails-1) backoff up to 6 h, alive recheck after 120 s"
+
+    alive_recheck_s = 120.0
+    max_backoff_s = 6 * 3600.0
+
+    def priorities(self, db, now):
+        since = now - db.last_tested
+        never = db.total_tests == 0
+        retest = ~never & db.needs_retest
+        rest = ~never & ~db.needs_retest
+        stale_alive = rest & db.alive & (since > self.alive_recheck_s)
+        backoff = np.minimum(self.max_backoff_s,
+                             60.0 * np.exp2(np.clip(db.consecutive_fails - 1, 0, 30)))
+        failed = rest & ~db.alive & (db.consecutive_fails > 0) & (since > backoff)
+        priority = np.select([never, retest, stale_alive, failed], [0, 1, 2, 3], -1)
+        priority[~db.present] = -1
+        return priority
+
+
+POLICIES = {cls.name: cls for cls in (HunterPolicy, NewestFirstPolicy, DeadBackoffPolicy)}
+
+
+# ─── Ground truth ───
+
+class AliveModel:
+    """Which configs are really up, when, and how a test of them behaves
+
+    A config is up during [up_from, up_until). Configs alive in the
+    snapshot stay up with probability ``alive_keep``, tested-dead ones
+    come back with ``dead_revive``, untested and new ones are up with
+    ``new_alive``; lifetimes are exponential with mean ``mean_life_h``.
+    A test of an up config fails spuriously with probability ``flake``
+    (after the timeout); a test of a down config fails fast (refused,
+    0.2-2 s) with probability ``fast_fail``, otherwise at the timeout.
+    """
+
+    def __init__(self, seed=1, alive_keep=0.85, dead_revive=0.03, new_alive=0.25,
+                 mean_life_h=6.0, flake=0.05, fast_fail=0.6, download_s=1.5,
+                 latency_median_ms=900.0, latency_sigma=0.25):
+        self.seed = seed
+        self.alive_keep = alive_keep
+        self.dead_revive = dead_revive
+        self.new_alive = new_alive
+        self.mean_life_s = mean_life_h * 3600.0
+        self.flake = flake
+        self.fast_fail = fast_fail
+        self.download_s = download_s
+        self.latency_median_ms = latency_median_ms
+        self.latency_sigma = latency_sigma
+        self.up_from = self.up_until = self.base_latency = None
+
+    def assign(self, db, start):
+        rng = np.random.default_rng(self.seed)
+        n = len(db)
+        future = ~db.present
+        p_up = np.where(db.alive, self.alive_keep,
+                        np.where(db.total_tests > 0, self.dead_revive, self.new_alive))
+        p_up[future] = self.new_alive
+        up = rng.random(n) < p_up
+        born = np.where(future, db.arrival, start)
+        self.up_from = np.where(up, born, NEVER)
+        self.up_until = np.where(up, born + rng.exponential(self.mean_life_s, n), NEVER)
+        guess = np.exp(rng.normal(np.log(self.latency_median_ms), 0.6, n))
+        self.base_latency = np.where(db.latency_ms > 0, db.latency_ms, np.clip(guess, 50.0, 10000.0))
+        return self
+
+    def is_up(self, rows, t):
+        return (self.up_from[rows] <= t) & (t < self.up_until[rows])
+
+    def test(self, i, t, timeout_s, rng):
+        """``(ok, latency_ms, duration_s)`` of testing row ``i`` started at ``t``"""
+        if self.up_from[i] <= t < self.up_until[i]:
+            if rng.random() >= self.flake:
+                latency = float(self.base_latency[i] * np.exp(rng.normal(0.0, self.latency_sigma)))
+                return True, latency, min(float(timeout_s), latency / 1000.0 + self.download_s)
+            return False, 0.0, float(timeout_s)
+        if rng.random() < self.fast_fail:
+            return False, 0.0, rng.uniform(0.2, 2.0)
+        return False, 0.0, float(timeout_s)
+
+
+# ─── Simulation ───
+
+def _percentiles(values, qs=(50, 90)):
+    if not len(values):
+        return {f"p{q}": None for q in qs}
+    return {f"p{q}": float(v) for q, v in zip(qs, np.percentile(values, qs))}
+
+
+class Workload:
+    """Initial database, arrival schedule and ground truth shared by all runs"""
+
+    def __init__(self, db, model, start, duration_s, arrivals_per_hour=2000.0,
+                 arrival_every_s=600.0, arrival_tags=DEFAULT_ARRIVAL_TAGS, seed=1):
+        rng = np.random.default_rng(seed)
+        bursts = np.arange(start + arrival_every_s / 2, start + duration_s, arrival_every_s)
+        sizes = rng.poisson(arrivals_per_hour * arrival_every_s / 3600.0, len(bursts))
+        times = np.repeat(bursts, sizes)
+        names, weights = zip(*arrival_tags)
+        tags = rng.choice(np.array(names, dtype=object), size=len(times),
+                          p=np.asarray(weights) / sum(weights))
+        self.initial_rows = len(db)
+        self.db = db.with_arrivals(times, tags, rng)
+        self.model = model.assign(self.db, start)
+        self.start = start
+        self.duration_s = duration_s
+        self.bursts = [(t, np.flatnonzero(self.db.arrival == t)) for t in bursts]
+
+    @classmethod
+    def from_snapshot(cls, path, duration_s, model=None, start=None, **kwargs):
+        frame = HealthFrame.load(path)
+        db = SimDatabase.from_frame(frame)
+        if start is None:
+            start = float(max(db.last_tested.max(initial=0.0), db.first_seen.max(initial=0.0)))
+        return cls(db, model or AliveModel(), start, duration_s, **kwargs)
+
+
+class Simulation:
+    """One run of a policy over a Workload"""
+
+    def __init__(self, workload, policy, batch_size=MAX_VALIDATE_BATCH, max_concurrent=10,
+                 timeout_s=15, interval_s=30, max_size=200000, seed=1):
+        self.workload = workload
+        self.policy = policy
+        self.batch_size = min(batch_size, MAX_VALIDATE_BATCH)
+        self.chunk = max(1, min(50, max_concurrent))
+        self.timeout_s = max(1, min(30, timeout_s))
+        self.interval_s = interval_s
+        self.max_size = max_size
+        self.rng = np.random.default_rng(seed)
+
+    def run(self):
+        w, model = self.workload, self.workload.model
+        db = w.db.copy()
+        end = w.start + w.duration_s
+        first_test = np.full(len(db), NEVER)
+        first_pass = np.full(len(db), NEVER)
+        last_test = np.where(db.total_tests > 0, db.last_tested, NEVER)
+        alive_gaps, detect_lag, false_alive, healthy = [], [], [], []
+        tests = passes = wasted = wasted_known = dropped = batches = 0
+
+        events = [(t, 0, "arrive", rows) for t, rows in w.bursts]
+        events.append((w.start, 1, "validate", None))
+        heapq.heapify(events)
+        while events:
+            t, _, kind, rows = heapq.heappop(events)
+            if t >= end:
+                break
+            if kind == "arrive":
+                room = max(0, self.max_size - db.size())
+                dropped += max(0, len(rows) - room)
+                db.add(rows[:room], t)
+                continue
+
+            batches += 1
+            marked = np.flatnonzero(db.present & db.alive & (db.latency_ms > 0))
+            healthy.append(len(marked))
+            if len(marked):
+                false_alive.append(float((~model.is_up(marked, t)).mean()))
+            batch = self.policy.select(db, t, self.batch_size)
+            chunk_start = t
+            for off in range(0, len(batch), self.chunk):
+                done = chunk_start
+                for i in batch[off:off + self.chunk].tolist():
+                    ok, latency, duration = model.test(i, chunk_start, self.timeout_s, self.rng)
+                    done = max(done, chunk_start + duration)
+                    up = model.up_from[i] <= chunk_start < model.up_until[i]
+                    tests += 1
+                    if not up:
+                        wasted += 1
+                        wasted_known += db.consecutive_fails[i] >= 3
+                    if db.alive[i] and last_test[i] < NEVER:
+                        alive_gaps.append(done - last_test[i])
+                    first_test[i] = min(first_test[i], done)
+                    last_test[i] = done
+                    if ok:
+                        passes += 1
+                        first_pass[i] = min(first_pass[i], done)
+                    if db.update_health(i, ok, latency, done) and model.up_until[i] <= done:
+                        detect_lag.append(done - model.up_until[i])
+                chunk_start = done
+            heapq.heappush(events, (chunk_start + self.interval_s, 1, "validate", None))
+
+        arrived = np.flatnonzero(db.present & (db.arrival > -NEVER))
+        up_on_arrival = arrived[model.is_up(arrived, db.arrival[arrived])]
+        backlog = np.flatnonzero(db.present[:w.initial_rows] & (w.db.total_tests[:w.initial_rows] == 0))
+        to_test = first_test[arrived] - db.arrival[arrived]
+        to_pass = first_pass[up_on_arrival] - db.arrival[up_on_arrival]
+        return {
+            "policy": self.policy.name,
+            "batches": batches,
+            "tests": tests,
+            "tests_per_s": tests / w.duration_s,
+            "pass_share": passes / tests if tests else 0.0,
+            "wasted_share": wasted / tests if tests else 0.0,
+            "wasted_known_dead_share": wasted_known / tests if tests else 0.0,
+            "arrivals": len(arrived),
+            "dropped": dropped,
+            "arrivals_tested_share": float(np.isfinite(to_test).mean()) if len(arrived) else 0.0,
+            "time_to_first_test_s": _percentiles(to_test[np.isfinite(to_test)]),
+            "arrivals_up": len(up_on_arrival),
+            "reached_balancer_share": (float(np.isfinite(to_pass).mean())
+                                       if len(up_on_arrival) else 0.0),
+            "time_to_balancer_s": _percentiles(to_pass[np.isfinite(to_pass)]),
+            "backlog_untested_at_start": len(backlog),
+            "backlog_tested_share": (float(np.isfinite(first_test[backlog]).mean())
+                                     if len(backlog) else 0.0),
+            "alive_recheck_s": _percentiles(alive_gaps),
+            "death_detect_lag_s": _percentiles(detect_lag),
+            "false_alive_share": float(np.mean(false_alive)) if false_alive else 0.0,
+            "healthy_mean": float(np.mean(healthy)) if healthy else 0.0,
+        }
+
+
+def compare(workload, policies, **params):
+    return [Simulation(workload, POLICIES[name](), **params).run() for name in policies]
+
+
+# ─── Report ───
+
+def _fmt_s(value):
+    if value is None:
+        return "-"
+    if value >= 3600:
+        return f"{value / 3600:.1f}h"
+    if value >= 60:
+        return f"{value / 60:.1f}m"
+    return f"{value:.0f}s"
+
+
+def print_comparison(results):
+    rows = [
+        ("tests/s", lambda r: f"{r['tests_per_s']:.2f}"),
+        ("pass share", lambda r: f"{r['pass_share']:.1%}"),
+        ("wasted on down configs", lambda r: f"{r['wasted_share']:.1%}"),
+        ("  of which known dead", lambda r: f"{r['wasted_known_dead_share']:.1%}"),
+        ("arrivals tested", lambda r: f"{r['arrivals_tested_share']:.1%} of {r['arrivals']:,}"),
+        ("time to first test p50", lambda r: _fmt_s(r["time_to_first_test_s"]["p50"])),
+        ("time to first test p90", lambda r: _fmt_s(r["time_to_first_test_s"]["p90"])),
+        ("reached balancer", lambda r: f"{r['reached_balancer_share']:.1%} of {r['arrivals_up']:,}"),
+        ("time to balancer p50", lambda r: _fmt_s(r["time_to_balancer_s"]["p50"])),
+        ("time to balancer p90", lambda r: _fmt_s(r["time_to_balancer_s"]["p90"])),
+        ("start backlog tested", lambda r: f"{r['backlog_tested_share']:.1%} of {r['backlog_untested_at_start']:,}"),
+        ("alive recheck p50", lambda r: _fmt_s(r["alive_recheck_s"]["p50"])),
+        ("death detected p50", lambda r: _fmt_s(r["death_detect_lag_s"]["p50"])),
+        ("death detected p90", lambda r: _fmt_s(r["death_detect_lag_s"]["p90"])),
+        ("marked alive but down", lambda r: f"{r['false_alive_share']:.1%}"),
+        ("healthy pool (mean)", lambda r: f"{r['healthy_mean']:.0f}"),
+    ]
+    cells = [[fmt(r) for r in results] for _, fmt in rows]
+    width = 2 + max(len(text) for text in [r["policy"] for r in results] + sum(cells, []))
+    print(" " * 26 + "".join(f"{r['policy']:>{width}}" for r in results))
+    for (label, _), line in zip(rows, cells):
+        print(f"   {label:23s}" + "".join(f"{text:>{width}}" for text in line))
+
+
+def synthetic_workload(count, duration_s, seed=3, **kwargs):
+    import os
+    import tempfile
+
+    start = 1_700_000_000.0
+    with tempfile.TemporaryDirectory() as tmp:
+        records = make_synthetic_snapshot(os.path.join(tmp, "seed.tsv"), count, seed, start)
+    frame = HealthFrame.from_records(records)
+    return Workload(SimDatabase.from_frame(frame), AliveModel(seed=seed), start, duration_s,
+                    seed=seed, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate the validator scheduling policy")
+    parser.add_argument("snapshot", nargs="?", help="HUNTER_config_db.tsv to replay")
+    parser.add_argument("--synthetic", type=int, metavar="RECORDS",
+                        help="use a synthetic snapshot instead")
+    parser.add_argument("--policy", default="all",
+                        help=f"comma-separated from {', '.join(POLICIES)}, or all")
+    parser.add_argument("--hours", type=float, default=6.0)
+    parser.add_argument("--arrivals-per-hour", type=float, default=2000.0)
+    parser.add_argument("--arrival-every", type=float, default=600.0, metavar="SECONDS")
+    parser.add_argument("--batch-size", type=int, default=MAX_VALIDATE_BATCH)
+    parser.add_argument("--max-concurrent", type=int, default=10)
+    parser.add_argument("--timeout", type=int, default=15)
+    parser.add_argument("--interval", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    if not args.snapshot and not args.synthetic:
+        parser.print_usage()
+        return 2
+
+    policies = list(POLICIES) if args.policy == "all" else args.policy.split(",")
+    unknown = [name for name in policies if name not in POLICIES]
+    if unknown:
+        parser.error(f"unknown policy {', '.join(unknown)}")
+    duration = args.hours * 3600
+    load = dict(arrivals_per_hour=args.arrivals_per_hour, arrival_every_s=args.arrival_every)
+    started = time.perf_counter()
+    if args.snapshot:
+        workload = Workload.from_snapshot(args.snapshot, duration, AliveModel(seed=args.seed),
+                                          seed=args.seed, **load)
+    else:
+        workload = synthetic_workload(args.synthetic, duration, seed=args.seed, **load)
+    print(f"[SIM] {workload.initial_rows:,} configs + {len(workload.db) - workload.initial_rows:,} "
+          f"arrivals over {args.hours:g} h, batch {min(args.batch_size, MAX_VALIDATE_BATCH)}, "
+          f"concurrency {args.max_concurrent}, timeout {args.timeout}s, interval {args.interval:g}s")
+    results = compare(workload, policies, batch_size=args.batch_size,
+                      max_concurrent=args.max_concurrent, timeout_s=args.timeout,
+                      interval_s=args.interval, seed=args.seed)
+    for name in policies:
+        print(f"   {name:14s} {POLICIES[name].description}")
+    print()
+    print_comparison(results)
+    print(f"\n   simulated in {time.perf_counter() - started:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
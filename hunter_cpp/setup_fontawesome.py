@@ -1,235 +1,525 @@
 #!/usr/bin/env python3
 """
 Download and setup FontAwesome font for the application
+
+ImGuiApp::ReloadFonts merges the icon font into the atlas for the whole
+0xf000-0xf8ff range, so well over a thousand glyphs are rasterized at
+every startup and DPI change although the UI uses a handful. This script
+scans the C++ sources for the ICON_FA_* macros actually used, subsets
+the font to those glyphs (fontTools) and writes it as the TTF that
+FontAwesome::LoadFont looks for first (src/win32/fonts/fa-solid-900.ttf).
+The generated header carries the used codepoints as
+ICON_FA_GLYPH_RANGES, which ReloadFonts passes to ImGui instead of the
+whole private-use range.
+
+The font is read from a local file (the woff2 in src/win32/fonts by
+default; reading woff2 needs brotli) and only downloaded when missing, so
+it works offline. With --atlas the subset glyphs are also rasterized into
+a zlib-compressed alpha atlas (fa-solid-900.atlas) ready to upload as a
+texture.
+
+Run with --bench to compare full and subset font size and glyph count.
 """
 
-import requests
-import os
+import argparse
+import re
+import struct
+import sys
+import zlib
 from pathlib import Path
 
-def download_fontawesome():
+import numpy as np
+import requests
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.pens.basePen import BasePen
+    from fontTools.ttLib import TTFont
+except ImportError:
+    ft_subset = TTFont = None
+    BasePen = object
+
+ROOT = Path(__file__).resolve().parent
+FONT_URL = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-solid-900.woff2"
+FONTS_DIR = ROOT / "src" / "win32" / "fonts"
+DEFAULT_FONT = FONTS_DIR / "fa-solid-900.woff2"
+SUBSET_FONT = FONTS_DIR / "fa-solid-900.ttf"
+ATLAS_FILE = FONTS_DIR / "fa-solid-900.atlas"
+HEADER_PATH = ROOT / "include" / "win32" / "font_awesome.h"
+SOURCE_DIRS = (ROOT / "src", ROOT / "include")
+ICON_PIXEL_SIZE = 17.0 * 0.85          # ReloadFonts: sz * 0.85 at 100% DPI
+ATLAS_MAGIC = b"HFAT"
+ATLAS_VERSION = 1
+ATLAS_SUPERSAMPLE = 4
+
+# name -> (codepoint, comment), in header order
+ICONS = {
+    "EYE": (0xf06e, "eye"),
+    "EDIT": (0xf044, "edit"),
+    "TRASH": (0xf1f8, "trash"),
+    "PLUS": (0xf067, "plus"),
+    "MINUS": (0xf068, "minus"),
+    "CHECK": (0xf00c, "check"),
+    "TIMES": (0xf00d, "times"),
+    "SEARCH": (0xf002, "search"),
+    "DOWNLOAD": (0xf019, "download"),
+    "UPLOAD": (0xf093, "upload"),
+    "REFRESH": (0xf021, "refresh"),
+    "SETTINGS": (0xf013, "settings"),
+    "INFO": (0xf05a, "info"),
+    "WARNING": (0xf071, "warning"),
+    "ERROR": (0xf071, "error/exclamation"),
+    "SUCCESS": (0xf058, "check-circle"),
+    "GEAR": (0xf013, "gear"),
+    "LINK": (0xf0c1, "link"),
+    "COPY": (0xf0c5, "copy"),
+    "PASTE": (0xf0ea, "paste"),
+    "PLAY": (0xf04b, "play"),
+    "PAUSE": (0xf04c, "pause"),
+    "STOP": (0xf04d, "stop"),
+}
+
+ICON_MACRO = re.compile(r"\bICON_FA_([A-Z0-9_]+)\b")
+
+
+def download_fontawesome(font_path=DEFAULT_FONT):
     """Download FontAwesome font file"""
     print("[START] Downloading FontAwesome font...")
-    
-    # FontAwesome 6 Free Solid font URL
-    font_url = "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/webfonts/fa-solid-900.woff2"
-    
+
     try:
         print("[DOWNLOAD] Fetching FontAwesome font...")
-        response = requests.get(font_url, timeout=30)
+        response = requests.get(FONT_URL, timeout=30)
         response.raise_for_status()
-        
-        # Create fonts directory
-        fonts_dir = Path("src/win32/fonts")
-        fonts_dir.mkdir(exist_ok=True)
-        
-        # Save font file
-        font_path = fonts_dir / "fa-solid-900.woff2"
+
+        font_path = Path(font_path)
+        font_path.parent.mkdir(parents=True, exist_ok=True)
         with open(font_path, 'wb') as f:
             f.write(response.content)
-        
+
         print(f"[SUCCESS] Font saved to: {font_path}")
         print(f"[INFO] Font size: {len(response.content):,} bytes")
-        
+
         return font_path
-        
+
     except Exception as e:
         print(f"[ERROR] Failed to download font: {e}")
         return None
 
-def create_fontawesome_header():
+
+def locate_font(font_path=DEFAULT_FONT, offline=False):
+    """Use the local font file, downloading it only when it is missing"""
+    font_path = Path(font_path)
+    if font_path.exists():
+        print(f"[FONT] Using local font: {font_path} ({font_path.stat().st_size:,} bytes)")
+        return font_path
+    if offline:
+        print(f"[ERROR] {font_path} not found and --offline given")
+        return None
+    return download_fontawesome(font_path)
+
+
+# ─── Usage scan ───
+
+def scan_icon_usage(source_dirs=SOURCE_DIRS, header_path=HEADER_PATH):
+    """``{macro name: [files]}`` for every ICON_FA_* used in the C++ sources"""
+    used = {}
+    header_path = Path(header_path).resolve()
+    for directory in source_dirs:
+        for path in sorted(Path(directory).rglob("*")):
+            if path.suffix not in (".cpp", ".h", ".hpp", ".inl") or path.resolve() == header_path:
+                continue
+            text = path.read_text(encoding="utf-8", errors="replace")
+            for name in ICON_MACRO.findall(text):
+                used.setdefault(name, [])
+                if str(path) not in used[name]:
+                    used[name].append(str(path))
+    return used
+
+
+def used_codepoints(used, extra=()):
+    """Sorted codepoints of the used macros (unknown ones are reported)"""
+    unknown = sorted(name for name in used if name not in ICONS and name != "GLYPH_RANGES")
+    for name in unknown:
+        print(f"[WARN] ICON_FA_{name} is used but not defined in the header")
+    return sorted({ICONS[name][0] for name in used if name in ICONS} | set(extra))
+
+
+def glyph_ranges(codepoints):
+    """ImGui range pairs (inclusive) for ``codepoints``, merged where adjacent"""
+    ranges = []
+    for cp in sorted(set(codepoints)):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return [tuple(r) for r in ranges]
+
+
+def create_fontawesome_header(codepoints=None, header_path=HEADER_PATH):
     """Create FontAwesome icon definitions header"""
     print("[CREATE] Creating FontAwesome header...")
-    
-    header_content = '''#pragma once
+
+    width = max(len(name) for name in ICONS) + len("ICON_FA_")
+    macros = "\n".join(f'#define {"ICON_FA_" + name:<{width}} "\\u{cp:04x}"   // {comment}'
+                       for name, (cp, comment) in ICONS.items())
+    ranges = ", ".join(f"0x{lo:04x}, 0x{hi:04x}" for lo, hi in glyph_ranges(codepoints or []))
+    header_content = f'''#pragma once
 #include <string>
 
 // FontAwesome 6 Free Solid Icons
 // Icon definitions as UTF-8 strings
 
-#define ICON_FA_EYE     "\\uf06e"   // eye
-#define ICON_FA_EDIT    "\\uf044"   // edit
-#define ICON_FA_TRASH   "\\uf1f8"   // trash
-#define ICON_FA_PLUS    "\\uf067"   // plus
-#define ICON_FA_MINUS   "\\uf068"   // minus
-#define ICON_FA_CHECK   "\\uf00c"   // check
-#define ICON_FA_TIMES   "\\uf00d"   // times
-#define ICON_FA_SEARCH  "\\uf002"   // search
-#define ICON_FA_DOWNLOAD "\\uf019" // download
-#define ICON_FA_UPLOAD  "\\uf093"   // upload
-#define ICON_FA_REFRESH "\\uf021"   // refresh
-#define ICON_FA_SETTINGS "\\uf013" // settings
-#define ICON_FA_INFO    "\\uf05a"   // info
-#define ICON_FA_WARNING "\\uf071"   // warning
-#define ICON_FA_ERROR   "\\uf071"   // error/exclamation
-#define ICON_FA_SUCCESS "\\uf058"   // check-circle
-#define ICON_FA_GEAR    "\\uf013"   // gear
-#define ICON_FA_LINK    "\\uf0c1"   // link
-#define ICON_FA_COPY    "\\uf0c5"   // copy
-#define ICON_FA_PASTE   "\\uf0ea"   // paste
-#define ICON_FA_PLAY    "\\uf04b"   // play
-#define ICON_FA_PAUSE   "\\uf04c"   // pause
-#define ICON_FA_STOP    "\\uf04d"   // stop
-
-namespace hunter {
-namespace win32 {
+{macros}
+
+// Codepoints used by the UI (generated by setup_fontawesome.py); the
+// shipped fa-solid-900.ttf is subset to exactly these glyphs
+#define ICON_FA_GLYPH_RANGES {ranges + ", " if ranges else ""}0
+
+namespace hunter {{
+namespace win32 {{
 
 // FontAwesome font loading
-class FontAwesome {
+class FontAwesome {{
 public:
     static bool LoadFont();
     static bool IsLoaded();
     static const char* GetFontData();
     static size_t GetFontSize();
-    
+
 private:
     static bool font_loaded_;
     static std::string font_data_;
-};
+}};
 
-} // namespace win32
-} // namespace hunter
+}} // namespace win32
+}} // namespace hunter
 '''
-    
-    header_path = Path("include/win32/font_awesome.h")
-    header_path.parent.mkdir(exist_ok=True)
-    
-    with open(header_path, 'w') as f:
+
+    header_path = Path(header_path)
+    header_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(header_path, 'w', newline='\n') as f:
         f.write(header_content)
-    
+
     print(f"[SUCCESS] Header created: {header_path}")
     return header_path
 
-def create_fontawesome_impl():
-    """Create FontAwesome implementation file"""
-    print("[CREATE] Creating FontAwesome implementation...")
-    
-    impl_content = '''#include "win32/font_awesome.h"
-#include <fstream>
-#include <sstream>
-#include <iostream>
-
-namespace hunter {
-namespace win32 {
-
-bool FontAwesome::font_loaded_ = false;
-std::string FontAwesome::font_data_;
-
-bool FontAwesome::LoadFont() {
-    if (font_loaded_) {
-        return true;
-    }
-    
-    try {
-        // Try to load font from file
-        std::ifstream font_file("src/win32/fonts/fa-solid-900.woff2", std::ios::binary);
-        if (!font_file.is_open()) {
-            std::cout << "[FontAwesome] Font file not found, using fallback icons" << std::endl;
-            return false;
-        }
-        
-        // Read font data
-        std::stringstream buffer;
-        buffer << font_file.rdbuf();
-        font_data_ = buffer.str();
-        
-        font_loaded_ = true;
-        std::cout << "[FontAwesome] Font loaded successfully (" << font_data_.size() << " bytes)" << std::endl;
-        return true;
-        
-    } catch (const std::exception& e) {
-        std::cout << "[FontAwesome] Failed to load font: " << e.what() << std::endl;
-        return false;
-    }
-}
 
-bool FontAwesome::IsLoaded() {
-    return font_loaded_;
-}
+# ─── Subsetting ───
 
-const char* FontAwesome::GetFontData() {
-    return font_data_.c_str();
-}
+def subset_font(font_path, codepoints, out_path=SUBSET_FONT):
+    """Write a TTF holding only ``codepoints`` (plus .notdef)"""
+    if ft_subset is None:
+        print("[ERROR] Subsetting needs fontTools (and brotli for woff2): "
+              "pip install fonttools brotli")
+        return None
+    print(f"[SUBSET] Keeping {len(codepoints)} glyphs: "
+          f"{' '.join(f'U+{cp:04X}' for cp in codepoints)}")
+    options = ft_subset.Options()
+    options.flavor = None              # ImGui (stb_truetype) reads plain TTF only
+    options.hinting = False            # ImGui does its own oversampling
+    options.layout_features = []
+    options.name_IDs = [0, 1, 2, 3, 4, 5, 6]
+    options.notdef_outline = True
+    font = TTFont(str(font_path))
+    subsetter = ft_subset.Subsetter(options=options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    font.flavor = None
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    font.save(str(out_path))
+    print(f"[SUCCESS] Subset font saved to: {out_path} ({out_path.stat().st_size:,} bytes)")
+    return out_path
 
-size_t FontAwesome::GetFontSize() {
-    return font_data_.size();
-}
 
-} // namespace win32
-} // namespace hunter
-'''
-    
-    impl_path = Path("src/win32/font_awesome.cpp")
-    
-    with open(impl_path, 'w') as f:
-        f.write(impl_content)
-    
-    print(f"[SUCCESS] Implementation created: {impl_path}")
-    return impl_path
+# ─── Glyph atlas ───
+
+class FlattenPen(BasePen):
+    """Collects a glyph outline as closed polygons (curves flattened)"""
+
+    def __init__(self, glyph_set, steps=8):
+        super().__init__(glyph_set)
+        self.steps = steps
+        self.contours = []
+        self._current = []
+
+    def _moveTo(self, pt):
+        self._current = [pt]
+
+    def _lineTo(self, pt):
+        self._current.append(pt)
+
+    def _qCurveToOne(self, pt1, pt2):
+        (x0, y0), (x1, y1), (x2, y2) = self._current[-1], pt1, pt2
+        for i in range(1, self.steps + 1):
+            t = i / self.steps
+            u = 1 - t
+            self._current.append((u * u * x0 + 2 * u * t * x1 + t * t * x2,
+                                  u * u * y0 + 2 * u * t * y1 + t * t * y2))
+
+    def _curveToOne(self, pt1, pt2, pt3):
+        (x0, y0), (x1, y1), (x2, y2), (x3, y3) = self._current[-1], pt1, pt2, pt3
+        for i in range(1, self.steps + 1):
+            t = i / self.steps
+            a, b, c, d = (1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t * t, t ** 3
+            self._current.append((a * x0 + b * x1 + c * x2 + d * x3,
+                                  a * y0 + b * y1 + c * y2 + d * y3))
+
+    def _closePath(self):
+        if len(self._current) > 2:
+            self.contours.append(self._current)
+        self._current = []
+
+    _endPath = _closePath
+
+
+def rasterize(contours, width, height, supersample=ATLAS_SUPERSAMPLE):
+    """Alpha8 coverage of polygons given in pixel coordinates (y down)
+
+    Non-zero winding, sampled on a ``supersample`` x ``supersample`` grid
+    per pixel.
+    """
+    n = supersample
+    xs = (np.arange(width * n, dtype=np.float64) + 0.5) / n
+    ys = (np.arange(height * n, dtype=np.float64) + 0.5) / n
+    winding = np.zeros((height * n, width * n), np.int32)
+    for contour in contours:
+        pts = np.asarray(contour, np.float64)
+        x0, y0 = pts[:, 0], pts[:, 1]
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+        for ax, ay, bx, by in zip(x0, y0, x1, y1):
+            if ay == by:
+                continue
+            direction = 1 if by > ay else -1
+            lo, hi = (ay, by) if ay < by else (by, ay)
+            rows = np.nonzero((ys >= lo) & (ys < hi))[0]
+            if not len(rows):
+                continue
+            cross = ax + (ys[rows] - ay) * (bx - ax) / (by - ay)
+            winding[rows] += direction * (xs[None, :] < cross[:, None])
+    coverage = (winding != 0).reshape(height, n, width, n).mean(axis=(1, 3))
+    return np.rint(coverage * 255).astype(np.uint8)
+
+
+def pack_shelves(sizes, atlas_width=256, padding=1):
+    """Shelf-pack ``[(w, h)]`` into ``atlas_width``; returns positions and height"""
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    positions = [None] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w + padding > atlas_width and x > 0:
+            x, y, shelf = 0, y + shelf + padding, 0
+        positions[i] = (x + padding, y + padding)
+        x += w + padding
+        shelf = max(shelf, h)
+    return positions, y + shelf + 2 * padding
+
+
+def encode_atlas(glyphs, pixels, pixel_size, ascent, descent):
+    """Serialize the atlas (layout described in bake_atlas)"""
+    height, width = pixels.shape
+    out = [ATLAS_MAGIC, struct.pack("<HHHHfff", ATLAS_VERSION, len(glyphs), width, height,
+                                    pixel_size, ascent, descent)]
+    for g in glyphs:
+        out.append(struct.pack("<IHHHHfff", g["codepoint"], g["x"], g["y"], g["w"], g["h"],
+                               g["x0"], g["y0"], g["advance"]))
+    packed = zlib.compress(pixels.tobytes(), 9)
+    out.append(struct.pack("<I", len(packed)))
+    out.append(packed)
+    return b"".join(out)
+
+
+def decode_atlas(data):
+    """Inverse of encode_atlas: ``(glyphs, pixels, pixel_size, ascent, descent)``"""
+    if data[:4] != ATLAS_MAGIC:
+        raise ValueError("not a glyph atlas")
+    version, count, width, height, pixel_size, ascent, descent = struct.unpack_from(
+        "<HHHHfff", data, 4)
+    if version != ATLAS_VERSION:
+        raise ValueError(f"atlas version {version} not supported")
+    offset = 4 + struct.calcsize("<HHHHfff")
+    glyphs = []
+    record = struct.calcsize("<IHHHHfff")
+    for _ in range(count):
+        cp, x, y, w, h, x0, y0, advance = struct.unpack_from("<IHHHHfff", data, offset)
+        glyphs.append({"codepoint": cp, "x": x, "y": y, "w": w, "h": h, "x0": x0, "y0": y0,
+                       "advance": advance})
+        offset += record
+    (size,) = struct.unpack_from("<I", data, offset)
+    raw = zlib.decompress(data[offset + 4: offset + 4 + size])
+    pixels = np.frombuffer(raw, np.uint8).reshape(height, width)
+    return glyphs, pixels, pixel_size, ascent, descent
+
+
+def bake_atlas(font_path, codepoints, pixel_size=ICON_PIXEL_SIZE, out_path=ATLAS_FILE):
+    """Rasterize ``codepoints`` of the font into a compressed alpha atlas
+
+    Layout (little endian): "HFAT", u16 version, u16 glyph count, u16
+    width, u16 height, f32 pixel size, f32 ascent, f32 descent; per glyph
+    u32 codepoint, u16 x, y, w, h in the atlas, f32 x0/y0 offset of the
+    bitmap from the pen position on the baseline, f32 advance; then u32
+    length and the zlib-compressed width*height alpha bytes. Scaled like
+    stb_truetype's ScaleForPixelHeight, as ImGui does.
+    """
+    if TTFont is None:
+        print("[ERROR] Baking the atlas needs fontTools: pip install fonttools brotli")
+        return None
+    font = TTFont(str(font_path))
+    cmap = font.getBestCmap()
+    glyph_set = font.getGlyphSet()
+    ascent, descent = font["hhea"].ascent, font["hhea"].descent
+    scale = pixel_size / (ascent - descent)
+    shapes = []
+    for cp in codepoints:
+        name = cmap.get(cp)
+        if name is None:
+            print(f"[WARN] U+{cp:04X} is not in {font_path}")
+            continue
+        pen = FlattenPen(glyph_set)
+        glyph_set[name].draw(pen)
+        points = [p for c in pen.contours for p in c]
+        advance = glyph_set[name].width * scale
+        if not points:
+            shapes.append((cp, [], 0, 0, 0, 0, advance))
+            continue
+        xmin = int(np.floor(min(p[0] for p in points) * scale))
+        xmax = int(np.ceil(max(p[0] for p in points) * scale))
+        ymax = int(np.ceil(max(p[1] for p in points) * scale))
+        ymin = int(np.floor(min(p[1] for p in points) * scale))
+        contours = [[(x * scale - xmin, ymax - y * scale) for x, y in c] for c in pen.contours]
+        shapes.append((cp, contours, xmax - xmin, ymax - ymin, xmin, -ymax, advance))
+    positions, height = pack_shelves([(s[2], s[3]) for s in shapes])
+    width = 256
+    pixels = np.zeros((max(1, height), width), np.uint8)
+    glyphs = []
+    for (cp, contours, w, h, x0, y0, advance), (x, y) in zip(shapes, positions):
+        if w and h:
+            pixels[y:y + h, x:x + w] = rasterize(contours, w, h)
+        glyphs.append({"codepoint": cp, "x": x, "y": y, "w": w, "h": h, "x0": float(x0),
+                       "y0": float(y0), "advance": advance})
+    data = encode_atlas(glyphs, pixels, pixel_size, ascent * scale, descent * scale)
+    out_path = Path(out_path)
+    out_path.write_bytes(data)
+    print(f"[SUCCESS] Atlas saved to: {out_path} ({len(glyphs)} glyphs, {width}x{height}, "
+          f"{len(data):,} bytes, {pixels.nbytes:,} bytes uncompressed)")
+    return out_path
+
 
 def update_cmake():
     """Update CMakeLists.txt to include FontAwesome files"""
     print("[CMAKE] Updating CMakeLists.txt...")
-    
-    cmake_path = Path("CMakeLists.txt")
+
+    cmake_path = ROOT / "CMakeLists.txt"
     if not cmake_path.exists():
         print("[ERROR] CMakeLists.txt not found")
         return False
-    
+
     try:
         with open(cmake_path, 'r') as f:
             content = f.read()
-        
+
         # Add FontAwesome implementation to sources
         if "font_awesome.cpp" not in content:
             # Find the add_executable line and add our file
             lines = content.split('\n')
             new_lines = []
-            
+
             for i, line in enumerate(lines):
                 new_lines.append(line)
-                
+
                 # Add font_awesome.cpp after imgui_sources_page.cpp
                 if "imgui_sources_page.cpp" in line and "add_executable" in lines[max(0, i-5):i+1]:
                     new_lines.append("    src/win32/font_awesome.cpp")
                     print("[CMAKE] Added font_awesome.cpp to executable sources")
-            
+
             with open(cmake_path, 'w') as f:
                 f.write('\n'.join(new_lines))
-            
-            print("[SUCCESS] CMakeLists.txt updated")
-            return True
-            
+
+        print("[SUCCESS] CMakeLists.txt up to date")
+        return True
+
     except Exception as e:
         print(f"[ERROR] Failed to update CMakeLists.txt: {e}")
         return False
 
-if __name__ == "__main__":
+
+def run_benchmark(font_path=DEFAULT_FONT):
+    """Glyphs ImGui rasterizes from the full font vs the subset"""
+    import tempfile
+    import time
+
+    if TTFont is None:
+        print("[ERROR] --bench needs fontTools (and brotli for woff2)")
+        return 1
+    codepoints = used_codepoints(scan_icon_usage())
+    full = TTFont(str(font_path))
+    in_range = [cp for cp in full.getBestCmap() if 0xf000 <= cp <= 0xf8ff]
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        path = subset_font(font_path, codepoints, Path(tmp) / "subset.ttf")
+        elapsed = time.perf_counter() - start
+        full_ttf = Path(tmp) / "full.ttf"
+        full.flavor = None
+        full.save(str(full_ttf))
+        print(f"[BENCH] full font: {full_ttf.stat().st_size:,} bytes as TTF, "
+              f"{len(in_range)} glyphs in ImGui's 0xf000-0xf8ff range")
+        print(f"[BENCH] subset   : {path.stat().st_size:,} bytes, {len(codepoints)} glyphs "
+              f"(subset took {elapsed * 1000:.0f} ms)")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Subset FontAwesome to the icons the UI uses")
+    parser.add_argument("--font", default=str(DEFAULT_FONT),
+                        help=f"local FontAwesome font (default: {DEFAULT_FONT.name}, "
+                             "downloaded if missing)")
+    parser.add_argument("--offline", action="store_true", help="never download the font")
+    parser.add_argument("--extra", default="", metavar="CODEPOINTS",
+                        help="additional codepoints to keep, e.g. f0e7,f1c0")
+    parser.add_argument("--atlas", nargs="?", type=float, const=ICON_PIXEL_SIZE, metavar="PX",
+                        help=f"also bake a glyph atlas at PX pixels (default {ICON_PIXEL_SIZE:g})")
+    parser.add_argument("--bench", action="store_true")
+    args = parser.parse_args()
+
     print("[SETUP] FontAwesome Integration Setup")
     print("=" * 50)
-    
-    # Download font
-    font_path = download_fontawesome()
-    
-    # Create header
-    header_path = create_fontawesome_header()
-    
-    # Create implementation
-    impl_path = create_fontawesome_impl()
-    
-    # Update CMake
+
+    font_path = locate_font(args.font, offline=args.offline)
+    if args.bench:
+        return run_benchmark(font_path) if font_path else 1
+
+    used = scan_icon_usage()
+    extra = [int(cp, 16) for cp in filter(None, args.extra.split(","))]
+    codepoints = used_codepoints(used, extra)
+    print(f"[SCAN] {len(used)} ICON_FA_* macros used -> {len(codepoints)} glyphs")
+    for name, files in sorted(used.items()):
+        print(f"   ICON_FA_{name:<10s} {', '.join(Path(f).name for f in files)}")
+
+    header_path = create_fontawesome_header(codepoints)
+    subset_path = subset_font(font_path, codepoints) if font_path else None
+    atlas_path = None
+    if args.atlas and subset_path:
+        atlas_path = bake_atlas(subset_path, codepoints, args.atlas)
     cmake_updated = update_cmake()
-    
+
     print("\n" + "=" * 50)
     print("[SUMMARY] Setup Results:")
     print(f"Font file: {'OK' if font_path else 'FAIL'}")
     print(f"Header file: {'OK' if header_path else 'FAIL'}")
-    print(f"Implementation: {'OK' if impl_path else 'FAIL'}")
+    print(f"Subset font: {'OK' if subset_path else 'FAIL'}")
+    if args.atlas:
+        print(f"Glyph atlas: {'OK' if atlas_path else 'FAIL'}")
     print(f"CMake update: {'OK' if cmake_updated else 'FAIL'}")
-    
-    if font_path and header_path and impl_path:
+
+    if subset_path and header_path:
         print("\n[SUCCESS] FontAwesome integration setup complete!")
         print("[NEXT] Rebuild the application with: ./build.bat")
-    else:
-        print("\n[PARTIAL] Some components failed to setup")
-        print("[NOTE] The application will still work with fallback icons")
+        return 0
+    print("\n[PARTIAL] Some components failed to setup")
+    print("[NOTE] The application will still work with fallback icons")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
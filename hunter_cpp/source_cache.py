@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Conditional-request cache for subscription sources
+Stores each source's body with its ETag / Last-Modified validators on
+disk (runtime/source_cache by default). The next download of the same URL
+sends If-None-Match / If-Modified-Since; a 304 means the source is
+unchanged and the cached body, along with any annotations stored for it
+(e.g. the config count), is reused without transferring it again.
+
+Run with --bench to sweep the local source farm twice and show which
+sources came from cache and the bandwidth saved.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from fetch_session import DEFAULT_CHUNK_SIZE, FetchResponse, get_session
+
+DEFAULT_CACHE_DIR = os.path.join("runtime", "source_cache")
+
+
+class SourceCache:
+    """On-disk HTTP validator cache keyed by source URL
+
+    Each URL maps to ``<key>.body`` (decoded payload) and ``<key>.json``
+    (url, etag, last_modified, stored_at, size and annotations). Only
+    responses carrying a validator are stored, since nothing else can be
+    revalidated.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, session=None):
+        self.directory = directory
+        self.session = session
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "bytes_saved": 0}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _session(self):
+        return self.session or get_session()
+
+    def _paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:20]
+        base = os.path.join(self.directory, key)
+        return base + ".body", base + ".json"
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def entry(self, url):
+        """Stored metadata for ``url``, or None (also when the body is missing)"""
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not os.path.exists(body_path):
+            return None
+        return meta
+
+    def body(self, url):
+        with open(self._paths(url)[0], "rb") as f:
+            return f.read()
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for the stored validators"""
+        meta = self.entry(url)
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def annotate(self, url, **info):
+        """Attach derived results (config count, verdict, ...) to a cached source"""
+        meta = self.entry(url)
+        if meta is None:
+            return
+        meta.setdefault("info", {}).update(info)
+        self._write_meta(url, meta)
+
+    def info(self, url):
+        meta = self.entry(url)
+        return (meta or {}).get("info", {})
+
+    def _write_meta(self, url, meta):
+        meta_path = self._paths(url)[1]
+        tmp = meta_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def _store(self, url, headers, body_path_tmp, size):
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        body_path, _ = self._paths(url)
+        if not etag and not last_modified:
+            os.remove(body_path_tmp)
+            return False
+        os.replace(body_path_tmp, body_path)
+        self._write_meta(url, {"url": url, "etag": etag, "last_modified": last_modified,
+                               "stored_at": time.time(), "size": size, "info": {}})
+        self._count("stored")
+        return True
+
+    def fetch(self, url, timeout=30):
+        """Download ``url``, revalidating a cached copy when there is one
+
+        Returns a FetchResponse; on 304 its content is the cached body and
+        ``from_cache`` is True. HTTP errors raise as with fetch_session.fetch.
+        """
+        conditional = self.conditional_headers(url)
+        response = self._session().fetch(url, timeout=timeout, headers=conditional)
+        if response.status_code == 304 and conditional:
+            body = self.body(url)
+            self._count("hits")
+            self._count("bytes_saved", len(body))
+            return FetchResponse(url, 200, response.headers, body, response.wire_bytes,
+                                 from_cache=True)
+        response.raise_for_status()
+        self._count("misses")
+        tmp = self._paths(url)[0] + f".{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(response.content)
+        self._store(url, response.headers, tmp, len(response.content))
+        return response
+
+    def iter_chunks(self, url, timeout=30, chunk_size=DEFAULT_CHUNK_SIZE, meta=None):
+        """Streaming counterpart of ``fetch``: yields body chunks
+
+        A 304 replays the cached body from disk. A 200 is written to the
+        cache while it streams; a download stopped early is not stored.
+        ``meta`` (a dict) receives ``from_cache``.
+        """
+        conditional = self.conditional_headers(url)
+        info = {}
+        chunks = self._session().iter_chunks(url, timeout=timeout, chunk_size=chunk_size,
+                                             headers=conditional, meta=info)
+        tmp = self._paths(url)[0] + f".{threading.get_ident()}.tmp"
+        out = None
+        complete = False
+        size = 0
+        try:
+            for chunk in chunks:
+                if out is None:
+                    out = open(tmp, "wb")
+                out.write(chunk)
+                size += len(chunk)
+                yield chunk
+            complete = True
+        finally:
+            chunks.close()
+            if out is not None:
+                out.close()
+                if complete:
+                    self._store(url, info.get("headers", {}), tmp, size)
+                else:
+                    os.remove(tmp)
+
+        if info.get("status_code") == 304 and conditional:
+            if meta is not None:
+                meta["from_cache"] = True
+            self._count("hits")
+            with open(self._paths(url)[0], "rb") as f:
+                while True:
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        break
+                    self._count("bytes_saved", len(chunk))
+                    yield chunk
+        else:
+            self._count("misses")
+            if meta is not None:
+                meta["from_cache"] = False
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith((".body", ".json", ".tmp")):
+                os.remove(os.path.join(self.directory, name))
+
+
+def run_benchmark(sources=24, payload_kb=512):
+    import tempfile
+
+    from fetch_session import FetchSession
+    from source_farm import SourceFarm
+    from source_fetcher import fetch_sources
+
+    with tempfile.TemporaryDirectory() as tmp, SourceFarm(sources, payload_kb) as farm:
+        session = FetchSession()
+        cache = SourceCache(tmp, session=session)
+        urls = farm.urls()
+        # One source has no validators; another changes between sweeps
+        urls[2] += "?validators=0"
+        print(f"[BENCH] {len(urls)} farm sources x {payload_kb} KB, two sweeps")
+
+        def fetch_one(url, timeout=30):
+            response = cache.fetch(url, timeout=timeout)
+            return True, len(response.content), "cache" if response.from_cache else "network", 0
+
+        for sweep_no in (1, 2):
+            farm.reset_stats()
+            start = time.perf_counter()
+            results = fetch_sources(urls, fetch_one, host_interval=0)
+            elapsed = time.perf_counter() - start
+            cached = [url for url, r in zip(urls, results) if r[2] == "cache"]
+            print(f"   sweep {sweep_no}: {len(cached)}/{len(urls)} from cache, "
+                  f"{farm.stats['bytes_sent'] / 1e6:.2f} MB transferred, {elapsed:.2f} s")
+            if sweep_no == 2:
+                for url, r in zip(urls, results):
+                    print(f"      [{r[2].upper():7s}] {url}")
+            farm.touch(urls[1])
+        session.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        run_benchmark(*(int(x) for x in sys.argv[2:4]))
+    elif len(sys.argv) > 1 and sys.argv[1] == "--clear":
+        SourceCache(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CACHE_DIR).clear()
+    else:
+        print("Usage: source_cache.py --bench [SOURCES] [PAYLOAD_KB] | --clear [DIR]")
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Local HTTP source farm for offline download tests
+Serves deterministic subscription payloads (plain URI lists, base64
+blobs, Clash YAML and v2ray JSON) from 127.0.0.1 so the sweep scripts and
+throughput benchmarks give the same answer on every run. Recorded payloads
+can be served as-is from a fixtures directory, and every source can be
+made slow, throttled, truncated, hung, or answered with 404/429.
+
+Faults are set per URL through the query string:
+    latency=<s>     delay before the response headers
+    rate=<bytes/s>  throttle the body
+    truncate=<f>    close the connection after this fraction of the body
+    hang=<s>        send nothing for <s> seconds (client timeout)
+    status=<code>   answer 404, 429 (with Retry-After) or any other code
+    size=<KB>       payload size for generated fixtures
+    revision=<n>    change the ETag (as if the source was updated; see touch())
+    validators=0    send no ETag/Last-Modified
+
+Sources answer If-None-Match / If-Modified-Since with 304 like
+raw.githubusercontent.com does.
+
+Run with --serve to keep a farm up for the sweep scripts, or --bench for
+a buffered vs streaming throughput run at a chosen scale.
+"""
+
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+from uri_parser import make_synthetic_uris, parse
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+FIXTURE_KINDS = ("plain", "base64", "clash", "v2ray")
+FIXTURE_EXTENSIONS = {"plain": "txt", "base64": "txt", "clash": "yaml", "v2ray": "json"}
+FIXTURE_TYPES = {"txt": "text/plain; charset=utf-8", "yaml": "text/yaml; charset=utf-8",
+                 "json": "application/json"}
+DEFAULT_PAYLOAD_KB = 256
+THROTTLE_SLICES = 20
+
+# Fault mix for farm.urls(faults=True): fraction of sources per fault
+DEFAULT_FAULT_PLAN = (
+    ("latency=0.5", 0.10),
+    ("rate=262144", 0.10),
+    ("truncate=0.5", 0.05),
+    ("hang=60", 0.05),
+    ("status=404", 0.05),
+    ("status=429", 0.05),
+)
+
+
+# ─── Fixtures ───
+
+def _clash_proxy(cfg, name):
+    lines = [f"  - name: \"{name}\"",
+             f"    type: {'ss' if cfg.protocol == 'shadowsocks' else cfg.protocol}",
+             f"    server: {cfg.address}",
+             f"    port: {cfg.port}"]
+    if cfg.protocol in ("vmess", "vless"):
+        lines.append(f"    uuid: {cfg.uuid}")
+    elif cfg.protocol == "shadowsocks":
+        lines.append(f"    cipher: {cfg.encryption or 'aes-256-gcm'}")
+        lines.append(f"    password: {cfg.uuid}")
+    else:
+        lines.append(f"    password: {cfg.uuid}")
+    if cfg.network and cfg.network != "tcp":
+        lines.append(f"    network: {cfg.network}")
+    if cfg.is_tls():
+        lines.append("    tls: true")
+        if cfg.sni:
+            lines.append(f"    servername: {cfg.sni}")
+    return "\n".join(lines)
+
+
+def _v2ray_outbound(cfg, tag):
+    if cfg.protocol == "shadowsocks":
+        settings = {"servers": [{"address": cfg.address, "port": cfg.port,
+                                 "method": cfg.encryption or "aes-256-gcm",
+                                 "password": cfg.uuid}]}
+    elif cfg.protocol == "trojan":
+        settings = {"servers": [{"address": cfg.address, "port": cfg.port,
+                                 "password": cfg.uuid}]}
+    else:
+        settings = {"vnext": [{"address": cfg.address, "port": cfg.port,
+                               "users": [{"id": cfg.uuid}]}]}
+    stream = {"network": cfg.network or "tcp", "security": cfg.security or "none"}
+    if cfg.path:
+        stream["wsSettings"] = {"path": cfg.path, "headers": {"Host": cfg.host}}
+    return {"tag": tag, "protocol": cfg.protocol, "settings": settings,
+            "streamSettings": stream}
+
+
+def make_fixture(kind, index=0, size_kb=DEFAULT_PAYLOAD_KB):
+    """Deterministic payload of roughly ``size_kb`` KB for one source"""
+    target = size_kb * 1024
+    seed = index * 7919 + FIXTURE_KINDS.index(kind)
+    batch = make_synthetic_uris(max(8, target // 150), seed=seed)
+    if kind in ("plain", "base64"):
+        lines = []
+        size = 0
+        while size < (target * 3 // 4 if kind == "base64" else target):
+            for uri in batch:
+                lines.append(uri)
+                size += len(uri) + 1
+        text = "\n".join(lines) + "\n"
+        if kind == "base64":
+            return base64.b64encode(text.encode())
+        return text.encode()
+
+    configs = [cfg for cfg in map(parse, batch) if cfg is not None and cfg.protocol != "tuic"]
+    if kind == "clash":
+        parts = ["port: 7890", "socks-port: 7891", "mode: rule", "proxies:"]
+        size = 60
+        i = 0
+        while size < target:
+            block = _clash_proxy(configs[i % len(configs)], f"node-{i}")
+            parts.append(block)
+            size += len(block) + 1
+            i += 1
+        return ("\n".join(parts) + "\n").encode()
+
+    # v2ray JSON, shaped like v2fly's release config.json plus outbounds
+    outbounds = []
+    size = 200
+    i = 0
+    while size < target:
+        outbound = _v2ray_outbound(configs[i % len(configs)], f"proxy-{i}")
+        outbounds.append(outbound)
+        size += len(json.dumps(outbound)) + 2
+        i += 1
+    outbounds.append({"protocol": "freedom", "settings": {}})
+    doc = {"log": {"loglevel": "warning"},
+           "inbounds": [{"port": 1080, "listen": "127.0.0.1", "protocol": "socks",
+                         "settings": {"auth": "noauth", "udp": False}}],
+           "outbounds": outbounds}
+    return json.dumps(doc, indent=2).encode()
+
+
+# ─── Server ───
+
+class _FarmHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "HunterSourceFarm/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.farm._count("connections")
+
+    def do_GET(self):
+        farm = self.server.farm
+        farm._count("requests")
+        parts = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+
+        latency = float(query.get("latency", 0) or 0)
+        hang = float(query.get("hang", 0) or 0)
+        if hang and farm._stopping.wait(hang):
+            return
+        if latency:
+            time.sleep(latency)
+
+        status = int(query.get("status", 200) or 200)
+        if status != 200:
+            body = f"{status} {self.responses.get(status, ('',))[0]}\n".encode()
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", query.get("retry_after", "1"))
+            self.send_header("Content-Type", "text/plain")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self._write(body)
+            return
+
+        encoding = farm.pick_encoding(self.headers.get("Accept-Encoding", ""))
+        body, content_type = farm.payload(parts.path, int(query.get("size", 0) or 0), encoding)
+        if body is None:
+            self.send_error(404, "No such fixture")
+            return
+        etag = farm.etag(parts.path, body, query)
+        if farm.not_modified(self.headers, etag):
+            farm._count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", farm.last_modified)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", farm.last_modified)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        truncate = float(query.get("truncate", 0) or 0)
+        if truncate:
+            body = body[:int(len(body) * truncate)]
+            self.close_connection = True
+        rate = float(query.get("rate", 0) or 0)
+        if rate:
+            step = max(1, int(rate / THROTTLE_SLICES))
+            for pos in range(0, len(body), step):
+                if not self._write(body[pos:pos + step]):
+                    return
+                time.sleep(1.0 / THROTTLE_SLICES)
+        else:
+            self._write(body)
+
+    def _write(self, data):
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+            return False
+        self.server.farm._count("bytes_sent", len(data))
+        return True
+
+
+class SourceFarm:
+    """In-process HTTP server hosting generated and recorded source payloads
+
+    Use as a context manager; ``urls()`` returns source URLs for the sweep
+    scripts. Payloads are generated once per (path, size) and cached.
+    """
+
+    def __init__(self, sources=6, payload_kb=DEFAULT_PAYLOAD_KB, fixtures_dir=None,
+                 host="127.0.0.1", port=0, compress=True):
+        self.sources = sources
+        self.payload_kb = payload_kb
+        self.fixtures_dir = fixtures_dir
+        self.compress = compress
+        self.started = time.time()
+        self.last_modified = formatdate(self.started, usegmt=True)
+        self.stats = {"connections": 0, "requests": 0, "bytes_sent": 0, "not_modified": 0}
+        self._cache = {}
+        self._revisions = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), _FarmHandler)
+        self._server.daemon_threads = True
+        self._server.farm = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="source-farm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def etag(self, path, body, query):
+        """Strong ETag for a served body, or "" when validators are disabled"""
+        if query.get("validators") == "0":
+            return ""
+        digest = hashlib.sha1(body).hexdigest()[:16]
+        revision = int(query.get("revision", 0) or 0) + self._revisions.get(path, 0)
+        return f'"{digest}-{revision}"'
+
+    def touch(self, url):
+        """Mark a source as updated: its ETag changes from the next request on"""
+        path = urlsplit(url).path
+        with self._lock:
+            self._revisions[path] = self._revisions.get(path, 0) + 1
+
+    def not_modified(self, headers, etag):
+        """True when the request's validators still match (304)"""
+        if not etag:
+            return False
+        if_none_match = headers.get("If-None-Match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match == "*"
+        if_modified_since = headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= int(self.started)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def pick_encoding(self, accept_encoding):
+        """Content-Encoding to answer with for an Accept-Encoding header"""
+        if not self.compress:
+            return ""
+        offered = {token.split(";")[0].strip().lower() for token in accept_encoding.split(",")}
+        if "br" in offered and brotli is not None:
+            return "br"
+        return "gzip" if "gzip" in offered else ""
+
+    def payload(self, path, size_kb=0, encoding=""):
+        """(body, content type) for a request path, or (None, None)"""
+        key = (path, size_kb, encoding)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        if encoding:
+            body, content_type = self.payload(path, size_kb)
+            if body is None:
+                return None, None
+            if encoding == "br":
+                body = brotli.compress(body, quality=5)
+            else:
+                body = gzip.compress(body, compresslevel=6, mtime=0)
+            result = (body, content_type)
+        else:
+            result = self._load(path, size_kb or self.payload_kb)
+        if result[0] is not None:
+            with self._lock:
+                self._cache[key] = result
+        return result
+
+    def _load(self, path, size_kb):
+        segments = [s for s in path.split("/") if s]
+        if len(segments) >= 2 and segments[0] == "recorded" and self.fixtures_dir:
+            name = os.path.basename("/".join(segments[1:]))
+            file_path = os.path.join(self.fixtures_dir, name)
+            if os.path.isfile(file_path):
+                ext = name.rsplit(".", 1)[-1]
+                with open(file_path, "rb") as f:
+                    return f.read(), FIXTURE_TYPES.get(ext, "text/plain; charset=utf-8")
+            return None, None
+        if len(segments) != 2 or segments[0] not in FIXTURE_KINDS:
+            return None, None
+        stem, _, ext = segments[1].partition(".")
+        if not stem.isdigit():
+            return None, None
+        body = make_fixture(segments[0], int(stem), size_kb)
+        return body, FIXTURE_TYPES.get(ext, "text/plain; charset=utf-8")
+
+    def url(self, kind, index, **faults):
+        query = "&".join(f"{k}={quote(str(v))}" for k, v in faults.items())
+        return f"{self.base_url}/{kind}/{index}.{FIXTURE_EXTENSIONS[kind]}" + (
+            f"?{query}" if query else "")
+
+    def urls(self, faults=False, seed=5):
+        """Source URLs cycling through the fixture kinds
+
+        With ``faults=True`` a deterministic share of the sources gets one
+        of the DEFAULT_FAULT_PLAN faults appended.
+        """
+        rng = random.Random(seed)
+        result = []
+        for i in range(self.sources):
+            url = self.url(FIXTURE_KINDS[i % len(FIXTURE_KINDS)], i)
+            if faults:
+                roll = rng.random()
+                for fault, share in DEFAULT_FAULT_PLAN:
+                    if roll < share:
+                        url += f"?{fault}"
+                        break
+                    roll -= share
+            result.append(url)
+        if self.fixtures_dir and os.path.isdir(self.fixtures_dir):
+            for name in sorted(os.listdir(self.fixtures_dir)):
+                result.append(f"{self.base_url}/recorded/{quote(name)}")
+        return result
+
+
+def record_fixtures(urls, fixtures_dir, timeout=30):
+    """Download live sources once into ``fixtures_dir`` for offline replay"""
+    import requests
+
+    from fetch_session import fetch
+
+    os.makedirs(fixtures_dir, exist_ok=True)
+    saved = []
+    for i, url in enumerate(urls):
+        name = f"{i:02d}_" + (urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1] or "index.txt")
+        try:
+            response = fetch(url, timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            print(f"[RECORD] [FAIL] {url}: {e}")
+            continue
+        with open(os.path.join(fixtures_dir, name), "wb") as f:
+            f.write(response.content)
+        print(f"[RECORD] [OK] {url} -> {name} ({len(response.content):,} bytes)")
+        saved.append(name)
+    return saved
+
+
+# ─── Sweep script integration ───
+
+def add_farm_arguments(parser):
+    """Add --farm/--farm-size/--farm-faults/--fixtures to a sweep script's parser"""
+    parser.add_argument("--farm", type=int, metavar="N",
+                        help="sweep N sources on a local source farm instead of the live URLs")
+    parser.add_argument("--farm-size", type=int, default=DEFAULT_PAYLOAD_KB, metavar="KB",
+                        help=f"payload size per farm source (default: {DEFAULT_PAYLOAD_KB})")
+    parser.add_argument("--farm-faults", action="store_true",
+                        help="inject latency, throttling, truncation, hangs and 404/429")
+    parser.add_argument("--fixtures", metavar="DIR",
+                        help="also serve recorded payloads from DIR")
+    parser.add_argument("--farm-port", type=int, default=0, metavar="PORT",
+                        help="fixed farm port, so URLs (and cache keys) repeat across runs")
+
+
+def farm_from_args(args):
+    """Start a SourceFarm for the parsed arguments, or return None"""
+    if not args.farm and not args.fixtures:
+        return None
+    farm = SourceFarm(args.farm or 0, args.farm_size, args.fixtures, port=args.farm_port).start()
+    print(f"[FARM] {len(farm.urls())} sources x {args.farm_size} KB at {farm.base_url}"
+          f"{' with faults' if args.farm_faults else ''}")
+    return farm
+
+
+# ─── Benchmark ───
+
+def _buffered_fetch(url, timeout=30):
+    from config_scanner import is_valid_config_content, scan_config_content
+    from fetch_session import fetch
+
+    response = fetch(url, timeout=timeout)
+    scan = scan_config_content(response.content)
+    ok, message = is_valid_config_content(response.content, scan=scan)
+    return ok, scan.size, message, scan.config_count if ok else 0
+
+
+def _streaming_fetch(url, timeout=30):
+    from source_fetcher import stream_source
+
+    counter = stream_source(url, timeout=timeout)
+    ok, message = counter.verdict()
+    return ok, counter.size, message, counter.result().config_count if ok else 0
+
+
+def run_benchmark(sources=32, payload_kb=1024, faults=False):
+    from source_fetcher import fetch_sources
+
+    with SourceFarm(sources, payload_kb) as farm:
+        urls = farm.urls(faults=faults)
+        print(f"[BENCH] {len(urls)} farm sources x {payload_kb} KB"
+              f"{' with faults' if faults else ''}")
+        for label, fetch_one in (("buffered", _buffered_fetch), ("streaming", _streaming_fetch)):
+            farm.reset_stats()
+            start = time.perf_counter()
+            results = fetch_sources(urls, fetch_one, per_host=8, host_interval=0,
+                                    timeout=5, deadline=60)
+            elapsed = time.perf_counter() - start
+            ok = sum(1 for r in results if r[0])
+            size = sum(r[1] for r in results)
+            configs = sum(r[3] for r in results)
+            print(f"   {label:9s}: {ok}/{len(urls)} ok, {configs:,} configs, "
+                  f"{size / 1e6:.1f} MB in {elapsed:.2f} s ({size / 1e6 / elapsed:.1f} MB/s), "
+                  f"{farm.stats['connections']} connections")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP source farm")
+    parser.add_argument("--serve", action="store_true", help="serve until interrupted")
+    parser.add_argument("--bench", action="store_true", help="run a throughput benchmark")
+    parser.add_argument("--sources", type=int, default=32)
+    parser.add_argument("--size", type=int, default=DEFAULT_PAYLOAD_KB, metavar="KB")
+    parser.add_argument("--faults", action="store_true")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--fixtures", metavar="DIR")
+    parser.add_argument("--record", nargs="+", metavar="URL",
+                        help="download live URLs into --fixtures DIR")
+    args = parser.parse_args()
+
+    if args.record:
+        record_fixtures(args.record, args.fixtures or "fixtures")
+    elif args.bench:
+        run_benchmark(args.sources, args.size, args.faults)
+    elif args.serve:
+        with SourceFarm(args.sources, args.size, args.fixtures, port=args.port) as farm:
+            print(f"[FARM] serving at {farm.base_url}")
+            for url in farm.urls(faults=args.faults):
+                print(url)
+            try:
+                while True:
+                    time.sleep(3600)
+            except KeyboardInterrupt:
+                pass
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
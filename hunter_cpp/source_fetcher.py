@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Concurrent download engine for the source sweep scripts
+Runs the blocking per-source download on a bounded pool with per-host
+politeness limits and a global deadline, so a full sweep takes about as
+long as the slowest single source instead of the sum of all of them
+"""
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlsplit
+
+from config_scanner import StreamingConfigCounter
+from fetch_session import DEFAULT_CHUNK_SIZE, get_session
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PER_HOST = 4
+DEFAULT_HOST_INTERVAL = 0.2
+DEFAULT_TIMEOUT = 30
+DEFAULT_DEADLINE = 120.0
+
+
+def host_of(url):
+    """Return the lowercase host a source URL points at"""
+    return (urlsplit(url).hostname or "").lower()
+
+
+def stream_source(url, timeout=DEFAULT_TIMEOUT, max_configs=None,
+                  chunk_size=DEFAULT_CHUNK_SIZE, headers=None, cache=None, meta=None,
+                  uri_sink=None, decoder=None, session=None):
+    """Download a source in chunks, classifying config lines as they arrive
+
+    Returns the StreamingConfigCounter after the body is exhausted or
+    ``max_configs`` config lines were seen, whichever comes first. Raises
+    the usual requests exceptions on HTTP or network failure. Uses the
+    shared FetchSession, so the connection goes back to the pool; with a
+    SourceCache the source is revalidated and ``meta["from_cache"]`` says
+    whether the body was replayed from disk. ``uri_sink`` receives each
+    proxy URI line (see StreamingConfigCounter). A PayloadDecoder passed as
+    ``decoder`` takes over the scan: the counter only tracks size, its
+    samples are the first decoded URIs, ``max_configs`` applies to
+    ``decoder.uris`` (whole-document JSON only yields URIs once complete,
+    so it is always read to the end) and the decoder is closed at the end. ``session``
+    replaces the shared FetchSession (e.g. a proxy_pool.ProxyPool).
+    """
+    counter = StreamingConfigCounter(max_configs=max_configs, uri_sink=uri_sink)
+    if cache is not None:
+        chunks = cache.iter_chunks(url, timeout=timeout, chunk_size=chunk_size, meta=meta)
+    else:
+        chunks = (session or get_session()).iter_chunks(url, timeout=timeout,
+                                                        chunk_size=chunk_size, headers=headers)
+    if decoder is not None:
+        sink = decoder.uri_sink
+
+        def sample(uri):
+            if len(counter.samples) < counter.sample_limit:
+                counter.samples.append(uri)
+            if sink is not None:
+                sink(uri)
+
+        decoder.uri_sink = sample
+    try:
+        try:
+            for chunk in chunks:
+                if decoder is None:
+                    if counter.feed(chunk):
+                        break
+                    continue
+                counter.skip(chunk)
+                decoder.feed(chunk)
+                if max_configs and decoder.uris >= max_configs:
+                    counter.truncated = True
+                    break
+        finally:
+            chunks.close()
+        counter.close()
+        if decoder is not None:
+            decoder.close()
+    finally:
+        if decoder is not None:
+            decoder.uri_sink = sink
+    return counter
+
+
+def failed_result(message):
+    """Result tuple for a source that never produced a download"""
+    return False, 0, message, 0
+
+
+def _run_detached(loop, fn):
+    """Loop future for ``fn()`` run on its own daemon thread
+
+    A thread still running when the sweep gives up on it is left alone:
+    being a daemon it cannot keep the interpreter alive, unlike a
+    ThreadPoolExecutor worker, which is joined at exit.
+    """
+    future = loop.create_future()
+
+    def deliver(result, error):
+        if not future.done():
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def run():
+        result = error = None
+        try:
+            result = fn()
+        except Exception as e:
+            error = e
+        try:
+            loop.call_soon_threadsafe(deliver, result, error)
+        except RuntimeError:
+            pass        # loop closed: the sweep already reported a deadline
+
+    threading.Thread(target=run, name="source-fetch", daemon=True).start()
+    return future
+
+
+class _HostGate:
+    """Caps in-flight requests per host and spaces out their start times"""
+
+    def __init__(self, per_host, min_interval):
+        self.per_host = max(1, per_host)
+        self.min_interval = max(0.0, min_interval)
+        self._slots = {}
+        self._locks = {}
+        self._next_start = {}
+
+    def slot(self, host):
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(self.per_host)
+            self._locks[host] = asyncio.Lock()
+            self._next_start[host] = 0.0
+        return self._slots[host]
+
+    async def wait_turn(self, host):
+        loop = asyncio.get_running_loop()
+        async with self._locks[host]:
+            delay = self._next_start[host] - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start[host] = loop.time() + self.min_interval
+
+
+async def fetch_sources_async(sources, fetch_one, concurrency=DEFAULT_CONCURRENCY,
+                              per_host=DEFAULT_PER_HOST,
+                              host_interval=DEFAULT_HOST_INTERVAL,
+                              timeout=DEFAULT_TIMEOUT, deadline=DEFAULT_DEADLINE):
+    """Download all sources concurrently and return their result tuples
+
+    ``fetch_one(url, timeout=...)`` is the existing blocking downloader (e.g.
+    ``test_download_from_source``) and must return
+    ``(success, size, message, config_count)``. Results come back in the
+    same order as ``sources``; anything still running when ``deadline``
+    seconds have passed is reported as failed. Each download gets at most
+    the time left before the deadline as its timeout, and runs on a daemon
+    thread: one still going at the deadline is abandoned (it ends when its
+    socket timeout fires) and never blocks the process from exiting.
+    """
+    sources = list(sources)
+    if not sources:
+        return []
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    pool = asyncio.Semaphore(max(1, concurrency))
+    gate = _HostGate(per_host, host_interval)
+
+    async def run_one(url):
+        host = host_of(url)
+        async with gate.slot(host):
+            async with pool:
+                await gate.wait_turn(host)
+                remaining = deadline - (loop.time() - started)
+                if remaining <= 0:
+                    return failed_result("Deadline exceeded")
+                per_request = max(1, min(timeout, remaining))
+                try:
+                    return await _run_detached(loop, lambda: fetch_one(url, timeout=per_request))
+                except Exception as e:
+                    return failed_result(str(e))
+
+    tasks = [asyncio.ensure_future(run_one(url)) for url in sources]
+    try:
+        await asyncio.wait(tasks, timeout=deadline)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    results = []
+    for task in tasks:
+        if task.cancelled() or not task.done():
+            results.append(failed_result("Deadline exceeded"))
+        elif task.exception() is not None:
+            results.append(failed_result(str(task.exception())))
+        else:
+            results.append(task.result())
+    return results
+
+
+def fetch_sources(sources, fetch_one, **kwargs):
+    """Blocking wrapper around fetch_sources_async for the sweep scripts"""
+    return asyncio.run(fetch_sources_async(sources, fetch_one, **kwargs))
+
+
+def sweep(sources, fetch_one, **kwargs):
+    """Run a concurrent sweep and print per-source lines in source order
+
+    Returns the result tuples plus the wall-clock time of the sweep.
+    """
+    start = time.perf_counter()
+    results = fetch_sources(sources, fetch_one, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n[SWEEP] {len(sources)} sources in {elapsed:.1f}s")
+    for i, (source, result) in enumerate(zip(sources, results), 1):
+        status = "[OK]" if result[0] else "[FAIL]"
+        print(f"[SOURCE] {i}/{len(sources)} {status} {source}")
+    return results, elapsed
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Cross-source endpoint overlap and marginal-yield ranking
+FlexibleFetcher::getSourceRankings only counts successes and failures, so
+mirrored sources look as good as original ones. This stage sketches the
+endpoints (ConfigDatabase::hashUri keys, see endpoint_index.py) of every
+downloaded payload with MinHash and HyperLogLog, estimates pairwise
+overlap, then greedily orders sources by new endpoints per byte
+downloaded. Sources whose marginal yield falls below a threshold are
+dropped; the rest is printed (or written) one URL per line, ready for
+``github_urls``.
+
+Run with --bench for a synthetic 20-source sweep with mirrors, comparing
+the sketch estimates with exact set arithmetic.
+"""
+
+import argparse
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from config_db import endpoint_digest
+from payload_decoder import decode_uris
+
+MINHASH_PERMUTATIONS = 128
+HLL_PRECISION = 12
+DEFAULT_MIN_NEW = 50          # endpoints a kept source must add
+DEFAULT_MIN_YIELD = 1.0       # new endpoints per MB downloaded
+SKETCH_BLOCK = 8192           # endpoints per MinHash block (permutations x block uint64s)
+
+_U64 = np.uint64
+_MIX1 = _U64(0xbf58476d1ce4e5b9)
+_MIX2 = _U64(0x94d049bb133111eb)
+
+SourceRank = namedtuple("SourceRank", [
+    "source",       # source URL or name
+    "size",         # bytes downloaded
+    "endpoints",    # estimated unique endpoints in the source
+    "new",          # estimated endpoints not covered by earlier-ranked sources
+    "per_mb",       # new endpoints per MB downloaded
+    "kept",         # above both thresholds
+])
+
+
+def _mix64(values):
+    """splitmix64 finaliser over a uint64 array (wraps mod 2**64)"""
+    with np.errstate(over="ignore"):
+        values = (values ^ (values >> _U64(30))) * _MIX1
+        values = (values ^ (values >> _U64(27))) * _MIX2
+        return values ^ (values >> _U64(31))
+
+
+def endpoint_hashes(content):
+    """Sorted unique uint64 endpoint hashes (hashUri as an integer) of a payload"""
+    keys = [int.from_bytes(endpoint_digest(uri)[:8], "big") for uri in decode_uris(content)]
+    return np.unique(np.array(keys, dtype=np.uint64))
+
+
+def _bit_length(values):
+    """Per-element bit length of a uint64 array"""
+    length = np.zeros(values.shape, dtype=np.int64)
+    values = values.copy()
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= (_U64(1) << _U64(shift))
+        length[high] += shift
+        values[high] >>= _U64(shift)
+    return length + (values > 0)
+
+
+class SourceSketch:
+    """MinHash signature and HyperLogLog registers of one source's endpoints
+
+    Both are built from the same uint64 hashes. MinHash gives Jaccard
+    similarity between two sources; HLL registers merge by maximum, so the
+    size of any union of sources can be estimated without the URIs.
+    """
+
+    def __init__(self, source, hashes, size=0, permutations=MINHASH_PERMUTATIONS,
+                 precision=HLL_PRECISION):
+        self.source = source
+        self.size = size
+        self.count = len(hashes)
+        self.precision = precision
+        mixed = _mix64(hashes)
+        seeds = _mix64(np.arange(1, permutations + 1, dtype=np.uint64))
+        # One mixed hash XOR a per-permutation seed, then re-mixed; done in
+        # column blocks so memory stays at permutations x SKETCH_BLOCK
+        self.signature = np.full(permutations, np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(mixed), SKETCH_BLOCK):
+            block = mixed[None, start:start + SKETCH_BLOCK] ^ seeds[:, None]
+            np.minimum(self.signature, _mix64(block).min(axis=1), out=self.signature)
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+        if len(mixed):
+            index = (mixed >> _U64(64 - precision)).astype(np.int64)
+            rest = (mixed << _U64(precision)) >> _U64(precision)
+            rank = (64 - precision) - _bit_length(rest) + 1
+            np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    @classmethod
+    def from_content(cls, source, content, **kwargs):
+        return cls(source, endpoint_hashes(content), size=len(content), **kwargs)
+
+    def jaccard(self, other):
+        return float(np.mean(self.signature == other.signature))
+
+    def cardinality(self):
+        return hll_cardinality(self.registers)
+
+
+def hll_cardinality(registers):
+    """HyperLogLog estimate with the small-range (linear counting) correction"""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = int(np.count_nonzero(registers == 0))
+    if estimate <= 2.5 * m and zeros:
+        estimate = m * np.log(m / zeros)
+    return float(estimate)
+
+
+def overlap_matrix(sketches):
+    """Pairwise Jaccard estimates (MinHash) as a square float array"""
+    signatures = np.stack([s.signature for s in sketches])
+    matrix = np.empty((len(sketches), len(sketches)))
+    for i, row in enumerate(signatures):
+        matrix[i] = np.mean(signatures == row, axis=1)
+    return matrix
+
+
+def rank_sources(sketches, min_new=DEFAULT_MIN_NEW, min_yield=DEFAULT_MIN_YIELD):
+    """Greedy marginal-yield order: repeatedly take the source adding most
+    new endpoints (HLL union estimate) per MB downloaded
+
+    Sources adding fewer than ``min_new`` endpoints or ``min_yield`` per MB
+    are marked dropped, as are kept sources made redundant by later picks.
+    """
+    remaining = list(sketches)
+    covered = np.zeros(1 << sketches[0].precision, dtype=np.uint8) if sketches else None
+    covered_count = 0.0
+    ranking = []
+    while remaining:
+        best = None
+        for sketch in remaining:
+            union = hll_cardinality(np.maximum(covered, sketch.registers))
+            new = max(0.0, union - covered_count) if sketch.count else 0.0
+            per_mb = new / max(sketch.size / 1e6, 1e-6)
+            if best is None or per_mb > best[2]:
+                best = (sketch, new, per_mb, union)
+        sketch, new, per_mb, union = best
+        remaining.remove(sketch)
+        kept = new >= min_new and per_mb >= min_yield
+        if kept:
+            np.maximum(covered, sketch.registers, out=covered)
+            covered_count = union
+        ranking.append(SourceRank(sketch.source, sketch.size, sketch.cardinality(),
+                                  new, per_mb, kept))
+
+    # A cheap subset mirror can be picked before the source it copies; drop
+    # kept sources that the other kept sources already cover
+    registers = {s.source: s.registers for s in sketches}
+    for i, rank in enumerate(ranking):
+        if not rank.kept:
+            continue
+        others = [registers[r.source] for r in ranking if r.kept and r is not rank]
+        rest = np.maximum.reduce(others) if others else np.zeros_like(covered)
+        loss = max(0.0, covered_count - hll_cardinality(rest))
+        if loss < min_new:
+            ranking[i] = rank._replace(new=loss, per_mb=loss / max(rank.size / 1e6, 1e-6),
+                                       kept=False)
+            covered_count = hll_cardinality(rest)
+    return ranking
+
+
+def print_report(sketches, ranking):
+    names = [f"S{i + 1}" for i in range(len(sketches))]
+    position = {s.source: n for s, n in zip(sketches, names)}
+    for sketch, name in zip(sketches, names):
+        print(f"   {name:>4} {sketch.source}")
+    matrix = overlap_matrix(sketches)
+    print("\n[OVERLAP] Jaccard (MinHash)")
+    print("      " + " ".join(f"{n:>5}" for n in names))
+    for name, row in zip(names, matrix):
+        print(f"{name:>5} " + " ".join(f"{v:5.2f}" for v in row))
+    print("\n[RANK] Marginal yield (HLL)")
+    for i, r in enumerate(ranking, 1):
+        status = "[KEEP]" if r.kept else "[DROP]"
+        print(f"{i:3d}. {status} {position[r.source]:>4} {r.size / 1e6:7.2f} MB "
+              f"{r.endpoints:9,.0f} endpoints {r.new:9,.0f} new {r.per_mb:10,.0f}/MB")
+
+
+def pruned_sources(ranking):
+    """Kept sources in marginal-yield order, for ``github_urls``"""
+    return [r.source for r in ranking if r.kept]
+
+
+def download_payloads(sources, cache_dir=None, timeout=30):
+    """Fetch every source concurrently; returns ``{url: content}`` for successes"""
+    from fetch_session import fetch
+    from source_fetcher import fetch_sources
+
+    cache = None
+    if cache_dir:
+        from source_cache import SourceCache
+        cache = SourceCache(cache_dir)
+    payloads = {}
+
+    def fetch_one(url, timeout=timeout):
+        response = cache.fetch(url, timeout=timeout) if cache else fetch(url, timeout=timeout)
+        payloads[url] = response.content
+        return True, len(response.content), "ok", 0
+
+    results = fetch_sources(sources, fetch_one, timeout=timeout)
+    for url, result in zip(sources, results):
+        if not result[0]:
+            print(f"[FAIL] {url}: {result[2]}")
+    return {url: payloads[url] for url in sources if url in payloads}
+
+
+def make_synthetic_sweep(originals=6, mirrors=14, per_source=12000, seed=5):
+    """Payloads for ``originals`` independent sources plus re-shuffled,
+    partially overlapping mirrors of them
+    """
+    import random
+
+    from uri_parser import make_synthetic_uris
+
+    rng = random.Random(seed)
+    pool = make_synthetic_uris(originals * per_source, seed=seed)
+    sources = []
+    for i in range(originals):
+        sources.append((f"original-{i}", pool[i * per_source:(i + 1) * per_source]))
+    for i in range(mirrors):
+        picks = rng.sample(range(originals), rng.choice((1, 1, 2)))
+        lines = []
+        for p in picks:
+            lines.extend(rng.sample(sources[p][1], int(per_source * rng.uniform(0.5, 1.0))))
+        if i % 3 == 0:
+            lines.extend(rng.sample(pool, per_source // 20))
+        rng.shuffle(lines)
+        sources.append((f"mirror-{i}", lines))
+    rng.shuffle(sources)
+    return [(name, ("\n".join(lines) + "\n").encode()) for name, lines in sources]
+
+
+def run_benchmark():
+    sweep = make_synthetic_sweep()
+    total = sum(content.count(b"\n") for _, content in sweep)
+    print(f"[BENCH] {len(sweep)} sources, {total:,} URIs, "
+          f"{sum(len(c) for _, c in sweep) / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    hashes = {name: endpoint_hashes(content) for name, content in sweep}
+    hashed = time.perf_counter() - start
+    start = time.perf_counter()
+    sketches = [SourceSketch(name, hashes[name], len(content)) for name, content in sweep]
+    matrix = overlap_matrix(sketches)
+    ranking = rank_sources(sketches)
+    sketched = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sets = [set(hashes[s.source].tolist()) for s in sketches]
+    exact = np.array([[len(a & b) / max(1, len(a | b)) for b in sets] for a in sets])
+    exacted = time.perf_counter() - start
+    print(f"   hashing {hashed:.2f} s, sketches+matrix+ranking {sketched:.2f} s, "
+          f"exact pairwise sets {exacted:.2f} s")
+    print(f"   Jaccard error: mean {np.abs(matrix - exact).mean():.3f}, "
+          f"max {np.abs(matrix - exact).max():.3f}")
+
+    kept = pruned_sources(ranking)
+    by_name = dict(sweep)
+    all_endpoints = set().union(*sets)
+    kept_endpoints = set().union(*(set(hashes[name].tolist()) for name in kept))
+    kept_bytes = sum(len(by_name[name]) for name in kept)
+    print(f"   kept {len(kept)}/{len(sweep)} sources: {len(kept_endpoints):,}/"
+          f"{len(all_endpoints):,} endpoints "
+          f"({len(kept_endpoints) / len(all_endpoints):.1%}) for "
+          f"{kept_bytes / sum(len(c) for _, c in sweep):.1%} of the bytes")
+
+
+def parse_args():
+    from source_farm import add_farm_arguments
+
+    parser = argparse.ArgumentParser(description="Source overlap and marginal-yield ranking")
+    parser.add_argument("sources", nargs="*", help="source URLs (default: read --sources-file)")
+    parser.add_argument("--sources-file", metavar="FILE",
+                        help="source URLs, one per line (e.g. the current github_urls)")
+    parser.add_argument("--cache", metavar="DIR",
+                        help="revalidate through a SourceCache directory")
+    parser.add_argument("--min-new", type=float, default=DEFAULT_MIN_NEW,
+                        help="drop sources adding fewer new endpoints than this")
+    parser.add_argument("--min-yield", type=float, default=DEFAULT_MIN_YIELD,
+                        help="drop sources adding fewer new endpoints per MB than this")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the pruned source list here, one URL per line")
+    parser.add_argument("--bench", action="store_true", help="run the synthetic benchmark")
+    add_farm_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    from source_farm import farm_from_args
+
+    args = parse_args()
+    if args.bench:
+        run_benchmark()
+        return 0
+    sources = list(args.sources)
+    if args.sources_file:
+        with open(args.sources_file, encoding="utf-8") as f:
+            sources += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    farm = farm_from_args(args)
+    try:
+        if farm is not None:
+            sources = sources or farm.urls(faults=args.farm_faults)
+        if not sources:
+            print("Usage: source_overlap.py URL ... | --sources-file FILE | --farm N | --bench")
+            return 2
+        payloads = download_payloads(sources, cache_dir=args.cache)
+    finally:
+        if farm is not None:
+            farm.stop()
+
+    sketches = [SourceSketch.from_content(url, content) for url, content in payloads.items()]
+    if not sketches:
+        print("[FAIL] No source downloaded")
+        return 1
+    ranking = rank_sources(sketches, min_new=args.min_new, min_yield=args.min_yield)
+    print_report(sketches, ranking)
+
+    kept = pruned_sources(ranking)
+    print(f"\n[PRUNED] {len(kept)}/{len(sources)} sources kept")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write("\n".join(kept) + "\n")
+        print(f"[SAVE] {args.output}")
+    else:
+        print("\n".join(kept))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Adaptive per-sweep source selection from runtime/sources_manager.tsv
+Instead of downloading a hard-coded URL list every time, each sweep picks
+the enabled sources of the sources table (the one SeedData writes and the
+Sources page edits) that are expected to add the most new endpoints per
+byte, until a bandwidth budget is used up, and runs them with enough
+concurrency to finish in the target sweep time.
+
+Every source keeps exponentially weighted estimates of its success rate,
+new endpoints per pull, bytes and seconds per pull. Selection is a
+discounted UCB bandit: the score is the estimated new endpoints per byte
+plus an exploration bonus that grows as a source's evidence ages (its
+weight halves every ``half_life`` seconds), so sources never pulled go
+first and skipped ones are retried now and then. The table's priority
+column scales the score and breaks ties; as in the UI, 1 is HIGH, 0 NORMAL
+and 2 LOW.
+
+After the sweep the results are written back the way
+ImGuiApp::ProcessDownloadHistory does: last_success_ts,
+total_configs_found (configs in the last download) and success_rate
+(percent) in sources_manager.tsv, one line per URL in source_history.tsv.
+The bandit state lives in source_scheduler.tsv next to them, since the
+UI rewrites the sources table with exactly its ten columns.
+
+Run with a runtime directory (or --farm) to plan and run a sweep, or
+--bench to compare with a fixed list on a simulated source population.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import threading
+import time
+
+from endpoint_index import EndpointIndex
+from fetch_session import fetch
+from payload_decoder import decode_uris
+from source_fetcher import fetch_sources_async
+
+SOURCES_FILE = "sources_manager.tsv"
+HISTORY_FILE = "source_history.tsv"
+STATE_FILE = "source_scheduler.tsv"
+SOURCES_HEADER = ("# enabled\tpriority\tcategory\tadded_ts\tlast_success_ts\t"
+                  "total_configs_found\tsuccess_rate\tname\tdescription\turl\n")
+HISTORY_HEADER = ("# url\tlast_download_ts\tlast_success\ttotal_downloads\t"
+                  "successful_downloads\tconfigs_found\tunique_configs\tlast_error\n")
+STATE_HEADER = "# url\tweight\tsuccess\tnew\tbytes\tseconds\tlast_pull_ts\tpulls\n"
+
+DEFAULT_ALPHA = 0.3             # weight of the newest observation
+DEFAULT_HALF_LIFE = 6 * 3600.0  # evidence age at which a source's weight halves
+DEFAULT_EXPLORATION = 1.0
+DEFAULT_BYTE_BUDGET = 32 * 1024 * 1024
+DEFAULT_TARGET_SECONDS = 60.0
+MIN_CONCURRENCY = 2
+MAX_CONCURRENCY = 16
+PRIOR_BYTES = 1024 * 1024       # size assumed for a source never downloaded
+PRIOR_SECONDS = 5.0
+PRIORITY_WEIGHT = {1: 1.25, 0: 1.0, 2: 0.75}   # HIGH, NORMAL, LOW as shown by the UI
+MIN_BYTES = 16 * 1024
+
+
+def _sanitize(value):
+    return str(value).replace("\t", " ").replace("\r", " ").replace("\n", " ")
+
+
+def _num(text, kind, default=0):
+    try:
+        return kind(text)
+    except ValueError:
+        return default
+
+
+def _ts(value):
+    """Timestamps as whole seconds (the C++ side writes %g, which loses them)"""
+    return str(int(value)) if value else "0"
+
+
+def priority_weight(priority):
+    """Score multiplier for the UI priority (unknown values count as NORMAL)"""
+    return PRIORITY_WEIGHT.get(priority, 1.0)
+
+
+def _atomic_write(path, header, lines):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="\n") as f:
+        f.write(header)
+        f.writelines(lines)
+    os.replace(tmp, path)
+
+
+def _rows(path):
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    yield line.split("\t")
+    except FileNotFoundError:
+        return
+
+
+class SourceRow:
+    """One row of sources_manager.tsv (ImGuiApp::SourceItem)"""
+
+    __slots__ = ("enabled", "priority", "category", "added_ts", "last_success_ts",
+                 "total_configs_found", "success_rate", "name", "description", "url")
+
+    def __init__(self, url, name="", enabled=True, priority=0, category="custom"):
+        self.enabled = enabled
+        self.priority = priority
+        self.category = category
+        self.added_ts = 0.0
+        self.last_success_ts = 0.0
+        self.total_configs_found = 0
+        self.success_rate = 0
+        self.name = name or url
+        self.description = ""
+        self.url = url
+
+    @classmethod
+    def from_columns(cls, cols):
+        """LoadSourceManager's parse; None for short or URL-less rows"""
+        if len(cols) < 10 or not cols[9]:
+            return None
+        row = cls(cols[9], cols[7], cols[0] == "1", _num(cols[1], int), cols[2])
+        row.added_ts = _num(cols[3], float)
+        row.last_success_ts = _num(cols[4], float)
+        row.total_configs_found = _num(cols[5], int)
+        row.success_rate = _num(cols[6], int)
+        row.description = cols[8]
+        return row
+
+    def to_line(self):
+        return "\t".join([
+            "1" if self.enabled else "0", str(self.priority), _sanitize(self.category),
+            _ts(self.added_ts), _ts(self.last_success_ts), str(self.total_configs_found),
+            str(self.success_rate), _sanitize(self.name), _sanitize(self.description),
+            self.url]) + "\n"
+
+
+class SourceHistory:
+    """One line of source_history.tsv (ImGuiApp::SourceHistory)"""
+
+    __slots__ = ("url", "last_download_ts", "last_success", "total_downloads",
+                 "successful_downloads", "configs_found", "unique_configs", "last_error")
+
+    def __init__(self, url):
+        self.url = url
+        self.last_download_ts = 0.0
+        self.last_success = False
+        self.total_downloads = 0
+        self.successful_downloads = 0
+        self.configs_found = 0
+        self.unique_configs = 0
+        self.last_error = ""
+
+    @classmethod
+    def from_columns(cls, cols):
+        if len(cols) < 7 or not cols[0]:
+            return None
+        entry = cls(cols[0])
+        entry.last_download_ts = _num(cols[1], float)
+        entry.last_success = cols[2] == "1"
+        entry.total_downloads = _num(cols[3], int)
+        entry.successful_downloads = _num(cols[4], int)
+        entry.configs_found = _num(cols[5], int)
+        entry.unique_configs = _num(cols[6], int)
+        entry.last_error = cols[7] if len(cols) > 7 else ""
+        return entry
+
+    def to_line(self):
+        return "\t".join([
+            self.url, _ts(self.last_download_ts), "1" if self.last_success else "0",
+            str(self.total_downloads), str(self.successful_downloads), str(self.configs_found),
+            str(self.unique_configs), _sanitize(self.last_error)]) + "\n"
+
+
+class SourceArm:
+    """Exponentially weighted pull statistics for one source"""
+
+    __slots__ = ("url", "weight", "success", "new", "bytes", "seconds", "last_pull_ts", "pulls")
+
+    def __init__(self, url):
+        self.url = url
+        self.weight = 0.0
+        self.success = 1.0
+        self.new = 0.0
+        self.bytes = float(PRIOR_BYTES)
+        self.seconds = PRIOR_SECONDS
+        self.last_pull_ts = 0.0
+        self.pulls = 0
+
+    @classmethod
+    def from_columns(cls, cols):
+        if len(cols) < 8 or not cols[0]:
+            return None
+        arm = cls(cols[0])
+        arm.weight, arm.success, arm.new, arm.bytes, arm.seconds, arm.last_pull_ts = (
+            _num(c, float) for c in cols[1:7])
+        arm.pulls = _num(cols[7], int)
+        return arm
+
+    def to_line(self):
+        return (f"{self.url}\t{self.weight:.4f}\t{self.success:.4f}\t{self.new:.2f}\t"
+                f"{self.bytes:.0f}\t{self.seconds:.3f}\t{_ts(self.last_pull_ts)}\t{self.pulls}\n")
+
+    def effective_weight(self, now, half_life):
+        if not self.pulls:
+            return 0.0
+        age = max(0.0, now - self.last_pull_ts)
+        return self.weight * 0.5 ** (age / half_life)
+
+    def update(self, success, size, seconds, new, now, alpha):
+        """Fold one pull in; a failed pull only moves the success rate"""
+        first = self.pulls == 0
+        self.pulls += 1
+        self.weight = self.weight * (1.0 - alpha) + 1.0
+        self.success = float(success) if first else (1 - alpha) * self.success + alpha * success
+        self.last_pull_ts = now
+        if not success:
+            return
+        if first or (self.new, self.bytes, self.seconds) == (0.0, PRIOR_BYTES, PRIOR_SECONDS):
+            # First successful pull replaces the priors outright
+            self.new, self.bytes, self.seconds = float(new), float(size), float(seconds)
+        else:
+            self.new = (1 - alpha) * self.new + alpha * new
+            self.bytes = (1 - alpha) * self.bytes + alpha * size
+            self.seconds = (1 - alpha) * self.seconds + alpha * seconds
+
+    def rate(self):
+        """Expected new endpoints per byte downloaded"""
+        return self.success * self.new / max(self.bytes, MIN_BYTES)
+
+
+class SweepPlan:
+    """Sources chosen for one sweep, best first, and the concurrency to use"""
+
+    __slots__ = ("urls", "concurrency", "predicted_bytes", "predicted_new", "predicted_seconds",
+                 "scores")
+
+    def __init__(self, urls, concurrency, predicted_bytes, predicted_new, predicted_seconds, scores):
+        self.urls = urls
+        self.concurrency = concurrency
+        self.predicted_bytes = predicted_bytes
+        self.predicted_new = predicted_new
+        self.predicted_seconds = predicted_seconds
+        self.scores = scores
+
+    def __repr__(self):
+        return (f"SweepPlan({len(self.urls)} sources, concurrency {self.concurrency}, "
+                f"~{self.predicted_bytes / 1e6:.1f} MB, ~{self.predicted_new:.0f} new)")
+
+
+class SourceScheduler:
+    """Bandit over the enabled rows of a sources table"""
+
+    def __init__(self, sources, history=None, arms=None, alpha=DEFAULT_ALPHA,
+                 half_life=DEFAULT_HALF_LIFE, exploration=DEFAULT_EXPLORATION,
+                 byte_budget=DEFAULT_BYTE_BUDGET, target_seconds=DEFAULT_TARGET_SECONDS,
+                 min_concurrency=MIN_CONCURRENCY, max_concurrency=MAX_CONCURRENCY):
+        self.sources = list(sources)
+        self.history = {h.url: h for h in history or ()}
+        self.arms = {a.url: a for a in arms or ()}
+        for row in self.sources:
+            self.arms.setdefault(row.url, SourceArm(row.url))
+        self.alpha = alpha
+        self.half_life = half_life
+        self.exploration = exploration
+        self.byte_budget = byte_budget
+        self.target_seconds = target_seconds
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.runtime_dir = None
+        self._lock = threading.Lock()
+
+    # ─── Files ───
+
+    @classmethod
+    def load(cls, runtime_dir, **kwargs):
+        sources = [r for r in map(SourceRow.from_columns, _rows(os.path.join(runtime_dir, SOURCES_FILE))) if r]
+        history = [h for h in map(SourceHistory.from_columns, _rows(os.path.join(runtime_dir, HISTORY_FILE))) if h]
+        arms = [a for a in map(SourceArm.from_columns, _rows(os.path.join(runtime_dir, STATE_FILE))) if a]
+        scheduler = cls(sources, history, arms, **kwargs)
+        scheduler.runtime_dir = runtime_dir
+        return scheduler
+
+    def save(self, runtime_dir=None):
+        runtime_dir = runtime_dir or self.runtime_dir
+        os.makedirs(runtime_dir, exist_ok=True)
+        with self._lock:
+            _atomic_write(os.path.join(runtime_dir, SOURCES_FILE), SOURCES_HEADER,
+                          [row.to_line() for row in self.sources])
+            _atomic_write(os.path.join(runtime_dir, HISTORY_FILE), HISTORY_HEADER,
+                          [h.to_line() for h in self.history.values()])
+            _atomic_write(os.path.join(runtime_dir, STATE_FILE), STATE_HEADER,
+                          [a.to_line() for a in self.arms.values()])
+
+    # ─── Planning ───
+
+    def scores(self, now=None):
+        """``{url: score}`` for every enabled source (inf = never pulled)"""
+        now = time.time() if now is None else now
+        enabled = [row for row in self.sources if row.enabled]
+        arms = [self.arms[row.url] for row in enabled]
+        weights = [arm.effective_weight(now, self.half_life) for arm in arms]
+        explored = sorted(arm.rate() for arm in arms if arm.pulls)
+        scale = explored[len(explored) // 2] if explored else 0.0
+        scale = scale or (max(explored) if explored else 0.0) or 1e-6
+        total = sum(weights)
+        result = {}
+        for row, arm, weight in zip(enabled, arms, weights):
+            if not arm.pulls:
+                result[row.url] = math.inf
+                continue
+            bonus = self.exploration * scale * math.sqrt(math.log(total + 1.0) / max(weight, 1e-3))
+            result[row.url] = (arm.rate() + bonus) * priority_weight(row.priority)
+        return result
+
+    def plan(self, now=None, byte_budget=None):
+        """Pick sources by score until the predicted bytes reach the budget"""
+        budget = self.byte_budget if byte_budget is None else byte_budget
+        scores = self.scores(now)
+        weight = {row.url: priority_weight(row.priority) for row in self.sources}
+        order = sorted(scores, key=lambda url: (-scores[url], -weight[url]))
+        urls, used, new, seconds = [], 0.0, 0.0, 0.0
+        for url in order:
+            arm = self.arms[url]
+            size = arm.bytes if arm.pulls else PRIOR_BYTES
+            if urls and used + size > budget:
+                continue
+            urls.append(url)
+            used += size
+            new += arm.success * arm.new
+            seconds += arm.seconds
+        concurrency = math.ceil(seconds / max(self.target_seconds, 1e-3)) if urls else 0
+        concurrency = max(self.min_concurrency, min(self.max_concurrency, concurrency, len(urls) or 1))
+        return SweepPlan(urls, concurrency, used, new, seconds, {u: scores[u] for u in urls})
+
+    # ─── Feedback ───
+
+    def record(self, url, success, size=0, seconds=0.0, configs_found=0, new_endpoints=0,
+               error="", now=None):
+        """Fold a download result into the table, history and bandit state"""
+        now = time.time() if now is None else now
+        with self._lock:
+            history = self.history.get(url)
+            if history is None:
+                history = self.history[url] = SourceHistory(url)
+            history.last_download_ts = now
+            history.last_success = bool(success)
+            history.total_downloads += 1
+            history.successful_downloads += bool(success)
+            history.configs_found = configs_found
+            history.unique_configs = new_endpoints
+            history.last_error = error
+            for row in self.sources:
+                if row.url == url:
+                    row.total_configs_found = configs_found
+                    row.success_rate = history.successful_downloads * 100 // history.total_downloads
+                    if success:
+                        row.last_success_ts = now
+                    break
+            arm = self.arms.setdefault(url, SourceArm(url))
+            arm.update(bool(success), size, seconds, new_endpoints, now, self.alpha)
+
+
+# ─── Sweeps ───
+
+def run_sweep(scheduler, index=None, fetch_payload=fetch, timeout=30, deadline=None, now=None):
+    """Plan a sweep, download it and feed every result back
+
+    New endpoints are counted against ``index`` (an EndpointIndex shared
+    across sweeps). Returns ``(plan, summary)``.
+    """
+    index = index if index is not None else EndpointIndex()
+    plan = scheduler.plan(now)
+    lock = threading.Lock()
+    outcome = {}
+
+    def fetch_one(url, timeout=timeout):
+        started = time.perf_counter()
+        response = fetch_payload(url, timeout=timeout)
+        response.raise_for_status()
+        uris = decode_uris(response.content)
+        with lock:
+            new = sum(1 for uri in uris if index.add(uri))
+        outcome[url] = (time.perf_counter() - started, len(uris), new)
+        return True, len(response.content), f"{len(uris)} configs, {new} new", len(uris)
+
+    started = time.perf_counter()
+    deadline = deadline or max(2 * scheduler.target_seconds, timeout)
+    results = asyncio.run(fetch_sources_async(plan.urls, fetch_one, concurrency=plan.concurrency,
+                                              timeout=timeout, deadline=deadline))
+    wall = time.perf_counter() - started
+    summary = {"sources": len(plan.urls), "ok": 0, "bytes": 0, "configs": 0, "new": 0,
+               "wall_s": wall}
+    for url, (success, size, message, configs) in zip(plan.urls, results):
+        seconds, _, new = outcome.get(url, (wall, 0, 0))
+        scheduler.record(url, success, size, seconds, configs, new if success else 0,
+                         "" if success else message, now)
+        summary["ok"] += bool(success)
+        summary["bytes"] += size
+        summary["configs"] += configs
+        summary["new"] += new if success else 0
+    summary["new_per_min"] = summary["new"] / max(wall / 60.0, 1e-9)
+    return plan, summary
+
+
+# ─── Simulated population (benchmark) ───
+
+class SimSource:
+    """A source whose payload is a rolling window of endpoint ids
+
+    Each sweep interval a ``fresh`` share of the window is replaced with
+    never-seen endpoints; mirrors serve their origin's window.
+    """
+
+    def __init__(self, rng, ids, url, size, fresh, fail, rtt, throughput, origin=None):
+        self.url = url
+        self.size = size
+        self.fresh = fresh
+        self.fail = fail
+        self.rtt = rtt
+        self.throughput = throughput
+        self.origin = origin
+        self.window = [] if origin else [next(ids) for _ in range(size)]
+        self._rng = rng
+        self._ids = ids
+
+    def advance(self):
+        if self.origin is None and self.window:
+            replace = int(len(self.window) * self.fresh)
+            self.window = self.window[replace:] + [next(self._ids) for _ in range(replace)]
+
+    def payload(self):
+        return (self.origin or self).window
+
+
+def make_population(count=40, mirrors=12, seed=9):
+    rng = random.Random(seed)
+    ids = iter(range(1, 1 << 62))
+    originals = []
+    for i in range(count - mirrors):
+        size = int(rng.lognormvariate(math.log(3000), 1.0)) + 50
+        fresh = rng.choice([0.0, 0.01, 0.05, 0.1, 0.2, 0.35])
+        fail = 1.0 if rng.random() < 0.08 else rng.choice([0.0, 0.0, 0.05, 0.3])
+        originals.append(SimSource(rng, ids, f"https://sim.example/{i}.txt", size, fresh, fail,
+                                   rng.uniform(0.2, 3.0), rng.uniform(0.2e6, 5e6)))
+    population = list(originals)
+    for j in range(mirrors):
+        origin = rng.choice(originals)
+        population.append(SimSource(rng, ids, f"https://mirror.example/{j}.txt", origin.size,
+                                    0.0, rng.choice([0.0, 0.1]), rng.uniform(0.2, 3.0),
+                                    rng.uniform(0.2e6, 5e6), origin=origin))
+    rng.shuffle(population)
+    return population
+
+
+def _simulate_sweep(population, urls, concurrency, seen, rng, bytes_per_endpoint=220):
+    """Download ``urls`` from the population; returns per-URL results and wall time"""
+    by_url = {s.url: s for s in population}
+    lanes = [0.0] * max(1, concurrency)
+    results = []
+    for url in urls:
+        source = by_url[url]
+        lane = min(range(len(lanes)), key=lanes.__getitem__)
+        if rng.random() < source.fail:
+            seconds = source.rtt + 2.0
+            results.append((url, False, 0, seconds, 0, 0))
+        else:
+            ids = source.payload()
+            size = len(ids) * bytes_per_endpoint
+            seconds = source.rtt + size / source.throughput
+            new = 0
+            for endpoint in ids:
+                if endpoint not in seen:
+                    seen.add(endpoint)
+                    new += 1
+            results.append((url, True, size, seconds, len(ids), new))
+        lanes[lane] += seconds
+    return results, max(lanes)
+
+
+def simulate(policy, sweeps=40, interval_s=1800.0, byte_budget=8 * 1024 * 1024, seed=9):
+    """Run ``sweeps`` sweeps of the simulated population with a policy
+
+    ``policy`` is "fixed" (enabled sources in table order until the budget
+    is used, concurrency 8, like the hard-coded sweep lists) or "adaptive".
+    """
+    population = make_population(seed=seed)
+    rows = [SourceRow(s.url, priority=0) for s in population]
+    scheduler = SourceScheduler(rows, byte_budget=byte_budget, target_seconds=30.0)
+    rng = random.Random(seed + 1)
+    seen = set()
+    # Everything already published before the first sweep counts as known
+    for source in population:
+        if source.origin is None:
+            seen.update(source.window[: len(source.window) // 2])
+    now = 1_700_000_000.0
+    total_new = total_bytes = 0
+    total_wall = 0.0
+    for _ in range(sweeps):
+        for source in population:
+            source.advance()
+        if policy == "fixed":
+            urls, used = [], 0
+            for source in population:
+                estimate = len(source.payload()) * 220
+                if urls and used + estimate > byte_budget:
+                    break
+                urls.append(source.url)
+                used += estimate
+            concurrency = 8
+        else:
+            plan = scheduler.plan(now)
+            urls, concurrency = plan.urls, plan.concurrency
+        results, wall = _simulate_sweep(population, urls, concurrency, seen, rng)
+        for url, ok, size, seconds, configs, new in results:
+            scheduler.record(url, ok, size, seconds, configs, new, "" if ok else "failed", now)
+            total_new += new
+            total_bytes += size
+        total_wall += wall
+        now += interval_s
+    return {"policy": policy, "new": total_new, "bytes": total_bytes, "wall_s": total_wall,
+            "new_per_min": total_new / (total_wall / 60.0), "new_per_mb": total_new / (total_bytes / 1e6)}
+
+
+def run_benchmark(sweeps=40):
+    print(f"[BENCH] {sweeps} sweeps over 40 simulated sources (12 mirrors), 8 MB per sweep")
+    for policy in ("fixed", "adaptive"):
+        r = simulate(policy, sweeps)
+        print(f"   {policy:9s}: {r['new']:8,} new endpoints, {r['bytes'] / 1e6:7.1f} MB, "
+              f"{r['wall_s'] / 60:5.1f} min sweeping -> {r['new_per_min']:7.0f} new/min, "
+              f"{r['new_per_mb']:6.0f} new/MB")
+
+
+# ─── CLI ───
+
+def print_plan(scheduler, plan, now=None):
+    print(f"[PLAN] {len(plan.urls)}/{sum(r.enabled for r in scheduler.sources)} enabled sources, "
+          f"concurrency {plan.concurrency}, ~{plan.predicted_bytes / 1e6:.1f} MB, "
+          f"~{plan.predicted_new:.0f} new endpoints expected")
+    for url in plan.urls:
+        arm = scheduler.arms[url]
+        score = plan.scores[url]
+        label = "explore" if math.isinf(score) else f"{score * 1e6:8.1f}/MB"
+        print(f"   {label:>12s}  ok {arm.success:4.0%}  new {arm.new:7.0f}  "
+              f"{arm.bytes / 1e6:6.2f} MB  {arm.seconds:5.1f}s  {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptive source sweep from sources_manager.tsv")
+    parser.add_argument("runtime", nargs="?", default="runtime",
+                        help=f"directory holding {SOURCES_FILE} (default: runtime)")
+    parser.add_argument("--budget-mb", type=float, default=DEFAULT_BYTE_BUDGET / (1024 * 1024))
+    parser.add_argument("--target-seconds", type=float, default=DEFAULT_TARGET_SECONDS)
+    parser.add_argument("--exploration", type=float, default=DEFAULT_EXPLORATION)
+    parser.add_argument("--timeout", type=int, default=30)
+    parser.add_argument("--plan-only", action="store_true", help="print the plan without fetching")
+    parser.add_argument("--bench", nargs="?", type=int, const=40, metavar="SWEEPS")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmark(args.bench)
+        return 0
+
+    scheduler = SourceScheduler.load(args.runtime, byte_budget=int(args.budget_mb * 1024 * 1024),
+                                     target_seconds=args.target_seconds,
+                                     exploration=args.exploration)
+    if not scheduler.sources:
+        print(f"[ERROR] no sources in {os.path.join(args.runtime, SOURCES_FILE)}")
+        return 1
+    if args.plan_only:
+        print_plan(scheduler, scheduler.plan())
+        return 0
+    plan, summary = run_sweep(scheduler, timeout=args.timeout)
+    print_plan(scheduler, plan)
+    print(f"\n[SWEEP] {summary['ok']}/{summary['sources']} ok, {summary['bytes'] / 1e6:.1f} MB, "
+          f"{summary['configs']:,} configs, {summary['new']:,} new endpoints in "
+          f"{summary['wall_s']:.1f}s ({summary['new_per_min']:.0f} new/min)")
+    scheduler.save()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
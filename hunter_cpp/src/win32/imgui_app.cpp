@@ -645,9 +645,11 @@ void ImGuiApp::ReloadFonts() {
     }
 
     if (FontAwesome::IsLoaded() && FontAwesome::GetFontData() && FontAwesome::GetFontSize() > 0) {
-        static const ImWchar icon_ranges[] = { 0xf000, 0xf8ff, 0 };
+        // Only the glyphs the UI uses (regenerate with setup_fontawesome.py)
+        static const ImWchar icon_ranges[] = { ICON_FA_GLYPH_RANGES };
         ImFontConfig icon_cfg = cfg;
         icon_cfg.MergeMode = true;
+        icon_cfg.FontDataOwnedByAtlas = false;  // FontAwesome keeps the buffer
         icon_cfg.PixelSnapH = true;
         icon_cfg.GlyphMinAdvanceX = sz * 0.8f;
         io.Fonts->AddFontFromMemoryTTF(
@@ -5,105 +5,134 @@ Ensures downloaded content contains actual configuration data
 """
 
 import requests
+import argparse
+import asyncio
 import json
-import time
 import sys
 import os
+import tracemalloc
+from functools import partial
 from pathlib import Path
 
-def is_valid_config_content(content):
-    """Check if downloaded content contains valid configuration data"""
-    if not content or len(content.strip()) < 10:
-        return False, "Content too short or empty"
-    
-    content_lower = content.lower()
-    
-    # Check for common config patterns
-    config_patterns = [
-        # V2Ray/VMess patterns
-        'vmess://', 'vless://', 'trojan://', 'hysteria://',
-        # Shadowsocks patterns  
-        'ss://', 'shadowsocks',
-        # JSON config patterns
-        '"protocol":', '"server":', '"port":', '"settings":',
-        # Common config fields
-        '"host":', '"path":', '"tls":', '"network":',
-        # Base64 encoded configs (common)
-        'eyJ', 'ewo', 'In0', 'CiAg',
-    ]
-    
-    found_patterns = []
-    for pattern in config_patterns:
-        if pattern in content_lower:
-            found_patterns.append(pattern)
-    
-    if not found_patterns:
-        return False, "No config patterns found"
-    
-    # Additional validation for JSON configs
-    if content.strip().startswith('{') and content.strip().endswith('}'):
-        try:
-            json.loads(content)
-            return True, f"Valid JSON with patterns: {', '.join(found_patterns[:3])}"
-        except json.JSONDecodeError:
-            return False, "Invalid JSON format"
-    
-    # For non-JSON configs, check if they look like proxy lists
-    lines = [line.strip() for line in content.split('\n') if line.strip()]
-    proxy_lines = [line for line in lines if any(pattern in line.lower() for pattern in ['://', 'ss://', 'vmess://'])]
-    
-    if len(proxy_lines) >= 1:
-        return True, f"Valid proxy list with {len(proxy_lines)} configs"
-    
-    return True, f"Valid content with patterns: {', '.join(found_patterns[:3])}"
+from endpoint_index import EndpointIndex
+from fetch_breaker import DEFAULT_STATE_FILE, CircuitBreaker, RetryBudget, with_retries
+from fetch_session import fetch
+from payload_decoder import PayloadDecoder, decode_verdict
+from proxy_pool import ProxyPool, parse_ports
+from realtime_client import DEFAULT_CONTROL_PORT, ControlClient, RealtimeError, parse_target
+from source_cache import DEFAULT_CACHE_DIR, SourceCache
+from source_farm import add_farm_arguments, farm_from_args
+from source_fetcher import stream_source, sweep
 
-def test_download_from_source(source_url, timeout=30):
-    """Test downloading from a single source"""
+def test_download_from_source(source_url, timeout=30, stream=False, max_configs=None,
+                              cache=None, pool=None):
+    """Test downloading from a single source
+
+    The payload format (plain, base64, Clash, v2ray/sing-box JSON) is
+    sniffed and every proxy entry is decoded, so the counts are what can
+    actually be imported. With ``stream=True`` the body is decoded chunk
+    by chunk, stopping once ``max_configs`` URIs have been decoded (JSON
+    documents are decoded whole, so they are always read to the end).
+    With a SourceCache an unchanged source (304) is served from disk and
+    its previous verdict is reused. The returned count is of unique
+    endpoints (as ConfigDatabase keys them), not raw URI lines. With a
+    ProxyPool the download goes through the local proxy ports.
+    """
     print(f"\n[TEST] Testing: {source_url}")
     
     try:
-        # Make request with common headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/plain,application/json,*/*',
-        }
-        
-        response = requests.get(source_url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        
-        content = response.text
-        content_size = len(content)
-        
-        print(f"   [OK] Downloaded {content_size} bytes")
+        if stream:
+            meta = {}
+            endpoints = EndpointIndex()
+            decoder = PayloadDecoder(uri_sink=endpoints.add)
+            counter = stream_source(source_url, timeout=timeout, max_configs=max_configs,
+                                    cache=cache, meta=meta, decoder=decoder, session=pool)
+            from_cache = meta.get("from_cache", False)
+            content_size = counter.size
+            peak_buffer = counter.peak_buffer
+            payload_format = decoder.format
+            config_count = decoder.uris
+            unique_count = len(endpoints)
+            is_valid, message = decode_verdict(decoder)
+            preview = b"\n".join(line.encode() for line in counter.samples)
+            if counter.truncated:
+                print(f"   [STOP] Reached {max_configs} configs, stopped reading early")
+        else:
+            if cache:
+                response = cache.fetch(source_url, timeout=timeout)
+            elif pool:
+                response = pool.fetch(source_url, timeout=timeout)
+                response.raise_for_status()
+            else:
+                response = fetch(source_url, timeout=timeout)
+            from_cache = response.from_cache
+            
+            content = response.content
+            content_size = len(content)
+            peak_buffer = content_size
+            
+            # Reuse the verdict of an unchanged source, else decode it
+            cached = cache.info(source_url) if from_cache else {}
+            if "format" in cached:
+                is_valid, message = cached["is_valid"], cached["message"]
+                payload_format = cached["format"]
+                config_count = cached["config_count"]
+                unique_count = cached["unique_count"]
+            else:
+                endpoints = EndpointIndex()
+                decoder = PayloadDecoder(uri_sink=endpoints.add)
+                decoder.feed(content)
+                decoder.close()
+                payload_format = decoder.format
+                config_count = decoder.uris
+                unique_count = len(endpoints)
+                is_valid, message = decode_verdict(decoder)
+                if cache:
+                    cache.annotate(source_url, is_valid=is_valid, message=message,
+                                   format=payload_format, config_count=config_count,
+                                   unique_count=unique_count)
+            preview = content[:200]
         
-        # Validate content
-        is_valid, message = is_valid_config_content(content)
+        if from_cache:
+            print(f"   [CACHE] Not modified, reused cached {content_size} bytes")
+            message += " (from cache)"
+        else:
+            print(f"   [OK] Downloaded {content_size} bytes")
+        print(f"   [MEM] Peak buffer {peak_buffer:,} bytes")
         
         if is_valid:
             print(f"   [OK] Valid config content: {message}")
-            return True, content_size, message
+            print(f"   [COUNT] Found {config_count} {payload_format} configuration entries "
+                  f"({unique_count} unique endpoints)")
+            return True, content_size, message, unique_count
         else:
             print(f"   [FAIL] Invalid content: {message}")
-            print(f"   [PREVIEW] Content preview: {content[:200]}...")
-            return False, content_size, message
+            print(f"   [PREVIEW] Content preview: {preview[:200].decode('utf-8', 'replace')}...")
+            return False, content_size, message, 0
             
     except requests.exceptions.Timeout:
         print(f"   [TIMEOUT] Timeout after {timeout}s")
-        return False, 0, "Timeout"
+        return False, 0, "Timeout", 0
     except requests.exceptions.RequestException as e:
         print(f"   [ERROR] Request failed: {e}")
-        return False, 0, str(e)
+        return False, 0, str(e), 0
     except Exception as e:
         print(f"   [ERROR] Unexpected error: {e}")
-        return False, 0, str(e)
+        return False, 0, str(e), 0
+
+def test_all_sources(stream=False, max_configs=None, sources=None, cache=None, breaker=None,
+                     pool=None):
+    """Test downloading from all configured sources (or ``sources`` if given)
 
-def test_all_sources():
-    """Test downloading from all configured sources"""
+    With a CircuitBreaker, sources whose circuit is open are skipped
+    without a download and transient failures are retried within a
+    RetryBudget. With a ProxyPool downloads are spread over its ports.
+    """
     print("[START] Comprehensive download test from all sources")
     print("=" * 60)
     
     # Default sources from the application
-    sources = [
+    sources = sources or [
         "https://raw.githubusercontent.com/bahmany/censorship_hunter/main/configs.txt",
         "https://raw.githubusercontent.com/mahdibland/ShadowsocksAggregator/master/all/iran.txt", 
         "https://raw.githubusercontent.com/Alvin9999/pac_nodes/master/ssr.txt",
@@ -116,24 +145,28 @@ def test_all_sources():
     total_downloaded = 0
     successful_sources = 0
     
-    for i, source in enumerate(sources, 1):
-        print(f"\n[SOURCE] {i}/{len(sources)}")
-        
-        success, size, message = test_download_from_source(source)
-        
+    # Download all sources concurrently (bounded, polite per host)
+    fetch_one = partial(test_download_from_source, stream=stream, max_configs=max_configs,
+                        cache=cache, pool=pool)
+    if breaker:
+        fetch_one = breaker.guard(with_retries(fetch_one, RetryBudget()))
+    tracemalloc.start()
+    sweep_results, elapsed = sweep(sources, fetch_one)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    for source, (success, size, message, config_count) in zip(sources, sweep_results):
         results.append({
             'url': source,
             'success': success,
             'size': size,
-            'message': message
+            'message': message,
+            'config_count': config_count
         })
         
         if success:
             total_downloaded += size
             successful_sources += 1
-        
-        # Small delay between requests
-        time.sleep(1)
     
     # Print summary
     print("\n" + "=" * 60)
@@ -144,6 +177,13 @@ def test_all_sources():
     print(f"Successful downloads: {successful_sources}")
     print(f"Failed downloads: {len(sources) - successful_sources}")
     print(f"Total data downloaded: {total_downloaded:,} bytes")
+    print(f"Total unique endpoints found (per source): {sum(r['config_count'] for r in results)}")
+    print(f"Sweep time: {elapsed:.1f}s ({'streaming' if stream else 'buffered'})")
+    print(f"Peak Python memory: {peak_memory:,} bytes")
+    if cache:
+        from_cache = [r for r in results if r['message'].endswith("(from cache)")]
+        print(f"Served from cache: {len(from_cache)}/{len(sources)} sources "
+              f"({cache.stats['bytes_saved']:,} bytes not re-downloaded)")
     print(f"Success rate: {successful_sources/len(sources)*100:.1f}%")
     
     print("\n[DETAILS] RESULTS:")
@@ -152,7 +192,8 @@ def test_all_sources():
     for i, result in enumerate(results, 1):
         status = "[OK]" if result['success'] else "[FAIL]"
         size_info = f"({result['size']:,} bytes)" if result['size'] > 0 else "(0 bytes)"
-        print(f"{i:2d}. {status} {size_info} - {result['message']}")
+        config_info = f"[{result['config_count']} endpoints]"
+        print(f"{i:2d}. {status} {size_info} {config_info} - {result['message']}")
         print(f"     URL: {result['url']}")
     
     print("\n[RECOMMENDATIONS]:")
@@ -184,11 +225,41 @@ def test_all_sources():
     
     return successful_sources, len(sources)
 
-def test_application_download_system():
-    """Test the application's download system via command"""
+async def send_download_command(target, command, timeout=30):
+    """Send the download command over the realtime control channel"""
+    host, port, _ = parse_target(target)
+    async with ControlClient(host, port, reconnect=False, timeout=timeout) as client:
+        fields = {k: v for k, v in command.items() if k != "command"}
+        return await client.request(command["command"], **fields)
+
+def test_application_download_system(control=None, proxy=""):
+    """Test the application's download system via command
+
+    With ``control`` (``host:port`` of the control websocket) the command
+    is sent to a running orchestrator instead of printed for pasting.
+    ``proxy`` goes into the command's proxy field.
+    """
     print("\n[APP_TEST] TESTING APPLICATION DOWNLOAD SYSTEM")
     print("=" * 60)
     
+    if control:
+        command = {
+            "command": "download_configs",
+            "sources": [
+                "https://raw.githubusercontent.com/bahmany/censorship_hunter/main/configs.txt",
+                "https://raw.githubusercontent.com/mahdibland/ShadowsocksAggregator/master/all/iran.txt"
+            ],
+            "proxy": proxy
+        }
+        try:
+            result = asyncio.run(send_download_command(control, command))
+        except (OSError, RealtimeError, asyncio.TimeoutError) as e:
+            print(f"[ERROR] Control channel {control}: {e}")
+            return False
+        print(f"[{'OK' if result.ok else 'FAIL'}] {result.command}: {result.message} "
+              f"({result.round_trip_s * 1000:.1f} ms)")
+        return result.ok
+    
     # Check if application executable exists
     project_root = Path(__file__).parent
     exe_path = project_root / "build" / "huntercensor.exe"
@@ -212,7 +283,7 @@ def test_application_download_system():
     command = {
         "command": "download_configs",
         "sources": test_sources,
-        "proxy": ""
+        "proxy": proxy
     }
     
     command_json = json.dumps(command)
@@ -227,15 +298,72 @@ def test_application_download_system():
     
     return True
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Download test for all config sources")
+    parser.add_argument("--stream", action="store_true",
+                        help="read responses in chunks and count configs incrementally")
+    parser.add_argument("--max-configs", type=int,
+                        default=int(os.environ.get("HUNTER_GITHUB_BG_CAP", "0")) or None,
+                        help="stop reading a source after this many configs "
+                             "(streaming mode, default: $HUNTER_GITHUB_BG_CAP)")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_CACHE_DIR, metavar="DIR",
+                        help="revalidate sources with ETag/Last-Modified and reuse unchanged "
+                             f"ones from DIR (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--control", nargs="?", const=f"127.0.0.1:{DEFAULT_CONTROL_PORT}",
+                        metavar="HOST:PORT",
+                        help="send download_configs to a running orchestrator's control "
+                             "websocket instead of printing it")
+    parser.add_argument("--breaker", nargs="?", const=DEFAULT_STATE_FILE, metavar="FILE",
+                        help="skip sources that keep failing and retry transient errors, "
+                             f"keeping circuit state in FILE (default: {DEFAULT_STATE_FILE})")
+    parser.add_argument("--proxy-ports", metavar="PORTS",
+                        help="download through these local proxy ports, e.g. "
+                             "10808,http:10809 (socks5h unless prefixed)")
+    parser.add_argument("--direct-fallback", action="store_true",
+                        help="with --proxy-ports, download directly when no port works")
+    add_farm_arguments(parser)
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    
     print("[TEST] HUNTER CENSORSHIP - COMPREHENSIVE DOWNLOAD TEST")
     print("=" * 60)
     
-    # Test direct downloads from sources
-    successful, total = test_all_sources()
+    # Test direct downloads from sources (or a local source farm)
+    farm = farm_from_args(args)
+    sources = farm.urls(faults=args.farm_faults) if farm else None
+    pool = None
+    if args.proxy_ports:
+        try:
+            pool = ProxyPool(parse_ports(args.proxy_ports), direct=args.direct_fallback)
+        except RuntimeError as e:
+            print(f"[ERROR] {e}")
+            sys.exit(2)
+        alive = pool.probe()
+        print(f"[PROXY] {len(alive)}/{len(pool.ports)} proxy ports alive: "
+              f"{', '.join(p.name for p in alive) or 'none'}")
+    cache = SourceCache(args.cache, session=pool) if args.cache else None
+    breaker = CircuitBreaker(args.breaker) if args.breaker else None
+    successful, total = test_all_sources(stream=args.stream, max_configs=args.max_configs,
+                                         sources=sources, cache=cache, breaker=breaker,
+                                         pool=pool)
+    proxy = ""
+    if pool:
+        pool.print_stats()
+        best = max(pool.alive_ports(), key=lambda p: p.throughput or 0, default=None)
+        if best:
+            proxy = f"{best.scheme}://{pool.host}:{best.port}"
+        pool.close()
+    if breaker:
+        breaker.save()
+        print(f"[BREAKER] {breaker.stats['rejected']} skipped, {breaker.stats['trips']} tripped, "
+              f"{len(breaker.open_circuits())} open circuits in {args.breaker}")
+    if farm:
+        farm.stop()
     
     # Test application download system
-    app_test = test_application_download_system()
+    app_test = test_application_download_system(control=args.control, proxy=proxy)
     
     print("\n" + "=" * 60)
     print("[FINAL] TEST RESULTS")
@@ -250,7 +378,8 @@ if __name__ == "__main__":
         print("   Check internet connection and source URLs")
     
     if app_test:
-        print("[OK] Application test instructions provided")
+        print("[OK] Application download command sent" if args.control
+              else "[OK] Application test instructions provided")
     
     print(f"\n[RESULT] Overall Success Rate: {successful/total*100:.1f}%")
     
@@ -4,82 +4,36 @@ Test with actual working proxy config sources
 """
 
 import requests
+import argparse
 import json
-import time
 import sys
 from pathlib import Path
 
-def is_valid_config_content(content):
-    """Check if downloaded content contains valid configuration data"""
-    if not content or len(content.strip()) < 10:
-        return False, "Content too short or empty"
-    
-    content_lower = content.lower()
-    
-    # Check for common config patterns
-    config_patterns = [
-        # V2Ray/VMess patterns
-        'vmess://', 'vless://', 'trojan://', 'hysteria://',
-        # Shadowsocks patterns  
-        'ss://', 'shadowsocks',
-        # JSON config patterns
-        '"protocol":', '"server":', '"port":', '"settings":',
-        # Common config fields
-        '"host":', '"path":', '"tls":', '"network":',
-        # Base64 encoded configs (common)
-        'eyJ', 'ewo', 'In0', 'CiAg',
-    ]
-    
-    found_patterns = []
-    for pattern in config_patterns:
-        if pattern in content_lower:
-            found_patterns.append(pattern)
-    
-    if not found_patterns:
-        return False, "No config patterns found"
-    
-    # For non-JSON configs, check if they look like proxy lists
-    lines = [line.strip() for line in content.split('\n') if line.strip()]
-    proxy_lines = [line for line in lines if any(pattern in line.lower() for pattern in ['://', 'ss://', 'vmess://', 'vless://', 'trojan://'])]
-    
-    if len(proxy_lines) >= 1:
-        return True, f"Valid proxy list with {len(proxy_lines)} configs"
-    
-    return True, f"Valid content with patterns: {', '.join(found_patterns[:3])}"
+from fetch_session import fetch
+from payload_decoder import PayloadDecoder, decode_verdict
+from source_farm import add_farm_arguments, farm_from_args
+from source_fetcher import sweep
 
 def test_download_from_source(source_url, timeout=30):
     """Test downloading from a single source"""
     print(f"\n[TEST] Testing: {source_url}")
     
     try:
-        # Make request with common headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/plain,application/json,*/*',
-        }
-        
-        response = requests.get(source_url, headers=headers, timeout=timeout)
-        response.raise_for_status()
+        # Shared keep-alive session (common headers, gzip/brotli)
+        response = fetch(source_url, timeout=timeout)
         
-        content = response.text
+        content = response.content
         content_size = len(content)
         
         print(f"   [OK] Downloaded {content_size} bytes")
         
-        # Count actual configs
-        lines = [line.strip() for line in content.split('\n') if line.strip()]
-        config_count = 0
-        sample_configs = []
-        
-        for line in lines:
-            if any(pattern in line.lower() for pattern in ['vmess://', 'vless://', 'trojan://', 'ss://', 'hysteria://']):
-                config_count += 1
-                if len(sample_configs) < 3:  # Save first 3 samples
-                    sample_configs.append(line[:80] + "..." if len(line) > 80 else line)
-            elif line.startswith('{') and '"server"' in line:
-                config_count += 1
-                if len(sample_configs) < 3:
-                    sample_configs.append("JSON config: " + line[:60] + "...")
+        # Decode the payload (plain, base64, Clash or JSON) and count its URIs
+        uris = []
+        decoder = PayloadDecoder(uri_sink=uris.append)
+        decoder.feed(content)
+        decoder.close()
+        config_count = decoder.uris
+        sample_configs = [uri[:80] + "..." if len(uri) > 80 else uri for uri in uris[:3]]
         
         if sample_configs:
             print(f"   [SAMPLE] Config examples:")
@@ -87,7 +41,7 @@ def test_download_from_source(source_url, timeout=30):
                 print(f"     {i}. {sample}")
         
         # Validate content
-        is_valid, message = is_valid_config_content(content)
+        is_valid, message = decode_verdict(decoder)
         
         if is_valid:
             print(f"   [OK] Valid config content: {message}")
@@ -107,13 +61,13 @@ def test_download_from_source(source_url, timeout=30):
         print(f"   [ERROR] Unexpected error: {e}")
         return False, 0, str(e), 0
 
-def test_real_config_sources():
-    """Test downloading from sources with real proxy configs"""
+def test_real_config_sources(sources=None):
+    """Test downloading from sources with real proxy configs (or ``sources`` if given)"""
     print("[START] Testing sources with real proxy configurations")
     print("=" * 70)
     
     # Sources that should contain actual proxy configs
-    sources = [
+    sources = sources or [
         # V2Ray official config (template)
         "https://raw.githubusercontent.com/v2fly/v2ray-core/master/release/config/config.json",
         
@@ -131,11 +85,10 @@ def test_real_config_sources():
     total_configs = 0
     successful_sources = 0
     
-    for i, source in enumerate(sources, 1):
-        print(f"\n[SOURCE] {i}/{len(sources)}")
-        
-        success, size, message, config_count = test_download_from_source(source)
-        
+    # Download all sources concurrently (bounded, polite per host)
+    sweep_results, elapsed = sweep(sources, test_download_from_source)
+    
+    for source, (success, size, message, config_count) in zip(sources, sweep_results):
         results.append({
             'url': source,
             'success': success,
@@ -148,9 +101,6 @@ def test_real_config_sources():
             total_downloaded += size
             total_configs += config_count
             successful_sources += 1
-        
-        # Small delay between requests
-        time.sleep(1)
     
     # Print summary
     print("\n" + "=" * 70)
@@ -162,6 +112,7 @@ def test_real_config_sources():
     print(f"Failed downloads: {len(sources) - successful_sources}")
     print(f"Total data downloaded: {total_downloaded:,} bytes")
     print(f"Total config entries found: {total_configs}")
+    print(f"Sweep time: {elapsed:.1f}s")
     print(f"Success rate: {successful_sources/len(sources)*100:.1f}%")
     
     print("\n[DETAILS] RESULTS:")
@@ -212,12 +163,23 @@ def test_real_config_sources():
     
     return successful_sources, total_configs, len(sources)
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    add_farm_arguments(parser)
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    farm = farm_from_args(args)
+    
     print("[TEST] HUNTER CENSORSHIP - REAL CONFIG SOURCES TEST")
     print("=" * 70)
     
-    # Test real config sources
-    successful, configs, total = test_real_config_sources()
+    # Test real config sources (or a local source farm)
+    sources = farm.urls(faults=args.farm_faults) if farm else None
+    successful, configs, total = test_real_config_sources(sources)
+    if farm:
+        farm.stop()
     
     print("\n" + "=" * 70)
     print("[FINAL] COMPREHENSIVE TEST RESULTS")
@@ -4,95 +4,43 @@ Test script with working sources that contain actual config data
 """
 
 import requests
+import argparse
 import json
-import time
 import sys
 from pathlib import Path
 
-def is_valid_config_content(content):
-    """Check if downloaded content contains valid configuration data"""
-    if not content or len(content.strip()) < 10:
-        return False, "Content too short or empty"
-    
-    content_lower = content.lower()
-    
-    # Check for common config patterns
-    config_patterns = [
-        # V2Ray/VMess patterns
-        'vmess://', 'vless://', 'trojan://', 'hysteria://',
-        # Shadowsocks patterns  
-        'ss://', 'shadowsocks',
-        # JSON config patterns
-        '"protocol":', '"server":', '"port":', '"settings":',
-        # Common config fields
-        '"host":', '"path":', '"tls":', '"network":',
-        # Base64 encoded configs (common)
-        'eyJ', 'ewo', 'In0', 'CiAg',
-    ]
-    
-    found_patterns = []
-    for pattern in config_patterns:
-        if pattern in content_lower:
-            found_patterns.append(pattern)
-    
-    if not found_patterns:
-        return False, "No config patterns found"
-    
-    # Additional validation for JSON configs
-    if content.strip().startswith('{') and content.strip().endswith('}'):
-        try:
-            json.loads(content)
-            return True, f"Valid JSON with patterns: {', '.join(found_patterns[:3])}"
-        except json.JSONDecodeError:
-            return False, "Invalid JSON format"
-    
-    # For non-JSON configs, check if they look like proxy lists
-    lines = [line.strip() for line in content.split('\n') if line.strip()]
-    proxy_lines = [line for line in lines if any(pattern in line.lower() for pattern in ['://', 'ss://', 'vmess://'])]
-    
-    if len(proxy_lines) >= 1:
-        return True, f"Valid proxy list with {len(proxy_lines)} configs"
-    
-    return True, f"Valid content with patterns: {', '.join(found_patterns[:3])}"
+from fetch_session import fetch
+from payload_decoder import PayloadDecoder, decode_verdict
+from source_farm import add_farm_arguments, farm_from_args
+from source_fetcher import sweep
 
 def test_download_from_source(source_url, timeout=30):
     """Test downloading from a single source"""
     print(f"\n[TEST] Testing: {source_url}")
     
     try:
-        # Make request with common headers
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'Accept': 'text/plain,application/json,*/*',
-        }
+        # Shared keep-alive session (common headers, gzip/brotli)
+        response = fetch(source_url, timeout=timeout)
         
-        response = requests.get(source_url, headers=headers, timeout=timeout)
-        response.raise_for_status()
-        
-        content = response.text
+        content = response.content
         content_size = len(content)
         
         print(f"   [OK] Downloaded {content_size} bytes")
         
         # Show a preview of the content
-        preview = content[:300].replace('\n', ' ').strip()
+        preview = content[:300].decode('utf-8', 'replace').replace('\n', ' ').strip()
         print(f"   [PREVIEW] {preview}...")
         
-        # Validate content
-        is_valid, message = is_valid_config_content(content)
+        # Decode the payload (plain, base64, Clash or JSON) and count its URIs
+        decoder = PayloadDecoder()
+        decoder.feed(content)
+        decoder.close()
+        is_valid, message = decode_verdict(decoder)
         
         if is_valid:
             print(f"   [OK] Valid config content: {message}")
             
-            # Count actual configs
-            lines = [line.strip() for line in content.split('\n') if line.strip()]
-            config_count = 0
-            for line in lines:
-                if any(pattern in line.lower() for pattern in ['vmess://', 'vless://', 'trojan://', 'ss://', 'hysteria://']):
-                    config_count += 1
-                elif line.startswith('{') and '"server"' in line:
-                    config_count += 1
-            
+            config_count = decoder.uris
             print(f"   [COUNT] Found {config_count} configuration entries")
             return True, content_size, message, config_count
         else:
@@ -109,13 +57,13 @@ def test_download_from_source(source_url, timeout=30):
         print(f"   [ERROR] Unexpected error: {e}")
         return False, 0, str(e), 0
 
-def test_working_sources():
-    """Test downloading from working sources that contain actual configs"""
+def test_working_sources(sources=None):
+    """Test downloading from working sources that contain actual configs (or ``sources`` if given)"""
     print("[START] Testing working sources with actual config content")
     print("=" * 70)
     
     # Working sources with actual config data
-    sources = [
+    sources = sources or [
         # V2Ray official config (JSON format)
         "https://raw.githubusercontent.com/v2fly/v2ray-core/master/release/config/config.json",
         
@@ -133,11 +81,10 @@ def test_working_sources():
     total_configs = 0
     successful_sources = 0
     
-    for i, source in enumerate(sources, 1):
-        print(f"\n[SOURCE] {i}/{len(sources)}")
-        
-        success, size, message, config_count = test_download_from_source(source)
-        
+    # Download all sources concurrently (bounded, polite per host)
+    sweep_results, elapsed = sweep(sources, test_download_from_source)
+    
+    for source, (success, size, message, config_count) in zip(sources, sweep_results):
         results.append({
             'url': source,
             'success': success,
@@ -150,9 +97,6 @@ def test_working_sources():
             total_downloaded += size
             total_configs += config_count
             successful_sources += 1
-        
-        # Small delay between requests
-        time.sleep(1)
     
     # Print summary
     print("\n" + "=" * 70)
@@ -164,6 +108,7 @@ def test_working_sources():
     print(f"Failed downloads: {len(sources) - successful_sources}")
     print(f"Total data downloaded: {total_downloaded:,} bytes")
     print(f"Total config entries found: {total_configs}")
+    print(f"Sweep time: {elapsed:.1f}s")
     print(f"Success rate: {successful_sources/len(sources)*100:.1f}%")
     
     print("\n[DETAILS] RESULTS:")
@@ -231,12 +176,23 @@ def create_test_command():
     
     return working_sources
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    add_farm_arguments(parser)
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    farm = farm_from_args(args)
+    
     print("[TEST] HUNTER CENSORSHIP - WORKING SOURCES DOWNLOAD TEST")
     print("=" * 70)
     
-    # Test working sources
-    successful, configs, total = test_working_sources()
+    # Test working sources (or a local source farm)
+    sources = farm.urls(faults=args.farm_faults) if farm else None
+    successful, configs, total = test_working_sources(sources)
+    if farm:
+        farm.stop()
     
     # Create test command
     test_sources = create_test_command()
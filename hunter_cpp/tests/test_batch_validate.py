@@ -0,0 +1,49 @@
+"""
+Checks for batch_validate.py: sharded output matches the in-process result
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import batch_validate
+from batch_validate import batch_validate as run_batch, make_synthetic_dump, shard_bounds, validate_lines
+
+
+def test_shards_cover_file_on_line_boundaries(tmp_path):
+    path = tmp_path / "dump.txt"
+    make_synthetic_dump(str(path), 3000)
+    data = path.read_bytes()
+    bounds = shard_bounds(str(path), 7)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(data)
+    for (_, end), (start, _) in zip(bounds, bounds[1:]):
+        assert end == start and data[start - 1:start] == b"\n"
+
+
+def test_parallel_matches_single_pass(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_validate, "MIN_SHARD_BYTES", 4096)
+    path = tmp_path / "dump.txt"
+    make_synthetic_dump(str(path), 4000)
+    expected, (lines, invalid, duplicates) = validate_lines(path.read_bytes())
+
+    output = tmp_path / "valid.txt"
+    stats = run_batch(str(path), str(output), workers=2)
+    assert stats["shards"] > 1
+    assert output.read_bytes().split(b"\n")[:-1] == expected
+    assert stats["valid"] == len(expected)
+    assert stats["lines"] == lines
+    assert stats["valid"] + stats["invalid"] + stats["duplicates"] == lines
+
+
+def test_dump_without_final_newline(tmp_path):
+    uris = [b"trojan://pw@c.example.com:8443?security=tls&sni=c.example.com#three",
+            b"vless://u-1@a.example.com:443?security=reality&type=grpc&sni=a.example.com#one",
+            b"trojan://pw@b.example.com:443?security=tls&sni=b.example.com#two"]
+    path = tmp_path / "dump.txt"
+    path.write_bytes(b"\n".join(uris))
+    output = tmp_path / "valid.txt"
+    for workers in (1, 2):
+        stats = run_batch(str(path), str(output), workers=workers)
+        assert output.read_bytes() == b"".join(uri + b"\n" for uri in sorted(uris))
+        assert stats["valid"] == 3 and stats["lines"] == 3
@@ -0,0 +1,64 @@
+"""
+Checks for build_icons.py: .ico layout and incremental rebuilds
+"""
+
+import inspect
+import struct
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import build_icons
+from build_icons import ICONS, IconSpec, build, build_icon, input_hash, render, stale_icons
+
+
+def _directory(data):
+    reserved, kind, count = struct.unpack("<HHH", data[:6])
+    assert (reserved, kind) == (0, 1)
+    return [struct.unpack("<BBBBHHII", data[6 + 16 * i: 22 + 16 * i]) for i in range(count)]
+
+
+def test_ico_layout():
+    app = next(s for s in ICONS if s.name == "app")
+    _, data = build_icon(app)
+    entries = _directory(data)
+    assert [e[0] or 256 for e in entries] == list(app.sizes)
+    for width, height, _, _, planes, bpp, size, offset in entries:
+        image = data[offset:offset + size]
+        if width == 0:
+            assert image.startswith(b"\x89PNG\r\n\x1a\n")
+        else:
+            header = struct.unpack("<IiiHHI", image[:20])
+            assert header == (40, width, height * 2, 1, 32, 0)
+            mask_row = ((width + 31) // 32) * 4
+            assert size == 40 + width * height * 4 + mask_row * height
+    rgba = render(app, 32)
+    assert rgba[0, 0, 3] == 0 and rgba[16, 16, 3] == 255
+
+
+def test_incremental_build(tmp_path):
+    out = str(tmp_path)
+    assert len(build(ICONS, out, jobs=2, verbose=False)) == len(ICONS)
+    serial = Path(out, "about.ico").read_bytes()
+    assert build(ICONS, out, verbose=False) == []
+    assert serial == build_icon(next(s for s in ICONS if s.name == "about"))[1]
+
+    Path(out, "logs.ico").write_bytes(b"edited")
+    edited = tuple(IconSpec(s.name, (1, 2, 3), s.glyph, s.sizes) if s.name == "online" else s
+                   for s in ICONS)
+    assert sorted(s.name for s in stale_icons(edited, out)) == ["logs", "online"]
+    assert sorted(build(edited, out, jobs=1, verbose=False)) == ["logs", "online"]
+    assert build(edited, out, verbose=False) == []
+
+
+def test_hash_ignores_line_endings(monkeypatch):
+    spec = ICONS[0]
+    expected = input_hash(spec)
+    getsource = inspect.getsource
+    monkeypatch.setattr(inspect, "getsource", lambda fn: getsource(fn).replace("\n", "\r\n"))
+    build_icons._source_hash.cache_clear()
+    try:
+        assert input_hash(spec) == expected
+    finally:
+        build_icons._source_hash.cache_clear()
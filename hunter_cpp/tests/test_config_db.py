@@ -0,0 +1,92 @@
+"""
+Checks for config_db.py: hashUri keying as in continuous_validator.cpp and
+SnapshotReader lookups/aggregations over a saveToDisk-format file
+"""
+
+import hashlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_db import (SNAPSHOT_FIELDS_V2, ConfigHealthRecord, SnapshotReader,
+                       endpoint_key_for_uri, hash_uri, looks_like_literal_ip,
+                       parse_snapshot_line, write_snapshot)
+
+
+def test_endpoint_key_and_hash():
+    assert looks_like_literal_ip("1.2.3.4")
+    assert looks_like_literal_ip("[2001:db8::1]")
+    assert not looks_like_literal_ip("1234")
+    assert not looks_like_literal_ip("example.com")
+
+    # Literal-IP endpoints collapse regardless of port or remark
+    a = "trojan://pw@1.2.3.4:443#one"
+    b = "trojan://other@1.2.3.4:8443#two"
+    assert endpoint_key_for_uri(a) == "1.2.3.4"
+    assert hash_uri(a) == hash_uri(b)
+    assert hash_uri(a) == hashlib.sha1(b"1.2.3.4").hexdigest()[:16]
+
+    # Hostnames key on the whole trimmed, lowercased URI
+    host = "  trojan://PW@Example.COM:443#X "
+    assert endpoint_key_for_uri(host) == "trojan://pw@example.com:443#x"
+
+
+def _record(uri, tag, alive=False, latency=0.0, tests=0, last_tested=0.0):
+    rec = ConfigHealthRecord(uri, hash_uri(uri), tag)
+    rec.alive = alive
+    rec.latency_ms = latency
+    rec.total_tests = tests
+    rec.last_tested = last_tested
+    return rec
+
+
+def test_snapshot_reader(tmp_path):
+    records = [
+        _record("trojan://a@10.0.0.1:443#a", "scrape", True, 120.5, 2, 100.0),
+        _record("trojan://b@10.0.0.2:443#b", "scrape", True, 300.25, 1, 200.0),
+        _record("trojan://c@10.0.0.3:443#c", "scrape", False, 0.0, 3, 300.0),
+        _record("trojan://d@10.0.0.4:443#d", "manual"),
+    ]
+    path = tmp_path / "HUNTER_config_db.tsv"
+    write_snapshot(str(path), records)
+    with open(path, "a") as f:
+        f.write("trojan://dup@10.0.0.1:8443#dup\tmanual\t\t0\t0\t0\t0\t0\t0\t0\t0\t0\n")
+
+    for use_cache in (True, True, False):
+        with SnapshotReader(str(path), use_cache=use_cache) as reader:
+            assert len(reader) == 4
+            got = reader.get(records[1].uri_hash)
+            assert got.uri == records[1].uri and got.alive and got.latency_ms == 300.25
+            assert reader.get_uri("trojan://x@10.0.0.1:1#x").tag == "scrape"
+            assert reader.get("ffffffffffffffff") is None
+            scanned = [r.uri for r in reader.scan_tested_between(150.0, 300.0)]
+            assert scanned == [records[1].uri]
+
+            stats = reader.tag_stats("scrape")
+            assert (stats.total, stats.alive, stats.untested) == (3, 2, 0)
+            assert abs(stats.avg_latency_ms - 210.375) < 1e-3
+            assert reader.tag_stats("manual").untested == 1
+
+
+def test_index_skips_rows_with_any_bad_numeric_field(tmp_path):
+    path = tmp_path / "HUNTER_config_db.tsv"
+    write_snapshot(str(path), [_record("trojan://a@10.0.0.1:443#a", "scrape", True, 120.5)])
+    good = "\tscrape\t\t0\t5\t0\t1\t0\t80\t0\t1\t1\n"
+    corrupt = [
+        "trojan://b@10.0.0.2:443#b\tscrape\t\tnope\t5\t0\t1\t0\t80\t0\t1\t1\n",
+        "trojan://c@10.0.0.3:443#c\tscrape\t\t0\t5\tx\t1\t0\t80\t0\t1\t1\n",
+        "trojan://d@10.0.0.4:443#d\tscrape\t\t0\t5\t0\t1\tyes\t80\t0\t1\t1\n",
+        "trojan://e@10.0.0.5:443#e\tscrape\t\t0\t5\t0\t1\t0\t80\t-\t1\t1\n",
+        "trojan://f@10.0.0.6:443#f\tscrape\t\t0\t5\t0\t1\t0\t80\t0\t1\tall\n",
+        "trojan://g@10.0.0.7:443#g\tscrape\t\t0\t5\t0\t1\t0\t1e300\t0\t1\t1\n",
+    ]
+    with open(path, "a") as f:
+        f.writelines(corrupt + ["trojan://h@10.0.0.8:443#h" + good])
+    assert all(parse_snapshot_line(line.encode(), SNAPSHOT_FIELDS_V2) is None for line in corrupt)
+
+    for use_cache in (True, True, False):
+        with SnapshotReader(str(path), use_cache=use_cache) as reader:
+            assert sorted(rec.uri for rec in reader) == ["trojan://a@10.0.0.1:443#a",
+                                                         "trojan://h@10.0.0.8:443#h"]
+            assert reader.tag_stats("scrape").alive == 2
@@ -0,0 +1,81 @@
+"""
+Checks for config_scanner.py: StreamingConfigCounter fed in arbitrary chunk
+sizes agrees with the one-shot scan, including lines split across chunks
+and the unterminated last line
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_scanner import (StreamingConfigCounter, is_valid_config_content, iter_proxy_uris,
+                            legacy_is_valid_config_content, make_synthetic_payload,
+                            scan_config_content)
+
+PAYLOAD = (b"# mixed subscription\r\n"
+           b"vless://id-1@a.example.com:443?security=reality&type=grpc#first\r\n"
+           b"  trojan://pw@b.example.com:443?sni=b.example.com#second\n"
+           b"not a config line, mentions shadowsocks\n"
+           b"\n"
+           b"vmess://eyJhZGQiOiAiYy5leGFtcGxlLmNvbSIsICJwb3J0IjogNDQzfQ==\n"
+           b"http://ignored.example.com/\n"
+           b"ss://YWVzLTI1Ni1nY206cGFzcw==@10.0.0.1:8388#" + b"x" * 300 + b"\n"
+           b"hy2://auth@h.example.net:8443#no-trailing-newline")
+
+
+def _stream(payload, size, **kwargs):
+    uris = []
+    counter = StreamingConfigCounter(uri_sink=uris.append, **kwargs)
+    for i in range(0, len(payload), size):
+        if counter.feed(payload[i:i + size]):
+            break
+    return counter, counter.close(), uris
+
+
+def test_chunk_boundaries_match_one_shot_scan():
+    expected = scan_config_content(PAYLOAD)
+    expected_uris = list(iter_proxy_uris(PAYLOAD))
+    # http:// is a scheme line but not a proxy config
+    assert (expected.proxy_lines, expected.config_count) == (6, 5)
+    assert expected_uris[-1].startswith("hy2://")
+    for size in (1, 2, 7, 64, 301, len(PAYLOAD)):
+        counter, result, uris = _stream(PAYLOAD, size)
+        assert result == expected, size
+        assert uris == expected_uris, size
+        assert counter.verdict() == is_valid_config_content(PAYLOAD), size
+        assert counter.size == len(PAYLOAD) and not counter.truncated
+        assert counter.peak_buffer <= 400 + size            # only the tail is carried
+        assert counter.samples == expected_uris[:3], size
+
+
+def test_large_payload_and_json_body():
+    payload = make_synthetic_payload(0.25, seed=4).encode()
+    expected = scan_config_content(payload)
+    for size in (7, 4093):
+        assert _stream(payload, size)[1] == expected
+
+    body = json.dumps({"outbounds": [{"protocol": "vless", "settings": {}}]}).encode()
+    for size in (1, 5):
+        counter, _, _ = _stream(body, size)
+        assert counter.verdict() == is_valid_config_content(body)
+    counter, _, _ = _stream(body[:-1], 5)                    # cut before the closing brace
+    assert counter.verdict() == is_valid_config_content(body[:-1])
+
+
+def test_max_configs_stops_at_boundary():
+    counter, result, uris = _stream(PAYLOAD, 7, max_configs=2)
+    assert counter.truncated and result.config_count == 2 and len(uris) == 2
+    assert counter.size < len(PAYLOAD)
+
+
+def test_base64_markers_are_case_sensitive():
+    jwt = "token eyJhbGciOiJIUzI1NiJ9 here"
+    assert legacy_is_valid_config_content(jwt)[0] is False
+    assert is_valid_config_content(jwt) == (True, "Valid content with patterns: eyJ")
+    upper = "DATA EWOGICAidGVzdCI6IDEK end"
+    assert legacy_is_valid_config_content(upper)[0] is True
+    assert is_valid_config_content(upper) == (False, "No config patterns found")
+    lower = "plain ewogICJ0ZXN0IjogMQ"
+    assert is_valid_config_content(lower) == legacy_is_valid_config_content(lower)
@@ -0,0 +1,83 @@
+"""
+Checks for config_table.py: filtering, selection, lazy fields, appends and
+loading ConfigDatabase snapshots
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_db import ConfigHealthRecord, hash_uri, write_snapshot
+from config_table import ConfigTable, Vocab
+from uri_parser import make_synthetic_uris, parse, parse_many
+
+URIS = [
+    "vless://u-1@a.example.com:443?security=reality&type=grpc&sni=www.speedtest.net&pbk=K1#one",
+    "vless://u-2@b.example.com:443?security=tls&type=ws&sni=b.example.com#two",
+    "trojan://pw@c.example.com:8443?security=tls&sni=c.example.com#three",
+    "vless://u-4@d.example.com:443?security=reality&type=grpc&sni=www.speedtest.net&pbk=K4#four",
+]
+
+
+def test_mask_select_and_lazy_fields():
+    table = ConfigTable.from_uris(URIS)
+    assert len(table) == 4 and table.uri(2) == URIS[2]
+    assert table.where(security="reality", network="grpc", port=443).tolist() == [0, 3]
+    assert table.where(protocol=["trojan", "vless"], port=8443).tolist() == [2]
+    assert not table.mask(security="none").any()
+    with pytest.raises(KeyError):
+        table.mask(uuid="u-1")
+
+    sub = table.select(table.mask(security="reality"))
+    assert [sub.uri(i) for i in range(len(sub))] == [URIS[0], URIS[3]]
+    assert sub.lazy_column("public_key") == ["K1", "K4"]
+    assert table.value("uuid", 1) == "u-2" and table.value("sni", 2) == "c.example.com"
+    assert table.counts("security") == {"reality": 2, "tls": 2}
+    assert table.row(0).ps == parse(URIS[0]).ps
+
+
+def test_extend_matches_one_shot_build():
+    uris = make_synthetic_uris(3000, seed=7)
+    whole = ConfigTable.from_uris(uris)
+    parts = ConfigTable()
+    configs = parse_many(uris)
+    for start in range(0, len(configs), 700):
+        parts.extend(configs[start:start + 700])
+        assert parts.uri(len(parts) - 1) == configs[len(parts) - 1].uri
+    assert len(parts) == len(whole) and len(parts._uri_parts) == 1
+    for name, column in whole.columns.items():
+        assert (parts.columns[name] == column).all(), name
+    assert parts.lazy_column("uuid") == whole.lazy_column("uuid")
+
+
+def test_vocab_overflow_leaves_table_unchanged():
+    table = ConfigTable.from_uris(URIS[:1])
+    table.vocabs["flow"] = Vocab(table.vocabs["flow"].values + [f"f{i}" for i in range(65535)])
+    before = {name: len(vocab) for name, vocab in table.vocabs.items()}
+    extra = parse(URIS[1])
+    extra.flow = "one-too-many"
+    with pytest.raises(ValueError, match="flow"):
+        table.extend([extra])
+    assert {name: len(vocab) for name, vocab in table.vocabs.items()} == before
+    assert len(table) == 1 and table.vocabs["flow"].lookup("one-too-many") == -1
+    assert table.vocabs["address"].lookup("b.example.com") == -1
+
+
+def test_load_snapshot_and_jsonl(tmp_path):
+    records = []
+    for i, uri in enumerate(URIS + URIS[:1]):
+        rec = ConfigHealthRecord(uri, hash_uri(uri), tag="sub")
+        rec.last_tested = 1_700_000_000.0 + i
+        records.append(rec)
+    snapshot = str(tmp_path / "HUNTER_config_db.tsv")
+    write_snapshot(snapshot, records)
+    table = ConfigTable.load(snapshot)
+    assert sorted(table.uri(i) for i in range(len(table))) == sorted(URIS)
+
+    export = tmp_path / "export.jsonl"
+    export.write_text("".join(json.dumps(r.to_dict()) + "\n" for r in records))
+    assert len(ConfigTable.load(str(export))) == len(URIS)
@@ -0,0 +1,43 @@
+"""
+Checks for endpoint_index.py: keys match ConfigDatabase::hashUri and both
+backends agree
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_scanner import StreamingConfigCounter
+from endpoint_index import EndpointIndex, dedup_sources, unique_endpoint_count
+
+PAYLOAD = b"""\
+ss://YWVzLTI1Ni1nY206cGFzc3dvcmQ=@172.16.0.1:8388#first
+ss://YWVzLTI1Ni1nY206cGFzc3dvcmQ=@172.16.0.1:9000#same-ip-other-port
+trojan://secret@t1.example.org:443?security=tls#one
+trojan://secret@t1.example.org:443?security=tls#renamed
+trojan://secret@t1.example.org:443?security=tls#one
+https://example.com/not-a-proxy
+"""
+
+
+def test_unique_endpoints_follow_hash_uri():
+    # Literal IPs collapse across ports; hostname URIs are keyed whole
+    assert unique_endpoint_count(PAYLOAD) == 3
+
+    index = EndpointIndex()
+    counter = StreamingConfigCounter(uri_sink=index.add)
+    for i in range(0, len(PAYLOAD), 7):
+        counter.feed(PAYLOAD[i:i + 7])
+    assert counter.close().config_count == 5
+    assert len(index) == 3 and index.duplicates == 2
+
+
+def test_bloom_backend_and_cross_source_counts():
+    exact, bloom = EndpointIndex(), EndpointIndex(bloom_capacity=1000)
+    uris = [f"vless://id@node{i % 40}.example.com:443#n{i % 40}" for i in range(100)]
+    assert list(exact.add_many(uris)) == list(bloom.add_many(uris))
+    assert len(bloom) == 40 and uris[0] in bloom
+
+    rows = dedup_sources([("a", PAYLOAD), ("b", PAYLOAD + b"vless://x@10.0.0.9:1#z\n")])
+    assert [(r.uris, r.unique, r.new) for r in rows] == [(5, 3, 3), (6, 4, 1)]
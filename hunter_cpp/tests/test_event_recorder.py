@@ -0,0 +1,95 @@
+"""
+Checks for event_recorder.py: round trip, seek, crash recovery and replay
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from event_recorder import EventRecorder, Recording, record, replay
+from mock_orchestrator import MockOrchestrator
+
+
+def _event(type, i):
+    return json.dumps({"type": type, "payload": {"i": i}}, separators=(",", ":"))
+
+
+def _write(path, count, **kwargs):
+    with EventRecorder(str(path), chunk_events=100, **kwargs) as recorder:
+        for i in range(count):
+            recorder.append(1000.0 + i, "logs" if i % 10 else "status",
+                            _event("logs" if i % 10 else "status", i))
+
+
+def test_round_trip_and_seek(tmp_path):
+    path = tmp_path / "rec.hrec"
+    _write(path, 1000)
+    with Recording(str(path)) as recording:
+        assert recording.indexed and len(recording.chunks) == 10
+        assert recording.counts() == {"logs": 900, "status": 100}
+        events = list(recording.events())
+        assert [json.loads(e.raw)["payload"]["i"] for e in events] == list(range(1000))
+
+        hit = recording.seek(1433.5, types=("status",))
+        assert hit.t == 1440.0 and hit.type == "status"
+        window = list(recording.events(start=1100.0, end=1105.0))
+        assert [e.t for e in window] == [1100.0, 1101.0, 1102.0, 1103.0, 1104.0]
+
+
+def test_torn_tail_is_recovered_and_appended(tmp_path):
+    path = tmp_path / "rec.hrec"
+    _write(path, 500)
+    with Recording(str(path)) as recording:
+        index_offset = max(c.offset for c in recording.chunks)
+    # Simulate a crash mid-chunk: no index, last chunk cut short
+    with open(path, "r+b") as f:
+        f.truncate(index_offset + 40)
+    with Recording(str(path)) as recording:
+        assert not recording.indexed and sum(recording.counts().values()) == 400
+
+    with EventRecorder(str(path)) as recorder:
+        recorder.append(5000.0, "status", _event("status", -1))
+    with Recording(str(path)) as recording:
+        assert recording.indexed and sum(recording.counts().values()) == 401
+        assert recording.seek(4000.0).t == 5000.0
+
+
+def test_replay_is_paced(tmp_path):
+    path = tmp_path / "rec.hrec"
+    with EventRecorder(str(path)) as recorder:
+        for i in range(5):
+            recorder.append(100.0 + i * 0.1, "status", _event("status", i))
+
+    async def run(speed):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with Recording(str(path)) as recording:
+            count = len([e async for e in replay(recording, speed=speed)])
+        return count, loop.time() - start
+
+    count, elapsed = asyncio.run(run(1.0))
+    assert count == 5 and elapsed >= 0.35
+    count, elapsed = asyncio.run(run(0))
+    assert count == 5 and elapsed < 0.2
+
+
+def test_records_live_monitor(tmp_path):
+    path = tmp_path / "live.hrec"
+
+    async def run():
+        async with MockOrchestrator(status_hz=200, logs_hz=200, alive_configs=2,
+                                    latency_scale=0) as mock:
+            stats = await record(str(path), port=mock.monitor_port, duration=0.5,
+                                 report_every=0, flush_interval=0.1)
+        return stats
+
+    stats = asyncio.run(run())
+    with Recording(str(path)) as recording:
+        counts = recording.counts()
+    assert stats["events"] == sum(counts.values()) > 50
+    assert counts["status"] > 0 and counts["logs"] > 0
+    assert os.path.getsize(path) < stats["raw_bytes"]
@@ -0,0 +1,99 @@
+"""
+Checks for fetch_breaker.py: circuit transitions, persistence, the retry
+budget and a farm sweep with dead sources
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fetch_breaker import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, RetryBudget,
+                           with_retries)
+from fetch_session import fetch
+from source_farm import SourceFarm
+from source_fetcher import fetch_sources
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_circuit_opens_probes_and_closes(tmp_path):
+    clock = Clock()
+    breaker = CircuitBreaker(threshold=3, base_cooldown=100, jitter=0, clock=clock)
+    url = "https://dead.example/sub.txt"
+    for _ in range(3):
+        assert breaker.allow(url) == CLOSED
+        breaker.record_failure(url, "Timeout")
+    assert breaker.state(url) == OPEN and breaker.allow(url) is None
+
+    clock.now += 100
+    assert breaker.allow(url) == HALF_OPEN
+    assert breaker.allow(url) is None                # only one probe at a time
+    breaker.record_failure(url, "Timeout")
+    assert breaker.retry_in(url) == 200              # cooldown doubled
+
+    path = str(tmp_path / "breaker.tsv")
+    breaker.save(path)
+    restored = CircuitBreaker(path, jitter=0, clock=clock)
+    assert restored.state(url) == OPEN and restored.retry_in(url) == 200
+    clock.now += 200
+    assert restored.allow(url) == HALF_OPEN
+    restored.record_success(url)
+    assert restored.state(url) == CLOSED
+
+
+def test_retry_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, min_retries=1)
+    calls = []
+
+    def flaky(url, timeout=30):
+        calls.append(url)
+        return False, 0, "503 Server Error", 0
+
+    def missing(url, timeout=30):
+        calls.append(url)
+        return False, 0, "404 Client Error", 0
+
+    retrying = with_retries(flaky, budget, attempts=3, sleep=lambda s: None)
+    retrying("a")                                    # budget 1 + 0.5 * 1 attempt
+    assert len(calls) == 3 and budget.stats["retries"] == 2
+    retrying("b")                                    # 1 + 0.5 * 2: spent
+    assert len(calls) == 4 and budget.stats["denied"] == 1
+    retrying("c")                                    # 1 + 0.5 * 3: one more
+    assert len(calls) == 6
+    calls.clear()
+    with_retries(missing, RetryBudget(), sleep=lambda s: None)("d")
+    assert calls == ["d"]
+
+
+def test_dead_sources_skipped_on_next_run(tmp_path):
+    path = str(tmp_path / "breaker.tsv")
+
+    def download(url, timeout=30):
+        response = fetch(url, timeout=timeout)
+        response.raise_for_status()
+        return True, len(response.content), "ok", 0
+
+    with SourceFarm(sources=4, payload_kb=4) as farm:
+        urls = farm.urls()
+        urls[0] += "?hang=30"
+        urls[1] += "?status=404"
+        for _ in range(2):
+            breaker = CircuitBreaker(path, threshold=2)
+            fetch_one = breaker.guard(with_retries(download, RetryBudget(), backoff=0.01))
+            results = fetch_sources(urls, fetch_one, timeout=1, host_interval=0, per_host=4)
+            breaker.save()
+        assert [r[0] for r in results] == [False, False, True, True]
+
+        breaker = CircuitBreaker(path, threshold=2)
+        start = time.perf_counter()
+        results = fetch_sources(urls[:2], breaker.guard(download), timeout=1, host_interval=0)
+        assert time.perf_counter() - start < 0.5
+        assert all(r[2].startswith("Circuit open") for r in results)
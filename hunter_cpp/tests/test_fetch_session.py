@@ -0,0 +1,65 @@
+"""
+Checks for fetch_session.py: keep-alive reuse, byte counters, chunked
+streaming and handshake counting through a proxy
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fetch_session import FetchSession
+from proxy_pool import StubProxy
+from source_farm import SourceFarm
+
+
+@pytest.fixture(scope="module")
+def farm():
+    with SourceFarm(sources=6, payload_kb=64) as running:
+        yield running
+
+
+def test_connection_reuse_and_byte_counters(farm):
+    farm.reset_stats()
+    session = FetchSession()
+    urls = farm.urls()
+    decoded = 0
+    for _ in range(3):
+        for url in urls:
+            response = session.fetch(url, timeout=5)
+            response.raise_for_status()
+            decoded += len(response.content)
+        assert session.handshakes == 1                      # one keep-alive connection
+    stats = session.snapshot()
+    assert farm.stats["connections"] == 1 and farm.stats["requests"] == 3 * len(urls)
+    assert stats["requests"] == 3 * len(urls) and stats["bytes_decoded"] == decoded
+    # gzip on the wire, plus headers
+    assert farm.stats["bytes_sent"] < stats["bytes_on_wire"] < decoded
+    session.close()
+
+
+def test_iter_chunks(farm):
+    session = FetchSession()
+    url = farm.urls()[2]
+    meta = {}
+    chunks = list(session.iter_chunks(url, timeout=5, chunk_size=4096, meta=meta))
+    assert meta["status_code"] == 200 and len(chunks) > 1
+    assert b"".join(chunks) == session.fetch(url, timeout=5).content
+    assert session.snapshot()["bytes_decoded"] == 2 * sum(map(len, chunks))
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        next(session.iter_chunks(farm.url("plain", 0, status=503), timeout=5))
+    assert session.handshakes == 1
+    session.close()
+
+
+def test_handshakes_counted_through_proxy(farm):
+    with StubProxy() as stub:
+        session = FetchSession(proxy=f"http://127.0.0.1:{stub.port}")
+        for url in farm.urls()[:3]:
+            session.fetch(url, timeout=5).raise_for_status()
+        assert stub.requests == 3 and session.handshakes == 1
+        session.close()
@@ -0,0 +1,96 @@
+"""
+Checks for health_analytics.py: getStats/getTagStats parity with the scalar
+port and SnapshotReader, group-by percentiles and Kaplan-Meier survival
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_db import ConfigHealthRecord, SnapshotReader, hash_uri, write_snapshot
+from health_analytics import HealthFrame, decaying_records, scalar_stats
+
+NOW = 1_700_000_000.0
+
+
+def test_stats_match_scalar_port_and_reader(tmp_path):
+    records = decaying_records(3000, seed=5, now=NOW)
+    path = str(tmp_path / "db.tsv")
+    write_snapshot(path, records)
+    frame = HealthFrame.load(path)
+    assert frame.stats(NOW) == scalar_stats(records, NOW)
+    with SnapshotReader(path) as reader:
+        for tag in ("scrape", "manual", "missing", ""):
+            assert frame.tag_stats(tag).to_dict() == reader.tag_stats(tag).to_dict()
+
+    # A JSON-lines export loads to the same columns
+    jsonl = str(tmp_path / "db.jsonl")
+    with open(jsonl, "w") as f:
+        for rec in records:
+            f.write(json.dumps({name: getattr(rec, name) for name in ConfigHealthRecord.__slots__
+                                if name != "uri_hash"}) + "\n")
+    assert HealthFrame.load(jsonl).stats(NOW) == frame.stats(NOW)
+
+
+def test_classification_cached_in_index(tmp_path, monkeypatch):
+    records = decaying_records(500, seed=2, now=NOW)
+    assert len({rec.uri_hash for rec in records}) == 500
+    path = str(tmp_path / "db.tsv")
+    write_snapshot(path, records)
+    first = HealthFrame.load(path)
+    first.classify()
+    expected = first.latency_percentiles()
+
+    import health_analytics
+    monkeypatch.setattr(health_analytics, "parse_many", None)     # must not parse again
+    again = HealthFrame.load(path)
+    assert "protocol" in again.columns
+    assert again.latency_percentiles() == expected
+    assert "protocol" not in HealthFrame.load(path, use_cache=False).columns
+
+    write_snapshot(path, records[:400])                          # changed: cache dropped
+    monkeypatch.undo()
+    assert "protocol" not in HealthFrame.load(path).columns
+
+
+def _record(uri, tag, alive, latency, first_seen=0.0, last_alive=0.0):
+    rec = ConfigHealthRecord(uri, hash_uri(uri), tag)
+    rec.alive, rec.latency_ms, rec.total_tests = alive, latency, 2
+    rec.total_passes = 1 if alive else 0
+    rec.first_seen, rec.last_alive_time = first_seen, last_alive
+    return rec
+
+
+def test_groups_and_percentiles():
+    records = [_record(f"trojan://pw@h{i}.example.com:443?type=ws&security=tls#t", "scrape",
+                       True, float(10 * (i + 1))) for i in range(10)]
+    records += [_record("vless://00000000-0000-0000-0000-000000000000@v.example.com:443"
+                        "?type=tcp&security=reality#v", "manual", False, 0.0)]
+    frame = HealthFrame.from_records(records)
+    rates = {row["group"]: row for row in frame.pass_rates("tag")}
+    assert rates["scrape"]["pass_rate"] == 0.5 and rates["manual"]["alive"] == 0
+
+    rows = frame.latency_percentiles(percentiles=(50, 90))
+    assert len(rows) == 1 and rows[0]["group"] == ("trojan", "ws", "tls")
+    latencies = [10.0 * (i + 1) for i in range(10)]
+    assert rows[0]["p50"] == np.percentile(latencies, 50)
+    assert rows[0]["p90"] == np.percentile(latencies, 90)
+
+
+def test_survival_curve():
+    # Four dead configs living 1..4 h, one still alive (censored at 2.5 h)
+    records = [_record(f"trojan://pw@d{h}.example.com:443#d", "scrape", False, 0.0,
+                       first_seen=NOW - 10 * 3600, last_alive=NOW - 10 * 3600 + h * 3600)
+               for h in (1, 2, 3, 4)]
+    records.append(_record("trojan://pw@alive.example.com:443#a", "scrape", True, 50.0,
+                           first_seen=NOW - 2.5 * 3600, last_alive=NOW))
+    frame = HealthFrame.from_records(records)
+    times, surv = frame.survival(now=NOW)["all"]
+    assert list(times / 3600) == [1, 2, 3, 4]
+    assert np.allclose(surv, [4 / 5, 3 / 5, 3 / 5 * 1 / 2, 0.0])
+    assert frame.median_lifetime((times, surv)) == 3 * 3600
+    assert list(frame.survival_at((times, surv), [0, 3600 * 1.5])) == [1.0, 0.8]
@@ -0,0 +1,63 @@
+"""
+Checks for health_log.py: updateHealth replay, torn-tail recovery and
+compaction into a snapshot
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_db import ConfigHealthRecord, hash_uri, write_snapshot
+from health_log import HealthLog, compact, list_segments, load_database
+
+URI_A = "trojan://a@10.0.0.1:443#a"
+URI_B = "trojan://b@10.0.0.2:443#b"
+
+
+def _seed(tmp_path):
+    snapshot = str(tmp_path / "HUNTER_config_db.tsv")
+    write_snapshot(snapshot, [ConfigHealthRecord(URI_A, hash_uri(URI_A), "scrape")])
+    return snapshot, str(tmp_path / "health")
+
+
+def test_replay_matches_update_health(tmp_path):
+    snapshot, log_dir = _seed(tmp_path)
+    with HealthLog(log_dir) as log:
+        log.append_update(hash_uri(URI_A), True, 150.0, "xray", 100.0)
+        log.append_update(hash_uri(URI_A), False, 0.0, "", 200.0)
+        log.append_add(URI_B, "manual", 250.0)
+        log.append_update(hash_uri(URI_B), False, 0.0, "sing-box", 300.0, force_dead=True)
+        log.append_update("ffffffffffffffff", True, 1.0, "", 300.0)
+
+    db, stats = load_database(snapshot, log_dir)
+    a, b = db[hash_uri(URI_A)], db[hash_uri(URI_B)]
+    # One failure after a pass keeps the record alive (dead at 3 fails)
+    assert (a.alive, a.latency_ms, a.consecutive_fails) == (True, 150.0, 1)
+    assert (a.total_tests, a.total_passes, a.last_tested, a.engine_used) == (2, 1, 200.0, "xray")
+    assert (b.alive, b.consecutive_fails, b.tag, b.first_seen) == (False, 3, "manual", 250.0)
+    assert stats.skipped == 1
+
+
+def test_torn_tail_and_compaction(tmp_path):
+    snapshot, log_dir = _seed(tmp_path)
+    with HealthLog(log_dir) as log:
+        log.append_update(hash_uri(URI_A), True, 150.0, "xray", 100.0)
+    path = list_segments(log_dir)[-1][1]
+    with open(path, "ab") as f:
+        f.write(b"\x40\x00\x00\x00partial")
+
+    with HealthLog(log_dir) as log:
+        log.append_update(hash_uri(URI_A), True, 90.0, "xray", 200.0)
+        log.flush()
+        before, _ = load_database(snapshot, log_dir)
+        compact(snapshot, log)
+        log.append_update(hash_uri(URI_A), False, 0.0, "", 300.0)
+
+    after, stats = load_database(snapshot, log_dir)
+    rec = after[hash_uri(URI_A)]
+    assert before[hash_uri(URI_A)].total_tests == 2
+    assert (rec.total_tests, rec.latency_ms, rec.consecutive_fails) == (3, 90.0, 1)
+    assert stats.log_seq == 1 and stats.replayed == 1
+    assert os.path.exists(snapshot + ".idx.npz")
@@ -0,0 +1,44 @@
+"""
+Checks for mock_orchestrator.py: bridge protocol, command state and fan-out
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from mock_orchestrator import MockOrchestrator, measure_fanout
+from realtime_client import LogsEvent, Orchestrator, StatusEvent
+
+
+def test_commands_change_state_and_broadcast_status():
+    async def run():
+        async with MockOrchestrator(status_hz=0, logs_hz=0, latency_scale=0) as mock:
+            async with Orchestrator("127.0.0.1", mock.control_port, mock.monitor_port) as client:
+                first = await client.monitor.get(timeout=5)
+                assert isinstance(first, StatusEvent) and not first.paused
+                assert isinstance(await client.monitor.get(timeout=5), LogsEvent)
+
+                result = await client.request("pause")
+                assert result.ok and result.message == "paused" and result.status.paused
+                pushed = await client.monitor.get(timeout=5)
+                assert isinstance(pushed, StatusEvent) and pushed.paused
+
+                assert (await client.request("set_threads", value=99)).message == "invalid_threads"
+                assert (await client.request("bogus")).message == "unknown_command"
+                quiet = await client.request("get_status", quiet=True)
+                assert quiet.ok and client.monitor.pending() == 2
+    asyncio.run(run())
+
+
+def test_fanout_reaches_every_client():
+    async def run():
+        async with MockOrchestrator(status_hz=20, logs_hz=10, alive_configs=5,
+                                    latency_scale=0) as mock:
+            report = await measure_fanout(("127.0.0.1", mock.control_port, mock.monitor_port),
+                                          clients=20, duration=0.5, commanders=1)
+        assert report["events_delivered"] >= 20 * 5
+        assert report["commands"] > 0
+        assert 0 <= report["latency_ms"][50] <= report["latency_ms"][99]
+    asyncio.run(run())
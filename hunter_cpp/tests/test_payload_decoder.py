@@ -0,0 +1,137 @@
+"""
+Checks for payload_decoder.py: format sniffing, streaming decode and the
+URIs produced for each format
+"""
+
+import base64
+import json
+import sys
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from payload_decoder import PayloadDecoder, _parse_clash_item, decode_payload, decode_verdict
+from source_farm import FIXTURE_KINDS, SourceFarm, make_fixture
+from source_fetcher import stream_source
+from uri_parser import parse
+
+CLASH = """\
+mixed-port: 7890
+proxies:
+  - {name: "flow vmess", type: vmess, server: 1.2.3.4, port: 443, uuid: u-1, cipher: auto, tls: true, network: ws, ws-opts: {path: /ws, headers: {Host: cdn.example.com}}}
+  - name: reality
+    type: vless
+    server: r.example.com
+    port: 8443
+    uuid: u-2
+    tls: true
+    reality-opts:
+      public-key: PBK
+      short-id: ab
+    alpn:
+      - h2
+  - name: ss
+    type: ss
+    server: 5.6.7.8
+    port: 8388
+    cipher: aes-256-gcm
+    password: "p@ss"
+  - name: skip-me
+    type: http
+    server: 9.9.9.9
+    port: 80
+proxy-groups:
+  - name: auto
+    type: url-test
+"""
+
+SING_BOX = {"outbounds": [
+    {"type": "trojan", "tag": "t", "server": "t.example.org", "server_port": 443,
+     "password": "pw", "tls": {"enabled": True, "server_name": "t.example.org"}},
+    {"type": "hysteria2", "server": "h.example.net", "server_port": 8443, "password": "a"},
+    {"type": "direct", "tag": "direct"}]}
+
+
+def _chunked(payload, size=97):
+    uris = []
+    decoder = PayloadDecoder(uri_sink=uris.append)
+    for i in range(0, len(payload), size):
+        decoder.feed(payload[i:i + size])
+    decoder.close()
+    return decoder, uris
+
+
+def test_clash_items_match_yaml_loader():
+    lines = CLASH.splitlines()
+    for start, end in ((2, 3), (3, 14), (14, 20), (20, 24)):
+        item = [line[2:] for line in lines[start:end]]
+        try:
+            fast = _parse_clash_item(item)
+        except ValueError:
+            continue  # block list (alpn) goes to the YAML loader
+        assert fast == yaml.safe_load("\n".join(item))[0]
+
+    decoder, uris = _chunked(CLASH.encode())
+    assert decoder.format == "clash" and decoder.stats["clash"]["skipped"] == 1
+    configs = [parse(uri) for uri in uris]
+    assert [(c.protocol, c.address, c.port) for c in configs] == [
+        ("vmess", "1.2.3.4", 443), ("vless", "r.example.com", 8443),
+        ("shadowsocks", "5.6.7.8", 8388)]
+    assert configs[0].path == "/ws" and configs[0].host == "cdn.example.com"
+    assert configs[1].is_reality() and configs[1].public_key == "PBK"
+    assert configs[2].uuid == "p@ss"
+
+
+def test_json_and_base64_payloads():
+    fmt, uris = decode_payload(json.dumps(SING_BOX))
+    assert fmt == "json" and [parse(u).protocol for u in uris] == ["trojan", "hysteria2"]
+
+    template = json.dumps({"inbounds": [], "outbounds": [{"protocol": "freedom"}]})
+    decoder, _ = _chunked(template.encode())
+    assert decode_verdict(decoder)[0] is False
+
+    plain = make_fixture("plain", 0, 16)
+    _, expected = decode_payload(plain)
+    wrapped = base64.b64encode(plain)
+    decoder, uris = _chunked(b"\n".join(wrapped[i:i + 76] for i in range(0, len(wrapped), 76)))
+    assert decoder.format == "base64/plain" and uris == expected
+    assert decode_verdict(decoder) == (True, f"Valid base64/plain payload with {len(uris)} configs")
+
+
+def test_farm_fixtures_round_trip():
+    for kind in ("clash", "v2ray"):
+        _, uris = decode_payload(make_fixture(kind, 1, 32))
+        assert uris and all(parse(uri) is not None for uri in uris)
+
+
+def test_streaming_stops_at_max_configs_for_every_format():
+    with SourceFarm(sources=4, payload_kb=256) as farm:
+        for kind in FIXTURE_KINDS:
+            uris = []
+            decoder = PayloadDecoder(uri_sink=uris.append)
+            counter = stream_source(farm.url(kind, 0), timeout=10, max_configs=10,
+                                    chunk_size=4096, decoder=decoder)
+            full = len(make_fixture(kind, 0, 256))
+            assert decoder.uris >= 10 and len(uris) == decoder.uris, kind
+            assert counter.samples == uris[:3] and counter.result().proxy_lines == 0, kind
+            if kind == "v2ray":         # whole-document JSON only decodes at the end
+                assert not counter.truncated and counter.size == full
+            else:
+                assert counter.truncated and counter.size < full // 4, kind
+
+
+def test_base64_with_bom_and_stray_high_bytes():
+    plain = make_fixture("plain", 0, 16)
+    _, expected = decode_payload(plain)
+    wrapped = base64.b64encode(plain)
+    assert decode_payload(b"\xef\xbb\xbf" + wrapped) == ("base64/plain", expected)
+    # Latin-1 letters are not base64 digits and must not shift the 4-char groups
+    noisy = wrapped[:2000] + b"\xaa\xb2\xc0\xef" + wrapped[2000:]
+    for size in (97, len(noisy)):
+        decoder, uris = _chunked(b"\xef\xbb\xbf" + noisy, size)
+        assert decoder.format == "base64/plain" and uris == expected, size
+
+    decoder, uris = _chunked(b"QUJD" * 8 + b"Q", 5)      # dangling character is dropped
+    assert decoder.format.startswith("base64/") and uris == []
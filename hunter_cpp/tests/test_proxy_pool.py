@@ -0,0 +1,112 @@
+"""
+Checks for proxy_pool.py: probing, failover and throughput-weighted
+spreading over local stub proxies
+"""
+
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import proxy_pool
+from proxy_pool import ProxyPool, StubProxy, parse_ports, probe_port
+from source_farm import SourceFarm
+from source_fetcher import fetch_sources, stream_source
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def farm():
+    with SourceFarm(sources=12, payload_kb=64) as running:
+        yield running
+
+
+def test_parse_and_probe():
+    assert parse_ports("10808, http:10809") == [("socks5h", 10808), ("http", 10809)]
+    with StubProxy() as stub:
+        assert probe_port("127.0.0.1", stub.port, "http") is not None
+        assert probe_port("127.0.0.1", stub.port, "socks5h") is None   # not a SOCKS server
+    assert probe_port("127.0.0.1", _closed_port(), "http") is None
+
+
+def test_socks_ports_need_pysocks(monkeypatch):
+    monkeypatch.setattr(proxy_pool, "socks", None)
+    with pytest.raises(RuntimeError, match="socks5h:10808.*PySocks"):
+        ProxyPool(parse_ports("10808,http:10809"))
+    assert len(ProxyPool(parse_ports("http:10809")).ports) == 1
+
+
+def test_failover_and_direct_fallback(farm):
+    url = farm.urls()[0]
+    expected = requests.get(url, timeout=5).content
+    with StubProxy() as dying, StubProxy() as good:
+        pool = ProxyPool([("http", dying.port), ("http", good.port), ("http", _closed_port())],
+                         reprobe_interval=0)
+        assert len(pool.probe()) == 2
+        dying.stop()                    # the engine exits after the probe
+        for _ in range(4):
+            assert pool.fetch(url, timeout=5).content == expected
+        stats = {s["port"]: s for s in pool.stats()}
+        assert stats[f"http:{good.port}"]["ok"] == 4
+        assert stats[f"http:{dying.port}"]["ok"] == 0
+        pool.close()
+
+    pool = ProxyPool([("http", _closed_port())], direct=True, reprobe_interval=0)
+    assert pool.probe() == []
+    assert pool.fetch(url, timeout=5).content == expected
+    assert pool.stats()[-1]["port"] == "direct"
+    pool.close()
+
+
+def test_spreads_by_throughput(farm):
+    with StubProxy(rate=8e6) as fast, StubProxy(rate=0.5e6) as slow:
+        pool = ProxyPool([("http", fast.port), ("http", slow.port)], reprobe_interval=0)
+        pool.probe()
+
+        def fetch_one(url, timeout=30):
+            response = pool.fetch(url, timeout=timeout)
+            response.raise_for_status()
+            return True, len(response.content), "ok", 0
+
+        results = fetch_sources(farm.urls() * 2, fetch_one, concurrency=4, per_host=4,
+                                host_interval=0)
+        assert all(r[0] for r in results)
+        counter = stream_source(farm.urls()[1], timeout=10, session=pool)
+        assert counter.size > 0
+        stats = {s["port"]: s for s in pool.stats()}
+        assert stats[f"http:{fast.port}"]["requests"] > 2 * stats[f"http:{slow.port}"]["requests"]
+        assert stats[f"http:{fast.port}"]["throughput"] > stats[f"http:{slow.port}"]["throughput"]
+        pool.close()
+
+
+def test_dead_origins_leave_the_port_alive(farm):
+    dead_origin = f"http://127.0.0.1:{_closed_port()}/sub.txt"
+    with StubProxy() as stub:
+        pool = ProxyPool([("http", stub.port)], reprobe_interval=0, max_failures=2)
+        pool.probe()
+        for _ in range(4):
+            assert pool.fetch(dead_origin, timeout=5).status_code == 502   # proxy's answer
+        with pytest.raises(requests.exceptions.HTTPError):
+            stream_source(dead_origin, timeout=5, session=pool)
+        assert [p.port for p in pool.alive_ports()] == [stub.port]
+        assert pool.fetch(farm.urls()[0], timeout=5).status_code == 200
+        assert pool.stats()[0]["ok"] == 6 and pool.stats()[0]["throughput"] > 0
+        pool.close()
+
+    with StubProxy(fail="hang") as stalled, StubProxy() as spare:   # origin never answers
+        pool = ProxyPool([("http", stalled.port), ("http", spare.port)],
+                         reprobe_interval=0, max_failures=1)
+        pool.probe()
+        with pytest.raises(requests.exceptions.Timeout):      # not retried on the spare
+            pool.fetch(farm.urls()[0], timeout=0.3)
+        assert len(pool.alive_ports()) == 2 and spare.requests == 0
+        pool.close()
@@ -0,0 +1,118 @@
+"""
+Checks for realtime_client.py against a minimal in-process bridge that
+answers like WebSocketBridge::handleControlClient
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from realtime_client import (OP_TEXT, ControlClient, LogsEvent, MonitorClient, RealtimeError,
+                             StatusEvent, accept_value, command_many, decode_event,
+                             encode_frame, read_frame)
+
+
+async def _serve_handshake(reader, writer):
+    head = (await reader.readuntil(b"\r\n\r\n")).decode()
+    key = next(line.split(":", 1)[1].strip() for line in head.split("\r\n")
+               if line.lower().startswith("sec-websocket-key"))
+    writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+                  f"Connection: Upgrade\r\nSec-WebSocket-Accept: {accept_value(key)}\r\n\r\n").encode())
+
+
+async def _bridge(handler):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def test_frames_round_trip():
+    async def run():
+        reader = asyncio.StreamReader()
+        for size in (0, 5, 300, 70000):
+            reader.feed_data(encode_frame("x" * size))
+        for size in (0, 5, 300, 70000):
+            fin, opcode, payload = await read_frame(reader)
+            assert fin and opcode == OP_TEXT and payload == b"x" * size
+    asyncio.run(run())
+
+
+def test_decode_events():
+    status = decode_event(json.dumps({"type": "status", "payload": {
+        "phase": "cycle", "paused": False, "db": {"total": 12, "alive": 3}}}))
+    assert isinstance(status, StatusEvent)
+    assert status.phase == "cycle" and status.db.total == 12 and status.db.alive == 3
+    logs = decode_event('{"type":"logs","payload":{"lines":["a","b"]}}')
+    assert isinstance(logs, LogsEvent) and logs.lines == ["a", "b"]
+    assert decode_event('{"type":"discovery_log","payload":{}}').type == "discovery_log"
+    assert decode_event("not json") is None
+
+
+def test_requests_are_correlated_and_reconnect():
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        await _serve_handshake(reader, writer)
+        try:
+            while True:
+                _, _, payload = await read_frame(reader)
+                msg = json.loads(payload)
+                if msg["command"] == "drop":
+                    writer.close()
+                    return
+                writer.write(encode_frame(json.dumps(
+                    {"type": "command_ack", "request_id": msg["request_id"]}), mask=False))
+                writer.write(encode_frame(json.dumps(
+                    {"type": "command_result", "ok": True, "request_id": msg["request_id"],
+                     "command": msg["command"], "message": msg.get("value", "")}), mask=False))
+        except asyncio.IncompleteReadError:
+            pass
+
+    async def run():
+        server, port = await _bridge(handle)
+        async with server:
+            clients = [await ControlClient(port=port, timeout=5).start() for _ in range(3)]
+            results = await command_many(clients, "echo", value="hi")
+            assert [r.message for r in results] == ["hi"] * 3
+            many = await asyncio.gather(*(clients[0].request("echo", value=str(i)) for i in range(20)))
+            assert [r.message for r in many] == [str(i) for i in range(20)]
+
+            with pytest.raises(RealtimeError):
+                await clients[0].request("drop")
+            result = await clients[0].request("echo", value="back")
+            assert result.ok and result.message == "back"
+            assert clients[0].stats["connects"] == 2
+            for client in clients:
+                await client.close()
+    asyncio.run(run())
+
+
+def test_monitor_coalesces_snapshots_when_behind():
+    async def handle(reader, writer):
+        await _serve_handshake(reader, writer)
+        for i in range(50):
+            writer.write(encode_frame(json.dumps(
+                {"type": "status", "payload": {"phase": f"p{i}"}}), mask=False))
+            writer.write(encode_frame(json.dumps(
+                {"type": "discovery_log", "payload": {"i": i}}), mask=False))
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server, port = await _bridge(handle)
+        async with server:
+            monitor = await MonitorClient(port=port, max_queue=8, reconnect=False).start()
+            await asyncio.sleep(0.2)
+            events = [event async for event in monitor]
+            await monitor.close()
+        assert len(events) == 8
+        assert monitor.latest["status"].phase == "p49"
+        assert [e.phase for e in events if e.type == "status"] == ["p49"]
+        assert monitor.stats["events"] == 100
+        assert monitor.stats["coalesced"] + monitor.stats["dropped"] == 92
+    asyncio.run(run())
@@ -0,0 +1,79 @@
+"""
+Checks for schedule_sim.py: the shipped getUntestedBatch ordering,
+updateHealth transitions and an end-to-end run
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_db import ConfigHealthRecord, hash_uri
+from health_analytics import HealthFrame
+from schedule_sim import (AliveModel, HunterPolicy, SimDatabase, Simulation, Workload,
+                          synthetic_workload)
+
+NOW = 1_700_000_000.0
+
+
+def _db(specs):
+    records = []
+    for i, (tests, alive, fails, since) in enumerate(specs):
+        rec = ConfigHealthRecord(f"trojan://pw@h{i}.example.com:443#r", "", "scrape")
+        rec.uri_hash = hash_uri(rec.uri)
+        rec.total_tests, rec.alive, rec.consecutive_fails = tests, alive, fails
+        rec.last_tested = NOW - since if tests else 0.0
+        rec.needs_retest = False
+        records.append(rec)
+    return SimDatabase.from_frame(HealthFrame.from_records(records), restart=False)
+
+
+def test_shipped_priority_order():
+    db = _db([
+        (4, False, 2, 61),    # 0: failed, past 60 s backoff      -> 3
+        (2, True, 0, 31),     # 1: alive, stale                   -> 2
+        (0, False, 0, 0),     # 2: never tested                   -> 0
+        (1, True, 0, 10),     # 3: alive, fresh                   -> skipped
+        (6, False, 6, 200),   # 4: 6 fails, 5 min backoff pending -> skipped
+        (5, False, 1, 100),   # 5: needs_retest                   -> 1
+        (1, True, 0, 40),     # 6: alive, stale, fewer tests than 1
+        (3, False, 1, 90),    # 7: failed, boosted                -> first
+    ])
+    db.needs_retest[5] = True
+    db.priority_boost_until[7] = NOW + 100
+    assert HunterPolicy().select(db, NOW, 50).tolist() == [7, 2, 5, 6, 1, 0]
+    assert HunterPolicy().select(db, NOW, 2).tolist() == [7, 2]
+
+
+def test_update_health_marks_dead_after_three_fails():
+    db = _db([(1, True, 0, 100)])
+    db.latency_ms[0] = 300.0
+    assert not db.update_health(0, False, 0.0, NOW)
+    assert not db.update_health(0, False, 0.0, NOW + 1)
+    assert db.alive[0]
+    assert db.update_health(0, False, 0.0, NOW + 2)
+    assert not db.alive[0] and db.latency_ms[0] == 0.0 and db.total_tests[0] == 4
+    db.update_health(0, True, 120.0, NOW + 3)
+    assert db.alive[0] and db.consecutive_fails[0] == 0 and db.last_alive_time[0] == NOW + 3
+
+
+def test_light_load_run_tests_every_arrival():
+    workload = synthetic_workload(500, 2 * 3600, seed=4, arrivals_per_hour=100)
+    first = Simulation(workload, HunterPolicy(), seed=2).run()
+    again = Simulation(workload, HunterPolicy(), seed=2).run()
+    assert first == again
+    assert first["arrivals"] > 0 and first["arrivals_tested_share"] == 1.0
+    assert first["backlog_tested_share"] == 1.0
+    assert first["time_to_first_test_s"]["p90"] < 15 * 60
+    # Never more than one batch of 50 per interval + slowest chunks
+    assert first["tests_per_s"] <= 50 / 30
+    assert 0.0 < first["wasted_share"] < 1.0
+
+
+def test_up_config_passes():
+    db = _db([(0, False, 0, 0)])
+    workload = Workload(db, AliveModel(seed=1, new_alive=1.0), NOW, 600, arrivals_per_hour=0)
+    assert np.isfinite(workload.model.up_from).all()
+    assert Simulation(workload, HunterPolicy()).run()["pass_share"] > 0
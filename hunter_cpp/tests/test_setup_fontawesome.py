@@ -0,0 +1,72 @@
+"""
+Checks for setup_fontawesome.py: icon usage scan, generated ranges, the
+glyph rasterizer and atlas format, and subsetting when fontTools is there
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import setup_fontawesome as fa
+
+
+def test_scan_and_header(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "page.cpp").write_text('ImGui::Button(ICON_FA_PLUS " Add");\n'
+                                  'ImGui::Text(ICON_FA_PLUS ICON_FA_TRASH);\n')
+    (src / "other.h").write_text("#define X ICON_FA_MINUS\n")
+    header = tmp_path / "font_awesome.h"
+    header.write_text('#define ICON_FA_EYE "\\uf06e"\n')
+
+    used = fa.scan_icon_usage([src], header)
+    assert sorted(used) == ["MINUS", "PLUS", "TRASH"]
+    codepoints = fa.used_codepoints(used, extra=[0xf069])
+    assert codepoints == [0xf067, 0xf068, 0xf069, 0xf1f8]
+    assert fa.glyph_ranges(codepoints) == [(0xf067, 0xf069), (0xf1f8, 0xf1f8)]
+
+    fa.create_fontawesome_header(codepoints, header)
+    text = header.read_text()
+    assert "#define ICON_FA_GLYPH_RANGES 0xf067, 0xf069, 0xf1f8, 0xf1f8, 0" in text
+    assert '#define ICON_FA_DOWNLOAD "\\uf019"' in text
+
+
+def test_rasterize_and_atlas_round_trip():
+    square = [(1, 1), (7, 1), (7, 7), (1, 7)]
+    hole = [(3, 3), (3, 5), (5, 5), (5, 3)]           # opposite winding
+    alpha = fa.rasterize([square, hole], 8, 8)
+    assert alpha[0, 0] == 0 and alpha[2, 2] == 255 and alpha[4, 4] == 0
+    half = fa.rasterize([[(0, 0), (1.5, 0), (1.5, 1), (0, 1)]], 2, 1)
+    assert half[0, 0] == 255 and 120 <= half[0, 1] <= 135
+
+    positions, height = fa.pack_shelves([(10, 12), (250, 4), (8, 8)])
+    assert all(p is not None for p in positions) and height >= 12 + 4
+
+    glyphs = [{"codepoint": 0xf067, "x": 1, "y": 1, "w": 8, "h": 8, "x0": 0.0, "y0": -8.0,
+               "advance": 9.5}]
+    pixels = np.zeros((16, 256), np.uint8)
+    pixels[1:9, 1:9] = alpha
+    data = fa.encode_atlas(glyphs, pixels, 14.45, 12.0, -3.0)
+    decoded, restored, size, ascent, descent = fa.decode_atlas(data)
+    assert decoded == glyphs and np.array_equal(restored, pixels)
+    assert (round(size, 2), ascent, descent) == (14.45, 12.0, -3.0)
+    assert len(data) < pixels.nbytes
+
+
+def test_subset_shipped_font(tmp_path):
+    pytest.importorskip("fontTools")
+    pytest.importorskip("brotli")
+    from fontTools.ttLib import TTFont
+
+    codepoints = [0xf002, 0xf067]
+    out = fa.subset_font(fa.DEFAULT_FONT, codepoints, tmp_path / "subset.ttf")
+    font = TTFont(str(out))
+    assert sorted(font.getBestCmap()) == codepoints
+    assert out.stat().st_size < fa.DEFAULT_FONT.stat().st_size
+    atlas = fa.bake_atlas(out, codepoints, out_path=tmp_path / "fa.atlas")
+    glyphs, pixels, *_ = fa.decode_atlas(atlas.read_bytes())
+    assert [g["codepoint"] for g in glyphs] == codepoints and pixels.max() > 0
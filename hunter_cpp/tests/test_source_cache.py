@@ -0,0 +1,41 @@
+"""
+Checks for source_cache.py against the local source farm: 304 reuse,
+changed sources and sources without validators
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fetch_session import FetchSession
+from source_cache import SourceCache
+from source_farm import SourceFarm, make_fixture
+
+
+def test_conditional_cache(tmp_path):
+    with SourceFarm(sources=2, payload_kb=8) as farm:
+        session = FetchSession()
+        cache = SourceCache(str(tmp_path), session=session)
+        url = farm.url("plain", 0)
+        first = cache.fetch(url)
+        cache.annotate(url, config_count=7)
+        second = cache.fetch(url)
+        assert not first.from_cache and second.from_cache
+        assert second.content == first.content == make_fixture("plain", 0, 8)
+        assert cache.info(url)["config_count"] == 7
+        assert farm.stats["not_modified"] == 1
+
+        meta = {}
+        streamed = b"".join(cache.iter_chunks(url, meta=meta))
+        assert streamed == first.content and meta["from_cache"]
+
+        farm.touch(url)
+        assert not cache.fetch(url).from_cache
+        assert cache.fetch(url).from_cache
+
+        bare = farm.url("plain", 1, validators=0)
+        cache.fetch(bare)
+        assert not cache.fetch(bare).from_cache
+        assert cache.stats["hits"] == 3
+        session.close()
@@ -0,0 +1,40 @@
+"""
+Checks for source_farm.py: deterministic fixtures and injected faults
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config_scanner import is_valid_config_content
+from source_farm import SourceFarm, make_fixture
+
+
+@pytest.fixture(scope="module")
+def farm():
+    with SourceFarm(sources=4, payload_kb=16) as running:
+        yield running
+
+
+def test_fixtures_are_deterministic(farm):
+    for url in farm.urls():
+        body = requests.get(url, timeout=5).content
+        kind = url.rsplit("/", 2)[1]
+        assert body == make_fixture(kind, int(url.rsplit("/", 1)[1].split(".")[0]), 16)
+    assert is_valid_config_content(make_fixture("plain", 0, 16))[0]
+    assert is_valid_config_content(make_fixture("v2ray", 0, 16))[0]
+
+
+def test_injected_faults(farm):
+    assert requests.get(farm.url("plain", 0, status=404), timeout=5).status_code == 404
+    throttled = requests.get(farm.url("plain", 0, status=429, retry_after=7), timeout=5)
+    assert throttled.status_code == 429 and throttled.headers["Retry-After"] == "7"
+
+    with pytest.raises(requests.exceptions.RequestException):
+        requests.get(farm.url("plain", 0, truncate=0.5), timeout=5).content
+    with pytest.raises(requests.exceptions.Timeout):
+        requests.get(farm.url("plain", 0, hang=5), timeout=0.5)
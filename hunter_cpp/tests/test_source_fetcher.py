@@ -0,0 +1,71 @@
+"""
+Checks for source_fetcher.py: result order, per-request timeouts, errors
+and the sweep deadline (hanging sources come back as "Deadline exceeded"
+without holding up process exit)
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from source_fetcher import failed_result, fetch_sources
+
+
+def test_deadline_and_errors_keep_source_order():
+    release = threading.Event()
+    timeouts = {}
+
+    def fetch_one(url, timeout=30):
+        timeouts[url] = timeout
+        if "hang" in url:
+            release.wait(10)
+            return True, 1, "too late", 1
+        if "boom" in url:
+            raise ConnectionError("connection refused")
+        return True, len(url), "ok", 2
+
+    urls = ["https://a.example/ok", "https://b.example/hang", "https://c.example/boom",
+            "https://d.example/ok"]
+    start = time.perf_counter()
+    try:
+        results = fetch_sources(urls, fetch_one, concurrency=4, host_interval=0,
+                                timeout=30, deadline=0.5)
+    finally:
+        release.set()
+    assert time.perf_counter() - start < 3
+    assert results == [(True, len(urls[0]), "ok", 2), failed_result("Deadline exceeded"),
+                       failed_result("connection refused"), (True, len(urls[3]), "ok", 2)]
+    assert all(t <= 1 for t in timeouts.values())      # capped by the remaining deadline
+
+
+def test_queued_behind_deadline_never_starts():
+    started = []
+
+    def fetch_one(url, timeout=30):
+        started.append(url)
+        time.sleep(0.3)
+        return True, 0, "ok", 0
+
+    urls = [f"https://same.example/{i}" for i in range(4)]
+    results = fetch_sources(urls, fetch_one, per_host=1, host_interval=0, deadline=0.5)
+    assert results[0][0] and results[-1] == failed_result("Deadline exceeded")
+    assert len(started) < len(urls)
+
+
+def test_abandoned_download_does_not_block_exit():
+    script = (
+        "import time\n"
+        "from source_fetcher import fetch_sources\n"
+        "def fetch_one(url, timeout=30):\n"
+        "    time.sleep(30)\n"
+        "    return True, 0, 'ok', 0\n"
+        "print(fetch_sources(['https://slow.example/'], fetch_one, deadline=0.3)[0][2])\n")
+    start = time.perf_counter()
+    done = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                          timeout=20, cwd=str(Path(__file__).resolve().parent.parent))
+    assert done.stdout.strip() == "Deadline exceeded", done.stderr
+    assert time.perf_counter() - start < 10
@@ -0,0 +1,50 @@
+"""
+Checks for source_overlap.py: sketch estimates and mirror pruning
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from source_overlap import SourceSketch, endpoint_hashes, pruned_sources, rank_sources
+from uri_parser import make_synthetic_uris
+
+
+def _payload(uris):
+    return ("\n".join(uris) + "\n").encode()
+
+
+def test_mirrors_are_pruned():
+    pool = make_synthetic_uris(6000, seed=3)
+    original = _payload(pool[:3000])
+    other = _payload(pool[3000:])
+    mirror = _payload(pool[:2500][::-1])
+    sketches = [SourceSketch.from_content(name, content)
+                for name, content in (("mirror", mirror), ("a", original), ("b", other))]
+
+    sets = [set(endpoint_hashes(c).tolist()) for c in (mirror, original, other)]
+    assert abs(sketches[1].cardinality() - len(sets[1])) < 0.05 * len(sets[1])
+    for i, j in ((0, 1), (1, 2)):
+        exact = len(sets[i] & sets[j]) / len(sets[i] | sets[j])
+        assert abs(sketches[i].jaccard(sketches[j]) - exact) < 0.15
+
+    ranking = rank_sources(sketches)
+    assert sorted(pruned_sources(ranking)) == ["a", "b"]
+    assert [r.kept for r in ranking if r.source == "mirror"] == [False]
+
+
+def test_large_source_sketch_memory_is_bounded():
+    hashes = np.unique(np.random.default_rng(5).integers(0, 2**63, 300_000, dtype=np.uint64))
+    tracemalloc.start()
+    try:
+        sketch = SourceSketch("big", hashes)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert peak < 64 * 1024 * 1024               # the unblocked matrix alone is ~300 MB
+    assert sketch.jaccard(SourceSketch("big", hashes[::-1].copy())) == 1.0
+    assert abs(sketch.cardinality() - len(hashes)) < 0.05 * len(hashes)
@@ -0,0 +1,103 @@
+"""
+Checks for source_scheduler.py: the UI's TSV formats, download-history
+bookkeeping and the bandit's choices
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from endpoint_index import EndpointIndex
+from source_farm import SourceFarm
+from source_scheduler import (SOURCES_HEADER, SourceRow, SourceScheduler, run_sweep,
+                              simulate)
+
+NOW = 1_700_000_000.0
+
+
+def test_sources_table_round_trip(tmp_path):
+    lines = [
+        "1\t1\tpremium\t1700000000\t0\t0\t0\tPremium\tfirst\thttps://a.example/sub.txt",
+        "0\t0\tprimary\t1700000000\t1700000100\t42\t75\tOff\tdisabled\thttps://b.example/sub.txt",
+        "1\t0\tshort row",
+    ]
+    (tmp_path / "sources_manager.tsv").write_text(SOURCES_HEADER + "\n".join(lines) + "\n")
+    scheduler = SourceScheduler.load(str(tmp_path))
+    assert [row.url for row in scheduler.sources] == ["https://a.example/sub.txt",
+                                                     "https://b.example/sub.txt"]
+    off = scheduler.sources[1]
+    assert (off.enabled, off.total_configs_found, off.success_rate) == (False, 42, 75)
+
+    scheduler.sources[0].description = "tab\there"
+    scheduler.save()
+    text = (tmp_path / "sources_manager.tsv").read_text().splitlines()
+    assert text[0] + "\n" == SOURCES_HEADER
+    assert text[1].split("\t")[8] == "tab here" and len(text[1].split("\t")) == 10
+    assert text[2] == lines[1]
+    assert (tmp_path / "source_scheduler.tsv").exists()
+
+
+def test_record_follows_download_history():
+    scheduler = SourceScheduler([SourceRow("https://a.example/sub.txt")])
+    scheduler.record("https://a.example/sub.txt", True, 1000, 1.0, 30, 20, now=NOW)
+    scheduler.record("https://a.example/sub.txt", False, error="timeout", now=NOW + 60)
+    scheduler.record("https://a.example/sub.txt", True, 1000, 1.0, 25, 5, now=NOW + 120)
+    row = scheduler.sources[0]
+    history = scheduler.history[row.url]
+    assert (history.total_downloads, history.successful_downloads) == (3, 2)
+    assert (row.success_rate, row.total_configs_found, row.last_success_ts) == (66, 25, NOW + 120)
+    assert history.unique_configs == 5 and history.last_error == ""
+
+
+def test_plan_prefers_yield_and_explores():
+    rows = [SourceRow(f"https://s{i}.example/sub.txt") for i in range(4)]
+    rows[3].enabled = False
+    scheduler = SourceScheduler(rows, byte_budget=4_000_000)
+    assert scheduler.plan(NOW).urls[:3] == [r.url for r in rows[:3]]
+
+    scheduler.record(rows[0].url, True, 1_000_000, 2.0, 5000, 5000, now=NOW)
+    scheduler.record(rows[1].url, True, 1_000_000, 2.0, 5000, 10, now=NOW)
+    plan = scheduler.plan(NOW + 1)
+    assert plan.urls == [rows[2].url, rows[0].url, rows[1].url]  # never pulled goes first
+
+    scheduler.record(rows[2].url, True, 1_000_000, 2.0, 5000, 3000, now=NOW + 1)
+    tight = scheduler.plan(NOW + 2, byte_budget=1_000_000)
+    assert tight.urls == [rows[0].url]
+    # Stale evidence earns the low-yield source another look eventually
+    later = NOW + 3 * 24 * 3600
+    for _ in range(3):
+        scheduler.record(rows[0].url, True, 1_000_000, 2.0, 5000, 5000, now=later)
+        scheduler.record(rows[2].url, True, 1_000_000, 2.0, 5000, 3000, now=later)
+    assert scheduler.plan(later, byte_budget=2_000_000).urls == [rows[1].url, rows[0].url]
+
+
+def test_priority_follows_ui_scale():
+    rows = [SourceRow(f"https://{name}.example/sub.txt", priority=priority)
+            for name, priority in (("low", 2), ("high", 1), ("normal", 0))]
+    scheduler = SourceScheduler(rows, byte_budget=10_000_000)
+    assert scheduler.plan(NOW).urls == [rows[1].url, rows[2].url, rows[0].url]
+    for row in rows:
+        scheduler.record(row.url, True, 1_000_000, 2.0, 500, 500, now=NOW)
+    scores = scheduler.scores(NOW + 1)
+    assert scores[rows[1].url] > scores[rows[2].url] > scores[rows[0].url]
+    assert scheduler.plan(NOW + 1).urls == [rows[1].url, rows[2].url, rows[0].url]
+
+
+def test_adaptive_beats_fixed_list_in_simulation():
+    fixed = simulate("fixed", sweeps=12)
+    adaptive = simulate("adaptive", sweeps=12)
+    assert adaptive["new_per_mb"] > fixed["new_per_mb"]
+
+
+def test_sweep_against_farm():
+    with SourceFarm(sources=3, payload_kb=8) as farm:
+        good = farm.urls()[:2]
+        rows = [SourceRow(url) for url in good + [farm.url("plain", 0, status=404)]]
+        scheduler = SourceScheduler(rows, target_seconds=5)
+        index = EndpointIndex()
+        plan, summary = run_sweep(scheduler, index, timeout=5, now=NOW)
+    assert len(plan.urls) == 3 and summary["ok"] == 2 and summary["new"] > 0
+    assert summary["new"] == len(index)
+    assert scheduler.history[rows[2].url].last_error
+    assert scheduler.arms[good[0]].bytes > 0 and scheduler.sources[0].success_rate == 100
@@ -0,0 +1,142 @@
+"""
+Golden checks for uri_parser.py, mirroring the UriParser and ParsedConfig
+cases in test_core.cpp so the Python port stays in step with the C++ one
+"""
+
+import base64
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import uri_parser
+from uri_parser import ParsedConfig, is_valid_scheme, parse, parse_many
+
+
+def test_parsed_config_is_valid():
+    pc = ParsedConfig()
+    assert not pc.is_valid(), "empty config should be invalid"
+
+    pc.protocol = "vless"
+    pc.address = "example.com"
+    pc.port = 443
+    assert pc.is_valid(), "valid config rejected"
+
+    pc.port = 0
+    assert not pc.is_valid(), "port 0 should be invalid"
+
+    pc.port = 443
+    pc.address = ""
+    assert not pc.is_valid(), "empty address should be invalid"
+
+    pc.address = "example.com"
+    pc.port = 70000
+    assert not pc.is_valid(), "port > 65535 should be invalid"
+
+    pc.port = 443
+    pc.uuid = 'bad"quote'
+    assert not pc.is_valid(), "quote in uuid should be invalid"
+
+
+def test_is_valid_scheme():
+    assert is_valid_scheme("vless://abc@host:443")
+    assert is_valid_scheme("vmess://abc")
+    assert is_valid_scheme("trojan://pass@host:443")
+    assert is_valid_scheme("ss://abc")
+    assert not is_valid_scheme("http://example.com")
+    assert not is_valid_scheme("ftp://host")
+    assert not is_valid_scheme("")
+
+
+def test_parse_vless():
+    uri = ("vless://uuid-here@example.com:443?encryption=none&security=reality"
+           "&sni=sni.example.com&fp=chrome&pbk=pubkey123&sid=ab&type=tcp"
+           "&flow=xtls-rprx-vision#MyRemarkName")
+    pc = parse(uri)
+    assert pc is not None, "should parse valid vless URI"
+    assert pc.protocol == "vless"
+    assert pc.address == "example.com"
+    assert pc.port == 443
+    assert pc.uuid == "uuid-here"
+    assert pc.security == "reality"
+    assert pc.sni == "sni.example.com"
+    assert pc.fingerprint == "chrome"
+    assert pc.public_key == "pubkey123"
+    assert pc.short_id == "ab"
+    assert pc.flow == "xtls-rprx-vision"
+    assert pc.ps == "MyRemarkName"
+
+
+def test_url_decode_matches_sscanf_escapes():
+    # utils::urlDecode reads each escape with sscanf("%x") and always skips two bytes
+    cases = {"a%41b": "aAb", "a+b%2B": "a b+", "%4V": "\x04", "%4": "%4", "%%41": "%A",
+             "% 9x": "\tx", "%-1": "\udcff", "%+f": "\x0f", "%0x": "\x00", "%x1": "%x1",
+             "%  z": "%  z", "%zz": "%zz", "%e9%9": "\udce9%9"}
+    for raw, decoded in cases.items():
+        assert uri_parser.url_decode(raw) == decoded, raw
+    pc = parse("vless://id@example.com:443?type=ws&sni=cdn%2Ecom%4V&host=h%-1#tag%4")
+    assert (pc.sni, pc.host, pc.ps) == ("cdn.com\x04", "h\udcff", "tag%4")
+
+
+def test_parse_trojan():
+    uri = ("trojan://password123@trojan.example.com:443?security=tls"
+           "&sni=trojan.example.com&type=tcp#TrojanNode")
+    pc = parse(uri)
+    assert pc is not None, "should parse valid trojan URI"
+    assert pc.protocol == "trojan"
+    assert pc.address == "trojan.example.com"
+    assert pc.port == 443
+    assert pc.uuid == "password123"
+
+
+def test_parse_invalid():
+    assert parse("not-a-uri") is None
+    assert parse("") is None
+    assert parse("vless://") is None
+    assert parse("ssr://abc") is None
+
+
+def test_parse_many():
+    uris = [
+        "vless://uuid@host1:443?type=tcp&security=tls#name1",
+        "not-valid",
+        "trojan://pass@host2:443#name2",
+    ]
+    assert len(parse_many(uris)) == 2
+
+
+def test_parse_vmess_and_batch_agree():
+    body = {"v": "2", "ps": "node", "add": "1.2.3.4", "port": 8443, "id": "abc-id",
+            "net": "ws", "tls": "tls", "host": "cdn.example.com", "path": "/ws"}
+    uri = "vmess://" + base64.b64encode(json.dumps(body).encode()).decode().rstrip("=")
+    pc = parse(uri)
+    assert pc is not None
+    assert (pc.address, pc.port, pc.uuid) == ("1.2.3.4", 8443, "abc-id")
+    assert (pc.network, pc.security, pc.encryption) == ("ws", "tls", "auto")
+    assert pc.ps == "node"
+    assert parse_many([uri]) == [pc]
+
+
+def test_parse_shadowsocks_forms():
+    userinfo = base64.b64encode(b"aes-256-gcm:secret").decode()
+    sip002 = parse(f"ss://{userinfo}@10.0.0.1:8388#plain")
+    legacy = parse("ss://" + base64.b64encode(b"aes-256-gcm:secret@10.0.0.1:8388").decode())
+    for pc in (sip002, legacy):
+        assert pc is not None
+        assert (pc.protocol, pc.encryption, pc.uuid) == ("shadowsocks", "aes-256-gcm", "secret")
+        assert (pc.address, pc.port) == ("10.0.0.1", 8388)
+
+
+def test_parse_hysteria2_and_tuic():
+    hy2 = parse("hy2://auth@h.example.net?sni=s.example.net#x")
+    assert (hy2.protocol, hy2.address, hy2.port, hy2.security) == ("hysteria2", "h.example.net", 443, "tls")
+    tuic = parse("tuic://id:pw@q.example.net:443?sni=q.example.net")
+    assert (tuic.uuid, tuic.extra, tuic.port) == ("id", {"password": "pw"}, 443)
+    assert parse("tuic://id@q.example.net") is None
+
+
+def test_synthetic_batch_matches_single_parse():
+    uris = uri_parser.make_synthetic_uris(2000)
+    singles = [pc for pc in map(parse, uris) if pc is not None and pc.is_valid()]
+    assert parse_many(uris) == singles
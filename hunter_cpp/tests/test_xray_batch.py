@@ -0,0 +1,87 @@
+"""
+Checks for xray_batch.py: batch config layout as in
+generateBatchSpeedtestConfig, classifyTier thresholds and a batch run
+against the stub engine
+"""
+
+import asyncio
+import socket
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from uri_parser import parse
+from xray_batch import (STUB_TEST_URLS, batch_config, batch_test, classify_tier, plan_batch,
+                        stub_behaviour, stub_command)
+
+
+def _free_base_port(span=16):
+    for base in range(23000, 40000, 97):
+        busy = False
+        for port in range(base, base + span):
+            with socket.socket() as sock:
+                if sock.connect_ex(("127.0.0.1", port)) == 0:
+                    busy = True
+                    break
+        if not busy:
+            return base
+    raise RuntimeError("no free port range")
+
+
+def test_classify_tier():
+    assert classify_tier(0) == "dead"
+    assert classify_tier(-1) == "dead"
+    assert classify_tier(2000) == "gold"
+    assert classify_tier(2000.5) == "silver"
+    assert classify_tier(5000) == "silver"
+    assert classify_tier(5001) == "dead"
+
+
+def test_batch_config_layout():
+    uris = [
+        "trojan://pw@a.example.com:443?security=tls&sni=a.example.com#a",
+        "vless://11111111-2222-3333-4444-555555555555@b.example.com:443"
+        "?security=reality&sni=www.speedtest.net&pbk=Pk&sid=ab&type=grpc#b",
+        "hy2://auth@c.example.net:8443#c",
+        "ss://cmM0LW1kNTpwYXNz@d.example.com:8388#rc4",
+        "not a uri",
+    ]
+    results, entries = plan_batch(uris, base_port=_free_base_port())
+    assert [r.error for r in results] == ["", "", "Unsupported protocol for xray batch",
+                                          "Unsupported config for xray batch", "URI parse failed"]
+    ports = [port for _, _, port in entries]
+    assert ports == [ports[0], ports[0] + 1]
+
+    config = batch_config([(cfg, port) for _, cfg, port in entries])
+    assert [ib["tag"] for ib in config["inbounds"]] == [f"test-{p}" for p in ports]
+    assert all(ib["protocol"] == "mixed" for ib in config["inbounds"])
+    proxies = [ob for ob in config["outbounds"] if ob["tag"].startswith("proxy-")]
+    assert [ob["tag"] for ob in proxies] == [f"proxy-{p}" for p in ports]
+    # TLS outbounds dial through the fragment outbound; reality does not
+    assert proxies[0]["streamSettings"]["sockopt"] == {"dialerProxy": "fragment-out"}
+    assert "sockopt" not in proxies[1]["streamSettings"]
+    assert proxies[1]["streamSettings"]["realitySettings"]["fingerprint"] == "chrome"
+    assert [ob["tag"] for ob in config["outbounds"][-3:]] == ["direct", "fragment-out", "dns-out"]
+    rules = config["routing"]["rules"]
+    assert rules[:2] == [{"type": "field", "inboundTag": [f"test-{p}"], "outboundTag": f"proxy-{p}"}
+                         for p in ports]
+    assert parse(uris[0]).protocol == "trojan"
+
+
+def test_batch_run_against_stub():
+    hosts = [f"n{i}.example.com" for i in range(40)]
+    refused = next(h for h in hosts if stub_behaviour(h) is None)
+    answering = [h for h in hosts if stub_behaviour(h) is not None and stub_behaviour(h) < 1.0][:3]
+    uris = [f"trojan://pw@{h}:443?security=tls#{h}" for h in [refused] + answering]
+    uris.append("tuic://u:p@q.example.net:443#q")
+
+    results, stats = asyncio.run(batch_test(uris, stub_command(0.5), _free_base_port(), 5,
+                                            STUB_TEST_URLS, settle_s=0.1))
+    assert stats["processes"] == 1 and stats["inbounds"] == 4
+    assert not results[0].success and results[0].tier == "dead"
+    assert results[0].error.startswith("All connectivity tests failed")
+    for result, host in zip(results[1:4], answering):
+        assert result.success and result.tier == "gold"
+        assert result.latency_ms >= stub_behaviour(host, 0.5) * 1000
+    assert results[4].error == "Unsupported protocol for xray batch"
@@ -0,0 +1,568 @@
+#!/usr/bin/env python3
+"""
+Python port of hunter::network::UriParser
+Parses vmess://, vless://, trojan://, ss://, hysteria2:// (hy2://) and
+tuic:// URIs into ParsedConfig records with the same fields and validity
+rules as core/models.h, so offline tooling agrees with the C++ runtime.
+
+Run with --bench to time parse_many on synthetic URIs.
+"""
+
+import binascii
+import re
+import sys
+import time
+from urllib.parse import unquote_to_bytes
+
+SUPPORTED_SCHEMES = ("vmess", "vless", "trojan", "ss", "ssr", "hysteria2", "hy2", "tuic")
+
+FIELDS = ("uri", "protocol", "address", "port", "uuid", "encryption", "network",
+          "security", "sni", "path", "host", "fingerprint", "public_key",
+          "short_id", "flow", "ps", "type", "extra")
+
+_SCHEME_RE = re.compile(r"(vmess|vless|trojan|ss|hysteria2|hy2|tuic)://")
+_VALID_SCHEME_RE = re.compile(r"(?:%s)://" % "|".join(SUPPORTED_SCHEMES))
+_NON_DIGIT_RE = re.compile(r"[^0-9]+")
+_STOI_RE = re.compile(r"[ \t\n\v\f\r]*([+-]?[0-9]+)")
+_BAD_CHARS_RE = re.compile(r'[\x00-\x1f"\\\x7f]')
+# urlDecode: '%' plus two bytes that sscanf("%x") accepts (a hex digit first,
+# or whitespace/sign then a hex digit), or '+'
+_URL_ESCAPE_RE = re.compile(rb"%(?:([0-9A-Fa-f])(.)|([\t\n\v\f\r +-])([0-9A-Fa-f]))|\+", re.S)
+_MALFORMED_RE = re.compile(rb"%(?![0-9A-Fa-f]{2})")
+_HEX_DIGITS = frozenset(b"0123456789abcdefABCDEF")
+_VMESS_KEY_RE = re.compile(r'"(add|port|id|scy|net|tls|sni|host|path|type|fp|ps)"')
+_VMESS_VALUE_RE = re.compile(r' *(?:"([^"]*)(")?|([^,}]*))')
+_TRIM = " \t\r\n"
+
+# utils::base64Decode keeps only the standard alphabet and stops at '='
+_B64_DELETE = bytes(c for c in range(256)
+                    if chr(c) not in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+                                     "abcdefghijklmnopqrstuvwxyz0123456789+/=")
+
+_INT_MAX = 2 ** 31 - 1
+
+
+class ParsedConfig:
+    """Parsed proxy configuration, field-for-field with hunter::ParsedConfig"""
+
+    __slots__ = FIELDS
+
+    def __init__(self, uri="", protocol=""):
+        self.uri = uri
+        self.protocol = protocol
+        self.address = ""
+        self.port = 0
+        self.uuid = ""
+        self.encryption = ""
+        self.network = ""
+        self.security = ""
+        self.sni = ""
+        self.path = ""
+        self.host = ""
+        self.fingerprint = ""
+        self.public_key = ""
+        self.short_id = ""
+        self.flow = ""
+        self.ps = ""
+        self.type = ""
+        self.extra = {}
+
+    def is_valid(self):
+        if not self.protocol or not self.address or self.port < 1 or self.port > 65535:
+            return False
+        if _BAD_CHARS_RE.search(self.address + self.uuid + self.sni + self.host + self.encryption):
+            return False
+        # Limits are in bytes; only encode when the char count can exceed them
+        if len(self.address) > 63 and len(self.address.encode("utf-8", "surrogateescape")) > 253:
+            return False
+        if len(self.uuid) > 128 and len(self.uuid.encode("utf-8", "surrogateescape")) > 512:
+            return False
+        return True
+
+    def is_reality(self):
+        return self.security == "reality"
+
+    def is_tls(self):
+        return self.security == "tls"
+
+    def is_cdn(self):
+        return self.network in ("ws", "grpc", "splithttp", "httpupgrade")
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, ParsedConfig) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return (f"ParsedConfig({self.protocol}://{self.address}:{self.port}"
+                f" net={self.network or '-'} sec={self.security or '-'})")
+
+
+# ─── Helpers mirroring core/utils.cpp ───
+
+def _decode(raw):
+    return raw.decode("utf-8", "surrogateescape")
+
+
+def _url_escape(match):
+    first, second, lead, digit = match.groups()
+    if first is None:
+        if lead is None:
+            return b" "
+        value = int(digit, 16)
+        return bytes(((-value if lead == b"-" else value) & 0xFF,))
+    # Both bytes are consumed even when sscanf stopped after the first
+    if second[0] in _HEX_DIGITS:
+        return bytes((int(first + second, 16),))
+    return bytes((int(first, 16),))
+
+
+def url_decode(value):
+    """utils::urlDecode: %XX escapes and '+' as space
+
+    Follows the C++ loop exactly, including what sscanf("%x") makes of
+    malformed escapes: ``%4V`` decodes to 0x04, ``%-1`` to 0xff and ``% 9``
+    to 0x09, while ``%%41`` keeps the first '%'.
+    """
+    if "%" not in value and "+" not in value:
+        return value
+    raw = value.encode("utf-8", "surrogateescape")
+    if _MALFORMED_RE.search(raw) is None:
+        return _decode(unquote_to_bytes(raw.replace(b"+", b" ")))
+    return _decode(_URL_ESCAPE_RE.sub(_url_escape, raw))
+
+
+def _b64_clean(payload):
+    clean = payload.encode("ascii", "ignore").translate(None, _B64_DELETE)
+    eq = clean.find(b"=")
+    if eq != -1:
+        clean = clean[:eq]
+    # A dangling 6-bit group produces no output byte in the C++ decoder
+    if len(clean) % 4 == 1:
+        clean = clean[:-1]
+    return clean + b"=" * (-len(clean) % 4)
+
+
+def base64_decode(payload):
+    """utils::base64Decode: lenient standard-alphabet decode"""
+    try:
+        return _decode(binascii.a2b_base64(_b64_clean(payload)))
+    except binascii.Error:
+        return ""
+
+
+def base64_decode_many(payloads):
+    """Decode a batch of payloads; the cleaning and decoding stay in C loops"""
+    a2b = binascii.a2b_base64
+    out = []
+    for clean in map(_b64_clean, payloads):
+        try:
+            out.append(_decode(a2b(clean)))
+        except binascii.Error:
+            out.append("")
+    return out
+
+
+def _stoi(value):
+    """std::stoi: leading whitespace, optional sign, digits; None on failure"""
+    if value.isascii() and value.isdigit() and len(value) < 10:
+        return int(value)
+    m = _STOI_RE.match(value)
+    if not m:
+        return None
+    number = int(m.group(1))
+    if number > _INT_MAX or number < -_INT_MAX - 1:
+        return None
+    return number
+
+
+def _digits_port(value):
+    """Port parse used by the host:port branches: strip non-digits, then stoi"""
+    return _stoi(_NON_DIGIT_RE.sub("", value))
+
+
+def parse_query_params(query):
+    params = {}
+    if not query:
+        return params
+    for pair in query.split("&"):
+        key, eq, value = pair.partition("=")
+        params[key] = url_decode(value) if eq else ""
+    return params
+
+
+def _split_fragment(rest):
+    rest, hash_mark, fragment = rest.partition("#")
+    return rest, (url_decode(fragment) if hash_mark else "")
+
+
+def _split_query(rest):
+    rest, q_mark, query = rest.partition("?")
+    return rest, (parse_query_params(query) if q_mark else {})
+
+
+def _valid_port(port):
+    return port is not None and 1 <= port <= 65535
+
+
+# ─── Per-protocol parsers ───
+
+def _vmess_fields(json_text):
+    """Minimal vmess JSON field extraction, as in UriParser::parseVmess
+
+    Like the C++ lambda this takes the first occurrence of each quoted key,
+    the value after the next ':', and does not unescape strings. All keys
+    are located in one regex pass instead of one find per field.
+    """
+    fields = {}
+    for m in _VMESS_KEY_RE.finditer(json_text):
+        key = m.group(1)
+        if key in fields:
+            continue
+        colon = json_text.find(":", m.end())
+        if colon == -1:
+            fields[key] = ""
+            continue
+        v = _VMESS_VALUE_RE.match(json_text, colon + 1)
+        if v.group(1) is not None:
+            fields[key] = v.group(1) if v.group(2) else ""
+        else:
+            fields[key] = v.group(3).strip(_TRIM)
+    return fields
+
+
+def _parse_vmess(uri, json_text=None):
+    payload, hash_mark, fragment = uri[8:].partition("#")
+    remark = url_decode(fragment) if hash_mark else ""
+    if json_text is None:
+        json_text = base64_decode(payload)
+    if not json_text or "{" not in json_text:
+        return None
+
+    cfg = ParsedConfig(uri, "vmess")
+    cfg.ps = remark
+    get = _vmess_fields(json_text).get
+    cfg.address = get("add", "")
+    port = _stoi(get("port", ""))
+    if not _valid_port(port):
+        return None
+    cfg.port = port
+    cfg.uuid = get("id", "")
+    cfg.encryption = get("scy") or "auto"
+    cfg.network = get("net") or "tcp"
+    cfg.security = get("tls", "")
+    cfg.sni = get("sni", "")
+    cfg.host = get("host", "")
+    cfg.path = get("path", "")
+    cfg.type = get("type", "")
+    cfg.fingerprint = get("fp", "")
+    if not cfg.ps:
+        cfg.ps = get("ps", "")
+
+    if not cfg.address or not cfg.uuid:
+        return None
+    return cfg
+
+
+def _parse_vless(uri):
+    rest, remark = _split_fragment(uri[8:])
+    rest, params = _split_query(rest)
+    cfg = ParsedConfig(uri, "vless")
+    cfg.ps = remark
+
+    user, at, hostport = rest.partition("@")
+    if not at or not hostport:
+        return None
+    cfg.uuid = user
+
+    if hostport[0] == "[":
+        bracket = hostport.find("]")
+        if bracket == -1:
+            return None
+        cfg.address = hostport[1:bracket]
+        if hostport[bracket + 1:bracket + 2] == ":":
+            port = _digits_port(hostport[bracket + 2:])
+            if not _valid_port(port):
+                return None
+            cfg.port = port
+    else:
+        colon = hostport.rfind(":")
+        if colon == -1:
+            return None
+        cfg.address = hostport[:colon]
+        port = _digits_port(hostport[colon + 1:])
+        if not _valid_port(port):
+            return None
+        cfg.port = port
+
+    get = params.get
+    cfg.encryption = get("encryption", "none")
+    cfg.security = get("security", "")
+    cfg.network = get("type", "tcp")
+    cfg.sni = get("sni", "")
+    cfg.host = get("host", "")
+    cfg.path = get("path", "")
+    cfg.fingerprint = get("fp", "")
+    cfg.public_key = get("pbk", "")
+    cfg.short_id = get("sid", "")
+    cfg.flow = get("flow", "")
+
+    if not cfg.address or not _valid_port(cfg.port):
+        return None
+    return cfg
+
+
+def _parse_trojan(uri):
+    rest, remark = _split_fragment(uri[9:])
+    rest, params = _split_query(rest)
+    cfg = ParsedConfig(uri, "trojan")
+    cfg.ps = remark
+
+    user, at, hostport = rest.partition("@")
+    if not at or not hostport:
+        return None
+    cfg.uuid = user
+
+    colon = hostport.rfind(":")
+    if colon == -1:
+        return None
+    cfg.address = hostport[:colon]
+    port = _digits_port(hostport[colon + 1:])
+    if not _valid_port(port):
+        return None
+    cfg.port = port
+
+    get = params.get
+    cfg.security = get("security", "tls")
+    cfg.network = get("type", "tcp")
+    cfg.sni = get("sni", "")
+    cfg.host = get("host", "")
+    cfg.path = get("path", "")
+    cfg.fingerprint = get("fp", "")
+
+    if not cfg.address:
+        return None
+    return cfg
+
+
+def _split_hostport(cfg, hostport):
+    colon = hostport.rfind(":")
+    if colon != -1:
+        cfg.address = hostport[:colon]
+        port = _digits_port(hostport[colon + 1:])
+        if port is not None:
+            cfg.port = port
+
+
+def _parse_shadowsocks(uri):
+    rest, remark = _split_fragment(uri[5:])
+    cfg = ParsedConfig(uri, "shadowsocks")
+    cfg.ps = remark
+
+    at = rest.find("@")
+    if at != -1:
+        # base64(method:password)@host:port
+        userinfo = base64_decode(rest[:at])
+        hostport = rest[at + 1:]
+        if not hostport:
+            return None
+        method, colon, password = userinfo.partition(":")
+        if colon:
+            cfg.encryption = method
+            cfg.uuid = password
+        _split_hostport(cfg, hostport)
+    else:
+        # base64(method:password@host:port)
+        decoded = base64_decode(rest)
+        colon1 = decoded.find(":")
+        at = decoded.find("@")
+        if colon1 != -1 and at != -1 and colon1 < at:
+            cfg.encryption = decoded[:colon1]
+            cfg.uuid = decoded[colon1 + 1:at]
+            _split_hostport(cfg, decoded[at + 1:])
+
+    if not cfg.address or not _valid_port(cfg.port):
+        return None
+    return cfg
+
+
+def _parse_hysteria2(uri):
+    if uri.startswith("hysteria2://"):
+        rest = uri[12:]
+    elif uri.startswith("hy2://"):
+        rest = uri[6:]
+    else:
+        return None
+    rest, remark = _split_fragment(rest)
+    rest, params = _split_query(rest)
+    cfg = ParsedConfig(uri, "hysteria2")
+    cfg.ps = remark
+
+    at = rest.find("@")
+    if at != -1:
+        cfg.uuid = rest[:at]
+        rest = rest[at + 1:]
+
+    colon = rest.rfind(":")
+    if colon != -1:
+        cfg.address = rest[:colon]
+        port = _digits_port(rest[colon + 1:])
+        cfg.port = port if port is not None else 0
+        if not _valid_port(cfg.port):
+            return None
+    else:
+        cfg.address = rest
+        cfg.port = 443
+
+    cfg.sni = params.get("sni", "")
+    cfg.security = "tls"
+
+    if not cfg.address:
+        return None
+    return cfg
+
+
+def _parse_tuic(uri):
+    rest, remark = _split_fragment(uri[7:])
+    rest, params = _split_query(rest)
+    cfg = ParsedConfig(uri, "tuic")
+    cfg.ps = remark
+
+    at = rest.find("@")
+    if at != -1:
+        user, colon, password = rest[:at].partition(":")
+        cfg.uuid = user
+        if colon:
+            cfg.extra["password"] = password
+        rest = rest[at + 1:]
+
+    colon = rest.rfind(":")
+    if colon != -1:
+        cfg.address = rest[:colon]
+        port = _digits_port(rest[colon + 1:])
+        cfg.port = port if port is not None else 0
+        if not _valid_port(cfg.port):
+            return None
+
+    cfg.sni = params.get("sni", "")
+    cfg.security = "tls"
+
+    if not cfg.address or not _valid_port(cfg.port):
+        return None
+    return cfg
+
+
+_PARSERS = {
+    "vmess": _parse_vmess,
+    "vless": _parse_vless,
+    "trojan": _parse_trojan,
+    "ss": _parse_shadowsocks,
+    "hysteria2": _parse_hysteria2,
+    "hy2": _parse_hysteria2,
+    "tuic": _parse_tuic,
+}
+
+
+# ─── Public API ───
+
+def is_valid_scheme(uri):
+    """UriParser::isValidScheme"""
+    return _VALID_SCHEME_RE.match(uri) is not None
+
+
+def parse(uri):
+    """UriParser::parse: ParsedConfig or None"""
+    trimmed = uri.strip(_TRIM)
+    m = _SCHEME_RE.match(trimmed)
+    if not m:
+        return None
+    return _PARSERS[m.group(1)](trimmed)
+
+
+def parse_many(uris):
+    """UriParser::parseMany: parse a batch, keeping only valid configs
+
+    vmess payloads are collected and base64-decoded as one batch before
+    their JSON fields are extracted; everything else goes straight to its
+    protocol parser.
+    """
+    match = _SCHEME_RE.match
+    parsers = _PARSERS
+    slots = []
+    vmess_slots = []
+    vmess_payloads = []
+    for uri in uris:
+        trimmed = uri.strip(_TRIM)
+        m = match(trimmed)
+        if not m:
+            continue
+        scheme = m.group(1)
+        if scheme == "vmess":
+            vmess_slots.append(len(slots))
+            vmess_payloads.append(trimmed[8:].partition("#")[0])
+            slots.append(trimmed)
+        else:
+            slots.append(parsers[scheme](trimmed))
+
+    for slot, json_text in zip(vmess_slots, base64_decode_many(vmess_payloads)):
+        slots[slot] = _parse_vmess(slots[slot], json_text)
+
+    return [cfg for cfg in slots if cfg is not None and cfg.is_valid()]
+
+
+def make_synthetic_uris(count, seed=7):
+    """Mixed vless/vmess/trojan/ss/hy2/tuic URIs for benchmarking"""
+    import base64
+    import json
+    import random
+
+    rng = random.Random(seed)
+    uris = []
+    for i in range(count):
+        r = rng.random()
+        if r < 0.35:
+            uris.append(f"vless://{i:08x}-1a2b-3c4d-5e6f-{i:012x}@node{i}.example.com:443"
+                        f"?encryption=none&security=reality&sni=www.speedtest.net&fp=chrome"
+                        f"&pbk=Pk{i}&sid=ab&type=grpc#Remark%20{i}")
+        elif r < 0.65:
+            body = json.dumps({"v": "2", "ps": f"node {i}", "add": f"10.0.{i % 250}.{i % 200}",
+                               "port": "443", "id": f"{i:08x}-0000-0000-0000-000000000000",
+                               "net": "ws", "tls": "tls", "host": "cdn.example.com", "path": "/ws"})
+            uris.append("vmess://" + base64.b64encode(body.encode()).decode())
+        elif r < 0.8:
+            uris.append(f"trojan://secret{i}@t{i}.example.org:443?security=tls&sni=t{i}.example.org#t{i}")
+        elif r < 0.92:
+            uris.append(f"ss://YWVzLTI1Ni1nY206cGFzc3dvcmQ=@172.16.{i % 250}.{i % 200}:8388#ss-{i}")
+        elif r < 0.97:
+            uris.append(f"hy2://auth{i}@h{i}.example.net:8443?sni=h{i}.example.net#hy{i}")
+        else:
+            uris.append(f"tuic://{i:08x}:pw{i}@q{i}.example.net:443?sni=q{i}.example.net#tuic{i}")
+    return uris
+
+
+def run_benchmark(count=100000, repeat=3):
+    uris = make_synthetic_uris(count)
+    best = None
+    parsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parsed = parse_many(uris)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"[BENCH] parse_many: {count:,} URIs -> {len(parsed):,} valid in {best * 1000:.0f} ms "
+          f"({count / best:,.0f} URIs/s)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--bench":
+        run_benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 100000)
+    elif len(sys.argv) > 1:
+        with open(sys.argv[1], encoding="utf-8", errors="surrogateescape") as f:
+            lines = f.read().splitlines()
+        configs = parse_many(lines)
+        print(f"[PARSE] {len(configs):,} valid configs out of {len(lines):,} lines")
+        for cfg in configs[:10]:
+            print(f"   {cfg!r} {cfg.ps}")
+    else:
+        print("Usage: uri_parser.py --bench [COUNT] | uri_parser.py <uri list file>")
@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""
+Batch config testing through one multi-inbound xray process
+Port of ProxyTester::batchTestWithXray for Linux-side offline testing:
+every testable URI gets its own mixed inbound on a sequential port from
+base_port and its own outbound, wired together by one routing rule per
+inbound tag (XRayManager::generateBatchSpeedtestConfig), so N configs
+cost one engine process instead of N. All inbounds are probed at once
+with asyncio through SOCKS5 (remote DNS, like socks5h) and every config
+gets a latency and the ProxyBenchmark::classifyTier tier.
+
+The engine is any command that takes ``run -c <config.json>`` (xray,
+or a compatible build). For tests and benchmarks without network access
+``--stub`` starts this module as a stub engine: it opens every inbound of
+the config, answers SOCKS5 CONNECT and replies to the HTTP probe after a
+delay derived from the outbound's server address, refusing some
+addresses outright.
+
+Outbounds are built as dicts and serialized with json, so values are
+escaped where ParsedConfig::toXrayOutboundJson would splice them in raw;
+otherwise the JSON matches the C++ output field for field.
+
+Run with a file of URIs, or --bench N to compare one batch process with
+one process per config (ProxyBenchmark::benchmarkSingle) on the stub.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import ssl
+import sys
+import tempfile
+import time
+import zlib
+from urllib.parse import urlsplit
+
+from uri_parser import make_synthetic_uris, parse
+
+GOLD_LATENCY_MS = 2000       # constants::GOLD_LATENCY_MS
+SILVER_LATENCY_MS = 5000     # constants::SILVER_LATENCY_MS
+XRAY_START_TIMEOUT_MS = 5000
+PORT_SPAN = 500              # batchTestWithXray gives up after base_port + 500
+DEFAULT_BASE_PORT = 20800
+TEST_URLS = (
+    "https://1.1.1.1/generate_204",
+    "http://1.1.1.1:80/generate_204",
+    "https://www.gstatic.com/generate_204",
+)
+STUB_TEST_URLS = ("http://1.1.1.1:80/generate_204",)
+
+SS_CIPHERS = frozenset((
+    "aes-128-gcm", "aes-256-gcm", "chacha20-ietf-poly1305", "xchacha20-ietf-poly1305",
+    "2022-blake3-aes-128-gcm", "2022-blake3-aes-256-gcm", "2022-blake3-chacha20-poly1305",
+    "none", "plain",
+))
+XRAY_NETWORKS = frozenset(("tcp", "raw", "ws", "grpc", "h2", "httpupgrade", "splithttp",
+                           "kcp", "quic", "xhttp"))
+_DNS = {
+    "tag": "dns-module",
+    "servers": ["1.1.1.1", "8.8.8.8", "https+local://1.1.1.1/dns-query"],
+    "queryStrategy": "UseIPv4",
+    "disableCache": False,
+}
+_SNIFFING = {"enabled": True, "destOverride": ["http", "tls", "quic"], "routeOnly": True}
+_PRIVATE_IPS = ["10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16", "127.0.0.0/8", "169.254.0.0/16"]
+_FRAGMENT = {"packets": "tlshello", "length": "50-100", "interval": "30-50"}
+
+
+def classify_tier(latency_ms):
+    """ProxyBenchmark::classifyTier"""
+    if latency_ms <= 0:
+        return "dead"
+    if latency_ms <= GOLD_LATENCY_MS:
+        return "gold"
+    if latency_ms <= SILVER_LATENCY_MS:
+        return "silver"
+    return "dead"
+
+
+class BenchResult:
+    """Outcome for one URI, field-for-field with hunter::BenchResult"""
+
+    __slots__ = ("uri", "latency_ms", "success", "tier", "ps", "protocol", "engine_used",
+                 "error", "telegram_only", "port")
+
+    def __init__(self, uri, port=0):
+        self.uri = uri
+        self.latency_ms = 0.0
+        self.success = False
+        self.tier = "dead"
+        self.ps = ""
+        self.protocol = ""
+        self.engine_used = "xray"
+        self.error = ""
+        self.telegram_only = False
+        self.port = port
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        state = f"{self.tier} {self.latency_ms:.0f}ms" if self.success else self.error or "dead"
+        return f"BenchResult({self.protocol or '?'} :{self.port} {state})"
+
+
+# ─── Config generation (XRayManager / ParsedConfig) ───
+
+def outbound_for(cfg, tag="proxy"):
+    """ParsedConfig::toXrayOutboundJson as a dict, or None if xray can't run it"""
+    if cfg.protocol in ("hysteria2", "tuic"):
+        return None
+    if cfg.protocol == "shadowsocks" and cfg.encryption not in SS_CIPHERS:
+        return None
+
+    if cfg.protocol == "vmess":
+        settings = {"vnext": [{"address": cfg.address, "port": cfg.port, "users": [
+            {"id": cfg.uuid, "alterId": 0, "security": cfg.encryption or "auto"}]}]}
+    elif cfg.protocol == "vless":
+        user = {"id": cfg.uuid, "encryption": "none"}
+        if cfg.flow:
+            user["flow"] = cfg.flow
+        settings = {"vnext": [{"address": cfg.address, "port": cfg.port, "users": [user]}]}
+    elif cfg.protocol == "trojan":
+        settings = {"servers": [{"address": cfg.address, "port": cfg.port, "password": cfg.uuid}]}
+    elif cfg.protocol == "shadowsocks":
+        settings = {"servers": [{"address": cfg.address, "port": cfg.port,
+                                 "method": cfg.encryption, "password": cfg.uuid}]}
+    else:
+        settings = {}
+
+    net = cfg.network or "tcp"
+    if net not in XRAY_NETWORKS:
+        return None
+    if net == "raw":
+        net = "tcp"
+    sec = cfg.security
+    if sec not in ("tls", "reality", "none", ""):
+        return None
+
+    stream = {"network": net}
+    if sec == "tls":
+        tls = {"serverName": cfg.sni or cfg.address, "allowInsecure": True}
+        if cfg.fingerprint:
+            tls["fingerprint"] = cfg.fingerprint
+        if net == "h2":
+            tls["alpn"] = ["h2", "http/1.1"]
+        stream.update(security="tls", tlsSettings=tls)
+    elif sec == "reality":
+        reality = {"serverName": cfg.sni, "publicKey": cfg.public_key}
+        if cfg.short_id:
+            reality["shortId"] = cfg.short_id
+        reality["fingerprint"] = cfg.fingerprint or "chrome"
+        stream.update(security="reality", realitySettings=reality)
+    else:
+        stream["security"] = "none"
+
+    path = cfg.path or "/"
+    if net == "ws":
+        stream["wsSettings"] = {"path": path}
+        if cfg.host:
+            stream["wsSettings"]["headers"] = {"Host": cfg.host}
+    elif net == "httpupgrade":
+        stream["httpupgradeSettings"] = {"path": path, **({"host": cfg.host} if cfg.host else {})}
+    elif net in ("splithttp", "xhttp"):
+        stream["splithttpSettings"] = {"path": path, **({"host": cfg.host} if cfg.host else {})}
+    elif net == "grpc":
+        stream["grpcSettings"] = {"serviceName": cfg.path or cfg.extra.get("serviceName", "")}
+    elif net == "h2":
+        stream["httpSettings"] = {"path": path, **({"host": [cfg.host]} if cfg.host else {})}
+    elif net == "kcp":
+        stream["kcpSettings"] = {"header": {"type": cfg.type or "none"}}
+    elif net == "quic":
+        stream["quicSettings"] = {"security": "none", "key": "",
+                                  "header": {"type": cfg.type or "none"}}
+    return {"tag": tag, "protocol": cfg.protocol, "settings": settings, "streamSettings": stream}
+
+
+def batch_config(entries):
+    """XRayManager::generateBatchSpeedtestConfig for ``[(cfg, port), ...]``"""
+    if not entries:
+        return None
+    inbounds, outbounds, rules = [], [], []
+    for cfg, port in entries:
+        inbounds.append({"tag": f"test-{port}", "port": port, "listen": "127.0.0.1",
+                         "protocol": "mixed", "settings": {"udp": True}, "sniffing": _SNIFFING})
+        outbound = outbound_for(cfg, f"proxy-{port}")
+        if outbound is None:
+            continue
+        if cfg.security == "tls":
+            outbound["streamSettings"] = {"sockopt": {"dialerProxy": "fragment-out"},
+                                          **outbound["streamSettings"]}
+        outbounds.append(outbound)
+    outbounds += [
+        {"protocol": "freedom", "tag": "direct", "settings": {"domainStrategy": "UseIPv4"}},
+        {"protocol": "freedom", "tag": "fragment-out",
+         "settings": {"domainStrategy": "AsIs", "fragment": _FRAGMENT}},
+        {"protocol": "dns", "tag": "dns-out"},
+    ]
+    for cfg, port in entries:
+        rules.append({"type": "field", "inboundTag": [f"test-{port}"], "outboundTag": f"proxy-{port}"})
+    rules.append({"type": "field", "port": 53, "outboundTag": "direct"})
+    rules.append({"type": "field", "ip": _PRIVATE_IPS, "outboundTag": "direct"})
+    return {"log": {"loglevel": "warning"}, "dns": _DNS, "inbounds": inbounds,
+            "outbounds": outbounds, "routing": {"domainStrategy": "AsIs", "rules": rules}}
+
+
+def single_config(cfg, socks_port):
+    """XRayManager::generateConfig (socks inbound, no geosite rule)"""
+    outbound = outbound_for(cfg)
+    if outbound is None:
+        return None
+    if cfg.security == "tls":
+        outbound["streamSettings"]["tlsSettings"] = {
+            "fragment": _FRAGMENT, **outbound["streamSettings"]["tlsSettings"]}
+    return {
+        "log": {"loglevel": "warning"},
+        "dns": _DNS,
+        "inbounds": [{"tag": "mixed-in", "port": socks_port, "listen": "127.0.0.1",
+                      "protocol": "socks", "settings": {"udp": True}, "sniffing": _SNIFFING}],
+        "outbounds": [outbound,
+                      {"protocol": "freedom", "tag": "direct", "settings": {"domainStrategy": "UseIPv4"}},
+                      {"protocol": "dns", "tag": "dns-out"}],
+        "routing": {"domainStrategy": "AsIs", "rules": [
+            {"type": "field", "inboundTag": ["mixed-in"], "port": 53, "outboundTag": "dns-out"},
+            {"type": "field", "inboundTag": ["dns-module"], "outboundTag": "proxy"},
+            {"type": "field", "port": 53, "outboundTag": "direct"},
+            {"type": "field", "ip": _PRIVATE_IPS, "outboundTag": "direct"},
+        ]},
+    }
+
+
+def port_alive(port, timeout_ms=50):
+    """utils::isPortAlive: something accepts connections on 127.0.0.1:port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout_ms / 1000.0)
+        return sock.connect_ex(("127.0.0.1", port)) == 0
+
+
+def plan_batch(uris, base_port=DEFAULT_BASE_PORT):
+    """Parse URIs and assign free sequential ports as batchTestWithXray does
+
+    Returns ``(results, entries)``: a BenchResult per URI (with ``error``
+    set for the ones that can't be tested) and ``[(index, cfg, port)]``.
+    """
+    results = [BenchResult(uri) for uri in uris]
+    entries = []
+    next_port = base_port
+    for i, uri in enumerate(uris):
+        cfg = parse(uri)
+        if cfg is None or not cfg.is_valid():
+            results[i].error = "URI parse failed"
+            continue
+        results[i].ps, results[i].protocol = cfg.ps, cfg.protocol
+        if cfg.protocol in ("hysteria2", "tuic"):
+            results[i].error = "Unsupported protocol for xray batch"
+            continue
+        if outbound_for(cfg) is None:
+            results[i].error = "Unsupported config for xray batch"
+            continue
+        while port_alive(next_port) and next_port < base_port + PORT_SPAN:
+            next_port += 1
+        if next_port >= base_port + PORT_SPAN:
+            results[i].error = "No free ports available"
+            continue
+        results[i].port = next_port
+        entries.append((i, cfg, next_port))
+        next_port += 1
+    return results, entries
+
+
+# ─── Probing ───
+
+async def socks5_open(port, host, target_port, timeout):
+    """CONNECT through the SOCKS5 inbound on 127.0.0.1:port, name resolved remotely"""
+    reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", port), timeout)
+    try:
+        writer.write(b"\x05\x01\x00")
+        if await asyncio.wait_for(reader.readexactly(2), timeout) != b"\x05\x00":
+            raise ConnectionError("SOCKS5 method rejected")
+        name = host.encode("idna")
+        writer.write(b"\x05\x01\x00\x03" + bytes([len(name)]) + name + target_port.to_bytes(2, "big"))
+        head = await asyncio.wait_for(reader.readexactly(4), timeout)
+        if head[1] != 0:
+            raise ConnectionError(f"SOCKS5 connect failed ({head[1]})")
+        skip = {1: 4, 4: 16}.get(head[3])
+        if skip is None:
+            skip = (await reader.readexactly(1))[0]
+        await reader.readexactly(skip + 2)
+        return reader, writer
+    except BaseException:
+        writer.close()
+        raise
+
+
+async def probe_url(port, url, timeout):
+    """GET ``url`` through the inbound; latency in ms or raises
+
+    Like ProxyBenchmark::testSocksConnectivity the clock covers the whole
+    request through the proxy. Any 2xx/3xx status counts as reachable
+    (generate_204 has no body).
+    """
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    target_port = parts.port or (443 if secure else 80)
+    start = time.perf_counter()
+
+    async def exchange():
+        reader, writer = await socks5_open(port, parts.hostname, target_port, timeout)
+        try:
+            if secure:
+                context = ssl.create_default_context()
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+                await writer.start_tls(context, server_hostname=parts.hostname)
+            writer.write(f"GET {parts.path or '/'} HTTP/1.1\r\nHost: {parts.hostname}\r\n"
+                         "User-Agent: hunter-batch\r\nConnection: close\r\n\r\n".encode())
+            status = await reader.readline()
+            fields = status.split()
+            if len(fields) < 2 or not fields[1].isdigit() or not 200 <= int(fields[1]) < 400:
+                raise ConnectionError(f"bad response {status[:40]!r}")
+        finally:
+            writer.close()
+
+    await asyncio.wait_for(exchange(), timeout)
+    return (time.perf_counter() - start) * 1000.0
+
+
+async def probe_inbound(result, test_urls, timeout_s):
+    """Try the test URLs in order (quick timeout first) and fill in ``result``"""
+    quick = max(3, min(timeout_s, 8))
+    full = max(5, timeout_s)
+    errors = []
+    for n, url in enumerate(test_urls):
+        try:
+            latency = await probe_url(result.port, url, quick if n == 0 else full)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ssl.SSLError) as exc:
+            errors.append(type(exc).__name__ if not str(exc) else str(exc))
+            continue
+        result.latency_ms = latency
+        result.success = latency > 0
+        result.tier = classify_tier(latency)
+        if result.tier == "dead":
+            result.error = "Latency above silver threshold"
+        return result
+    result.error = "All connectivity tests failed" + (f" ({errors[-1]})" if errors else "")
+    return result
+
+
+# ─── Engine processes ───
+
+class EngineProcess:
+    """An engine started as ``command + ["run", "-c", config_path]``"""
+
+    def __init__(self, command, config, work_dir, name):
+        self.command = list(command)
+        self.config_path = os.path.join(work_dir, f"{name}.json")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        self.log_path = os.path.join(work_dir, f"{name}_out.txt")
+        self.process = None
+
+    async def start(self, ports, timeout_ms=XRAY_START_TIMEOUT_MS, settle_s=0.0):
+        """Start and wait until one of ``ports`` listens; False if it never does"""
+        with open(self.log_path, "wb") as log:
+            self.process = await asyncio.create_subprocess_exec(
+                *self.command, "run", "-c", self.config_path,
+                stdin=asyncio.subprocess.DEVNULL, stdout=log, stderr=log)
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        while time.monotonic() < deadline:
+            if await asyncio.to_thread(lambda: any(port_alive(port, 20) for port in ports[:8])):
+                if settle_s:
+                    await asyncio.sleep(settle_s)
+                return True
+            if self.process.returncode is not None:
+                break
+            await asyncio.sleep(0.05)
+        return False
+
+    def error_line(self):
+        try:
+            with open(self.log_path, encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            return ""
+        for needle in ("Failed to start", "failed to", "error"):
+            pos = text.find(needle)
+            if pos >= 0:
+                return text[pos:pos + 300].split("\n", 1)[0]
+        return ""
+
+    async def stop(self):
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 3)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        for path in (self.config_path, self.log_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+async def batch_test(uris, engine, base_port=DEFAULT_BASE_PORT, timeout_s=8,
+                     test_urls=TEST_URLS, work_dir=None, settle_s=0.5):
+    """batchTestWithXray: one engine process for all URIs
+
+    Returns ``(results, stats)``; stats has processes, inbounds and the
+    startup/probe/wall times in seconds.
+    """
+    started = time.perf_counter()
+    results, entries = plan_batch(uris, base_port)
+    stats = {"processes": 0, "inbounds": len(entries), "startup_s": 0.0, "probe_s": 0.0}
+    if entries:
+        config = batch_config([(cfg, port) for _, cfg, port in entries])
+        with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+            engine_proc = EngineProcess(engine, config, tmp, f"temp_xray_batch_{base_port}")
+            stats["processes"] = 1
+            try:
+                ready = await engine_proc.start([port for _, _, port in entries], settle_s=settle_s)
+                stats["startup_s"] = time.perf_counter() - started
+                if not ready:
+                    detail = engine_proc.error_line()
+                    for i, _, _ in entries:
+                        results[i].error = "Batch xray ports not listening" + (f": {detail}" if detail else "")
+                else:
+                    probe_start = time.perf_counter()
+                    await asyncio.gather(*(probe_inbound(results[i], test_urls, timeout_s)
+                                           for i, _, _ in entries))
+                    stats["probe_s"] = time.perf_counter() - probe_start
+            finally:
+                await engine_proc.stop()
+    stats["wall_s"] = time.perf_counter() - started
+    return results, stats
+
+
+async def per_config_test(uris, engine, base_port=DEFAULT_BASE_PORT, timeout_s=8,
+                          test_urls=TEST_URLS, concurrency=50, work_dir=None):
+    """benchmarkSingle per URI: one engine process each, ``concurrency`` at a time"""
+    started = time.perf_counter()
+    results, entries = plan_batch(uris, base_port)
+    stats = {"processes": 0, "inbounds": len(entries), "peak_processes": 0}
+    running = 0
+    gate = asyncio.Semaphore(concurrency)
+
+    async def run_one(tmp, i, cfg, port):
+        nonlocal running
+        async with gate:
+            engine_proc = EngineProcess(engine, single_config(cfg, port), tmp, f"temp_xray_{port}")
+            stats["processes"] += 1
+            running += 1
+            stats["peak_processes"] = max(stats["peak_processes"], running)
+            try:
+                if await engine_proc.start([port]):
+                    await probe_inbound(results[i], test_urls, timeout_s)
+                else:
+                    results[i].error = "XRay port timeout"
+            finally:
+                await engine_proc.stop()
+                running -= 1
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        await asyncio.gather(*(run_one(tmp, i, cfg, port) for i, cfg, port in entries))
+    stats["wall_s"] = time.perf_counter() - started
+    return results, stats
+
+
+# ─── Stub engine ───
+
+def stub_behaviour(address, latency_scale=1.0):
+    """Delay in seconds for a server address, or None if the stub refuses it
+
+    One address in five is refused; the rest answer in 20-1000 ms, with one
+    in eight slow enough (2.5-6 s) to land in silver or dead.
+    """
+    h = zlib.crc32(address.encode("utf-8", "surrogateescape"))
+    if h % 5 == 0:
+        return None
+    if h % 8 == 0:
+        return (2500 + (h >> 8) % 3500) / 1000.0 * latency_scale
+    return (20 + (h >> 8) % 980) / 1000.0 * latency_scale
+
+
+def _outbound_address(outbound):
+    settings = outbound.get("settings", {})
+    servers = settings.get("vnext") or settings.get("servers") or [{}]
+    return servers[0].get("address", "")
+
+
+async def serve_stub(config, latency_scale=1.0):
+    """Serve every inbound of an xray config as the stub engine (until cancelled)"""
+    by_tag = {ob.get("tag"): ob for ob in config.get("outbounds", [])}
+    route = {}
+    for rule in config.get("routing", {}).get("rules", []):
+        for tag in rule.get("inboundTag", []):
+            if rule.get("outboundTag") in by_tag and "port" not in rule:
+                route.setdefault(tag, by_tag[rule["outboundTag"]])
+    if "mixed-in" in [ib.get("tag") for ib in config.get("inbounds", [])]:
+        route.setdefault("mixed-in", by_tag.get("proxy", {}))
+
+    async def handle(reader, writer, outbound):
+        try:
+            greeting = await reader.readexactly(2)
+            await reader.readexactly(greeting[1])
+            writer.write(b"\x05\x00")
+            head = await reader.readexactly(4)
+            if head[3] == 3:
+                await reader.readexactly((await reader.readexactly(1))[0] + 2)
+            else:
+                await reader.readexactly({1: 4, 4: 16}.get(head[3], 0) + 2)
+            delay = stub_behaviour(_outbound_address(outbound), latency_scale)
+            if delay is None:
+                await asyncio.sleep(0.01)
+                writer.write(b"\x05\x05\x00\x01\x00\x00\x00\x00\x00\x00")
+                return
+            writer.write(b"\x05\x00\x00\x01\x7f\x00\x00\x01\x00\x00")
+            await reader.readuntil(b"\r\n\r\n")
+            await asyncio.sleep(delay)
+            writer.write(b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    servers = []
+    for inbound in config.get("inbounds", []):
+        outbound = route.get(inbound.get("tag"), {})
+        servers.append(await asyncio.start_server(
+            lambda r, w, ob=outbound: handle(r, w, ob),
+            inbound.get("listen", "127.0.0.1"), inbound["port"]))
+    try:
+        await asyncio.Event().wait()
+    finally:
+        for server in servers:
+            server.close()
+
+
+def stub_command(latency_scale=1.0):
+    """Engine command that runs this module as the stub engine"""
+    return [sys.executable, os.path.abspath(__file__), "--stub-engine",
+            "--latency-scale", str(latency_scale)]
+
+
+def run_stub_engine(argv):
+    parser = argparse.ArgumentParser(prog="xray_batch.py --stub-engine")
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    parser.add_argument("run")
+    parser.add_argument("-c", "--config", required=True)
+    args = parser.parse_args(argv)
+    with open(args.config, encoding="utf-8") as f:
+        config = json.load(f)
+    try:
+        asyncio.run(serve_stub(config, args.latency_scale))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+# ─── Report / benchmark ───
+
+def print_results(results, stats, label):
+    tiers = {"gold": 0, "silver": 0, "dead": 0}
+    for r in results:
+        tiers[r.tier] += 1
+    print(f"[{label}] {len(results)} URIs, {stats['inbounds']} testable, "
+          f"{stats['processes']} engine process(es), {stats['wall_s']:.2f} s wall")
+    print(f"   gold {tiers['gold']}  silver {tiers['silver']}  dead {tiers['dead']}")
+
+
+def run_benchmark(count=200, concurrency=50, latency_scale=0.2, base_port=DEFAULT_BASE_PORT):
+    uris = make_synthetic_uris(count, seed=11)
+    engine = stub_command(latency_scale)
+    timeout_s = 8
+
+    batch_results, batch_stats = asyncio.run(
+        batch_test(uris, engine, base_port, timeout_s, STUB_TEST_URLS))
+    single_results, single_stats = asyncio.run(
+        per_config_test(uris, engine, base_port, timeout_s, STUB_TEST_URLS, concurrency))
+
+    print(f"[BENCH] {count} synthetic URIs, stub engine (latency x{latency_scale:g}), "
+          f"per-config concurrency {concurrency}")
+    print(f"   batch      : {batch_stats['processes']:4d} process   "
+          f"{batch_stats['wall_s']:6.2f} s wall (startup {batch_stats['startup_s']:.2f} s, "
+          f"probes {batch_stats['probe_s']:.2f} s)")
+    print(f"   per-config : {single_stats['processes']:4d} processes "
+          f"{single_stats['wall_s']:6.2f} s wall (peak {single_stats['peak_processes']} running)")
+    same = sum(a.tier == b.tier for a, b in zip(batch_results, single_results))
+    print(f"   tiers agree for {same}/{count} URIs "
+          f"({sum(r.success for r in batch_results)} reachable in batch; per-config latencies "
+          f"include engine start-up contention)")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--stub-engine":
+        return run_stub_engine(sys.argv[2:])
+    parser = argparse.ArgumentParser(description="Test configs through one multi-inbound xray")
+    parser.add_argument("uris", nargs="?", help="file with one URI per line")
+    parser.add_argument("--engine", default="xray", help="xray-compatible binary")
+    parser.add_argument("--stub", action="store_true", help="use the local stub engine")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_BASE_PORT)
+    parser.add_argument("--timeout", type=int, default=8)
+    parser.add_argument("--per-config", action="store_true",
+                        help="one engine process per config instead of one batch")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    parser.add_argument("--bench", nargs="?", type=int, const=200, metavar="URIS")
+    args = parser.parse_args()
+    if args.bench:
+        run_benchmark(args.bench, args.concurrency, base_port=args.base_port)
+        return 0
+    if not args.uris:
+        parser.print_usage()
+        return 2
+
+    with open(args.uris, encoding="utf-8", errors="surrogateescape") as f:
+        uris = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    engine = stub_command() if args.stub else [args.engine]
+    test_urls = STUB_TEST_URLS if args.stub else TEST_URLS
+    if args.per_config:
+        results, stats = asyncio.run(per_config_test(uris, engine, args.base_port, args.timeout,
+                                                     test_urls, args.concurrency))
+    else:
+        results, stats = asyncio.run(batch_test(uris, engine, args.base_port, args.timeout, test_urls))
+    if args.json:
+        for r in results:
+            print(json.dumps(r.to_dict()))
+    else:
+        for r in sorted(results, key=lambda r: (not r.success, r.latency_ms)):
+            state = f"{r.tier:6s} {r.latency_ms:7.0f} ms" if r.success else f"dead   {r.error}"
+            print(f"   :{r.port or '-':<6} {r.protocol or '?':12s} {state}  {r.ps[:40]}")
+        print()
+    print_results(results, stats, "PER-CONFIG" if args.per_config else "BATCH")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())